@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine
+from tethysext.atcore.utilities import import_from_string
+from tethysext.atcore.cli.cli_helpers import print_header, print_success, print_info, print_error
+
+
+def compress_pickles(arguments):
+    """
+    Commandline interface for compressing the pickled values stored uncompressed in a resource database.
+    """
+    from tethysext.atcore.models.types.compressed_pickle import compress_columns
+
+    print_header('Compressing pickled values...')
+
+    engine = create_engine(arguments.url)
+    errors_occurred = False
+
+    try:
+        for base_path in arguments.base or ['tethysext.atcore.models.app_users.AppUsersBase']:
+            print_info(f'Compressing pickled values of the tables of {base_path}...')
+            try:
+                base = import_from_string(base_path)
+                counts = compress_columns(
+                    engine, base.metadata, batch_size=arguments.batch_size, pause=arguments.pause,
+                    codec=arguments.codec
+                )
+                for column, count in counts.items():
+                    print_success(f'Compressed {count} values of {column}.')
+            except Exception as e:
+                errors_occurred = True
+                print_error(f'An error occurred while compressing the pickled values of {base_path}: {e}')
+    finally:
+        engine.dispose()
+
+    if not errors_occurred:
+        print_success('Successfully compressed pickled values.')
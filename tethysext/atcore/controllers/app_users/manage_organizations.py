@@ -15,6 +15,7 @@ from tethys_sdk.permissions import has_permission, permission_required
 # ATCore
 from tethysext.atcore.controllers.app_users.mixins import MultipleResourcesViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
+from tethysext.atcore.services.request_session import release_request_session
 
 
 class ManageOrganizations(MultipleResourcesViewMixin):
@@ -57,8 +58,7 @@ class ManageOrganizations(MultipleResourcesViewMixin):
         """
         _AppUser = self.get_app_user_model()
         _Organization = self.get_organization_model()
-        make_session = self.get_sessionmaker()
-        session = make_session()
+        session = self.get_request_session(request)
         request_app_user = _AppUser.get_app_user_from_request(request, session)
 
         # List organizations: admins can see all, everyone else can see only the organizations to which they belong
@@ -136,7 +136,7 @@ class ManageOrganizations(MultipleResourcesViewMixin):
 
             organization_cards[license_display].append(organization_card)
 
-        session.close()
+        release_request_session(request, session)
         context = self.get_base_context(request)
         context.update({
             'page_title': _Organization.DISPLAY_TYPE_PLURAL,
@@ -6,10 +6,13 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import json
 import logging
 # Django
 from django.http import JsonResponse
 from django.shortcuts import render, reverse
+from sqlalchemy import and_, or_, nullsfirst, nullslast
+from sqlalchemy.orm import ColumnProperty, selectinload
 
 # Tethys core
 from tethys_sdk.permissions import has_permission, permission_required
@@ -17,6 +20,7 @@ from tethys_sdk.permissions import has_permission, permission_required
 from tethysext.atcore.controllers.app_users.mixins import ResourceViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
 from tethysext.atcore.services.paginate import paginate
+from tethysext.atcore.services.request_session import release_request_session
 
 
 log = logging.getLogger(f'tethys.{__name__}')
@@ -46,6 +50,8 @@ class ManageResources(ResourceViewMixin):
     # Opt-in: set True in a subclass to render the list as a client-side jQuery DataTable
     # (search box, sortable headers, page-size selector). Ignored when enable_groups is True.
     enable_datatable = False
+    # Filter, sort, and paginate the flat (non-grouped, non-DataTable) list in SQL.
+    enable_query_pagination = True
 
     ACTION_LAUNCH = 'launch'
     ACTION_PROCESSING = 'processing'
@@ -98,8 +104,7 @@ class ManageResources(ResourceViewMixin):
         _AppUser = self.get_app_user_model()
 
         _Resource = self.get_resource_model()
-        make_session = self.get_sessionmaker()
-        session = make_session()
+        session = self.get_request_session(request)
         request_app_user = _AppUser.get_app_user_from_request(request, session)
 
         # GET params
@@ -112,41 +117,50 @@ class ManageResources(ResourceViewMixin):
         # non-DataTable path; the DataTable filters client-side and never sends this param.
         search = (params.get('search', '') or '').strip()
 
+        # Get the existing user settings in one query, the updates below reuse the settings fetched here
+        settings = request_app_user.get_settings(
+            session=session,
+            page=_SETTINGS_PAGE,
+            keys=[_SETTING_RESOURCES_PER_PAGE, _SETTING_SORT_RESOURCE_BY],
+            as_value=True
+        )
+        settings_changed = False
+
         # Update setting if user made a change
         if resources_per_page:
-            request_app_user.update_setting(
-                session=session,
-                page=_SETTINGS_PAGE,
-                key=_SETTING_RESOURCES_PER_PAGE,
-                value=resources_per_page
-            )
+            if resources_per_page != settings[_SETTING_RESOURCES_PER_PAGE]:
+                request_app_user.update_setting(
+                    session=session,
+                    page=_SETTINGS_PAGE,
+                    key=_SETTING_RESOURCES_PER_PAGE,
+                    value=resources_per_page,
+                    commit=False
+                )
+                settings_changed = True
 
-        # Get the existing user setting if loading for the first time
+        # Use the existing user setting if loading for the first time
         else:
-            resources_per_page = request_app_user.get_setting(
-                session=session,
-                page=_SETTINGS_PAGE,
-                key=_SETTING_RESOURCES_PER_PAGE,
-                as_value=True
-            )
+            resources_per_page = settings[_SETTING_RESOURCES_PER_PAGE]
 
         # Update setting if user made a change
         if sort_by_raw:
-            request_app_user.update_setting(
-                session=session,
-                page=_SETTINGS_PAGE,
-                key=_SETTING_SORT_RESOURCE_BY,
-                value=sort_by_raw
-            )
+            if sort_by_raw != settings[_SETTING_SORT_RESOURCE_BY]:
+                request_app_user.update_setting(
+                    session=session,
+                    page=_SETTINGS_PAGE,
+                    key=_SETTING_SORT_RESOURCE_BY,
+                    value=sort_by_raw,
+                    commit=False
+                )
+                settings_changed = True
 
-        # Get the existing user setting if loading for the first time
+        # Use the existing user setting if loading for the first time
         else:
-            sort_by_raw = request_app_user.get_setting(
-                session=session,
-                page=_SETTINGS_PAGE,
-                key=_SETTING_SORT_RESOURCE_BY,
-                as_value=True
-            )
+            sort_by_raw = settings[_SETTING_SORT_RESOURCE_BY]
+
+        # Save changed settings in a single commit, before the resources are loaded for the cards
+        if settings_changed:
+            session.commit()
 
         # Set default settings if not set
         if not resources_per_page:
@@ -159,89 +173,103 @@ class ManageResources(ResourceViewMixin):
         sort_reversed = ':reverse' in sort_by_raw
         sort_by = sort_by_raw.split(':')[0]
 
-        # Get the resources
-        all_resources = self.get_resources(session, request, request_app_user)
-
-        # Build cards
-        def build_resource_cards(resources, level=0):
-            resource_cards = []
-            for resource in resources:
-                # Skip resources that have "hidden" statuses
-                if resource.get_status(resource.ROOT_STATUS_KEY) in resource.HIDDEN_STATUSES:
-                    continue
-
-                resource_card = resource.__dict__ if getattr(resource, '__dict__', None) else dict()
-                resource_card['level'] = level
-                resource_card['slug'] = resource.SLUG
-                resource_card['editable'] = self.can_edit_resource(session, request, resource)
-                resource_card['deletable'] = self.can_delete_resource(session, request, resource)
-                resource_card['archivable'] = self.show_archive_button and self.can_archive_resource(
-                    session, request, resource
-                )
-                resource_card['organizations'] = resource.organizations
-                resource_card['attributes'] = resource.attributes
-                resource_card['attributes']['id'] = str(resource.id)
-                resource_card['has_parents'] = len(resource.parents) > 0
-                resource_card['has_children'] = len(resource.children) > 0
-
-                # Get resource action parameters
-                action_dict = self.get_resource_action(
-                    session=session,
-                    request=request,
-                    request_app_user=request_app_user,
-                    resource=resource
-                )
-
-                resource_card['action'] = action_dict['action']
-                resource_card['action_title'] = action_dict['title']
-                resource_card['action_href'] = action_dict['href']
-                resource_card['action_icon'] = action_dict['icon']
-                resource_card['info_href'] = self.get_info_url(request, resource)
-
-                # Build child resources recursively
-                resource_card['children'] = build_resource_cards(resource.children, level=level+1) \
-                    if self.enable_groups and resource.children else []
-
-                # append resource to resource_cards
-                resource_cards.append(resource_card)
-
-            # Only attempt to sort if the sort field is a valid attribute of _Resource
-            if hasattr(_Resource, sort_by):
-                sorted_resources = sorted(
-                    resource_cards,
-                    key=lambda resource_card: (not resource_card[sort_by], resource_card[sort_by]),
-                    reverse=sort_reversed
-                )
-            else:
-                sorted_resources = resource_cards
-            return sorted_resources
-
-        resource_cards = build_resource_cards(all_resources)
-
         # DataTables handles search/sort/paging client-side, so it needs all rows rendered.
         # Server-side pagination is only used for the grouped (hierarchical) view.
         use_datatable = self.enable_datatable and not self.enable_groups
 
-        # Apply the server-side search filter when the search feature is enabled but the
-        # client-side DataTable is not in use (i.e. the grouped view). The filter is
-        # hierarchy-aware so parent/child relationships in the grouped view are preserved.
-        if search and self.enable_datatable and not use_datatable:
-            resource_cards = self.filter_resource_cards(resource_cards, search.lower())
-
-        # Generate pagination
-        paginated_resources, pagination_info = paginate(
-            objects=resource_cards,
-            results_per_page=resources_per_page,
-            page=page,
-            result_name=_Resource.DISPLAY_TYPE_PLURAL,
-            sort_by_raw=sort_by_raw,
-            sort_reversed=sort_reversed
-        )
+        if self.use_query_pagination(request_app_user, use_datatable):
+            # Filter, sort, and paginate in SQL and only build cards for the visible page.
+            resources_query = self.get_resources_query(session, request, request_app_user)
+            resources_query = self.filter_hidden_resources(resources_query, _Resource)
+
+            if search:
+                resources_query = self.search_resources_query(resources_query, _Resource, search)
+
+            resources_query = self.sort_resources_query(resources_query, _Resource, sort_by, sort_reversed)
+
+            num_resources = resources_query.order_by(None).count()
+            if num_resources <= resources_per_page:
+                page = 1
+
+            page_resources = resources_query \
+                .options(
+                    selectinload(_Resource.organizations),
+                    selectinload(_Resource.parents),
+                    selectinload(_Resource.children),
+                ) \
+                .offset((page - 1) * resources_per_page) \
+                .limit(resources_per_page) \
+                .all()
+
+            resource_cards = [
+                self.build_resource_card(session, request, request_app_user, resource)
+                for resource in page_resources
+            ]
+
+            paginated_resources, pagination_info = paginate(
+                objects=resource_cards,
+                results_per_page=resources_per_page,
+                page=page,
+                result_name=_Resource.DISPLAY_TYPE_PLURAL,
+                sort_by_raw=sort_by_raw,
+                sort_reversed=sort_reversed,
+                num_results=num_resources
+            )
+
+        else:
+            # Get the resources
+            all_resources = self.get_resources(session, request, request_app_user)
+
+            # Build cards
+            def build_resource_cards(resources, level=0):
+                resource_cards = []
+                for resource in resources:
+                    # Skip resources that have "hidden" statuses
+                    if resource.get_status(resource.ROOT_STATUS_KEY) in resource.HIDDEN_STATUSES:
+                        continue
+
+                    resource_card = self.build_resource_card(session, request, request_app_user, resource, level)
+
+                    # Build child resources recursively
+                    resource_card['children'] = build_resource_cards(resource.children, level=level+1) \
+                        if self.enable_groups and resource.children else []
+
+                    # append resource to resource_cards
+                    resource_cards.append(resource_card)
+
+                # Only attempt to sort if the sort field is a valid attribute of _Resource
+                if hasattr(_Resource, sort_by):
+                    sorted_resources = sorted(
+                        resource_cards,
+                        key=lambda resource_card: (not resource_card[sort_by], resource_card[sort_by]),
+                        reverse=sort_reversed
+                    )
+                else:
+                    sorted_resources = resource_cards
+                return sorted_resources
+
+            resource_cards = build_resource_cards(all_resources)
+
+            # Apply the server-side search filter when the search feature is enabled but the
+            # client-side DataTable is not in use (i.e. the grouped view). The filter is
+            # hierarchy-aware so parent/child relationships in the grouped view are preserved.
+            if search and self.enable_datatable and not use_datatable:
+                resource_cards = self.filter_resource_cards(resource_cards, search.lower())
+
+            # Generate pagination
+            paginated_resources, pagination_info = paginate(
+                objects=resource_cards,
+                results_per_page=resources_per_page,
+                page=page,
+                result_name=_Resource.DISPLAY_TYPE_PLURAL,
+                sort_by_raw=sort_by_raw,
+                sort_reversed=sort_reversed
+            )
 
-        # The DataTable paginates in the browser, so render every card rather than a single
-        # server-side page. The user's settings still drive the initial state via pagination_info.
-        if use_datatable:
-            paginated_resources = resource_cards
+            # The DataTable paginates in the browser, so render every card rather than a single
+            # server-side page. The user's settings still drive the initial state via pagination_info.
+            if use_datatable:
+                paginated_resources = resource_cards
 
         # Make the active search term available to the pagination links and the search input.
         # Empty on the DataTable path.
@@ -277,7 +305,7 @@ class ManageResources(ResourceViewMixin):
             'show_organizations_column': len(request_app_user.get_organizations(session, request)) > 1,
         })
 
-        session.close()
+        release_request_session(request, session)
 
         return render(request, self.template_name, context)
 
@@ -451,6 +479,156 @@ class ManageResources(ResourceViewMixin):
                 'icon': self.default_action_icon,
             }
 
+    def build_resource_card(self, session, request, request_app_user, resource, level=0):
+        """
+        Build the card (template context) for a single resource row.
+
+        Args:
+            session(sqlalchemy.session): open sqlalchemy session.
+            request(django.request): the Django request.
+            request_app_user(AppUser): app user that is making the request.
+            resource(Resource): the resource.
+            level(int): depth of the resource in the group hierarchy.
+
+        Returns:
+            dict: the resource card.
+        """
+        # Copy, so the card doesn't change the state of the resource or lose its values when the resource is expired
+        resource_card = dict(resource.__dict__) if getattr(resource, '__dict__', None) else dict()
+        resource_card['level'] = level
+        resource_card['slug'] = resource.SLUG
+        resource_card['editable'] = self.can_edit_resource(session, request, resource)
+        resource_card['deletable'] = self.can_delete_resource(session, request, resource)
+        resource_card['archivable'] = self.show_archive_button and self.can_archive_resource(
+            session, request, resource
+        )
+        resource_card['organizations'] = resource.organizations
+        resource_card['attributes'] = resource.attributes
+        resource_card['attributes']['id'] = str(resource.id)
+        resource_card['has_parents'] = len(resource.parents) > 0
+        resource_card['has_children'] = len(resource.children) > 0
+
+        # Get resource action parameters
+        action_dict = self.get_resource_action(
+            session=session,
+            request=request,
+            request_app_user=request_app_user,
+            resource=resource
+        )
+
+        resource_card['action'] = action_dict['action']
+        resource_card['action_title'] = action_dict['title']
+        resource_card['action_href'] = action_dict['href']
+        resource_card['action_icon'] = action_dict['icon']
+        resource_card['info_href'] = self.get_info_url(request, resource)
+        resource_card['children'] = []
+        return resource_card
+
+    def use_query_pagination(self, request_app_user, use_datatable):
+        """
+        Determine whether the resource list can be filtered, sorted, and paginated in SQL.
+
+        The query path is used for the flat, server-paginated list only. It is skipped if the
+        resource list has been customized through the get_resources or AppUser.filter_resources
+        hooks, because those operate on lists rather than queries.
+
+        Args:
+            request_app_user(AppUser): app user that is making the request.
+            use_datatable(bool): True if the client-side DataTable will render the list.
+
+        Returns:
+            bool: True if the query path should be used.
+        """
+        if not self.enable_query_pagination or self.enable_groups or use_datatable:
+            return False
+
+        if type(self).get_resources is not ManageResources.get_resources:
+            return False
+
+        from tethysext.atcore.models.app_users import AppUser
+        filter_resources = getattr(type(request_app_user), 'filter_resources', None)
+        return filter_resources is AppUser.filter_resources
+
+    def get_resources_query(self, session, request, request_app_user):
+        """
+        Hook to allow easy customization of the resources query used for SQL pagination.
+        Args:
+            session(sqlalchemy.session): open sqlalchemy session.
+            request(django.request): the Django request.
+            request_app_user(AppUser): app user that is making the request.
+        Returns:
+            sqlalchemy.orm.Query: query for the resources to render on the manage_resources page.
+        """
+        _Resource = self.get_resource_model()
+        return request_app_user.get_resources_query(
+            session, request, of_type=_Resource, include_children=not self.enable_groups
+        )
+
+    @staticmethod
+    def filter_hidden_resources(resources_query, _Resource):
+        """
+        Exclude resources with a root status in HIDDEN_STATUSES from the query.
+
+        Args:
+            resources_query(sqlalchemy.orm.Query): the resources query.
+            _Resource(Resource): the resource model class.
+
+        Returns:
+            sqlalchemy.orm.Query: the filtered query.
+        """
+        # Status is stored as a JSON string written by StatusMixin.set_status (json.dumps formatting).
+        hidden_patterns = [
+            json.dumps({_Resource.ROOT_STATUS_KEY: status})[1:-1] for status in _Resource.HIDDEN_STATUSES
+        ]
+        return resources_query.filter(or_(
+            _Resource.status.is_(None),
+            and_(*[~_Resource.status.contains(pattern, autoescape=True) for pattern in hidden_patterns])
+        ))
+
+    def search_resources_query(self, resources_query, _Resource, search):
+        """
+        Hook to filter the resources query by a search term. The SQL equivalent of resource_card_matches_search.
+
+        Args:
+            resources_query(sqlalchemy.orm.Query): the resources query.
+            _Resource(Resource): the resource model class.
+            search(str): the search term.
+
+        Returns:
+            sqlalchemy.orm.Query: the filtered query.
+        """
+        pattern = '%{}%'.format(search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_'))
+        return resources_query.filter(or_(
+            _Resource.name.ilike(pattern, escape='\\'),
+            _Resource.description.ilike(pattern, escape='\\'),
+            _Resource.created_by.ilike(pattern, escape='\\'),
+        ))
+
+    @staticmethod
+    def sort_resources_query(resources_query, _Resource, sort_by, sort_reversed):
+        """
+        Order the resources query by the given field. Empty values are sorted last (first if reversed).
+
+        Args:
+            resources_query(sqlalchemy.orm.Query): the resources query.
+            _Resource(Resource): the resource model class.
+            sort_by(str): name of the column to sort by.
+            sort_reversed(bool): sort in descending order if True.
+
+        Returns:
+            sqlalchemy.orm.Query: the sorted query.
+        """
+        column = getattr(_Resource, sort_by, None)
+
+        # Only attempt to sort if the sort field is a valid column of _Resource
+        if not isinstance(getattr(column, 'property', None), ColumnProperty):
+            return resources_query.order_by(_Resource.id)
+
+        if sort_reversed:
+            return resources_query.order_by(nullsfirst(column.desc()), _Resource.id)
+
+        return resources_query.order_by(nullslast(column.asc()), _Resource.id)
+
     def get_resources(self, session, request, request_app_user):
         """
         Hook to allow easy customization of the resources query.
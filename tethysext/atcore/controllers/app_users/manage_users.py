@@ -11,12 +11,15 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
+# SQLAlchemy
+from sqlalchemy.orm import selectinload
 # Tethys core
 from tethys_sdk.permissions import has_permission, permission_required
 # ATCore
 from tethysext.atcore.controllers.app_users.mixins import AppUsersViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
 from tethysext.atcore.services.paginate import paginate
+from tethysext.atcore.services.request_session import release_request_session
 
 
 class ManageUsers(AppUsersViewMixin):
@@ -64,8 +67,7 @@ class ManageUsers(AppUsersViewMixin):
         """
         _AppUser = self.get_app_user_model()
         permissions_manager = self.get_permissions_manager()
-        make_session = self.get_sessionmaker()
-        session = make_session()
+        session = self.get_request_session(request)
         request_app_user = _AppUser.get_app_user_from_request(request, session)
 
         # List users
@@ -79,7 +81,10 @@ class ManageUsers(AppUsersViewMixin):
         # App admins can see all users of the portal
         if has_permission(request, 'view_all_users'):
             # Django users
-            app_users = session.query(_AppUser).filter(_AppUser.username != request_app_user.username).all()
+            app_users = session.query(_AppUser).\
+                options(selectinload(_AppUser.organizations)).\
+                filter(_AppUser.username != request_app_user.username).\
+                all()
         else:
             # All others can manage users that belong to their organizations or organizations they consult
             app_users = request_app_user.get_peers(session, request, include_self=False, cascade=True)
@@ -90,6 +95,10 @@ class ManageUsers(AppUsersViewMixin):
         if not request_app_user.is_staff():
             app_users.insert(0, request_app_user)
 
+        # Resolve the Django users and permissions groups of all listed users in bulk rather than one query per user
+        _AppUser.prefetch_django_users(app_users)
+        permissions_manager.get_all_permissions_groups_for_users(app_users + [request_app_user])
+
         request_user_permission_rank = request_app_user.get_rank(permissions_manager)
 
         for app_user in app_users:
@@ -160,7 +169,7 @@ class ManageUsers(AppUsersViewMixin):
             'show_organizations_link': has_permission(request, 'view_organizations'),
         })
 
-        session.close()
+        release_request_session(request, session)
 
         return render(request, self.template_name, context)
 
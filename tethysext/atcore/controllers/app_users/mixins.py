@@ -14,6 +14,7 @@ from tethys_sdk.permissions import has_permission
 from tethysext.atcore.exceptions import ATCoreException
 from tethysext.atcore.models.app_users import AppUser, Organization, Resource
 from tethysext.atcore.services.app_users.permissions_manager import AppPermissionsManager
+from tethysext.atcore.services.request_session import get_request_session, release_request_session, request_scope
 
 
 class AppUsersViewMixin(TethysController):
@@ -44,6 +45,25 @@ class AppUsersViewMixin(TethysController):
 
         return self._app.get_persistent_store_database(self._persistent_store_name, as_sessionmaker=True)
 
+    def get_request_session(self, request):
+        """
+        Get the session shared by the decorators, controller and methods handling the request.
+
+        Args:
+            request: Django HttpRequest.
+
+        Returns:
+            sqlalchemy.orm.Session: the session.
+        """
+        return get_request_session(request, self.get_sessionmaker())
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Share one database session and the request app user among everything handling the request.
+        """
+        with request_scope(request):
+            return super().dispatch(request, *args, **kwargs)
+
     def get_base_context(self, request):
         base_context = {
             'is_app_admin': has_permission(request, 'has_app_admin_role')
@@ -70,17 +90,18 @@ class ResourceBackUrlViewMixin(AppUsersViewMixin):
         """
         Intercept kwargs before calling handler method.
         """
-        # Handle back_url
-        self.back_url = kwargs.get('back_url', '')
-
-        # Default to the resource details page
-        if not self.back_url:
-            self.back_url = self.default_back_url(
-                *args,
-                request=request,
-                **kwargs
-            )
-        return super().dispatch(request, *args, **kwargs)
+        with request_scope(request):
+            # Handle back_url
+            self.back_url = kwargs.get('back_url', '')
+
+            # Default to the resource details page
+            if not self.back_url:
+                self.back_url = self.default_back_url(
+                    *args,
+                    request=request,
+                    **kwargs
+                )
+            return super().dispatch(request, *args, **kwargs)
 
     def default_back_url(self, request, *args, **kwargs):
         """
@@ -95,7 +116,6 @@ class ResourceBackUrlViewMixin(AppUsersViewMixin):
         resource = self.get_resource(request, resource_id) if resource_id else None
         if resource:
             # Get resource_details page for the resource
-            resource = self.get_resource(request, resource_id)
             back_controller = f'{app_namespace}:{resource.SLUG}_resource_details'
             return reverse(back_controller, args=(str(resource_id),))
         else:
@@ -133,8 +153,7 @@ class ResourceViewMixin(ResourceBackUrlViewMixin):
 
         if not session:
             manage_session = True
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
 
         request_app_user = _AppUser.get_app_user_from_request(request, session)
         try:
@@ -148,7 +167,7 @@ class ResourceViewMixin(ResourceBackUrlViewMixin):
                     ))
         finally:
             if manage_session:
-                session.close()
+                release_request_session(request, session)
 
         return resource
 
@@ -182,8 +201,7 @@ class MultipleResourcesViewMixin(ResourceBackUrlViewMixin):
 
         if not session:
             manage_session = True
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
 
         request_app_user = _AppUser.get_app_user_from_request(request, session)
         try:
@@ -200,6 +218,6 @@ class MultipleResourcesViewMixin(ResourceBackUrlViewMixin):
                     ))
         finally:
             if manage_session:
-                session.close()
+                release_request_session(request, session)
 
         return resource
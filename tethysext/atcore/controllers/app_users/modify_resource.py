@@ -20,6 +20,7 @@ from tethys_gizmos.gizmo_options import TextInput, SelectInput
 # ATCore
 from tethysext.atcore.controllers.app_users.mixins import ResourceViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
+from tethysext.atcore.services.request_session import release_request_session
 from tethysext.atcore.exceptions import ATCoreException
 from tethysext.atcore.gizmos import SpatialReferenceSelect
 from tethysext.atcore.services.spatial_reference import SpatialReferenceService
@@ -84,8 +85,7 @@ class ModifyResource(ResourceViewMixin):
         _AppUser = self.get_app_user_model()
         _Organization = self.get_organization_model()
         _Resource = self.get_resource_model()
-        make_session = self.get_sessionmaker()
-        session = make_session()
+        session = self.get_request_session(request)
         request_app_user = _AppUser.get_app_user_from_request(request, session)
 
         # Defaults
@@ -414,7 +414,7 @@ class ModifyResource(ResourceViewMixin):
 
         finally:
             # Close sessions
-            session and session.close()
+            session and release_request_session(request, session)
 
         context.update({
             'next_controller': next_controller,
@@ -8,6 +8,7 @@ from tethys_apps.utilities import get_active_app
 from tethys_gizmos.gizmo_options import TextInput, ToggleSwitch, SelectInput
 from tethysext.atcore.controllers.app_users.mixins import AppUsersViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
+from tethysext.atcore.services.request_session import release_request_session
 
 
 class ModifyUser(AppUsersViewMixin):
@@ -62,13 +63,13 @@ class ModifyUser(AppUsersViewMixin):
         organization_select_error = ""
         disable_role_select = False
 
-        session = make_session()
+        session = self.get_request_session(request)
         request_app_user = _AppUser.get_app_user_from_request(request, session)
         is_me = user_id == str(request_app_user.id)
         organization_options = request_app_user.get_organizations(session, request, as_options=True, cascade=True)
         role_options = request_app_user.get_assignable_roles(request, as_options=True)
         no_organization_roles = _AppUser.ROLES.get_no_organization_roles()
-        session.close()
+        release_request_session(request, session)
 
         # Process next
         next_arg = request.GET.get('next', "")
@@ -13,6 +13,7 @@ from tethys_sdk.permissions import has_permission
 # ATCore
 from tethysext.atcore.controllers.app_users.mixins import AppUsersViewMixin
 from tethysext.atcore.services.app_users.decorators import active_user_required
+from tethysext.atcore.services.request_session import release_request_session
 
 
 class UserAccount(AppUsersViewMixin):
@@ -40,9 +41,8 @@ class UserAccount(AppUsersViewMixin):
         """
         _AppUser = self.get_app_user_model()
         _Organization = self.get_organization_model()
-        make_session = self.get_sessionmaker()
         permissions_manager = self.get_permissions_manager()
-        session = make_session()
+        session = self.get_request_session(request)
 
         request_app_user = _AppUser.get_app_user_from_request(request, session)
 
@@ -78,6 +78,6 @@ class UserAccount(AppUsersViewMixin):
             'show_organizations_link': has_permission(request, 'view_organizations')
         })
 
-        session.close()
+        release_request_session(request, session)
 
         return render(request, self.template_name, context)
@@ -7,22 +7,20 @@
 ********************************************************************************
 """
 import logging
+import re
 import requests
 import uuid
 import collections
 from django.shortcuts import redirect, render
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.contrib import messages
 from tethys_sdk.permissions import has_permission, permission_required
 from tethys_sdk.gizmos import ToggleSwitch, CesiumMapView
 from tethysext.atcore.controllers.resource_view import ResourceView
 from tethysext.atcore.gizmos import SlideSheet
+from tethysext.atcore.services.shapefile_export import geojson_to_shapefile_zip
+from tethysext.atcore.services import vector_tiles
 import json
-import shapefile
-from django.http import HttpResponse
-from zipfile import ZipFile
-from io import BytesIO
-import os
 
 log = logging.getLogger(f'tethys.{__name__}')
 
@@ -50,6 +48,10 @@ class MapView(ResourceView):
     _SpatialManager = None
     layer_tab_name = 'Layers'
     map_type = 'tethys_map_view'
+    #: Backend of the cache of vector tiles (see services.map_cache). None to use the process-wide tile cache.
+    vector_tile_cache = None
+    #: Seconds browsers may cache vector tiles. Tile urls change when the data of the layer changes.
+    vector_tile_max_age = 3600
 
     def get_context(self, request, session, resource, context, *args, **kwargs):
         """
@@ -85,7 +87,7 @@ class MapView(ResourceView):
         )
 
         # Render the Map
-        map_view, model_extent, layer_groups = map_manager.compose_map(
+        map_view, model_extent, layer_groups = map_manager.get_composed_map(
             *args,
             request=request,
             resource_id=resource_id,
@@ -410,6 +412,61 @@ class MapView(ResourceView):
         """
         return self.default_disable_basemap
 
+    def get_vector_tile(self, request, session, resource, *args, **kwargs):
+        """
+        Get a Mapbox Vector Tile of a layer, cutting it from the tile source of the layer if it is not cached (e.g.: ?method=get-vector-tile&layer_id=foo&v=1a2b3c&z=12&x=800&y=1500).
+
+        Args:
+            request(HttpRequest): The request.
+            session(sqlalchemy.Session): The database session.
+            resource(Resource): The resource.
+
+        Returns:
+            HttpResponse: the encoded tile.
+        """  # noqa: E501
+        try:
+            z, x, y = (int(request.GET[k]) for k in ('z', 'x', 'y'))
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest('The z, x and y parameters are required and must be integers.')
+
+        if not 0 <= z <= 30 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            return HttpResponseBadRequest(f'Invalid tile: {z}/{x}/{y}.')
+
+        layer_id = request.GET.get('layer_id', '')
+        version = request.GET.get('v', '')
+        # The path identifies the resource and any workflow, step or result of the layer
+        key = f'{request.path}:{layer_id}:{version}'
+
+        def get_source():
+            return vector_tiles.tile_source_cache.get(key, lambda: self.get_vector_tile_source(
+                request, session, resource, layer_id, version, *args, **kwargs
+            ))
+
+        tile = vector_tiles.get_tile(key, z, x, y, get_source, cache=self.vector_tile_cache)
+
+        if tile is None:
+            raise Http404(f'Layer not found: {layer_id}.')
+
+        response = HttpResponse(tile, content_type=vector_tiles.MVT_CONTENT_TYPE)
+        response['Cache-Control'] = f'private, max-age={self.vector_tile_max_age}'
+        return response
+
+    def get_vector_tile_source(self, request, session, resource, layer_id, version, *args, **kwargs):
+        """
+        Hook to provide the tile source of a layer served as vector tiles. Sources are cached per process until the version changes.
+
+        Args:
+            request(HttpRequest): The request.
+            session(sqlalchemy.Session): The database session.
+            resource(Resource): The resource.
+            layer_id(str): id of the layer.
+            version(str): version of the data of the layer given in the tile url.
+
+        Returns:
+            GeoJSONTileSource|PostGISTileSource: the tile source or None if the layer does not exist.
+        """  # noqa: E501
+        return None
+
     def get_map_manager(self, request, resource, *args, **kwargs):
         """
         Lazily build and retrieve a MapManager instance.
@@ -615,9 +672,7 @@ class MapView(ResourceView):
 
     def convert_geojson_to_shapefile(self, request, session, resource, *args, **kwargs):
         """
-        credit to:
-        https://github.com/TipsForGIS/geoJSONToShpFile/blob/master/geoJ.py
-        Updated for pyshp 3.x compatibility.
+        Convert the GeoJSON features of a layer to a zipped shapefile. Only features with the same type of geometry as the first feature are included.
 
         Args:
             request(HttpRequest): The request.
@@ -625,83 +680,15 @@ class MapView(ResourceView):
             resource(Resource): The resource.
 
         Returns:
-            HttpResponse: Zip file containing shapefile.
-        """
+            FileResponse: Zip file containing shapefile.
+        """  # noqa: E501
         json_data = json.loads(request.POST.get('data', ''))
         layer_id = request.POST.get('id', '0')
         json_type = json_data['features'][0]['geometry']['type']
 
-        # Create shapefile with path (pyshp 3.x compatible)
-        shp_file = layer_id + "_" + json_type
+        # Layer ids come from the client, only use safe characters in file names
+        shp_file = re.sub(r'[^\w\-]', '_', f'{layer_id}_{json_type}')
+        archive = geojson_to_shapefile_zip(json_data, shp_file)
 
-        # Set shape type based on geometry type
-        if json_type == 'Polygon':
-            shpfile_obj = shapefile.Writer(shp_file, shapeType=shapefile.POLYGON)
-        elif json_type == 'Point':
-            shpfile_obj = shapefile.Writer(shp_file, shapeType=shapefile.POINT)
-        elif json_type == 'LineString':
-            shpfile_obj = shapefile.Writer(shp_file, shapeType=shapefile.POLYLINE)
-        else:
-            raise ValueError(f"Unsupported geometry type: {json_type}")
-
-        shpfile_obj.autoBalance = 1
-
-        # Define fields
-        columns_list = json_data['features'][0]['properties'].keys()
-        for i in columns_list:
-            shpfile_obj.field(str(i), 'C', '50')
-
-        # Extract geometries and attributes
-        geometries = list()
-        attributes = list()
-        for feature in json_data['features']:
-            if feature['geometry']['type'] == json_type:
-                geometries.append(feature['geometry']['coordinates'])
-            attributes_per_feature = list()
-            for attribute_feature in columns_list:
-                attributes_per_feature.append(str(feature['properties'][str(attribute_feature)]))
-            attributes.append(attributes_per_feature)
-
-        # Write geometries
-        for geo in geometries:
-            if json_type == 'Polygon':
-                shpfile_obj.poly(geo)
-            elif json_type == 'Point':
-                shpfile_obj.point(geo[0], geo[1])
-            elif json_type == 'LineString':
-                shpfile_obj.line([geo])
-
-        # Write attributes
-        for attr in attributes:
-            shpfile_obj.record(*attr)
-
-        # Close the writer to finalize files
-        shpfile_obj.close()
-
-        # Create .prj file
-        prj_file = open(shp_file + '.prj', 'w')
-        prj_str = 'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137,298.257223563]],' \
-                  'PRIMEM["Greenwich",0],UNIT["Degree",0.017453292519943295]]'
-        prj_file.write(prj_str)
-        prj_file.close()
-
-        # Create zip file in memory
-        in_memory = BytesIO()
-        shp_file_ext = ['prj', 'shp', 'dbf', 'shx']
-
-        with ZipFile(in_memory, "w") as my_zip:
-            for ext in shp_file_ext:
-                my_zip.write(shp_file + "." + ext)
-
-        # Clean up temporary files
-        for ext in shp_file_ext:
-            if os.path.exists(shp_file + "." + ext):
-                os.remove(shp_file + "." + ext)
-
-        # Prepare HTTP response
-        response = HttpResponse(content_type='application/zip')
-        response['Content-Disposition'] = 'attachment; filename="' + shp_file + '.zip' + '"'
-
-        in_memory.seek(0)
-        response.write(in_memory.read())
-        return response
+        # The archive is streamed in chunks and closed when the response is complete
+        return FileResponse(archive, as_attachment=True, filename=shp_file + '.zip', content_type='application/zip')
@@ -333,7 +333,7 @@ class SpatialCondorJobMWV(MapWorkflowView):
         step.set_attribute('condor_job_id', job_id)
 
         # Allow the step to track statuses on each "sub-job"
-        step.set_attribute('condor_job_statuses', [])
+        step.clear_job_statuses(session)
 
         # Reset next steps
         step.workflow.reset_next_steps(step)
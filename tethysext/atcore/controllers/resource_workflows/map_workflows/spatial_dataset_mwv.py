@@ -157,18 +157,16 @@ class SpatialDatasetMWV(SpatialDataMWV):
         # Save the data to the datasets parameter of the step
         p_datasets = step.get_parameter('datasets')
 
-        # Lazy load the dataset parameter as a dictionary
+        # Lazy load the dataset parameter as a dictionary, copied so the change is detected
         if p_datasets is None or not isinstance(p_datasets, dict):
             p_datasets = {}
+        else:
+            p_datasets = dict(p_datasets)
 
         # Index datasets by feature id
         feature_id = request.POST.get('feature-id', None)
         p_datasets[feature_id] = dataset
 
-        # Reset the parameter to None for changes to be detected and saved.
-        step.set_parameter('datasets', None)
-        session.commit()
-
         # Save the new value of the datasets
         step.set_parameter('datasets', p_datasets)
         session.commit()
@@ -1,5 +1,12 @@
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from django.http import JsonResponse
+
 from tethysext.atcore.controllers.app_users.mixins import ResourceViewMixin
 from tethysext.atcore.models.app_users import ResourceWorkflow, ResourceWorkflowStep, ResourceWorkflowResult
+from tethysext.atcore.services.dataframe_query import parse_datatables_params, query_dataframe
+from tethysext.atcore.services.request_session import release_request_session
 
 
 class WorkflowViewMixin(ResourceViewMixin):
@@ -33,8 +40,7 @@ class WorkflowViewMixin(ResourceViewMixin):
 
         if not session:
             manage_session = True
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
 
         try:
             workflow = session.query(_ResourceWorkflow). \
@@ -43,7 +49,7 @@ class WorkflowViewMixin(ResourceViewMixin):
 
         finally:
             if manage_session:
-                session.close()
+                release_request_session(request, session)
 
         return workflow
 
@@ -64,8 +70,7 @@ class WorkflowViewMixin(ResourceViewMixin):
 
         if not session:
             manage_session = True
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
 
         try:
             step = session.query(_ResourceWorkflowStep). \
@@ -74,7 +79,7 @@ class WorkflowViewMixin(ResourceViewMixin):
 
         finally:
             if manage_session:
-                session.close()
+                release_request_session(request, session)
 
         return step
 
@@ -106,8 +111,7 @@ class ResultViewMixin(ResourceViewMixin):
 
         if not session:
             manage_session = True
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
 
         try:
             workflow = session.query(_ResourceWorkflowResult). \
@@ -116,6 +120,117 @@ class ResultViewMixin(ResourceViewMixin):
 
         finally:
             if manage_session:
-                session.close()
+                release_request_session(request, session)
 
         return workflow
+
+
+class DatasetTableViewMixin(ResultViewMixin):
+    """
+    Mixin for result views that render DatasetWorkflowResult datasets as tables. Tables with more than server_side_row_threshold rows are rendered empty and paged, sorted, and searched on the server through the get_dataset_rows method.
+    """  # noqa: E501
+    #: Datasets with more rows than this are loaded with server-side processing instead of being embedded in the page.
+    server_side_row_threshold = 10000
+
+    def get_server_side_table_kwargs(self, request, result, dataset_index):
+        """
+        Get the DataTableView options that enable server-side processing for a dataset if it is too large to embed in the page.
+
+        Args:
+            request(HttpRequest): The request.
+            result(DatasetWorkflowResult): The result the dataset belongs to.
+            dataset_index(int): Index of the dataset in the result.
+
+        Returns:
+            dict: DataTableView options or None if the rows should be embedded in the page.
+        """  # noqa: E501
+        # Use the number of rows of the stored dataset, so datasets stored out-of-row aren't loaded to count them
+        _, num_rows = result.get_dataset_shape(dataset_index)
+
+        if num_rows <= self.server_side_row_threshold:
+            return None
+
+        return {
+            'paging': True,
+            'processing': True,
+            'serverSide': True,
+            'ajax': self.get_dataset_rows_url(request, result, dataset_index),
+        }
+
+    def get_data_table_dataset(self, request, result, dataset_index):
+        """
+        Get a dataset and the DataTableView options to render it. Only datasets that are embedded in the page are loaded; the columns of datasets processed on the server are read from the stored dataset.
+
+        Args:
+            request(HttpRequest): The request.
+            result(DatasetWorkflowResult): The result the dataset belongs to.
+            dataset_index(int): Index of the dataset in the result.
+
+        Returns:
+            dict, dict: the dataset and the column_names, rows, and server-side processing options for the DataTableView.
+        """  # noqa: E501
+        server_side_kwargs = self.get_server_side_table_kwargs(request, result, dataset_index)
+
+        if server_side_kwargs:
+            dataset = result.get_dataset_metadata(dataset_index)
+            column_names, _ = result.get_dataset_shape(dataset_index)
+            return dataset, dict(column_names=column_names, rows=[], **server_side_kwargs)
+
+        dataset = result.get_dataset(dataset_index)
+        data_frame = dataset['dataset']
+        rows = [list(record.values()) for record in data_frame.to_dict(orient='records', into=OrderedDict)]
+        return dataset, dict(column_names=data_frame.columns, rows=rows)
+
+    @staticmethod
+    def get_dataset_rows_url(request, result, dataset_index):
+        """
+        Get the URL of the server-side processing endpoint for a dataset.
+        """
+        query = urlencode({'method': 'get-dataset-rows', 'result-id': str(result.id), 'dataset': dataset_index})
+        return f'{request.path}?{query}'
+
+    def get_dataset_rows(self, request, session, resource, *args, **kwargs):
+        """
+        Server-side processing endpoint for DataTables. Returns one page of a dataset after filtering and sorting.
+
+        Args:
+            request(HttpRequest): The request.
+            session(sqlalchemy.Session): The database session.
+            resource(Resource): The resource.
+
+        Returns:
+            JsonResponse: draw, recordsTotal, recordsFiltered, and data.
+        """
+        result_id = request.GET.get('result-id', kwargs.get('result_id'))
+        try:
+            dataset_index = int(request.GET.get('dataset', 0))
+        except ValueError:
+            return JsonResponse({'error': 'Invalid dataset.'}, status=400)
+
+        result = self.get_result(request, result_id, session)
+        if not hasattr(result, 'get_dataset') or not 0 <= dataset_index < result.num_datasets:
+            return JsonResponse({'error': 'Invalid dataset.'}, status=400)
+
+        params = parse_datatables_params(request.GET)
+
+        if params['fields'] is not None:
+            columns, _ = result.get_dataset_shape(dataset_index)
+            unknown_fields = [f for f in params['fields'] if f not in columns]
+            if unknown_fields:
+                return JsonResponse({'error': f'Invalid fields: {", ".join(unknown_fields)}.'}, status=400)
+
+        data_frame = result.get_dataset(dataset_index, columns=params['fields'])['dataset']
+        records_total, records_filtered, rows = query_dataframe(
+            data_frame,
+            start=params['start'],
+            length=params['length'],
+            search=params['search'],
+            order=params['order'],
+        )
+
+        return JsonResponse({
+            'draw': params['draw'],
+            'recordsTotal': records_total,
+            'recordsFiltered': records_filtered,
+            'data': rows,
+        })
@@ -16,6 +16,7 @@ from tethys_apps.utilities import get_active_app
 from tethysext.atcore.exceptions import ATCoreException
 from tethysext.atcore.controllers.resource_workflows.mixins import WorkflowViewMixin
 from tethysext.atcore.models.resource_workflow_steps import ResultsResourceWorkflowStep
+from tethysext.atcore.services.request_session import release_request_session
 
 
 log = logging.getLogger(f'tethys.{__name__}')
@@ -56,8 +57,7 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
         session = None
 
         try:
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
             workflow = self.get_workflow(request, workflow_id, session=session)
 
             if not step_id_given:
@@ -109,7 +109,7 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
             messages.warning(request, str(e))
             return redirect(self.back_url)
         finally:
-            session and session.close()
+            session and release_request_session(request, session)
 
         response = self._get_response(request, resource_id, workflow_id, step_id, result_id, args, kwargs)
 
@@ -206,8 +206,7 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
         session = None
 
         try:
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
             step = self.get_step(request, step_id, session=session)
 
             # Validate HTTP method
@@ -249,7 +248,7 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
             messages.warning(request, str(e))
             return redirect(self.back_url)
         finally:
-            session and session.close()
+            session and release_request_session(request, session)
 
     def _route_to_result_controller(self, request, resource_id, workflow_id, step_id, result_id, *args, **kwargs):
         """
@@ -270,8 +269,7 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
         session = None
 
         try:
-            make_session = self.get_sessionmaker()
-            session = make_session()
+            session = self.get_request_session(request)
             step = self.get_step(request, step_id, session=session)
 
             # Check if step is ResultsResourceWorkflowStep
@@ -323,4 +321,4 @@ class ResourceWorkflowRouter(WorkflowViewMixin):
             messages.warning(request, str(e))
             return redirect(self.back_url)
         finally:
-            session and session.close()
+            session and release_request_session(request, session)
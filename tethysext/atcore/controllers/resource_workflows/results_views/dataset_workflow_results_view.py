@@ -7,17 +7,17 @@
 ********************************************************************************
 """
 import logging
-from collections import OrderedDict
 from tethys_sdk.gizmos import DataTableView
 from tethysext.atcore.models.resource_workflow_results import DatasetWorkflowResult
 from tethysext.atcore.controllers.resource_workflows.workflow_results_view import WorkflowResultsView
+from tethysext.atcore.controllers.resource_workflows.mixins import DatasetTableViewMixin
 from tethys_sdk.permissions import has_permission
 
 
 log = logging.getLogger(f'tethys.{__name__}')
 
 
-class DatasetWorkflowResultView(WorkflowResultsView):
+class DatasetWorkflowResultView(WorkflowResultsView, DatasetTableViewMixin):
     """
     Dataset Result View Controller
     """
@@ -56,9 +56,6 @@ class DatasetWorkflowResultView(WorkflowResultsView):
         # Get the result
         result = self.get_result(request=request, result_id=result_id, session=session)
 
-        # Get datasets
-        datasets = result.datasets
-
         # Get options
         options = result.options
 
@@ -68,7 +65,11 @@ class DatasetWorkflowResultView(WorkflowResultsView):
         # Get can_export_datatable permission
         can_export_datatable = has_permission(request, 'can_export_datatable')
 
-        for ds in datasets:
+        datasets = list()
+        for dataset_index in range(result.num_datasets):
+            # Large datasets are paged, sorted, and searched on the server and aren't loaded here
+            ds, table_kwargs = self.get_data_table_dataset(request, result, dataset_index)
+
             # Check if the export options is there
             dom_attribute = ""
             if 'show_export_button' in ds.keys():
@@ -80,13 +81,15 @@ class DatasetWorkflowResultView(WorkflowResultsView):
                         # Show pagination/filtering but not export buttons.
                         dom_attribute = "frtip"
 
+            data_table_kwargs = dict(options.get('data_table_kwargs', {}))
+            data_table_kwargs.update(table_kwargs)
+
             data_table = DataTableView(
-                column_names=ds['dataset'].columns,
-                rows=[list(record.values()) for record in ds['dataset'].to_dict(orient='records', into=OrderedDict)],
                 dom=dom_attribute,
-                **options.get('data_table_kwargs', {})
+                **data_table_kwargs
             )
             ds.update({'data_table': data_table})
+            datasets.append(ds)
 
         base_context.update({
             'no_dataset_message': options.get('no_dataset_message', 'No dataset found.'),
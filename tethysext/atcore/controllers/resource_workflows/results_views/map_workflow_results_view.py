@@ -7,13 +7,15 @@
 ********************************************************************************
 """
 import logging
-from django.http import JsonResponse
+from urllib.parse import urlencode
+from django.http import HttpResponseBadRequest, JsonResponse
 import json
 
 from tethys_sdk.gizmos import SelectInput
 from tethysext.atcore.models.resource_workflow_results import SpatialWorkflowResult
 from tethysext.atcore.controllers.resource_workflows.map_workflows import MapWorkflowView
 from tethysext.atcore.controllers.resource_workflows.workflow_results_view import WorkflowResultsView
+from tethysext.atcore.services.vector_tiles import GeoJSONTileSource
 
 
 log = logging.getLogger(f'tethys.{__name__}')
@@ -107,7 +109,8 @@ class MapWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
 
             result_layer = None
             if layer_type == 'geojson':
-                result_layer = map_manager.build_geojson_layer(**layer)
+                vector_tile_url = self.get_vector_tile_url(request, map_manager, result, layer)
+                result_layer = map_manager.build_geojson_layer(vector_tile_url=vector_tile_url, **layer)
             elif layer_type == 'wms':
                 result_layer = map_manager.build_wms_layer(**layer)
             elif layer_type in ['CesiumModel', 'CesiumPrimitive']:
@@ -162,6 +165,58 @@ class MapWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
         })
         return base_context
 
+    def get_vector_tile_url(self, request, map_manager, result, layer):
+        """
+        Get the url template of the vector tiles of a geojson layer of the result, if the layer is large enough to be served as vector tiles.
+
+        Args:
+            request (HttpRequest): The request.
+            map_manager (MapManager): MapManager instance associated with this request.
+            result (SpatialWorkflowResult): the result the layer belongs to.
+            layer (dict): the geojson layer.
+
+        Returns:
+            str: the url template or None to send the features of the layer with the page.
+        """  # noqa: E501
+        # Vector tiles are only rendered by the OpenLayers map view
+        if self.map_type != 'tethys_map_view' or \
+                len(layer['geojson']['features']) <= map_manager.VECTOR_TILE_FEATURE_THRESHOLD:
+            return None
+
+        layer_id = layer.get('layer_id') or layer['layer_name']
+        query = urlencode({
+            'method': 'get-vector-tile',
+            'layer_id': layer_id,
+            'v': result.get_layer_version(layer_id),
+        })
+
+        return f'{request.path}?{query}&z={{z}}&x={{x}}&y={{y}}'
+
+    def get_vector_tile_source(self, request, session, resource, layer_id, version, result_id, *args, **kwargs):
+        """
+        Get the tile source of a geojson layer of the result.
+
+        Args:
+            request(HttpRequest): The request.
+            session(sqlalchemy.Session): The database session.
+            resource(Resource): The resource.
+            layer_id(str): id or name of the layer.
+            version(str): version of the GeoJSON of the layer given in the tile url.
+            result_id(str): id of the result.
+
+        Returns:
+            GeoJSONTileSource: the tile source or None if the layer does not exist or has changed.
+        """
+        result = self.get_result(request, result_id, session)
+
+        # Compare the version stored with the layer before copying the features of the layer
+        if result.get_layer_version(layer_id) != version:
+            return None
+
+        layer = result.get_layer(layer_id)
+
+        return GeoJSONTileSource(layer['geojson'], layer['layer_name'], properties={'layer_name': layer['layer_name']})
+
     def get_plot_data(self, request, session, resource, result_id, *args, **kwargs):
         """
         Load plot from given parameters.
@@ -181,7 +236,8 @@ class MapWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
 
         result = self.get_result(request, result_id, session)
 
-        layer = result.get_layer(layer_id)
+        # The features of geojson layers are limited to the feature, found with the index of the layer
+        layer = result.get_layer(layer_id, feature_id=feature_id)
 
         layer_type = layer.get('type', None)
 
@@ -201,7 +257,7 @@ class MapWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
         Retrieves plot for feature from given layer.
 
         Args:
-            layer(dict): layer dictionary.
+            layer(dict): layer dictionary. The features of the layer are limited to the feature with the given id.
             feature_id(str): id of the feature in the layer to plot.
 
         Returns:
@@ -261,6 +317,41 @@ class MapWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
 
         return title, data, layout
 
+    def get_layer_features(self, request, session, resource, result_id, *args, **kwargs):
+        """
+        Get the features of a geojson layer of the result by id or by bounding box, using the index of the layer (e.g.: ?method=get-layer-features&layer_id=foo&bbox=-112.1,40.5,-111.7,40.9 or ?method=get-layer-features&layer_id=foo&feature_id=12).
+
+        Args:
+            request (HttpRequest): The request.
+            session(sqlalchemy.Session): The database session.
+            resource(Resource): The resource.
+            result_id(str): id of the result.
+
+        Returns:
+            JsonResponse: GeoJSON FeatureCollection of the features.
+        """  # noqa: E501
+        params = request.GET if request.method == 'GET' else request.POST
+        layer_id = params.get('layer_id', '')
+        feature_id = params.get('feature_id', None)
+        result = self.get_result(request, result_id, session)
+
+        if feature_id is not None:
+            feature = result.get_feature(layer_id, feature_id)
+            features = [feature] if feature is not None else []
+
+        else:
+            try:
+                bbox = tuple(float(v) for v in params.get('bbox', '').split(','))
+            except ValueError:
+                bbox = ()
+
+            if len(bbox) != 4:
+                return HttpResponseBadRequest('The feature_id or bbox (minx,miny,maxx,maxy) parameter is required.')
+
+            features = result.query_features(layer_id, bbox)
+
+        return JsonResponse({'type': 'FeatureCollection', 'features': features})
+
     def update_result_layer(self, request, session, resource, *args, **kwargs):
         """
         Update color ramp of a layer in the result. In the future, we can add more things to update here.
@@ -10,19 +10,19 @@ import logging
 from tethysext.atcore.models.resource_workflow_results import ReportWorkflowResult
 from tethysext.atcore.controllers.resource_workflows.map_workflows import MapWorkflowView
 from tethysext.atcore.controllers.resource_workflows.workflow_results_view import WorkflowResultsView
+from tethysext.atcore.controllers.resource_workflows.mixins import DatasetTableViewMixin
 from tethysext.atcore.models.resource_workflow_results import DatasetWorkflowResult, PlotWorkflowResult, \
     SpatialWorkflowResult
 
 from tethys_sdk.gizmos import DataTableView
 from tethys_sdk.gizmos import BokehView
 from tethys_sdk.gizmos import PlotlyView
-from collections import OrderedDict
 
 
 log = logging.getLogger(f'tethys.{__name__}')
 
 
-class ReportWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
+class ReportWorkflowResultsView(MapWorkflowView, WorkflowResultsView, DatasetTableViewMixin):
     """
     Report Result View controller.
     """
@@ -69,16 +69,18 @@ class ReportWorkflowResultsView(MapWorkflowView, WorkflowResultsView):
         results = list()
         for result in current_step.results:
             if isinstance(result, DatasetWorkflowResult):
-                for ds in result.datasets:
-                    # Check if the export options is there
-                    data_table = DataTableView(
-                        column_names=ds['dataset'].columns,
-                        rows=[list(record.values()) for record in ds['dataset'].to_dict(orient='records',
-                                                                                        into=OrderedDict)],
-                        searching=False,
-                        paging=False,
-                        info=False
-                    )
+                for dataset_index in range(result.num_datasets):
+                    # Large datasets are paged on the server and aren't loaded here
+                    ds, table_kwargs = self.get_data_table_dataset(request, result, dataset_index)
+
+                    data_table_kwargs = {
+                        'searching': False,
+                        'paging': False,
+                        'info': False,
+                    }
+                    data_table_kwargs.update(table_kwargs)
+
+                    data_table = DataTableView(**data_table_kwargs)
                     ds.update({'data_table': data_table})
                     ds.update({'data_description': result.description})
                     results.append({'dataset': ds})
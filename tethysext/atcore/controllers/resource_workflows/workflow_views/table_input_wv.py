@@ -12,6 +12,7 @@ import numpy as np
 from pandas.api.types import is_numeric_dtype
 from tethysext.atcore.controllers.resource_workflows.workflow_view import ResourceWorkflowView
 from tethysext.atcore.models.resource_workflow_steps import TableInputRWS
+from tethysext.atcore.services.dataset_storage import is_dataset_reference, read_dataframe
 from tethysext.atcore.utilities import strip_list
 
 
@@ -49,6 +50,10 @@ class TableInputWV(ResourceWorkflowView):
         if inspect.isfunction(dataset):
             dataset = dataset(request, session, resource, current_step)
 
+        # Load template datasets stored out-of-row (see DatasetWorkflowResult.add_pandas_dataframe)
+        if is_dataset_reference(dataset):
+            dataset = read_dataframe(dataset)
+
         # If the dataset is a dictionary (i.e.: previously saved dataset parameter), convert it to a DataFrame
         if isinstance(dataset, dict):
             dataset = pd.DataFrame.from_dict(dataset, orient='columns')
@@ -109,6 +114,8 @@ class TableInputWV(ResourceWorkflowView):
         template_dataset = step.options.get('template_dataset')
         if inspect.isfunction(template_dataset):
             template_dataset = template_dataset(request, session, resource, step)
+        if is_dataset_reference(template_dataset):
+            template_dataset = read_dataframe(template_dataset)
         columns = template_dataset.columns
 
         row_count = 0
@@ -130,10 +137,6 @@ class TableInputWV(ResourceWorkflowView):
         # Coerce columns to be the same types as the template dataset
         dataset = dataset.astype(template_dataset.dtypes, copy=True)
 
-        # Reset the parameter to None for changes to be detected and saved.
-        step.set_parameter('dataset', None)
-        session.commit()
-
         # Save the new value of the dataset
         step.set_parameter('dataset', dataset.to_dict(orient='list'))
         session.commit()
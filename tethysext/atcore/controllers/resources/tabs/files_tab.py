@@ -6,15 +6,18 @@
 * Copyright: (c) Aquaveo 2020
 ********************************************************************************
 """
-import json
 import mimetypes
 import os
 import re
 import time
 import uuid
 
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 import tethys_gizmos.gizmo_options.datatable_view as gizmo_datatable_view
+from tethysext.atcore.services.directory_index import scan_directory
+from tethysext.atcore.services.file_database import DEFAULT_CHUNK_SIZE
 from .resource_tab import ResourceTab
 
 
@@ -28,6 +31,7 @@ class ResourceFilesTab(ResourceTab):
 
     Properties:
         file_hide_patterns: A list of regular expression patterns for files that should not be shown in the files tab.fla
+        download_chunk_size: Number of bytes read at a time when streaming downloads.
 
     Methods:
         get_file_collections (required): Override this method to define a list of FileCollections that are shown in this tab.
@@ -47,6 +51,7 @@ class ResourceFilesTab(ResourceTab):
     ]
 
     file_hide_patterns = [r'__meta__.json']
+    download_chunk_size = DEFAULT_CHUNK_SIZE
 
     def get_file_collections(self, request, resource, session, *args, **kwargs):
         """
@@ -65,12 +70,14 @@ class ResourceFilesTab(ResourceTab):
         files_from_collection = {}
         for collection in collections:
             instance_id = collection.instance.id
-            files_from_collection[instance_id] = self._path_hierarchy(collection.path)
+            files_from_collection[instance_id] = self._path_hierarchy(
+                collection.path, index=collection.get_directory_index()
+            )
 
         context['collections'] = files_from_collection
         return context
 
-    def _path_hierarchy(self, path: str, root_dir: str = None, parent_slug: str = None):
+    def _path_hierarchy(self, path: str, root_dir: str = None, parent_slug: str = None, index: dict = None):
         """
         A function used to create a dictionary representation of a folder structure.
 
@@ -78,12 +85,15 @@ class ResourceFilesTab(ResourceTab):
             path: The path to recursively map to a dictionary.
             root_dir: The root directory to be trimmed off of the absolute paths.
             parent_slug: The slug for the parent used for hiding and showing files.
+            index: A directory index of the path (see directory_index.scan_directory). The path is scanned if not given.
 
         Returns:
             dict: A dictionary defining the folder structure of the provided path.
         """
         if root_dir is None:
             root_dir = os.path.abspath(os.path.join(path, os.pardir))
+        if index is None:
+            index = scan_directory(path) if os.path.isdir(path) else None
         # Remove the root directory from the string that will be placed in the structure.
         # These paths will be relative to the path provided.
         hierarchy_path = path.replace(root_dir, '')
@@ -98,41 +108,39 @@ class ResourceFilesTab(ResourceTab):
             'parent_path': os.path.abspath(os.path.join(hierarchy_path, os.pardir)).replace(root_dir, ''),
             'parent_slug': parent_slug,
             'slug': '_' + hierarchy_path.replace(os.path.sep, '_').replace('.', '_').replace('-', '_'),
+            'children': [],
         }
 
-        # Try and get a name from the meta file.
-        meta_file = os.path.join(path, '__meta__.json')
-        if os.path.isfile(meta_file):
-            try:
-                with open(meta_file) as mf:
-                    meta_json = json.load(mf)
-                    if 'display_name' in meta_json:
-                        hierarchy['name'] = meta_json['display_name']
-            except json.JSONDecodeError:
-                pass
-
-        # Try and access 'children' here. If we can't than this is a file.
-        try:
-            # Recurse through each of the children if it is a directory.
-            hierarchy['children'] = []
-            for contents in os.listdir(path):
-                child = self._path_hierarchy(os.path.join(path, contents), root_dir, hierarchy['slug'])
+        # Files are not scanned on their own, stat them directly
+        if index is None:
+            index = {
+                'type': 'file',
+                'size': os.path.getsize(path),
+                'date_modified': os.path.getmtime(path),
+            }
+
+        hierarchy['date_modified'] = time.ctime(index['date_modified'])
+
+        if index['type'] == 'folder':
+            # Try and get a name from the meta file.
+            if index.get('display_name') is not None:
+                hierarchy['name'] = index['display_name']
+
+            # Recurse through each of the children using the index rather than the file system.
+            for child_index in index['children']:
+                child = self._path_hierarchy(os.path.join(path, child_index['name']), root_dir, hierarchy['slug'],
+                                             index=child_index)
                 if child is not None:
                     hierarchy['children'].append(child)
 
-            # If it is a directory we need to calculate the most recent modified date of a contained file
-            hierarchy['date_modified'] = time.ctime(max(os.path.getmtime(root) for root, _, _ in os.walk(path)))
-
-        # Catch the errors and assume we are dealing with a file instead of a directory
-        except OSError:
+        else:
             hierarchy['type'] = 'file'
-            hierarchy['date_modified'] = time.ctime(os.path.getmtime(path))
 
             # Calculate the file size and convert to the appropriate measurement.
             power = 2 ** 10
             n = 0
             power_labels = {0: 'Bytes', 1: 'KB', 2: 'MB', 3: 'GB', 4: 'TB'}
-            size = os.path.getsize(path)
+            size = index['size']
             while size > power:
                 size /= power
                 n += 1
@@ -141,22 +149,134 @@ class ResourceFilesTab(ResourceTab):
 
         return hierarchy
 
-    def download_file(self, request, resource, session, *args, **kwargs):
+    def _get_collection(self, request, resource, session, collection_id):
+        """
+        Get the FileCollection client with the given id.
+
+        Returns:
+            FileCollectionClient: the client or None if the collection is not one of this tab's collections.
+        """
+        try:
+            collection_uuid = uuid.UUID(collection_id)
+        except (TypeError, ValueError):
+            return None
+
+        collections = self.get_file_collections(request, resource, session)
+        return next((c for c in collections if c.instance.id == collection_uuid), None)
+
+    @staticmethod
+    def _get_collection_item(collection, path):
+        """
+        Convert a path of the form <collection_id>/<item> to a path relative to the collection.
+
+        Returns:
+            str: the item or None if the path is not inside of the collection.
+        """
+        collection_path = os.path.normpath(collection.path)
+        full_path = os.path.normpath(os.path.join(os.path.dirname(collection_path), path.lstrip('/')))
+        if full_path != collection_path and not full_path.startswith(collection_path + os.sep):
+            return None
+        return os.path.relpath(full_path, collection_path)
+
+    @staticmethod
+    def _parse_range_header(range_header, size):
+        """
+        Parse a single byte range from the value of a Range header.
+
+        Returns:
+            tuple: first and last byte of the range or None if the header should be ignored.
+
+        Raises:
+            ValueError: if the range cannot be satisfied.
         """
-        A function to download a file from a request.
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', range_header.strip())
+        if match is None or match.groups() == ('', ''):
+            # Multiple or malformed ranges: respond with the entire file
+            return None
+
+        start, end = match.groups()
+        if start == '':
+            length = int(end)
+            if length == 0:
+                raise ValueError('Unsatisfiable range.')
+            return max(size - length, 0), size - 1
+
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+        if start >= size or start > end:
+            raise ValueError('Unsatisfiable range.')
+        return start, end
+
+    def download_file(self, request, resource, session, *args, **kwargs):
         """
+        A function to download a file from a request. The file is streamed in chunks, and Range and conditional requests are supported.
+        """  # noqa: E501
         collection_id = request.GET.get('collection-id', None)
         file_path = request.GET.get('file-path', None)
-        collections = self.get_file_collections(request, resource, session)
-        for collection in collections:
-            if uuid.UUID('{' + collection_id + '}') == collection.instance.id:
-                base_file_path = collection.path.replace(collection_id, '')
-                full_file_path = base_file_path + file_path
-                file_ext = os.path.splitext(full_file_path)[1]
-                mimetype = mimetypes.types_map[file_ext] if file_ext in mimetypes.types_map.keys() else 'text/plain'
-                if os.path.exists(full_file_path):
-                    with open(full_file_path, 'rb') as fh:
-                        response = HttpResponse(fh.read(), content_type=mimetype)
-                        response['Content-Disposition'] = 'filename=' + os.path.basename(file_path)
-                        return response
-        raise Http404('Unable to download file.')
+        collection = self._get_collection(request, resource, session, collection_id)
+        item = self._get_collection_item(collection, file_path) if collection and file_path else None
+        if item is None or not os.path.isfile(os.path.join(collection.path, item)):
+            raise Http404('Unable to download file.')
+
+        stat = os.stat(os.path.join(collection.path, item))
+        size = stat.st_size
+        etag = quote_etag(f'{stat.st_mtime_ns:x}-{size:x}')
+        last_modified = int(stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+
+        start, end = 0, size - 1
+        partial = False
+        range_header = request.META.get('HTTP_RANGE', None)
+        if_range = request.META.get('HTTP_IF_RANGE', None)
+        if range_header and (not if_range or if_range in (etag, http_date(last_modified))):
+            try:
+                byte_range = self._parse_range_header(range_header, size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+            if byte_range is not None:
+                (start, end), partial = byte_range, True
+
+        file_ext = os.path.splitext(item)[1]
+        mimetype = mimetypes.types_map[file_ext] if file_ext in mimetypes.types_map.keys() else 'text/plain'
+        response = StreamingHttpResponse(
+            collection.iter_file(item, start, end, chunk_size=self.download_chunk_size),
+            status=206 if partial else 200,
+            content_type=mimetype,
+        )
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Content-Disposition'] = 'filename=' + os.path.basename(file_path)
+        if partial:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
+
+    def download_folder(self, request, resource, session, *args, **kwargs):
+        """
+        A function to download a folder or an entire collection as a zip archive that is built as it is streamed.
+        """
+        collection_id = request.GET.get('collection-id', None)
+        folder_path = request.GET.get('folder-path', None) or collection_id
+        collection = self._get_collection(request, resource, session, collection_id)
+        item = self._get_collection_item(collection, folder_path) if collection and folder_path else None
+        if item is None or not os.path.isdir(os.path.join(collection.path, item)):
+            raise Http404('Unable to download folder.')
+
+        if item == os.curdir:
+            filename = (collection.instance.meta or {}).get('display_name', None) or str(collection.instance.id)
+        else:
+            filename = os.path.basename(item)
+
+        response = StreamingHttpResponse(
+            collection.iter_zip(item, chunk_size=self.download_chunk_size),
+            content_type='application/zip',
+        )
+        response['Content-Disposition'] = f'attachment; filename={filename}.zip'
+        return response
@@ -12,6 +12,7 @@ from abc import abstractmethod
 from django.http import JsonResponse
 from django.shortcuts import reverse, redirect
 from django.contrib import messages
+from sqlalchemy.orm import joinedload
 from tethys_sdk.permissions import has_permission
 
 from tethysext.atcore.models.app_users import ResourceWorkflow
@@ -142,13 +143,19 @@ class ResourceWorkflowsTab(ResourceTab):
         if not self.show_all_workflows and app_user_role not in self.show_all_workflows_roles:
             workflows_query = workflows_query.filter(ResourceWorkflow.creator_id == app_user.id)
 
-        workflows = workflows_query.order_by(ResourceWorkflow.date_created.desc()).all()
+        workflows = workflows_query.\
+            options(joinedload(ResourceWorkflow.creator), joinedload(ResourceWorkflow.resource)).\
+            order_by(ResourceWorkflow.date_created.desc()).\
+            all()
+
+        # Statuses are stored with the workflows, only stale ones are recomputed from their steps
+        updated = ResourceWorkflow.update_stale_statuses(session, workflows)
 
         # Build up workflow cards for workflows table
         workflow_cards = []
 
         for workflow in workflows:
-            status = workflow.get_status()
+            status = workflow.get_stored_status()
             app_namespace = self.get_app().url_namespace
             url_name = f'{app_namespace}:{workflow.TYPE}_workflow'
             href = reverse(url_name, args=(workflow.resource.id, str(workflow.id)))
@@ -209,6 +216,9 @@ class ResourceWorkflowsTab(ResourceTab):
                 'can_delete': has_permission(request, 'delete_any_workflow') or is_creator
             })
 
+        if updated:
+            session.commit()
+
         context.update({'workflow_cards': workflow_cards, 'can_create_workflows': self.can_create_workflow(resource)})
         return context
 
@@ -6,10 +6,15 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import threading
+
 from django.http import JsonResponse
 from tethys_apps.base.controller import TethysController
 from tethysext.atcore.services.spatial_reference import SpatialReferenceService
 
+_engines_lock = threading.Lock()
+_engines = {}
+
 
 class QuerySpatialReference(TethysController):
     """
@@ -74,4 +79,12 @@ class QuerySpatialReference(TethysController):
             raise NotImplementedError('_app not implemented for QuerySpatialReference controller.')
         if not self._persistent_store_name:
             raise NotImplementedError('_persistent_store_name not implemented for QuerySpatialReference controller.')
-        return self._app.get_persistent_store_database(self._persistent_store_name)
+
+        # The app creates a new engine every time, reuse the first one for all requests
+        key = (self._app, self._persistent_store_name)
+
+        with _engines_lock:
+            if key not in _engines:
+                _engines[key] = self._app.get_persistent_store_database(self._persistent_store_name)
+
+            return _engines[key]
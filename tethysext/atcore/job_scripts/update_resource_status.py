@@ -1,10 +1,10 @@
 #!/opt/tethys-python
 import sys
 import traceback
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from tethysext.atcore.models.app_users import Resource
+from tethysext.atcore.services.job_database import get_statuses_by_id, update_status_by_id
+
+RESOURCE_CLASS_PATH = 'tethysext.atcore.models.app_users.Resource'
 
 
 def run(resource_db_url: str,
@@ -14,56 +14,44 @@ def run(resource_db_url: str,
         db_engine_kwargs: dict = None
         ):
     """
-    Update the root status of a resource based ont he status of one or more other statuses of the same resource.
+    Update the root status of a resource based ont he status of one or more other statuses of the same resource. Only the status column is read and written, in two short statements, so the resource is never loaded.
 
     Args:
         resource_db_url (str): The SQLAlchemy to the resource database.
         resource_id (str): The resource ID.
-        resource_class_path (str): Path to the class module.
+        resource_class_path (str): Path to the class module. Not imported, statuses of all Resource classes are stored in the table of the base Resource class.
         status_keys (list): One or more keys of statuses to check to determine resource status. The other jobs must update these statuses to one of the Resource.OK_STATUSES for the resource to be marked as SUCCESS.
         db_engine_kwargs (dict): Optional arguments to pass to SQLAlchemy create_engine method.
     """  # noqa: E501
-    resource_db_session = None
-    resource_module_path = resource_class_path.rsplit('.', 1)[0]
-    resource_class_name = resource_class_path.rsplit('.', 1)[1]
-
-    resource_module = __import__(resource_module_path, fromlist=[resource_class_name])
-    resource_class = getattr(resource_module, resource_class_name)
-    if db_engine_kwargs is None:
-        db_engine_kwargs = {}
-    else:
-        db_engine_kwargs = db_engine_kwargs
-
     try:
-        # Get resource
-        resource_db_engine = create_engine(resource_db_url, **db_engine_kwargs)
-        make_resource_db_session = sessionmaker(bind=resource_db_engine)
-        resource_db_session = make_resource_db_session()
-        resource = resource_db_session.query(resource_class).get(resource_id)
-
         # Check Status List
         if len(status_keys) <= 0:
             raise ValueError('Argument "status" keys must have at least one status.')
 
+        statuses = get_statuses_by_id(resource_db_url, RESOURCE_CLASS_PATH, [resource_id], db_engine_kwargs)
+
+        if not statuses:
+            raise ValueError(f'Resource "{resource_id}" not found.')
+
+        from tethysext.atcore.models.app_users import Resource
+        status_dict = next(iter(statuses.values()))
+
         # Get status for upload keys
         status_success = True
         for status_key in status_keys:
-            status = resource.get_status(status_key, None)
+            status = status_dict.get(status_key, None) or None
             status_success = status in Resource.OK_STATUSES and status_success
 
         # Set root status accordingly
-        if status_success:
-            resource.set_status(Resource.ROOT_STATUS_KEY, Resource.STATUS_SUCCESS)
-        else:
-            resource.set_status(Resource.ROOT_STATUS_KEY, Resource.STATUS_FAILED)
-
-        resource_db_session.commit()
+        update_status_by_id(
+            resource_db_url, RESOURCE_CLASS_PATH, [resource_id], Resource.ROOT_STATUS_KEY,
+            Resource.STATUS_SUCCESS if status_success else Resource.STATUS_FAILED,
+            db_engine_kwargs
+        )
     except Exception as e:
         sys.stderr.write('Error processing {0}'.format(resource_id))
         sys.stderr.write(str(e))
         traceback.print_exc(file=sys.stderr)
-    finally:
-        resource_db_session and resource_db_session.close()
 
 
 if __name__ == '__main__':
@@ -6,24 +6,94 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import copy
 import json
+import logging
+
+from sqlalchemy import cast, event, func, inspect, DDL
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+
+log = logging.getLogger(f'tethys.{__name__}')
+
+
+def _dumps(value):
+    # NaN and Infinity are not valid JSON and can't be cast to jsonb for the attributes index
+    return json.dumps(value, allow_nan=False)
+
+
+def _copy_value(value):
+    # Values are shared with the decoded cache, copy mutable ones so callers can't change the cache by accident
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
 
 class AttributesMixin(object):
     """
-    Provides methods for implementing the attributes pattern.
-    """
+    Provides methods for implementing the attributes pattern. The decoded attributes are cached on the instance and changes are serialized once, when the instance is flushed.
+    """  # noqa: E501
     _attributes = None
+    _attributes_cache = None  # (serialized attributes the cache was decoded from, decoded attributes)
+    _attributes_dirty = False
 
-    @property
-    def attributes(self):
+    def _get_decoded_attributes(self):
+        """
+        Get the cached decoded attributes, decoding them again if _attributes has changed (e.g.: refreshed from the database).
+        """  # noqa: E501
         if not self._attributes:
             self._attributes = json.dumps({})
-        return json.loads(self._attributes)
+
+        raw = self._attributes
+        cache = self._attributes_cache
+
+        if cache is None or cache[0] is not raw:
+            cache = (raw, json.loads(raw))
+            self._attributes_cache = cache
+            self._attributes_dirty = False
+
+        return cache[1]
+
+    def _mark_attributes_dirty(self):
+        """
+        Schedule the cached attributes to be serialized when the session is flushed. Instances that are not in a session (e.g.: not mapped, transient or detached) are serialized immediately, so the change isn't lost if the instance is merged into a session.
+        """  # noqa: E501
+        state = inspect(self, raiseerr=False)
+
+        if state is None or state.session_id is None:
+            self.flush_attributes(force=True)
+            return
+
+        self._attributes_dirty = True
+        flag_modified(self, '_attributes')
+
+    def flush_attributes(self, force=False):
+        """
+        Serialize the cached attributes into the _attributes column if they have been changed. Called automatically before the session is flushed.
+        Args:
+            force(bool): serialize even if the attributes have not been changed.
+        """  # noqa: E501
+        if not (self._attributes_dirty or force) or self._attributes_cache is None:
+            return
+
+        decoded = self._attributes_cache[1]
+        raw = _dumps(decoded)
+        self._attributes = raw
+        self._attributes_cache = (self._attributes, decoded)
+        self._attributes_dirty = False
+
+    @property
+    def attributes(self):
+        return _copy_value(self._get_decoded_attributes())
 
     @attributes.setter
     def attributes(self, value):
-        self._attributes = json.dumps(value)
+        value = _copy_value(dict(value))
+        # Fail when the value is set rather than when the instance is flushed
+        _dumps(value)
+        self._get_decoded_attributes()
+        self._attributes_cache = (self._attributes, value)
+        self._mark_attributes_dirty()
 
     def get_attribute(self, key, default=None):
         """
@@ -34,7 +104,7 @@ class AttributesMixin(object):
         Returns:
             varies: value of attribute.
         """
-        return self.attributes.get(key, default)
+        return _copy_value(self._get_decoded_attributes().get(key, default))
 
     def set_attribute(self, key, value):
         """
@@ -43,9 +113,51 @@ class AttributesMixin(object):
             key(str): key of attribute
             value: value of attribute
         """
-        attrs = self.attributes
-        attrs[key] = value
-        self.attributes = attrs
+        # Fail when the value is set rather than when the instance is flushed
+        _dumps(value)
+        self._get_decoded_attributes()[key] = _copy_value(value)
+        self._mark_attributes_dirty()
+
+    @classmethod
+    def attributes_contain(cls, **kwargs):
+        """
+        Build a SQL filter expression matching rows whose attributes contain the given key value pairs. PostgreSQL only. Uses the GIN index created by create_attributes_index if it exists.
+        Args:
+            **kwargs: any number of key value pairs to use for filtering.
+
+        Returns:
+            sqlalchemy.sql.ColumnElement: filter expression (e.g.: session.query(Resource).filter(Resource.attributes_contain(database_id=db_id))).
+        """  # noqa: E501
+        # Same expression as the index, empty attributes are NULL
+        attributes = cast(func.nullif(cls._attributes, ''), postgresql.JSONB)
+        return attributes.contains(cls.build_attributes(**kwargs))
+
+    @classmethod
+    def get_attributes_index_ddl(cls):
+        """
+        Get the statement that creates a GIN index on the attributes of the table of this class on PostgreSQL.
+
+        Returns:
+            sqlalchemy.schema.DDL: the statement.
+        """
+        return DDL(
+            'CREATE INDEX IF NOT EXISTS ix_%(table)s_attributes_gin '
+            "ON %(fullname)s USING gin ((CAST(NULLIF(_attributes, '') AS jsonb)))"
+        ).execute_if(dialect='postgresql')
+
+    @classmethod
+    def create_attributes_index(cls, bind):
+        """
+        Create a GIN index on the attributes of the table of this class, so attributes_contain filters don't scan the table. Does nothing if the index exists or the database is not PostgreSQL. A warning is logged if the index can't be created (e.g.: a row has attributes that are not valid jsonb).
+        Args:
+            bind(sqlalchemy.engine.Engine or sqlalchemy.engine.Connection): connection to the database.
+        """  # noqa: E501
+        table = inspect(cls).local_table
+
+        try:
+            cls.get_attributes_index_ddl()(table, bind)
+        except SQLAlchemyError:
+            log.warning('Unable to create the attributes index of table "%s".', table.name, exc_info=True)
 
     @classmethod
     def build_attributes_string(cls, **kwargs):
@@ -82,3 +194,13 @@ class AttributesMixin(object):
 
             attributes.update({key: value})
         return attributes
+
+
+@event.listens_for(Session, 'before_flush')
+def _flush_attributes(session, flush_context, instances):
+    """
+    Serialize the changed attributes of every instance about to be flushed.
+    """
+    for instance in list(session.new) + list(session.dirty):
+        if isinstance(instance, AttributesMixin) and instance._attributes_dirty:
+            instance.flush_attributes()
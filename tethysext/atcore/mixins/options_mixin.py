@@ -7,6 +7,46 @@
 ********************************************************************************
 """
 import copy
+import weakref
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# Read-only default options of each class, built from default_options the first time they are needed
+_default_options_cache = weakref.WeakKeyDictionary()
+
+# Values of these types can't be changed in place, so they are shared instead of copied
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, type(None))
+
+
+def _freeze(value):
+    """
+    Make a read-only copy of a dictionary of options, nested dictionaries included.
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _is_immutable(value):
+    """
+    Check if the value is a scalar or a tuple of scalars that can't be changed in place.
+    """
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
+
+
+def _copy_value(value):
+    """
+    Copy an options value. Immutable scalars are shared, other values (e.g.: sets and DataFrames) are deep copied. Read-only dictionaries are copied to plain dictionaries, so the copy can be changed and pickled.
+    """  # noqa: E501
+    if isinstance(value, Mapping):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    if _is_immutable(value):
+        return value
+    return copy.deepcopy(value)
 
 
 class OptionsMixin(object):
@@ -22,6 +62,20 @@ class OptionsMixin(object):
         """
         return {}
 
+    @property
+    def default_options_view(self):
+        """
+        Read-only view of the default options. Built from default_options once per class, use it instead of default_options when the defaults are only read.
+        """  # noqa: E501
+        cls = type(self)
+        view = _default_options_cache.get(cls)
+
+        if view is None:
+            view = _freeze(self.default_options)
+            _default_options_cache[cls] = view
+
+        return view
+
     @property
     def options(self):
         return self._options
@@ -30,12 +84,12 @@ class OptionsMixin(object):
     def options(self, value):
         if not isinstance(value, dict):
             raise ValueError('The options must be a dictionary: {}'.format(value))
-        opts = self._merge_options(self.default_options, value)
+        opts = self._merge_options(self.default_options_view, value)
         self._options = opts
 
     def _merge_options(self, left, right):
         """
-        Merge right hand dictionary onto left hand dictionary recursively.
+        Merge right hand dictionary onto left hand dictionary recursively. Neither dictionary is changed and the merged dictionary shares no values with them, except the values that can't be changed in place (e.g.: numbers and strings).
 
         Args:
             left(dict): baseline dictionary
@@ -43,14 +97,19 @@ class OptionsMixin(object):
 
         Returns:
             dict: The merged dictionary.
-        """
-        temp_right = copy.deepcopy(right)
-        temp_left = copy.deepcopy(left)
+        """  # noqa: E501
+        merged = {}
+
+        for k, v in left.items():
+            if k not in right:
+                merged[k] = _copy_value(v)
+            elif isinstance(v, Mapping) and isinstance(right[k], Mapping):
+                merged[k] = self._merge_options(v, right[k])
+            else:
+                merged[k] = _copy_value(right[k])
 
-        for k, v in temp_right.items():
-            if isinstance(v, dict) and k in temp_left:
-                if isinstance(temp_left[k], dict):
-                    temp_right[k] = self._merge_options(temp_left[k], temp_right[k])
+        for k, v in right.items():
+            if k not in left:
+                merged[k] = _copy_value(v)
 
-        temp_left.update(temp_right)
-        return temp_left
+        return merged
@@ -45,6 +45,9 @@ class StatusMixin(object):
 
     ROOT_STATUS_KEY = 'root'
 
+    # Maximum number of compare-and-swap attempts made by set_status_atomic on databases without jsonb
+    STATUS_UPDATE_MAX_ATTEMPTS = 20
+
     status = None
 
     def __init__(self, *args, **kwargs):
@@ -97,3 +100,117 @@ class StatusMixin(object):
         status_dict[key] = status
         status_str = json.dumps(status_dict)
         self.status = status_str
+
+    def set_status_atomic(self, session, key=ROOT_STATUS_KEY, status=None):
+        """
+        Set status for given key in the database without overwriting concurrent updates to other keys. The change is part of the current transaction of the session and must be committed by the caller.
+        Args:
+            session(sqlalchemy.orm.Session): session bound to this object.
+            key(str): status key.
+            status(str): one of the valid statuses.
+        """  # noqa: E501
+        from sqlalchemy import inspect
+        from sqlalchemy.orm.attributes import set_committed_value
+
+        state = inspect(self)
+
+        # Objects that are not in the database yet have nothing to contend with
+        if state.identity is None:
+            if status not in self.valid_statuses() and status is not None:
+                raise ValueError(f'"{status}" is not a valid status.')
+            self.set_status(key, status)
+            return
+
+        pk_value = state.identity[0]
+        new_values = self.update_status_by_id(session, [pk_value], key, status)
+
+        # Reflect the stored value without marking the attribute as modified
+        set_committed_value(self, 'status', new_values.get(pk_value, self.status))
+
+    @classmethod
+    def update_status_by_id(cls, session, ids, key=ROOT_STATUS_KEY, status=None):
+        """
+        Set status for given key of the rows with the given ids without loading the objects or overwriting concurrent updates to other keys. Uses a single jsonb_set UPDATE on PostgreSQL and a compare-and-swap UPDATE per row on other databases. Must be committed by the caller.
+        Args:
+            session(sqlalchemy.orm.Session or sqlalchemy.engine.Connection): session or connection to the database.
+            ids(list): primary keys of the rows to update.
+            key(str): status key.
+            status(str): one of the valid statuses.
+
+        Returns:
+            dict: new value of the status column keyed by primary key of each row updated.
+        """  # noqa: E501
+        from sqlalchemy import inspect, select, update, cast, func, literal, String, Text
+        from sqlalchemy.dialects import postgresql
+
+        if status not in cls.valid_statuses() and status is not None:
+            raise ValueError(f'"{status}" is not a valid status.')
+
+        ids = list(ids)
+        if not ids:
+            return {}
+
+        mapper = inspect(cls)
+        column = mapper.columns['status']
+        pk_column = mapper.primary_key[0]
+        table = column.table
+        bind = session.get_bind() if hasattr(session, 'get_bind') else session
+
+        if bind.dialect.name == 'postgresql':
+            # Update the single key in place, PostgreSQL serializes concurrent updates of each row
+            current = func.coalesce(cast(func.nullif(column, ''), postgresql.JSONB), func.jsonb_build_object())
+            path = cast(postgresql.array([literal(key, Text)]), postgresql.ARRAY(Text))
+            value = cast(literal(json.dumps(status), Text), postgresql.JSONB)
+            statement = update(table).\
+                where(pk_column.in_(ids)).\
+                values({column: cast(func.jsonb_set(current, path, value), String)}).\
+                returning(pk_column, column)
+            return {pk: new_value for pk, new_value in session.execute(statement)}
+
+        new_values = {}
+
+        for pk_value in ids:
+            for _ in range(cls.STATUS_UPDATE_MAX_ATTEMPTS):
+                row = session.execute(select(column).where(pk_column == pk_value)).first()
+                if row is None:
+                    break
+
+                current = row[0]
+                status_dict = json.loads(current) if current else {}
+                status_dict[key] = status
+                new_value = json.dumps(status_dict)
+                unchanged = column.is_(None) if current is None else column == current
+                result = session.execute(
+                    update(table).where(pk_column == pk_value).where(unchanged).values({column: new_value})
+                )
+                if result.rowcount:
+                    new_values[pk_value] = new_value
+                    break
+            else:
+                raise RuntimeError(f'Unable to update status of {cls.__name__} "{pk_value}" after '
+                                   f'{cls.STATUS_UPDATE_MAX_ATTEMPTS} attempts due to concurrent updates.')
+
+        return new_values
+
+    @classmethod
+    def get_statuses_by_id(cls, session, ids):
+        """
+        Get the status dictionaries of the rows with the given ids, loading only the status column.
+        Args:
+            session(sqlalchemy.orm.Session or sqlalchemy.engine.Connection): session or connection to the database.
+            ids(list): primary keys of the rows.
+
+        Returns:
+            dict: status dictionary keyed by primary key of each row found.
+        """
+        from sqlalchemy import inspect, select
+
+        ids = list(ids)
+        if not ids:
+            return {}
+
+        mapper = inspect(cls)
+        column = mapper.columns['status']
+        pk_column = mapper.primary_key[0]
+        rows = session.execute(select(pk_column, column).where(pk_column.in_(ids)))
+        return {pk: json.loads(status) if status else {} for pk, status in rows}
@@ -5,6 +5,8 @@ from tethysext.atcore.models.app_users.resource import *  # noqa: F401, F403
 from tethysext.atcore.models.app_users.spatial_resource import *  # noqa: F401, F403
 from tethysext.atcore.models.app_users.resource_workflow_result import *  # noqa: F401, F403
 from tethysext.atcore.models.app_users.resource_workflow_step import *  # noqa: F401, F403
+from tethysext.atcore.models.app_users.resource_workflow_step_job_status import *  # noqa: F401, F403
+from tethysext.atcore.models.app_users.resource_workflow_step_parameter import *  # noqa: F401, F403
 from tethysext.atcore.models.app_users.resource_workflow import *  # noqa: F401, F403
 from tethysext.atcore.models.app_users.initializer import initialize_app_users_db  # noqa: F401, F403
 # DO NOT REMOVE THIS LINE. NEED ResultsResourceWorkflowStep TO BE IN IMPORT PATH OF ResourceWorkflowStep
@@ -1,6 +1,7 @@
 import uuid
-from sqlalchemy import Column, Boolean, String
-from sqlalchemy.orm import relationship, validates, reconstructor
+from sqlalchemy import Column, Boolean, String, inspect
+from sqlalchemy.orm import relationship, validates, reconstructor, object_session
+from sqlalchemy.orm.exc import MultipleResultsFound
 from tethysext.atcore.models.types.guid import GUID
 from tethysext.atcore.services.app_users.func import get_display_name_for_django_user
 from tethysext.atcore.services.app_users.roles import Roles
@@ -45,6 +46,7 @@ class AppUser(AppUsersBase):
         Contstructor.
         """
         self._django_user = None
+        self._settings_cache = {}
 
         # Call super class
         super(AppUser, self).__init__(*args, **kwargs)
@@ -58,6 +60,7 @@ class AppUser(AppUsersBase):
         Contstructor for the instances loaded from database
         """
         self._django_user = None
+        self._settings_cache = {}
 
     @validates('role')
     def validate_role(self, key, field):
@@ -120,8 +123,19 @@ class AppUser(AppUsersBase):
         else:
             username = request.user.username
 
+        # The app user is cached on the request and reused by later calls with the same session (e.g.: decorators
+        # and the controller sharing the request session)
+        request_app_users = request.__dict__.setdefault('_atcore_app_users', {})
+        app_user = request_app_users.get((cls, username), None)
+
+        if app_user is not None and app_user in session:
+            return app_user
+
         app_user = session.query(cls).filter(cls.username == username).one_or_none()
 
+        if isinstance(app_user, cls):
+            request_app_users[(cls, username)] = app_user
+
         return app_user
 
     @staticmethod
@@ -169,6 +183,25 @@ class AppUser(AppUsersBase):
             return None
         return django_user
 
+    @staticmethod
+    def prefetch_django_users(app_users):
+        """
+        Load the Django user objects of the given app users with a single query.
+        Args:
+            app_users(list<AppUser>): AppUser objects.
+        """
+        from django.contrib.auth.models import User
+
+        pending = [app_user for app_user in app_users if getattr(app_user, '_django_user', None) is None]
+
+        if not pending:
+            return
+
+        django_users = User.objects.in_bulk([app_user.username for app_user in pending], field_name='username')
+
+        for app_user in pending:
+            app_user._django_user = django_users.get(app_user.username, None)
+
     def get_organizations(self, session, request, as_options=False, cascade=True, consultants=False):
         """
         Get the Organizations to which the given user belongs.
@@ -234,6 +267,27 @@ class AppUser(AppUsersBase):
             include_children(bool): include the resources that are children to other resources.
         Returns:
         """
+        q = self.get_resources_query(
+            session, request, of_type=of_type, cascade=cascade, for_assigning=for_assigning,
+            include_children=include_children
+        )
+        resources = set(q.all())
+        return self.filter_resources(resources)
+
+    def get_resources_query(self, session, request, of_type=None, cascade=True, for_assigning=False,
+                            include_children=True):
+        """
+        Get a query for the resources that the request user is able to view or assign. Use this instead of get_resources to apply additional filtering, sorting, or pagination in SQL.
+        Args:
+            session(sqlalchemy.session): SQLAlchemy session object
+            request(djanog.request): Django request object
+            of_type(Resource): A subclass of Resource.
+            cascade(bool): Also retrieve resources of child organizations.
+            for_assigning(bool): check assign permission versus view permission.
+            include_children(bool): include the resources that are children to other resources.
+        Returns:
+            sqlalchemy.orm.Query: query for the resources.
+        """  # noqa: E501
         from tethys_sdk.permissions import has_permission
 
         if of_type:
@@ -259,8 +313,7 @@ class AppUser(AppUsersBase):
         if not include_children:
             q = q.filter(~_Resource.parents.any())
 
-        resources = set(q.all())
-        return self.filter_resources(resources)
+        return q
 
     def filter_resources(self, resources):
         """
@@ -422,22 +475,79 @@ class AppUser(AppUsersBase):
         Returns:
             UserSetting: the user setting or None if does not exist.
         """
+        settings = self.get_settings(session, [key], as_value=as_value, **kwargs)
+        return settings[key]
+
+    def get_settings(self, session, keys, as_value=False, **kwargs):
+        """
+        Get the user settings with the given keys and criteria in a single query. Settings are cached on this instance for the given session, so repeated lookups in the same request don't query the database again.
+        Args:
+            session(sqlalchemy.session): database session.
+            keys(list<str>): names of settings.
+            as_value(bool): return values of settings, instead of UserSetting instances if True.
+            kwargs: Any number of key value attributes to attach for filtering (i.e.: page, secondary_id, resource).
+        Returns:
+            dict: the user setting or None if does not exist, keyed by name of setting.
+        """  # noqa: E501
         _UserSetting = self._get_user_setting_model()
+        attributes_string = _UserSetting.build_attributes_string(**kwargs)
 
-        q = session.query(_UserSetting) \
-            .filter(_UserSetting.user_id == self.id) \
-            .filter(_UserSetting.key == key) \
+        settings = {}
+        missing = []
 
-        attributes_string = _UserSetting.build_attributes_string(**kwargs)
-        q = q.filter(_UserSetting._attributes == attributes_string)
+        for key in keys:
+            cached = self._get_cached_setting(session, key, attributes_string)
+            if cached is False:
+                missing.append(key)
+            else:
+                settings[key] = cached
+
+        if missing:
+            q = session.query(_UserSetting) \
+                .filter(_UserSetting.user_id == self.id) \
+                .filter(_UserSetting.key.in_(missing)) \
+                .filter(_UserSetting._attributes == attributes_string)
+
+            found = {}
+            for setting in q.all():
+                if setting.key in found:
+                    raise MultipleResultsFound(f'Multiple settings found for key "{setting.key}".')
+                found[setting.key] = setting
 
-        setting = q.one_or_none()
+            for key in missing:
+                settings[key] = found.get(key, None)
+                self._settings_cache[(key, attributes_string)] = (session, settings[key])
 
         if as_value:
-            return setting.value if setting else None
+            return {key: setting.value if setting else None for key, setting in settings.items()}
+
+        return settings
+
+    def _get_cached_setting(self, session, key, attributes_string):
+        """
+        Get a setting from the settings cache. Settings cached for another session or no longer in the session (e.g.: deleted or rolled back) are not used.
+
+        Returns:
+            UserSetting: the cached setting, None if it was cached as not existing or False if it is not cached.
+        """  # noqa: E501
+        cached = self._settings_cache.get((key, attributes_string), None)
+
+        if cached is None or cached[0] is not session:
+            return False
+
+        setting = cached[1]
+
+        if setting is not None and (object_session(setting) is not session or inspect(setting).deleted):
+            return False
 
         return setting
 
+    def clear_settings_cache(self):
+        """
+        Clear the settings cached by get_setting and get_settings. Use after changing settings without the methods of this class.
+        """  # noqa: E501
+        self._settings_cache = {}
+
     def get_all_settings(self, session):
         """
         Get all user settings.
@@ -492,6 +602,7 @@ class AppUser(AppUsersBase):
             setting.user_id = self.id
             setting.attributes = _UserSetting.build_attributes(**kwargs)
             session.add(setting)
+            self._settings_cache[(key, _UserSetting.build_attributes_string(**kwargs))] = (session, setting)
 
         setting.value = value
 
@@ -1,6 +1,11 @@
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn, DDL
 from sqlalchemy.orm import sessionmaker
 from .base import AppUsersBase
 from .app_user import AppUser
+from .resource import Resource
+from .resource_workflow import ResourceWorkflow
+from .user_setting import UserSetting
 
 
 def initialize_app_users_db(engine, first_time=False, app_user_model=AppUser):
@@ -16,6 +21,18 @@ def initialize_app_users_db(engine, first_time=False, app_user_model=AppUser):
     # Create tables
     AppUsersBase.metadata.create_all(engine)
 
+    # Index attributes for filtering in SQL (PostgreSQL only)
+    for model in (Resource, ResourceWorkflow):
+        model.create_attributes_index(engine)
+
+    # Tables created before a column was added don't get it from create_all
+    for model in (ResourceWorkflow,):
+        add_missing_columns(engine, model)
+
+    # Tables created before an index was added don't get it from create_all
+    for index in UserSetting.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
     Session = sessionmaker(engine)
     session = Session()
 
@@ -32,3 +49,29 @@ def initialize_app_users_db(engine, first_time=False, app_user_model=AppUser):
         session.commit()
 
     session.close()
+
+
+def add_missing_columns(bind, model):
+    """
+    Add the columns of a model that are missing from its existing table (e.g.: columns added to the model after the table was created).
+    Args:
+        bind(sqlalchemy.engine.Engine or sqlalchemy.engine.Connection): connection to the database.
+        model(AppUsersBase): the model.
+
+    Returns:
+        list<str>: names of the columns added.
+    """  # noqa: E501
+    table = model.__table__
+    existing = {column['name'] for column in inspect(bind).get_columns(table.name, schema=table.schema)}
+    table_name = bind.dialect.identifier_preparer.format_table(table)
+    added = []
+
+    for column in table.columns:
+        if column.name in existing:
+            continue
+
+        column_spec = CreateColumn(column).compile(dialect=bind.dialect)
+        bind.execute(DDL(f'ALTER TABLE {table_name} ADD COLUMN {column_spec}'))
+        added.append(column.name)
+
+    return added
@@ -14,8 +14,8 @@ import datetime as dt
 from abc import abstractmethod
 
 from django.shortcuts import reverse
-from sqlalchemy import Column, ForeignKey, String, DateTime, Boolean
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy import Column, ForeignKey, String, DateTime, Boolean, Integer, event, inspect
+from sqlalchemy.orm import relationship, backref, selectinload, Session
 from tethysext.atcore.models.types import GUID
 from tethysext.atcore.mixins import AttributesMixin, ResultsMixin, UserLockMixin, SerializeMixin
 from tethysext.atcore.models.app_users.base import AppUsersBase
@@ -77,6 +77,9 @@ class ResourceWorkflow(AppUsersBase, AttributesMixin, ResultsMixin, UserLockMixi
     lock_when_finished = Column(Boolean, default=False)
     _attributes = Column(String)
     _user_lock = Column(String)
+    # Status of the workflow and index of its next step, maintained as steps change (see update_status)
+    _status = Column(String)
+    _next_step_index = Column(Integer)
 
     resource = relationship('Resource', backref=backref('workflows', cascade='all,delete'))
     creator = relationship('AppUser', backref='workflows')
@@ -132,6 +135,69 @@ class ResourceWorkflow(AppUsersBase, AttributesMixin, ResultsMixin, UserLockMixi
 
         return status
 
+    def update_status(self):
+        """
+        Compute the status of the workflow and the index of its next step from its steps and store them, so workflows can be listed without loading their steps. Called automatically when the steps of the workflow are flushed.
+
+        Returns:
+            ResourceWorkflowStep.STATUS_X: status of the workflow.
+        """  # noqa: E501
+        index, next_step = self.get_next_step()
+        status = self.get_status()
+        self._status = status
+        self._next_step_index = index if next_step else None
+        return status
+
+    def get_stored_status(self):
+        """
+        Returns the stored status of the workflow, computing and storing it if it is stale (e.g.: the status of a step was set in SQL).
+
+        Returns:
+            ResourceWorkflowStep.STATUS_X: status of the workflow.
+        """  # noqa: E501
+        if self._status is None:
+            return self.update_status()
+
+        return self._status
+
+    @property
+    def next_step_index(self):
+        """
+        Index of the next step of the workflow, as stored with its status.
+        """
+        if self._status is None:
+            self.update_status()
+
+        return self._next_step_index
+
+    @classmethod
+    def update_stale_statuses(cls, session, workflows):
+        """
+        Compute and store the statuses of the given workflows that are stale, loading the steps of all of them in one query.
+
+        Args:
+            session(sqlalchemy.orm.Session): session bound to the workflows.
+            workflows(list<ResourceWorkflow>): the workflows.
+
+        Returns:
+            list<ResourceWorkflow>: the workflows that were updated.
+        """  # noqa: E501
+        stale = [workflow for workflow in workflows if workflow._status is None]
+
+        if not stale:
+            return []
+
+        # Populates the steps of the workflows already in the session
+        session.query(ResourceWorkflow).\
+            filter(ResourceWorkflow.id.in_([workflow.id for workflow in stale])).\
+            options(selectinload(ResourceWorkflow.steps)).\
+            all()
+
+        for workflow in stale:
+            workflow.update_status()
+
+        return stale
+
     def get_step_by_name(self, name):
         """
         Get the step from the workflow with given name.
@@ -336,3 +402,41 @@ class ResourceWorkflow(AppUsersBase, AttributesMixin, ResultsMixin, UserLockMixi
         except NotImplementedError:
             log.warning('get_url_name() not implemented for ResourceWorkflow subclass. URL will be None.')
         return d
+
+
+@event.listens_for(Session, 'before_flush')
+def _update_workflow_statuses(session, flush_context, instances):
+    """
+    Update the stored status of every workflow with new steps or steps with a changed status or order about to be flushed.
+    """  # noqa: E501
+    workflows = set()
+    stale = set()
+
+    for instance in session.new:
+        if isinstance(instance, ResourceWorkflow):
+            workflows.add(instance)
+        elif isinstance(instance, ResourceWorkflowStep) and instance.workflow is not None:
+            workflows.add(instance.workflow)
+
+    for instance in session.dirty:
+        if not isinstance(instance, ResourceWorkflowStep):
+            continue
+
+        attrs = inspect(instance).attrs
+        if any(attrs[name].history.has_changes() for name in ('status', 'order', 'resource_workflow_id', 'workflow')) \
+                and instance.workflow is not None:
+            workflows.add(instance.workflow)
+
+    # Deleted steps are still in the steps of their workflow until it is reloaded, so its status is recomputed later
+    for instance in session.deleted:
+        if isinstance(instance, ResourceWorkflowStep) and instance.workflow is not None:
+            stale.add(instance.workflow)
+
+    for workflow in workflows - stale:
+        if workflow not in session.deleted:
+            workflow.update_status()
+
+    for workflow in stale:
+        if workflow not in session.deleted:
+            workflow._status = None
+            workflow._next_step_index = None
@@ -9,8 +9,8 @@
 import uuid
 from sqlalchemy.orm import Session
 from sqlalchemy.orm import relationship, backref
-from sqlalchemy import Column, ForeignKey, String, PickleType, Integer
-from tethysext.atcore.models.types import GUID
+from sqlalchemy import Column, ForeignKey, String, Integer
+from tethysext.atcore.models.types import GUID, CompressedPickleType
 from tethysext.atcore.mixins import StatusMixin, AttributesMixin, OptionsMixin, SerializeMixin
 from tethysext.atcore.models.app_users.base import AppUsersBase
 from tethysext.atcore.models.controller_metadata import ControllerMetadata
@@ -35,8 +35,8 @@ class ResourceWorkflowResult(AppUsersBase, StatusMixin, AttributesMixin, Options
     codename = Column(String)
     description = Column(String)
     order = Column(Integer)
-    _data = Column(PickleType, default={})
-    _options = Column(PickleType, default={})
+    _data = Column(CompressedPickleType, default={})
+    _options = Column(CompressedPickleType, default={})
     _attributes = Column(String)
 
     _controller = relationship(
@@ -58,7 +58,8 @@ class ResourceWorkflowResult(AppUsersBase, StatusMixin, AttributesMixin, Options
         if 'options' in kwargs:
             self.options = kwargs['options']
         else:
-            self._options = self.default_options
+            # Copy of the default options, which are built once per class
+            self._options = self._merge_options(self.default_options_view, {})
 
         self._controller = ControllerMetadata(path=controller)
 
@@ -11,12 +11,16 @@ import uuid
 from abc import abstractmethod
 from copy import deepcopy
 
-from sqlalchemy import Column, ForeignKey, String, PickleType, Integer, Boolean
-from sqlalchemy.orm import relationship, backref
-from tethysext.atcore.models.types import GUID
+from sqlalchemy import Column, ForeignKey, String, PickleType, Integer, Boolean, func, insert, inspect, select, update
+from sqlalchemy.orm import relationship, backref, object_session, undefer
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.collections import attribute_mapped_collection
+from tethysext.atcore.models.types import GUID, CompressedPickleType
 from tethysext.atcore.mixins import StatusMixin, AttributesMixin, OptionsMixin
 from tethysext.atcore.models.app_users.base import AppUsersBase
 from tethysext.atcore.models.app_users.associations import step_parent_child_association
+from tethysext.atcore.models.app_users.resource_workflow_step_job_status import ResourceWorkflowStepJobStatus
+from tethysext.atcore.models.app_users.resource_workflow_step_parameter import ResourceWorkflowStepParameter
 from tethysext.atcore.models.controller_metadata import ControllerMetadata
 from tethysext.atcore.utilities import json_serializer
 
@@ -53,6 +57,7 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
     CONTROLLER = ''
     TYPE = 'generic_workflow_step'
     ATTR_STATUS_MESSAGE = 'status_message'
+    ATTR_CONDOR_JOB_STATUSES = 'condor_job_statuses'
     OPT_PARENT_STEP = 'parent'
     UUID_FIELDS = ['id', 'child_id', 'resource_workflow_id']
     SERIALIZED_FIELDS = ['id', 'child_id', 'resource_workflow_id', 'type', 'name', 'help']
@@ -68,9 +73,10 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
     order = Column(Integer)
     status = Column(String)
     dirty = Column(Boolean, default=False)
-    _options = Column(PickleType, default={})
+    _options = Column(CompressedPickleType, default={})
     _attributes = Column(String)
-    _parameters = Column(PickleType, default={})
+    # Parameters of steps saved before they were stored per parameter, moved to _parameter_rows when first accessed
+    _legacy_parameters = Column('_parameters', CompressedPickleType)
     _active_roles = Column(PickleType, default=[])
 
     _controller = relationship(
@@ -97,6 +103,17 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
         cascade='all,delete'
     )
 
+    job_statuses = relationship(
+        'ResourceWorkflowStepJobStatus',
+        cascade='all,delete',
+    )
+
+    _parameter_rows = relationship(
+        'ResourceWorkflowStepParameter',
+        collection_class=attribute_mapped_collection('name'),
+        cascade='all,delete-orphan',
+    )
+
     __mapper_args__ = {
         'polymorphic_on': 'type',
         'polymorphic_identity': TYPE
@@ -115,7 +132,8 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
         if 'options' in kwargs:
             self.options = kwargs['options']
         else:
-            self._options = self.default_options
+            # Copy of the default options, which are built once per class
+            self._options = self._merge_options(self.default_options_view, {})
 
         if 'active_roles' in kwargs:
             self.active_roles = kwargs['active_roles']
@@ -193,6 +211,33 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
                 cls.STATUS_SUBMITTED, cls.STATUS_UNDER_REVIEW, cls.STATUS_APPROVED, cls.STATUS_REJECTED,
                 cls.STATUS_CHANGES_REQUESTED, cls.STATUS_REVIEWED]
 
+    @classmethod
+    def update_status_by_id(cls, session, ids, key=StatusMixin.ROOT_STATUS_KEY, status=None):
+        """
+        Set status for given key of the steps with the given ids in SQL. Setting the root status marks the stored status of their workflows as stale, to be recomputed the next time it is read.
+        Args:
+            session(sqlalchemy.orm.Session or sqlalchemy.engine.Connection): session or connection to the database.
+            ids(list): primary keys of the steps to update.
+            key(str): status key.
+            status(str): one of the valid statuses.
+
+        Returns:
+            dict: new value of the status column keyed by primary key of each step updated.
+        """  # noqa: E501
+        new_values = super().update_status_by_id(session, ids, key, status)
+
+        if new_values and key == cls.ROOT_STATUS_KEY:
+            steps = ResourceWorkflowStep.__table__
+            workflows = AppUsersBase.metadata.tables['app_users_resource_workflows']
+            workflow_ids = select(steps.c.resource_workflow_id).where(steps.c.id.in_(list(new_values)))
+            session.execute(
+                update(workflows).
+                where(workflows.c.id.in_(workflow_ids)).
+                values(_status=None, _next_step_index=None)
+            )
+
+        return new_values
+
     def to_dict(self):
         """
         Serialize ResourceWorkflowStep into a dictionary.
@@ -229,11 +274,10 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
         """
         Validates parameter values of this this step. If the parameter values of this step are invalid a ValueError will be raised
         """  # noqa: E501
-        params = self._parameters
-
-        # Check Required
-        for name, param in params.items():
-            if param['required'] and not param['value']:
+        # Only the values of required parameters are loaded
+        for name, parameter in self._get_parameter_rows().items():
+            definition = parameter.definition or {}
+            if definition.get('required') and not parameter.value:
                 raise ValueError('Parameter "{}" is required.'.format(name))
 
     def parse_parameters(self, parameters):
@@ -256,19 +300,17 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
             name(str): Name of the parameter to set.
             value(varies): Value of the parameter.
         """
-        if name not in self._parameters:
-            raise ValueError('No parameter named "{}" in this step.'.format(name))
+        parameter = self._get_parameter_rows().get(name)
 
-        # Must copy the entire parameters dict, make changes to the copy,
-        # and overwrite to get sqlalchemy to recognize a change has occurred,
-        # and propagate the changes to the database.
-        dc_parameters = deepcopy(self._parameters)
-        dc_parameters[name]['value'] = value
+        if parameter is None:
+            raise ValueError('No parameter named "{}" in this step.'.format(name))
 
-        if dc_parameters != self._parameters:
+        if parameter.value != value:
             self.dirty = True
 
-        self._parameters = dc_parameters
+        # Always written, values changed in place compare equal to the loaded value
+        parameter.value = value
+        flag_modified(parameter, 'value')
 
     def get_parameter(self, name):
         """
@@ -279,11 +321,13 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
         Returns:
             varies: Value of the named parameter.
         """
-        try:
-            return self._parameters[name]['value']
-        except KeyError:
+        parameter = self._get_parameter_rows().get(name)
+
+        if parameter is None:
             raise ValueError('No parameter named "{}" in step "{}".'.format(name, self))
 
+        return parameter.value
+
     def get_parameters(self):
         """
         Get all parameter objects.
@@ -292,6 +336,57 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
         """
         return deepcopy(self._parameters)
 
+    @property
+    def _parameters(self):
+        """
+        Definitions of all parameters with their values, keyed by name. Loads the values of all parameters in one query.
+        """  # noqa: E501
+        parameters = self._get_parameter_rows()
+        session = object_session(self)
+        unloaded = [p.id for p in parameters.values() if p.id is not None and 'value' in inspect(p).unloaded]
+
+        if unloaded and session is not None:
+            # Populates the values of the parameters already in the session
+            session.query(ResourceWorkflowStepParameter).\
+                filter(ResourceWorkflowStepParameter.id.in_(unloaded)).\
+                options(undefer(ResourceWorkflowStepParameter.value)).\
+                all()
+
+        return {name: parameter.to_definition() for name, parameter in parameters.items()}
+
+    @_parameters.setter
+    def _parameters(self, parameters):
+        """
+        Replace the definitions of all parameters with their values.
+        """
+        existing = self._get_parameter_rows()
+        parameters = parameters or {}
+
+        for name in list(existing):
+            if name not in parameters:
+                del existing[name]
+
+        # Existing rows are updated instead of replaced to keep the names unique when flushed
+        for name, definition in parameters.items():
+            if name in existing:
+                existing[name].set_definition(definition)
+                flag_modified(existing[name], 'value')
+            else:
+                existing[name] = ResourceWorkflowStepParameter.from_definition(name, definition)
+
+    def _get_parameter_rows(self):
+        """
+        Get the parameters of this step keyed by name, moving parameters saved before they were stored per parameter.
+        """  # noqa: E501
+        if self._legacy_parameters is not None:
+            legacy_parameters, self._legacy_parameters = self._legacy_parameters, None
+
+            for name, definition in legacy_parameters.items():
+                if name not in self._parameter_rows:
+                    self._parameter_rows[name] = ResourceWorkflowStepParameter.from_definition(name, definition)
+
+        return self._parameter_rows
+
     def resolve_option(self, option):
         """
         Resolve options that depend on parameters from other steps.
@@ -334,6 +429,67 @@ class ResourceWorkflowStep(AppUsersBase, StatusMixin, AttributesMixin, OptionsMi
 
             raise RuntimeError('Cannot resolve option from parent: no parents match criteria given.')
 
+    def add_job_status(self, session, status):
+        """
+        Record the status of one sub-job of this step. Inserts a new row rather than updating the step, so any number of jobs can report in parallel without lost updates or lock contention. Must be committed by the caller.
+        Args:
+            session(sqlalchemy.orm.Session): session bound to this step.
+            status(str): one of the valid statuses.
+        """  # noqa: E501
+        if status not in self.valid_statuses():
+            raise ValueError(f'"{status}" is not a valid status.')
+
+        session.execute(
+            insert(ResourceWorkflowStepJobStatus.__table__).
+            values(resource_workflow_step_id=self.id, status=status)
+        )
+
+    def get_job_status_counts(self, session):
+        """
+        Count the statuses reported by the sub-jobs of this step with a single aggregate query.
+        Args:
+            session(sqlalchemy.orm.Session): session bound to this step.
+
+        Returns:
+            dict<str:int>: number of jobs that reported each status.
+        """
+        counts = dict(
+            session.query(ResourceWorkflowStepJobStatus.status, func.count(ResourceWorkflowStepJobStatus.id)).
+            filter(ResourceWorkflowStepJobStatus.resource_workflow_step_id == self.id).
+            group_by(ResourceWorkflowStepJobStatus.status).
+            all()
+        )
+
+        # Statuses reported by jobs submitted before job statuses were stored in their own table
+        for status in self.get_attribute(self.ATTR_CONDOR_JOB_STATUSES) or []:
+            counts[status] = counts.get(status, 0) + 1
+
+        return counts
+
+    def get_job_status(self, session):
+        """
+        Derive the status of this step from the statuses reported by its sub-jobs.
+        Args:
+            session(sqlalchemy.orm.Session): session bound to this step.
+
+        Returns:
+            str: STATUS_FAILED if any job failed, otherwise STATUS_COMPLETE.
+        """
+        if self.get_job_status_counts(session).get(self.STATUS_FAILED, 0):
+            return self.STATUS_FAILED
+        return self.STATUS_COMPLETE
+
+    def clear_job_statuses(self, session):
+        """
+        Forget the statuses reported by the sub-jobs of this step. Must be committed by the caller.
+        Args:
+            session(sqlalchemy.orm.Session): session bound to this step.
+        """
+        session.query(ResourceWorkflowStepJobStatus).\
+            filter(ResourceWorkflowStepJobStatus.resource_workflow_step_id == self.id).\
+            delete(synchronize_session=False)
+        self.set_attribute(self.ATTR_CONDOR_JOB_STATUSES, [])
+
     def reset(self):
         """
         Resets the step back to its initial state.
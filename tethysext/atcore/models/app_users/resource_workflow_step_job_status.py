@@ -0,0 +1,33 @@
+"""
+********************************************************************************
+* Name: resource_workflow_step_job_status
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import datetime as dt
+import uuid
+
+from sqlalchemy import Column, ForeignKey, String, DateTime
+from tethysext.atcore.models.types import GUID
+from tethysext.atcore.models.app_users.base import AppUsersBase
+
+__all__ = ['ResourceWorkflowStepJobStatus']
+
+
+class ResourceWorkflowStepJobStatus(AppUsersBase):
+    """
+    Status reported by one sub-job of a resource workflow step. Each job inserts its own row, so parallel jobs never contend for the step row.
+    """  # noqa: E501
+    __tablename__ = 'app_users_resource_workflow_step_job_statuses'
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    resource_workflow_step_id = Column(
+        GUID, ForeignKey('app_users_resource_workflow_steps.id', ondelete='CASCADE'), index=True, nullable=False
+    )
+    status = Column(String, nullable=False)
+    date_created = Column(DateTime, default=dt.datetime.utcnow)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} step_id="{self.resource_workflow_step_id}" status="{self.status}">'
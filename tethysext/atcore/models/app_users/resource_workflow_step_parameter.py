@@ -0,0 +1,80 @@
+"""
+********************************************************************************
+* Name: resource_workflow_step_parameter
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import uuid
+
+from sqlalchemy import Column, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import deferred
+from tethysext.atcore.models.types import GUID, CompressedPickleType
+from tethysext.atcore.models.app_users.base import AppUsersBase
+
+__all__ = ['ResourceWorkflowStepParameter']
+
+
+class ResourceWorkflowStepParameter(AppUsersBase):
+    """
+    One parameter of a resource workflow step. Each parameter is stored in its own row, so reading or updating one parameter doesn't load or write the others. The value is only loaded when it is accessed.
+    """  # noqa: E501
+    __tablename__ = 'app_users_resource_workflow_step_parameters'
+    __table_args__ = (UniqueConstraint('resource_workflow_step_id', 'name'),)
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    resource_workflow_step_id = Column(
+        GUID, ForeignKey('app_users_resource_workflow_steps.id', ondelete='CASCADE'), index=True, nullable=False
+    )
+    name = Column(String, nullable=False)
+    # Parameter definition without the value (e.g.: help and required), None if the definition is not a dictionary
+    definition = Column(CompressedPickleType)
+    value = deferred(Column(CompressedPickleType))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} name="{self.name}" id="{self.id}">'
+
+    @classmethod
+    def from_definition(cls, name, definition):
+        """
+        Make a parameter from its definition, as returned by ResourceWorkflowStep.init_parameters.
+
+        Args:
+            name(str): name of the parameter.
+            definition(dict): definition of the parameter, with its value (e.g.: {'help': '', 'value': None, 'required': False}).
+
+        Returns:
+            ResourceWorkflowStepParameter: the parameter.
+        """  # noqa: E501
+        parameter = cls(name=name)
+        parameter.set_definition(definition)
+        return parameter
+
+    def set_definition(self, definition):
+        """
+        Set the definition and the value of the parameter.
+
+        Args:
+            definition(dict): definition of the parameter, with its value.
+        """
+        if isinstance(definition, dict):
+            self.definition = {k: v for k, v in definition.items() if k != 'value'}
+            self.value = definition.get('value')
+        else:
+            self.definition = None
+            self.value = definition
+
+    def to_definition(self):
+        """
+        Get the definition of the parameter, with its value.
+
+        Returns:
+            dict: definition of the parameter.
+        """
+        if self.definition is None:
+            return self.value
+
+        definition = dict(self.definition)
+        definition['value'] = self.value
+        return definition
@@ -8,7 +8,7 @@
 """
 import uuid
 import json
-from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy import Column, ForeignKey, Index, String
 from tethysext.atcore.models.types.guid import GUID
 from sqlalchemy.orm import relationship
 from .base import AppUsersBase
@@ -20,6 +20,10 @@ class UserSetting(AttributesMixin, AppUsersBase):
     SQLAlchemy interface for user_settings table.
     """
     __tablename__ = "app_users_user_settings"
+    __table_args__ = (
+        # Settings are looked up by user, key and attributes, the key narrows the rows to compare attributes of
+        Index('ix_app_users_user_settings_user_id_key', 'user_id', 'key'),
+    )
 
     # Primary and Foreign Keys
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
@@ -7,32 +7,113 @@
 ********************************************************************************
 """
 import inspect
+import logging
+import sys
+import threading
 import uuid
+from collections import OrderedDict
 
 from sqlalchemy import Column, String, PickleType
-from tethysext.atcore.models.types import GUID
+from tethysext.atcore.models.types import GUID, CompressedPickleType
 from tethysext.atcore.models.app_users.base import AppUsersBase
 from tethysext.atcore.utilities import import_from_string
 
-__all__ = ['ControllerMetadata']
+__all__ = ['ControllerMetadata', 'ControllerRegistry', 'controller_registry']
 
+log = logging.getLogger(f'tethys.{__name__}')
 
-class ControllerMetadata(AppUsersBase):
-    """
-    Data model that stores controller metadata for objects associated with controllers.
+
+class ControllerRegistry(object):
     """
-    __tablename__ = 'app_users_controller_metadata'
+    Process-wide registry of the controllers referenced by ControllerMetadata. The controller class of each path is imported once and the callables returned by as_controller are kept for each set of kwargs, so routing a request doesn't import or build the controller again. A class is imported again if its module was reloaded.
+    """  # noqa: E501
+    DEFAULT_MAX_SIZE = 256
 
-    id = Column(GUID, primary_key=True, default=uuid.uuid4)
-    path = Column(String)
-    kwargs = Column(PickleType, default={})
-    http_methods = Column(PickleType, default=['get', 'post', 'delete'])
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        Constructor.
 
-    def instantiate(self, **kwargs):
+        Args:
+            max_size(int): maximum number of as_controller callables kept.
         """
-        Instantiate an instance of the TethysController referenced by the path with the given kwargs.
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._classes = {}
+        self._controllers = OrderedDict()
+
+    @staticmethod
+    def _is_current(path, obj):
+        # The object is replaced in its module when the module is reloaded
+        module_path, obj_name = path.rsplit('.', 1)
+        module = sys.modules.get(module_path)
+        return module is not None and getattr(module, obj_name, None) is obj
+
+    def resolve(self, path):
+        """
+        Get the controller class or function at the given dot-path, importing it if it is not registered.
+
+        Args:
+            path(str): dot-path to the controller (e.g.: 'foo.controllers.BarController').
+
+        Returns:
+            class or function: the controller.
+        """  # noqa: E501
+        with self._lock:
+            obj = self._classes.get(path)
+
+        if obj is not None and self._is_current(path, obj):
+            return obj
+
+        try:
+            obj = import_from_string(path)
+
+        except (ValueError, AttributeError, ImportError) as e:
+            raise ImportError(f'Unable to import controller "{path}": {e}')
+
+        with self._lock:
+            self._classes[path] = obj
+
+        return obj
+
+    def get_controller(self, controller_class, kwargs):
+        """
+        Get the callable returned by the as_controller method of the controller class with the given kwargs, calling it if it is not registered.
+
+        Args:
+            controller_class(class): TethysController class.
+            kwargs(dict): kwargs passed to as_controller.
+
+        Returns:
+            function: the controller method.
+        """  # noqa: E501
+        try:
+            key = (controller_class, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            # Kwargs with values that can't be hashed (e.g.: dictionaries) are not registered
+            return controller_class.as_controller(**kwargs)
+
+        with self._lock:
+            if key in self._controllers:
+                self._controllers.move_to_end(key)
+                return self._controllers[key]
+
+        controller = controller_class.as_controller(**kwargs)
+
+        with self._lock:
+            self._controllers[key] = controller
+            while len(self._controllers) > self.max_size:
+                self._controllers.popitem(last=False)
+
+        return controller
+
+    def instantiate(self, path, controller_kwargs, **kwargs):
+        """
+        Get the controller at the given dot-path. The as_controller method of TethysControllers is called with the given kwargs.
 
         Args:
+            path(str): dot-path to the controller.
+            controller_kwargs(dict): kwargs stored with the controller, override the given kwargs.
             kwargs: any kwargs that would be passed to the as_controller method of TethysControllers (i.e.: class-based view property overrides).
 
         Returns:
@@ -42,29 +123,69 @@ class ControllerMetadata(AppUsersBase):
         from tethysext.atcore.controllers.app_users.mixins import ResourceViewMixin
         from tethysext.atcore.controllers.resource_workflows.workflow_view import ResourceWorkflowView
 
-        try:
-            controller = import_from_string(self.path)
-
-        except (ValueError, AttributeError, ImportError) as e:
-            raise ImportError(f'Unable to import controller "{self.path}": {e}')
+        controller = self.resolve(path)
 
         # Get entry point for class based views
         if inspect.isclass(controller) and issubclass(controller, TethysController):
-            # Call with all kwargs if is instance of an ResourceWorkflowView
-            if issubclass(controller, ResourceWorkflowView):
-                kwargs.update(self.kwargs)
-                controller = controller.as_controller(**kwargs)
-
-            # Call with all but workflow kwargs if ResourceView
-            elif issubclass(controller, ResourceViewMixin):
+            # Call with all but workflow kwargs if ResourceView, all kwargs if ResourceWorkflowView
+            if not issubclass(controller, ResourceWorkflowView) and issubclass(controller, ResourceViewMixin):
                 kwargs.pop('_ResourceWorkflow', None)
                 kwargs.pop('_ResourceWorkflowStep', None)
-                kwargs.update(self.kwargs)
-                controller = controller.as_controller(**kwargs)
 
-            # Otherwise, don't call with any kwargs
-            else:
-                kwargs.update(self.kwargs)
-                controller = controller.as_controller(**kwargs)
+            kwargs.update(controller_kwargs or {})
+            controller = self.get_controller(controller, kwargs)
 
         return controller
+
+    def warm(self, paths, **kwargs):
+        """
+        Import the controllers at the given dot-paths and call their as_controller methods with the given kwargs, so the first requests routed to them don't. Controllers that fail are skipped.
+
+        Args:
+            paths(iterable<str>): dot-paths to controllers.
+            kwargs: kwargs the controllers will be instantiated with (see instantiate).
+        """  # noqa: E501
+        for path in set(paths):
+            if not path:
+                continue
+
+            try:
+                self.instantiate(path, {}, **kwargs)
+            except Exception:
+                log.exception(f'Unable to warm controller "{path}".')
+
+    def clear(self):
+        """
+        Discard all registered controllers.
+        """
+        with self._lock:
+            self._classes.clear()
+            self._controllers.clear()
+
+
+class ControllerMetadata(AppUsersBase):
+    """
+    Data model that stores controller metadata for objects associated with controllers.
+    """
+    __tablename__ = 'app_users_controller_metadata'
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    path = Column(String)
+    kwargs = Column(CompressedPickleType, default={})
+    http_methods = Column(PickleType, default=['get', 'post', 'delete'])
+
+    def instantiate(self, **kwargs):
+        """
+        Instantiate an instance of the TethysController referenced by the path with the given kwargs.
+
+        Args:
+            kwargs: any kwargs that would be passed to the as_controller method of TethysControllers (i.e.: class-based view property overrides).
+
+        Returns:
+            function: the controller method.
+        """  # noqa: E501
+        return controller_registry.instantiate(self.path, self.kwargs, **kwargs)
+
+
+#: Default process-wide registry of controllers.
+controller_registry = ControllerRegistry()
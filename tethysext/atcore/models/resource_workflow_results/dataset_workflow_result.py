@@ -6,13 +6,23 @@
 * Copyright: (c) Aquaveo 2019
 ********************************************************************************
 """
-import copy
+import logging
+
 import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from tethysext.atcore.models.app_users.resource_workflow_result import ResourceWorkflowResult
+from tethysext.atcore.services.dataset_storage import STORAGE_PARQUET, delete_dataframe, get_file_collection_client, \
+    is_dataset_reference, read_dataframe, write_dataframe
 
 
 __all__ = ['DatasetWorkflowResult']
 
+log = logging.getLogger(f'tethys.{__name__}')
+
+# Key of the session info entry with the dataset files to delete when the session commits
+PENDING_DATASET_DELETES = 'atcore_pending_dataset_deletes'
+
 
 class DatasetWorkflowResult(ResourceWorkflowResult):
     """
@@ -52,19 +62,121 @@ class DatasetWorkflowResult(ResourceWorkflowResult):
 
     @property
     def datasets(self):
-        if 'datasets' not in self.data:
-            self.data['datasets'] = []
-        return copy.deepcopy(self.data['datasets'])
+        """
+        All datasets with their DataFrames loaded. Datasets stored out-of-row are read from their files. Treat the DataFrames as read-only; use get_dataset to load a single dataset.
+        """  # noqa: E501
+        return [self._load_dataset(dataset) for dataset in self._stored_datasets]
 
     @datasets.setter
     def datasets(self, value):
-        data = copy.deepcopy(self.data)
+        data = dict(self.data)
         data['datasets'] = value
         self.data = data
 
-    def reset(self):
+    @property
+    def _stored_datasets(self):
+        """
+        The datasets as stored, with references to out-of-row DataFrames unresolved.
+        """
+        datasets = self.data.get('datasets', [])
+        return datasets if isinstance(datasets, list) else []
+
+    @property
+    def num_datasets(self):
+        return len(self._stored_datasets)
+
+    def get_dataset(self, index, columns=None, file_collection_client=None):
+        """
+        Load a single dataset without loading its siblings.
+
+        Args:
+            index(int): index of the dataset.
+            columns(list<str>): only load these columns if given.
+            file_collection_client(FileCollectionClient): client used to resolve out-of-row dataset files if the FileDatabase has moved.
+
+        Returns:
+            dict: the dataset.
+        """  # noqa: E501
+        return self._load_dataset(self._stored_datasets[index], columns, file_collection_client)
+
+    def get_dataset_metadata(self, index):
+        """
+        Get the title and options of a dataset without its DataFrame.
+
+        Args:
+            index(int): index of the dataset.
+
+        Returns:
+            dict: the dataset without the "dataset" key.
+        """
+        return {k: v for k, v in self._stored_datasets[index].items() if k != 'dataset'}
+
+    def get_dataset_shape(self, index):
+        """
+        Get the column names and number of rows of a dataset without loading it if it is stored out-of-row.
+
+        Args:
+            index(int): index of the dataset.
+
+        Returns:
+            list, int: the column names and the number of rows.
+        """
+        data_frame = self._stored_datasets[index]['dataset']
+
+        if is_dataset_reference(data_frame):
+            return list(data_frame['columns']), data_frame['num_rows']
+
+        return list(data_frame.columns), len(data_frame)
+
+    @staticmethod
+    def _load_dataset(dataset, columns=None, file_collection_client=None):
+        """
+        Shallow copy the dataset dictionary and load the DataFrame if it is stored out-of-row.
+        """
+        if not isinstance(dataset, dict):
+            return dataset
+
+        dataset = dict(dataset)
+
+        if is_dataset_reference(dataset.get('dataset')):
+            dataset['dataset'] = read_dataframe(
+                dataset['dataset'], columns=columns, file_collection_client=file_collection_client
+            )
+        elif columns is not None:
+            dataset['dataset'] = dataset['dataset'][columns]
+
+        return dataset
+
+    def reset(self, file_collection_client=None):
+        """
+        Remove all datasets. The files of datasets stored out-of-row are deleted after the session commits, or immediately if the result is not in a session.
+
+        Args:
+            file_collection_client(FileCollectionClient): client for the FileCollection of the dataset files. Bound to the FileCollection in each reference if not given.
+        """  # noqa: E501
+        session = object_session(self)
+        deletes = []
+
+        for dataset in self._stored_datasets:
+            if isinstance(dataset, dict) and is_dataset_reference(dataset.get('dataset')):
+                reference = dataset['dataset']
+                client = file_collection_client
+                if client is None and session is not None:
+                    client = get_file_collection_client(session, reference)
+                deletes.append((reference, client))
+
         self.datasets = []
 
+        if session is not None:
+            # Resolve the paths of the clients now because no SQL can be emitted once the session has committed
+            for _, client in deletes:
+                client.path
+            session.info.setdefault(PENDING_DATASET_DELETES, []).extend(deletes)
+            return
+
+        for reference, client in deletes:
+            delete_dataframe(reference, file_collection_client=client)
+
     def _add_dataset(self, dataset):
         """
         Adds the dataset to the datasets array.
@@ -72,11 +184,12 @@ class DatasetWorkflowResult(ResourceWorkflowResult):
         Args:
             dataset(dict): The data.
         """
-        datasets = self.datasets
+        datasets = list(self._stored_datasets)
         datasets.append(dataset)
         self.datasets = datasets
 
-    def add_pandas_dataframe(self, title, data_frame, show_export_button=False):
+    def add_pandas_dataframe(self, title, data_frame, show_export_button=False, file_collection_client=None,
+                             storage_format=STORAGE_PARQUET):
         """
         Adds a pandas.DataFrame to the result.
 
@@ -84,7 +197,9 @@ class DatasetWorkflowResult(ResourceWorkflowResult):
             title(str): Display name.
             data_frame(pandas.DataFrame): The data.
             show_export_button(boolean): Enable data export option.
-        """
+            file_collection_client(FileCollectionClient): Store the DataFrame out-of-row in this FileCollection if given. Recommended for large DataFrames.
+            storage_format(str): File format for out-of-row storage, either 'parquet' or 'arrow' (Arrow IPC).
+        """  # noqa: E501
 
         if not title:
             raise ValueError('The argument "title" is required.')
@@ -95,9 +210,35 @@ class DatasetWorkflowResult(ResourceWorkflowResult):
         if data_frame.empty:
             raise ValueError('The pandas.DataFrame must not be empty.')
 
+        if file_collection_client is not None:
+            dataset = write_dataframe(file_collection_client, data_frame, storage_format=storage_format)
+        else:
+            dataset = data_frame
+
         d = {
             'title': title,
-            'dataset': data_frame,
+            'dataset': dataset,
             'show_export_button': show_export_button,
         }
         self._add_dataset(d)
+
+
+@event.listens_for(Session, 'after_commit')
+def _delete_reset_datasets(session):
+    """
+    Delete the files of the datasets removed by DatasetWorkflowResult.reset now that the reset is committed.
+    """
+    for reference, client in session.info.pop(PENDING_DATASET_DELETES, []):
+        try:
+            delete_dataframe(reference, file_collection_client=client)
+        except Exception:
+            log.exception(f'Unable to delete the dataset file "{reference["item"]}".')
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _discard_reset_datasets(session, transaction):
+    """
+    Keep the files of the datasets removed by DatasetWorkflowResult.reset if the reset is rolled back.
+    """
+    if transaction.parent is None:
+        session.info.pop(PENDING_DATASET_DELETES, None)
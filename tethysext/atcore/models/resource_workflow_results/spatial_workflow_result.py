@@ -8,6 +8,7 @@
 """
 import copy
 from tethysext.atcore.models.app_users.resource_workflow_result import ResourceWorkflowResult
+from tethysext.atcore.services.spatial_index import PackedRTree, build_geojson_index, get_geojson_version
 
 
 __all__ = ['SpatialWorkflowResult']
@@ -64,19 +65,65 @@ class SpatialWorkflowResult(ResourceWorkflowResult):
     def layers(self, value):
         data = copy.deepcopy(self.data)
         data['layers'] = value
+        data['layer_indexes'] = self._build_layer_indexes(value, data.get('layer_indexes'))
         self.data = data
 
-    def get_layer(self, layer_id):
+    @staticmethod
+    def _get_layer_key(layer):
+        return str(layer.get('layer_id') or layer.get('layer_name'))
+
+    @classmethod
+    def _build_layer_indexes(cls, layers, indexes=None):
+        """
+        Build the indexes of the features of the geojson layers, reusing the given indexes of layers that did not change.
+        """  # noqa: E501
+        indexes = indexes or {}
+        new_indexes = {}
+
+        for layer in layers if isinstance(layers, list) else []:
+            if not isinstance(layer, dict) or layer.get('type') != 'geojson' or not layer.get('geojson'):
+                continue
+
+            key = cls._get_layer_key(layer)
+            index = indexes.get(key)
+
+            if index is None or index['version'] != get_geojson_version(layer['geojson']):
+                index = build_geojson_index(layer['geojson'])
+
+            new_indexes[key] = index
+
+        return new_indexes
+
+    def get_layer(self, layer_id, feature_id=None):
         """
         Get layer with given identifier. If layer has layer_id attribute it will be checked, otherwise the layer_name attribute will be checked.
 
         Args:
             layer_id: Identifier of layer (either layer_name or layer_id).
+            feature_id: value of the id property of a feature. If given, the features of a geojson layer are limited to this feature, found with the index of the layer without copying the other features.
 
         Returns:
             dict: Layer dictionary.
         """  # noqa: E501
-        for layer in self.layers:
+        layer = self._find_layer(layer_id)
+
+        if layer is None:
+            return None
+
+        if feature_id is not None and layer.get('type') == 'geojson':
+            position = self._get_layer_index(layer)['ids'].get(str(feature_id))
+            features = [layer['geojson']['features'][position]] if position is not None else []
+            layer = dict(layer, geojson=dict(layer['geojson'], features=features))
+
+        return copy.deepcopy(layer)
+
+    def _find_layer(self, layer_id):
+        """
+        Find a layer without copying the layers.
+        """
+        layers = self.data.get('layers', [])
+
+        for layer in layers if isinstance(layers, list) else []:
             if 'layer_id' in layer and layer['layer_id']:
                 if layer_id == layer['layer_id']:
                     return layer
@@ -86,6 +133,87 @@ class SpatialWorkflowResult(ResourceWorkflowResult):
                     return layer
         return None
 
+    def _get_layer_index(self, layer):
+        """
+        Get the index of the features of a geojson layer, building it if the layer was stored without one or the stored index doesn't fit its features.
+        """  # noqa: E501
+        layer_indexes = self.data.get('layer_indexes')
+        index = layer_indexes.get(self._get_layer_key(layer)) if isinstance(layer_indexes, dict) else None
+
+        if not self._is_layer_index_valid(index, layer['geojson']):
+            index = build_geojson_index(layer['geojson'])
+
+        return index
+
+    @staticmethod
+    def _is_layer_index_valid(index, geojson):
+        """
+        Check that the positions of the features in a stored index are in range of the features of the layer, so the index can be trusted.
+        """  # noqa: E501
+        try:
+            num_features = len(geojson.get('features') or [])
+            positions = list(index['ids'].values()) + [item[4] for item in index['tree']['items']]
+            return index['version'] is not None and \
+                all(isinstance(p, int) and 0 <= p < num_features for p in positions)
+        except (AttributeError, IndexError, KeyError, TypeError):
+            return False
+
+    def get_layer_version(self, layer_id):
+        """
+        Get the version of the GeoJSON of a geojson layer, stored with the index of the layer so the features aren't hashed again.
+
+        Args:
+            layer_id: Identifier of layer (either layer_name or layer_id).
+
+        Returns:
+            str: the version or None if the layer does not exist or is not a geojson layer.
+        """  # noqa: E501
+        layer = self._find_layer(layer_id)
+
+        if not layer or layer.get('type') != 'geojson' or not layer.get('geojson'):
+            return None
+
+        return self._get_layer_index(layer)['version']
+
+    def get_feature(self, layer_id, feature_id):
+        """
+        Get a feature of a geojson layer by id, using the index of the layer.
+
+        Args:
+            layer_id: Identifier of layer (either layer_name or layer_id).
+            feature_id: value of the id property of the feature.
+
+        Returns:
+            dict: the GeoJSON feature or None if the layer or feature does not exist.
+        """
+        layer = self._find_layer(layer_id)
+
+        if not layer or layer.get('type') != 'geojson':
+            return None
+
+        position = self._get_layer_index(layer)['ids'].get(str(feature_id))
+        return copy.deepcopy(layer['geojson']['features'][position]) if position is not None else None
+
+    def query_features(self, layer_id, bbox):
+        """
+        Get the features of a geojson layer with bounding boxes that intersect a bounding box, using the index of the layer.
+
+        Args:
+            layer_id: Identifier of layer (either layer_name or layer_id).
+            bbox(tuple): minx, miny, maxx, maxy in the coordinates of the layer.
+
+        Returns:
+            list<dict>: the GeoJSON features, in the order of the layer.
+        """  # noqa: E501
+        layer = self._find_layer(layer_id)
+
+        if not layer or layer.get('type') != 'geojson':
+            return []
+
+        tree = PackedRTree.from_dict(self._get_layer_index(layer)['tree'])
+        features = layer['geojson']['features']
+        return [copy.deepcopy(features[i]) for i in tree.query(bbox)]
+
     def _add_layer(self, layer):
         """
         Add layer to this result.
@@ -86,7 +86,7 @@ class FormInputRWS(ResourceWorkflowStep):
 
     def validate(self):
         super().validate()
-        form_values = self._parameters['form-values']['value']
+        form_values = self.get_parameter('form-values')
         validators = self.options.get('validators', {})
         for param, validator in validators.items():
             if isinstance(param, str):
@@ -16,7 +16,7 @@ class TableInputRWS(ResourceWorkflowStep):
 
     Options:
         dataset_title(str): Title of the dataset (e.g.: Hydrograph). Defaults to 'Dataset'.
-        template_dataset(pd.DataFrame): A Pandas dataset to use as a template for the dataset. Default is pd.DataFrame(columns=['X', 'Y'])
+        template_dataset(pd.DataFrame): A Pandas dataset to use as a template for the dataset or a reference to a dataset stored out-of-row with tethysext.atcore.services.dataset_storage.write_dataframe. Default is pd.DataFrame(columns=['X', 'Y'])
         read_only_columns(tuple,list): Names of columns of the template dataset that are read only. All columns are editable by default.
         plot_columns(Union[2-tuple, list of 2-tuple]): Two columns to plot. First column given will be plotted on the x axis, the second on the y axis. No plot if not given. Multiple series plotted if a list of 2-tuple given, ex: [(x1, y1), (x2, y2)].
         max_rows(integer): Maximum number of rows allowed in the dataset. No maximum if not given.
@@ -101,7 +101,7 @@ class XMSToolRWS(ResourceWorkflowStep):
 
     def validate(self):
         super().validate()
-        form_values = self._parameters['form-values']['value']['value']
+        form_values = self.get_parameter('form-values')['value']
         validators = self.options.get('validators', {})
         for param, validator in validators.items():
             if isinstance(param, str):
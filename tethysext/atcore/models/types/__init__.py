@@ -1 +1,2 @@
 from tethysext.atcore.models.types.guid import GUID  # noqa: F401
+from tethysext.atcore.models.types.compressed_pickle import CompressedPickleType  # noqa: F401
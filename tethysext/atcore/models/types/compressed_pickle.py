@@ -0,0 +1,278 @@
+"""
+********************************************************************************
+* Name: compressed_pickle.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import logging
+import pickle
+import time
+import zlib
+
+from sqlalchemy import LargeBinary, PickleType, literal, select, type_coerce, update
+
+log = logging.getLogger(f'tethys.{__name__}')
+
+#: Prefix of compressed values. Pickles never start with a null byte, so values without it are plain pickles.
+MAGIC = b'\x00ATZ'
+#: Version of the header, changes if the format of the header changes.
+VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+DEFAULT_BATCH_SIZE = 100
+
+#: Pickles smaller than this are stored uncompressed, the header and compression would make them larger.
+MIN_COMPRESSED_SIZE = 256
+
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+CODEC_LZ4 = 'lz4'
+CODEC_IDS = {CODEC_ZLIB: 1, CODEC_ZSTD: 2, CODEC_LZ4: 3}
+CODEC_NAMES = {v: k for k, v in CODEC_IDS.items()}
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('The zstandard package is required to read and write values compressed with zstd. '
+                          'Install it with "pip install zstandard".')
+    return zstandard
+
+
+def _import_lz4():
+    try:
+        import lz4.frame
+    except ImportError:
+        raise ImportError('The lz4 package is required to read and write values compressed with lz4. '
+                          'Install it with "pip install lz4".')
+    return lz4.frame
+
+
+def get_default_codec():
+    """
+    Get the codec used when none is given: zstd if the zstandard package is installed, otherwise zlib.
+
+    Returns:
+        str: name of the codec.
+    """
+    try:
+        _import_zstandard()
+        return CODEC_ZSTD
+    except ImportError:
+        return CODEC_ZLIB
+
+
+def is_compressed(data):
+    """
+    Check if a stored value was compressed by this module.
+
+    Args:
+        data(bytes): the stored value.
+
+    Returns:
+        bool: True if compressed, False if it is a plain pickle.
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def compress(data, codec=None, min_size=MIN_COMPRESSED_SIZE):
+    """
+    Compress pickled data and prefix it with a header with the version and the codec. Data smaller than min_size is returned as is.
+
+    Args:
+        data(bytes): pickled data.
+        codec(str): one of "zstd", "lz4" or "zlib". Defaults to get_default_codec().
+        min_size(int): minimum size of the data to compress.
+
+    Returns:
+        bytes: the compressed data.
+    """  # noqa: E501
+    if len(data) < min_size or is_compressed(data):
+        return data
+
+    codec = codec or get_default_codec()
+
+    if codec == CODEC_ZSTD:
+        payload = _import_zstandard().ZstdCompressor(level=3).compress(data)
+    elif codec == CODEC_LZ4:
+        payload = _import_lz4().compress(data)
+    elif codec == CODEC_ZLIB:
+        payload = zlib.compress(data, 6)
+    else:
+        raise ValueError(f'Unsupported compression codec "{codec}".')
+
+    return MAGIC + bytes([VERSION, CODEC_IDS[codec]]) + payload
+
+
+def decompress(data):
+    """
+    Decompress data compressed with compress. Plain pickles are returned as is.
+
+    Args:
+        data(bytes): the stored value.
+
+    Returns:
+        bytes: pickled data.
+    """
+    data = bytes(data)
+
+    if not is_compressed(data):
+        return data
+
+    version, codec_id = data[len(MAGIC)], data[len(MAGIC) + 1]
+
+    if version != VERSION:
+        raise ValueError(f'Unsupported compressed pickle version {version}.')
+
+    codec = CODEC_NAMES.get(codec_id)
+    payload = data[HEADER_SIZE:]
+
+    if codec == CODEC_ZSTD:
+        return _import_zstandard().ZstdDecompressor().decompress(payload)
+    elif codec == CODEC_LZ4:
+        return _import_lz4().decompress(payload)
+    elif codec == CODEC_ZLIB:
+        return zlib.decompress(payload)
+
+    raise ValueError(f'Unsupported compression codec id {codec_id}.')
+
+
+class CompressedPickler(object):
+    """
+    Pickler for PickleType that compresses the pickles it dumps and loads compressed and plain pickles.
+    """
+
+    def __init__(self, codec=None, min_size=MIN_COMPRESSED_SIZE):
+        """
+        Constructor.
+
+        Args:
+            codec(str): one of "zstd", "lz4" or "zlib". Defaults to get_default_codec().
+            min_size(int): minimum size of the pickles to compress.
+        """
+        self.codec = codec
+        self.min_size = min_size
+
+    def dumps(self, obj, protocol=pickle.HIGHEST_PROTOCOL):
+        return compress(pickle.dumps(obj, protocol), codec=self.codec, min_size=self.min_size)
+
+    def loads(self, data):
+        return pickle.loads(decompress(data))
+
+
+class CompressedPickleType(PickleType):
+    """
+    Drop-in replacement for PickleType that compresses the pickled values. Stored in the same binary column type as PickleType and reads values stored uncompressed, so existing columns can be switched without a schema change. Existing values can be compressed with the "atcore compress-pickles" command.
+    """  # noqa: E501
+    cache_ok = True
+
+    def __init__(self, codec=None, min_size=MIN_COMPRESSED_SIZE, protocol=pickle.HIGHEST_PROTOCOL, comparator=None):
+        """
+        Constructor.
+
+        Args:
+            codec(str): one of "zstd", "lz4" or "zlib". Defaults to zstd if the zstandard package is installed, otherwise zlib.
+            min_size(int): minimum size of the pickles to compress.
+            protocol(int): pickle protocol.
+            comparator(callable): function used to compare values, defaults to ==.
+        """  # noqa: E501
+        super().__init__(protocol=protocol, pickler=CompressedPickler(codec, min_size), comparator=comparator)
+        self.codec = codec
+        self.min_size = min_size
+
+
+def get_compressed_pickle_columns(metadata):
+    """
+    Get the columns of the tables of the given metadata with the CompressedPickleType type.
+
+    Args:
+        metadata(sqlalchemy.MetaData): metadata of the tables (e.g.: AppUsersBase.metadata).
+
+    Returns:
+        list<sqlalchemy.Column>: the columns.
+    """
+    return [column for table in metadata.sorted_tables for column in table.columns
+            if isinstance(column.type, CompressedPickleType)]
+
+
+def compress_column(engine, column, batch_size=DEFAULT_BATCH_SIZE, pause=0.0, codec=None):
+    """
+    Compress the values of a column stored uncompressed (e.g.: stored before the column was switched from PickleType). The stored pickles are compressed as is, without unpickling them. Rows are updated in batches, each in its own transaction, and only if they weren't changed since they were read, so it is safe to run while the app is in use.
+
+    Args:
+        engine(sqlalchemy.engine.Engine): engine connected to the database.
+        column(sqlalchemy.Column): column with the CompressedPickleType type.
+        batch_size(int): number of rows read and updated per transaction.
+        pause(float): seconds to wait between batches, to limit the load on the database.
+        codec(str): one of "zstd", "lz4" or "zlib". Defaults to the codec of the column type.
+
+    Returns:
+        int: number of values compressed.
+    """  # noqa: E501
+    table = column.table
+    pk_column = list(table.primary_key.columns)[0]
+    raw_column = type_coerce(column, LargeBinary)
+    codec = codec or column.type.codec
+    last_pk = None
+    count = 0
+
+    while True:
+        query = select(pk_column, raw_column).where(column.isnot(None)).order_by(pk_column).limit(batch_size)
+
+        if last_pk is not None:
+            query = query.where(pk_column > last_pk)
+
+        with engine.begin() as connection:
+            rows = connection.execute(query).fetchall()
+
+            for pk_value, data in rows:
+                data = bytes(data)
+                compressed = compress(data, codec=codec, min_size=column.type.min_size)
+
+                if compressed == data:
+                    continue
+
+                result = connection.execute(
+                    update(table).
+                    where(pk_column == pk_value).
+                    where(raw_column == literal(data, LargeBinary)).
+                    values({column.name: literal(compressed, LargeBinary)})
+                )
+                count += result.rowcount
+
+        if len(rows) < batch_size:
+            break
+
+        last_pk = rows[-1][0]
+        log.debug('Compressed %s values of %s.%s.', count, table.name, column.name)
+
+        if pause:
+            time.sleep(pause)
+
+    return count
+
+
+def compress_columns(engine, metadata, batch_size=DEFAULT_BATCH_SIZE, pause=0.0, codec=None):
+    """
+    Compress the values stored uncompressed of all columns with the CompressedPickleType type of the tables of the given metadata.
+
+    Args:
+        engine(sqlalchemy.engine.Engine): engine connected to the database.
+        metadata(sqlalchemy.MetaData): metadata of the tables (e.g.: AppUsersBase.metadata).
+        batch_size(int): number of rows read and updated per transaction.
+        pause(float): seconds to wait between batches, to limit the load on the database.
+        codec(str): one of "zstd", "lz4" or "zlib". Defaults to the codec of each column type.
+
+    Returns:
+        dict: number of values compressed keyed by "<table>.<column>".
+    """  # noqa: E501
+    counts = {}
+
+    for column in get_compressed_pickle_columns(metadata):
+        key = f'{column.table.name}.{column.name}'
+        counts[key] = compress_column(engine, column, batch_size=batch_size, pause=pause, codec=codec)
+        log.info('Compressed %s values of %s.', counts[key], key)
+
+    return counts
@@ -52,7 +52,8 @@ var ATCORE_MAP_VIEW = (function() {
  	*                    PRIVATE FUNCTION DECLARATIONS
  	*************************************************************************/
  	// Config
- 	var parse_attributes, parse_permissions, setup_ajax, setup_map, csrf_token, sync_layer_visibility;
+ 	var parse_attributes, parse_permissions, setup_ajax, setup_map, setup_vector_tile_layers, csrf_token,
+ 	    sync_layer_visibility;
 
  	// Map management
  	var remove_layer_from_map, get_layer_name_from_feature, get_layer_id_from_layer, get_feature_id_from_feature;
@@ -137,6 +138,9 @@ var ATCORE_MAP_VIEW = (function() {
 	    // Set initial extent
 	    TETHYS_MAP_VIEW.zoomToExtent(m_extent);
 
+	    // Replace placeholders of large layers with vector tile layers
+	    setup_vector_tile_layers();
+
 	    // Setup layer map
 	    m_layers = {};
 
@@ -159,6 +163,34 @@ var ATCORE_MAP_VIEW = (function() {
 	    init_feature_selection();
     };
 
+    setup_vector_tile_layers = function() {
+        let layers = m_map.getLayers();
+
+        layers.getArray().slice().forEach(function(layer) {
+            if (!layer.tethys_data || !layer.tethys_data.vector_tile_url) {
+                return;
+            }
+
+            // Only the features in view are loaded, simplified for the zoom level
+            let tile_layer = new ol.layer.VectorTile({
+                source: new ol.source.VectorTile({
+                    format: new ol.format.MVT(),
+                    url: layer.tethys_data.vector_tile_url,
+                }),
+                style: layer.getStyle(),
+                visible: layer.getVisible(),
+                opacity: layer.getOpacity(),
+            });
+
+            ['tethys_legend_title', 'tethys_legend_classes', 'tethys_legend_extent',
+             'tethys_legend_extent_projection', 'tethys_editable', 'tethys_data'].forEach(function(property) {
+                tile_layer[property] = layer[property];
+            });
+
+            layers.setAt(layers.getArray().indexOf(layer), tile_layer);
+        });
+    };
+
     // Sync layer visibility
     sync_layer_visibility = function() {
         let layer_tab_panel = $('#layers-tab-panel');
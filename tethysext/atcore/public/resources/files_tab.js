@@ -134,6 +134,18 @@ function files_tab_loaded() {
         });
     });
 
+    // Download the folder being viewed as a zip archive.
+    $('#download_folder_button').bind('click', function() {
+        var folder_path = document.getElementById('filepath_input').value;
+        var collection_id = folder_path.split('/').filter(function(part) { return part.length > 0; })[0];
+        if (!collection_id) {
+            return;
+        }
+        var download_url = window.location + '?tab_action=download_folder&folder-path='
+            + encodeURIComponent(folder_path) + '&collection-id=' + collection_id;
+        window.open(download_url, '_blank');
+    });
+
     // Up Button Handler
     $('#up_button').bind('click', function() {
         button = document.getElementById('up_button');
@@ -21,18 +21,14 @@ def main(resource_db_session, model_db_session, resource, workflow, step, gs_pri
     # Write out needed files
     try:
         print('Updating status...')
-        job_statuses = step.get_attribute('condor_job_statuses')
-        print(job_statuses)
-        if step.STATUS_FAILED in job_statuses:
-            step.set_status(step.ROOT_STATUS_KEY, step.STATUS_FAILED)
-        else:
-            step.set_status(step.ROOT_STATUS_KEY, step.STATUS_COMPLETE)
-
+        print(step.get_job_status_counts(resource_db_session))
+        step.set_status_atomic(resource_db_session, step.ROOT_STATUS_KEY, step.get_job_status(resource_db_session))
         resource_db_session.commit()
 
     except Exception as e:
         if step and resource_db_session:
-            step.set_status(step.ROOT_STATUS_KEY, step.STATUS_FAILED)
+            resource_db_session.rollback()
+            step.set_status_atomic(resource_db_session, step.ROOT_STATUS_KEY, step.STATUS_FAILED)
             resource_db_session.commit()
         sys.stderr.write('Error processing step {0}'.format(cmd_args.resource_workflow_step_id))
         traceback.print_exc(file=sys.stderr)
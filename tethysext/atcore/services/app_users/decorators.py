@@ -18,6 +18,7 @@ from django.shortcuts import redirect
 from django.utils.functional import wraps
 from django.conf import settings
 from tethysext.atcore.exceptions import ATCoreException
+from tethysext.atcore.services.request_session import get_request_session, release_request_session, request_session
 
 
 log = logging.getLogger(f'tethys.{__name__}')
@@ -38,13 +39,10 @@ def active_user_required():
             # Validate that the user is active.
             if not request.user.is_staff:
                 _AppUser = self.get_app_user_model()
-                make_session = self.get_sessionmaker()
 
-                session = make_session()
-                app_user = session.query(_AppUser).\
-                    filter(_AppUser.username == request.user.username).\
-                    one_or_none()
-                session.close()
+                # The session and app user are reused by the controller if the request is scoped
+                with request_session(request, self.get_sessionmaker()) as session:
+                    app_user = _AppUser.get_app_user_from_request(request, session)
 
                 if app_user is None:
                     messages.warning(request, "We're sorry, but you are not allowed access to this app.")
@@ -82,8 +80,7 @@ def resource_controller(is_rest_controller=False):
                 return JsonResponse({'success': False, 'error': str(e)})
 
             try:
-                make_session = self.get_sessionmaker()
-                session = make_session()
+                session = get_request_session(request, self.get_sessionmaker())
 
                 if resource_id:
                     resource = self.get_resource(request, resource_id=resource_id, session=session)
@@ -109,7 +106,7 @@ def resource_controller(is_rest_controller=False):
                 )
 
             finally:
-                session and session.close()
+                session and release_request_session(request, session)
 
         return wraps(controller_func)(_wrapped_controller)
     return decorator
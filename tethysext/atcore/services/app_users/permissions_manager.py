@@ -37,6 +37,9 @@ class AppPermissionsManager:
     # Global Permissions Groups
     APP_A_PERMS = 'app_admin_perms'
 
+    # Maximum number of users resolved per query by the bulk methods
+    BULK_QUERY_CHUNK_SIZE = 500
+
     PERMISSIONS_GROUP_MAP = {
         LICENSES.STANDARD: {
             ROLES.ORG_USER: STD_U_PERMS,
@@ -68,6 +71,9 @@ class AppPermissionsManager:
         """
         self.app_namespace = app_namespace
 
+        # Permissions groups of users keyed by username, memoized for the life of this manager
+        self._permissions_groups_cache = {}
+
         # Namespaced Standard License Permissions Groups
         self.STANDARD_USER_PERMS = '{}:{}'.format(self.app_namespace, self.STD_U_PERMS)
         self.STANDARD_REVIEWER_PERMS = '{}:{}'.format(self.app_namespace, self.STD_R_PERMS)
@@ -367,29 +373,19 @@ class AppPermissionsManager:
             group.user_set.remove(django_user)
 
         django_user.save()
+        self.clear_cache(app_user)
 
     def get_all_permissions_groups_for(self, app_user, as_display_name=False):
         """
-        Get all of the custom_permissions groups to which the given user is assigned.
+        Get all of the custom_permissions groups to which the given user is assigned. Results are memoized for the life of the manager.
         Args:
             app_user(tethysext.atcore.models.AppUser): AppUser object
             as_display_name(bool): Returns display names instead of programmatic name if True.
 
         Returns:
             list: all custom_permissions group objects of the bound app to which the user belongs.
-        """
-        namespace = self.app_namespace + ':'
-        if app_user.is_staff():
-            from django.contrib.auth.models import Group
-            permissions_groups = Group.objects.\
-                filter(name__icontains=namespace).\
-                values_list('name', flat=True).\
-                order_by('-name')
-        else:
-            permissions_groups = app_user.django_user.groups.\
-                filter(name__icontains=namespace).\
-                values_list('name', flat=True).\
-                order_by('-name')
+        """  # noqa: E501
+        permissions_groups = self.get_all_permissions_groups_for_users([app_user])[app_user.username]
 
         groups = []
 
@@ -398,6 +394,86 @@ class AppPermissionsManager:
 
         return groups
 
+    def get_all_permissions_groups_for_users(self, app_users):
+        """
+        Get the custom_permissions groups of each of the given users. Groups of all users not yet memoized are resolved with a single query.
+        Args:
+            app_users(list<tethysext.atcore.models.AppUser>): AppUser objects.
+
+        Returns:
+            dict: programmatic names of the custom_permissions groups of the bound app to which each user belongs, keyed by username.
+        """  # noqa: E501
+        from django.contrib.auth.models import Group
+
+        namespace = self.app_namespace + ':'
+        staff_usernames = set()
+        usernames = set()
+
+        for app_user in app_users:
+            if app_user.username in self._permissions_groups_cache:
+                continue
+
+            if app_user.is_staff():
+                staff_usernames.add(app_user.username)
+            else:
+                usernames.add(app_user.username)
+
+        if staff_usernames:
+            # Staff users have all permissions groups of the app
+            all_permissions_groups = list(
+                Group.objects.
+                filter(name__icontains=namespace).
+                values_list('name', flat=True).
+                order_by('-name')
+            )
+
+            for username in staff_usernames:
+                self._permissions_groups_cache[username] = all_permissions_groups
+
+        if usernames:
+            usernames = sorted(usernames)
+
+            for username in usernames:
+                self._permissions_groups_cache[username] = []
+
+            # Chunk to stay under the bound parameter limits of the database backend
+            for i in range(0, len(usernames), self.BULK_QUERY_CHUNK_SIZE):
+                rows = Group.objects.\
+                    filter(name__icontains=namespace, user__username__in=usernames[i:i + self.BULK_QUERY_CHUNK_SIZE]).\
+                    values_list('user__username', 'name').\
+                    order_by('-name')
+
+                for username, permissions_group in rows:
+                    self._permissions_groups_cache[username].append(permissions_group)
+
+        return {app_user.username: self._permissions_groups_cache[app_user.username] for app_user in app_users}
+
+    def get_ranks_for_users(self, app_users):
+        """
+        Get the maximum permissions-based rank of each of the given users.
+        Args:
+            app_users(list<tethysext.atcore.models.AppUser>): AppUser objects.
+
+        Returns:
+            dict: highest permissions-based rank of each user keyed by username.
+        """
+        permissions_groups = self.get_all_permissions_groups_for_users(app_users)
+        return {
+            username: max([-1] + [self.get_rank_for(permissions_group) for permissions_group in groups])
+            for username, groups in permissions_groups.items()
+        }
+
+    def clear_cache(self, app_user=None):
+        """
+        Forget memoized permissions groups.
+        Args:
+            app_user(tethysext.atcore.models.AppUser): Only forget the groups of this user if given.
+        """
+        if app_user is None:
+            self._permissions_groups_cache.clear()
+        else:
+            self._permissions_groups_cache.pop(app_user.username, None)
+
     def assign_user_permission(self, app_user, role, license=None, **kwargs):
         """
         Add custom_permissions based on combo of role, license and other given criteria.
@@ -416,6 +492,7 @@ class AppPermissionsManager:
         django_user = app_user.django_user
         self.add_permissions_group(app_user, permission_group)
         django_user.save()
+        self.clear_cache(app_user)
 
     def remove_user_permission(self, app_user, role, license=None, **kwargs):
         """
@@ -435,3 +512,4 @@ class AppPermissionsManager:
         django_user = app_user.django_user
         self.remove_permissions_group(app_user, permission_group)
         django_user.save()
+        self.clear_cache(app_user)
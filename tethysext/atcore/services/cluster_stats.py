@@ -0,0 +1,189 @@
+"""
+********************************************************************************
+* Name: cluster_stats.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+#: Number and total size in bytes of the databases of a persistent store cluster.
+ClusterStats = namedtuple('ClusterStats', ['connection_name', 'count', 'size'])
+
+
+def _none_last(value):
+    # Sorts clusters that failed to report a statistic after the ones that did, like None sorted last in postgres
+    return (value is None, value or 0)
+
+
+def least_count(stats):
+    """
+    Select the cluster with the least number of databases, then the least size if tied. The first cluster listed wins ties on both.
+
+    Args:
+        stats(list<ClusterStats>): statistics of the candidate clusters.
+
+    Returns:
+        ClusterStats: the selected cluster or None if there are no candidates.
+    """  # noqa: E501
+    return min(stats, key=lambda s: (_none_last(s.count), _none_last(s.size)), default=None)
+
+
+def least_size(stats):
+    """
+    Select the cluster with the least total size, then the least number of databases if tied.
+
+    Args:
+        stats(list<ClusterStats>): statistics of the candidate clusters.
+
+    Returns:
+        ClusterStats: the selected cluster or None if there are no candidates.
+    """
+    return min(stats, key=lambda s: (_none_last(s.size), _none_last(s.count)), default=None)
+
+
+def weighted(count_weight=0.5, size_weight=0.5):
+    """
+    Make a strategy that selects the cluster with the lowest weighted sum of its number of databases and size, each relative to the largest of the candidates.
+
+    Args:
+        count_weight(float): weight of the number of databases.
+        size_weight(float): weight of the size.
+
+    Returns:
+        callable: the strategy.
+    """  # noqa: E501
+    def strategy(stats):
+        max_count = max((s.count or 0 for s in stats), default=0) or 1
+        max_size = max((s.size or 0 for s in stats), default=0) or 1
+
+        def score(s):
+            return count_weight * (s.count or 0) / max_count + size_weight * (s.size or 0) / max_size
+
+        return min(stats, key=score, default=None)
+
+    return strategy
+
+
+class ClusterStatsCache(object):
+    """
+    Process-wide cache of the statistics of the persistent store clusters of apps. Expired statistics are gathered from all clusters concurrently.
+    """  # noqa: E501
+    DEFAULT_TTL = 300
+    DEFAULT_MAX_WORKERS = 8
+
+    #: Template databases of model databases and their warm pools (named *_template_*) are not counted.
+    COUNT_QUERY = "SELECT count(*) AS count FROM pg_database WHERE strpos(datname, '_template_') = 0;"
+    SIZE_QUERY = 'SELECT sum(pg_catalog.pg_database_size(d.datname)) AS size FROM pg_catalog.pg_database d;'
+
+    def __init__(self, ttl=DEFAULT_TTL, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Constructor.
+
+        Args:
+            ttl(int): seconds the statistics of a cluster are reused before they are gathered again.
+            max_workers(int): maximum number of clusters queried at the same time.
+        """
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @staticmethod
+    def _get_key(app, connection_name):
+        return getattr(app, 'package', None), connection_name
+
+    def query(self, app, connection_name):
+        """
+        Gather the statistics of a cluster.
+
+        Args:
+            app(TethysApp): the app the persistent store connection belongs to.
+            connection_name(str): name of the persistent store connection of the cluster.
+
+        Returns:
+            ClusterStats: the statistics or None if the connection is not assigned.
+        """
+        count = None
+        size = None
+        engine = app.get_persistent_store_connection(connection_name)
+
+        if not engine:
+            return None
+
+        try:
+            for row in engine.execute(self.COUNT_QUERY):
+                count = row.count
+
+            for row in engine.execute(self.SIZE_QUERY):
+                size = row.size
+        finally:
+            engine.dispose()
+
+        return ClusterStats(connection_name, count, size)
+
+    def get_stats(self, app, connection_names):
+        """
+        Get the statistics of the given clusters, gathering the missing and expired ones concurrently.
+
+        Args:
+            app(TethysApp): the app the persistent store connections belong to.
+            connection_names(list<str>): names of the persistent store connections of the clusters.
+
+        Returns:
+            list<ClusterStats>: statistics of the clusters with assigned connections, in the order given.
+        """
+        now = time.monotonic()
+        stats = {}
+
+        with self._lock:
+            for connection_name in connection_names:
+                cached = self._stats.get(self._get_key(app, connection_name), None)
+                if cached is not None and now - cached[0] < self.ttl:
+                    stats[connection_name] = cached[1]
+
+        expired = [n for n in connection_names if n not in stats]
+
+        if expired:
+            if len(expired) == 1:
+                results = [self.query(app, expired[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(expired))) as executor:
+                    results = list(executor.map(lambda n: self.query(app, n), expired))
+
+            with self._lock:
+                for connection_name, result in zip(expired, results):
+                    self._stats[self._get_key(app, connection_name)] = (now, result)
+                    stats[connection_name] = result
+
+        return [stats[n] for n in connection_names if stats[n] is not None]
+
+    def record_database_created(self, app, connection_name):
+        """
+        Count a database created on a cluster in its cached statistics, so databases created before they expire are spread among the clusters.
+
+        Args:
+            app(TethysApp): the app the persistent store connection belongs to.
+            connection_name(str): name of the persistent store connection of the cluster.
+        """  # noqa: E501
+        key = self._get_key(app, connection_name)
+
+        with self._lock:
+            cached = self._stats.get(key, None)
+            if cached is not None and cached[1] is not None and cached[1].count is not None:
+                self._stats[key] = (cached[0], cached[1]._replace(count=cached[1].count + 1))
+
+    def clear(self):
+        """
+        Discard all cached statistics.
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+#: Default process-wide cache.
+cluster_stats_cache = ClusterStatsCache()
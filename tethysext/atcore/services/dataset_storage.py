@@ -0,0 +1,173 @@
+"""
+********************************************************************************
+* Name: dataset_storage.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import os
+import tempfile
+import uuid
+
+import pandas as pd
+
+from tethysext.atcore.services.directory_index import directory_index_cache
+from tethysext.atcore.services.file_database import FileCollectionClient, FileDatabaseClient
+
+__all__ = ['STORAGE_PARQUET', 'STORAGE_ARROW', 'STORAGE_FORMATS', 'is_dataset_reference', 'write_dataframe',
+           'read_dataframe', 'delete_dataframe', 'get_file_collection_client']
+
+STORAGE_PARQUET = 'parquet'
+STORAGE_ARROW = 'arrow'
+STORAGE_FORMATS = {
+    STORAGE_PARQUET: '.parquet',
+    STORAGE_ARROW: '.arrow',
+}
+DATASETS_DIRECTORY = 'datasets'
+_REFERENCE_KEY = '__dataset_reference__'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        raise ImportError('The pyarrow package is required to store datasets out-of-row. '
+                          'Install it with "conda install -c conda-forge pyarrow".')
+    return pyarrow
+
+
+def is_dataset_reference(value):
+    """
+    Check if the given value is a reference to an out-of-row dataset.
+
+    Args:
+        value(any): the value to check.
+
+    Returns:
+        bool: True if value is a dataset reference.
+    """
+    return isinstance(value, dict) and value.get(_REFERENCE_KEY, False)
+
+
+def write_dataframe(file_collection_client, data_frame, storage_format=STORAGE_PARQUET):
+    """
+    Write a DataFrame to a columnar file in the given FileCollection.
+
+    Args:
+        file_collection_client(FileCollectionClient): client for the FileCollection to write the file to.
+        data_frame(pandas.DataFrame): the data.
+        storage_format(str): one of 'parquet' or 'arrow' (Arrow IPC).
+
+    Returns:
+        dict: lightweight, picklable reference to the stored dataset.
+    """
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(f'Unsupported storage format "{storage_format}". '
+                         f'Must be one of: {", ".join(STORAGE_FORMATS)}.')
+
+    pa = _import_pyarrow()
+    item = os.path.join(DATASETS_DIRECTORY, f'{uuid.uuid4()}{STORAGE_FORMATS[storage_format]}')
+
+    # Write to a private temporary directory and move into the collection so readers never see partial files
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, item)
+        os.makedirs(os.path.dirname(tmp_path))
+
+        if storage_format == STORAGE_PARQUET:
+            data_frame.to_parquet(tmp_path, engine='pyarrow', index=True)
+        else:
+            table = pa.Table.from_pandas(data_frame, preserve_index=True)
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        file_collection_client.add_item(tmp_path, move=True, relative_to=tmp_dir)
+
+    return {
+        _REFERENCE_KEY: True,
+        'storage_format': storage_format,
+        'file_database_id': str(file_collection_client.instance.file_database_id),
+        'file_collection_id': str(file_collection_client.instance.id),
+        'item': item,
+        'path': os.path.join(file_collection_client.path, item),
+        'columns': [str(c) for c in data_frame.columns],
+        'num_rows': len(data_frame),
+    }
+
+
+def _get_path(reference, file_collection_client=None):
+    """
+    Get the path to the file of the referenced dataset.
+    """
+    if file_collection_client is not None:
+        return os.path.join(file_collection_client.path, reference['item'])
+    return reference['path']
+
+
+def get_file_collection_client(session, reference):
+    """
+    Bind a FileCollectionClient to the FileCollection containing the referenced dataset.
+
+    Args:
+        session(sqlalchemy.orm.Session): the session for the SQL database of the FileDatabase.
+        reference(dict): reference returned by write_dataframe.
+
+    Returns:
+        FileCollectionClient: client for the FileCollection of the dataset.
+    """
+    # The path of the dataset is <root_directory>/<file_database_id>/<file_collection_id>/<item>
+    collection_path = reference['path'][:-len(reference['item'])].rstrip(os.sep)
+    root_directory = os.path.dirname(os.path.dirname(collection_path))
+    file_database_client = FileDatabaseClient(session, root_directory, uuid.UUID(reference['file_database_id']))
+    return FileCollectionClient(session, file_database_client, uuid.UUID(reference['file_collection_id']))
+
+
+def read_dataframe(reference, columns=None, memory_map=True, file_collection_client=None):
+    """
+    Load a DataFrame stored with write_dataframe.
+
+    Args:
+        reference(dict): reference returned by write_dataframe.
+        columns(list<str>): only load these columns if given.
+        memory_map(bool): memory-map the file rather than reading it into a buffer.
+        file_collection_client(FileCollectionClient): client used to resolve the file if the FileDatabase has moved.
+
+    Returns:
+        pandas.DataFrame: the data.
+    """
+    pa = _import_pyarrow()
+    path = _get_path(reference, file_collection_client)
+
+    if reference['storage_format'] == STORAGE_PARQUET:
+        return pd.read_parquet(path, engine='pyarrow', columns=columns, memory_map=memory_map)
+
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+    with source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            # Keep the stored index columns so the DataFrame index is restored
+            index_columns = [c for c in (table.schema.pandas_metadata or {}).get('index_columns', [])
+                             if isinstance(c, str)]
+            table = table.select(list(columns) + [c for c in index_columns if c not in columns])
+        return table.to_pandas()
+
+
+def delete_dataframe(reference, file_collection_client=None):
+    """
+    Delete the file of a dataset stored with write_dataframe. Missing files are ignored.
+
+    Args:
+        reference(dict): reference returned by write_dataframe.
+        file_collection_client(FileCollectionClient): client used to resolve the file if the FileDatabase has moved.
+    """
+    if file_collection_client is not None:
+        if file_collection_client.has_item(reference['item']):
+            file_collection_client.delete_item(reference['item'])
+        return
+
+    path = _get_path(reference)
+    if os.path.isfile(path):
+        os.remove(path)
+        directory_index_cache.invalidate(path)
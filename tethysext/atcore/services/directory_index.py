@@ -0,0 +1,170 @@
+"""
+********************************************************************************
+* Name: directory_index.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+__all__ = ['scan_directory', 'DirectoryIndexCache', 'directory_index_cache']
+
+META_FILE = '__meta__.json'
+
+
+def _stat_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_display_name(path):
+    try:
+        with open(path) as f:
+            return json.load(f).get('display_name', None)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def scan_directory(path, previous=None):
+    """
+    Build an index of the given directory in a single bottom-up pass with os.scandir. File entries of directories whose mtime has not changed since the previous index are reused rather than re-stated.
+
+    Args:
+        path(str): path to the directory.
+        previous(dict): index of the same directory from a previous scan, if any.
+
+    Returns:
+        dict: index node with name, type, size, date_modified (newest directory mtime in the tree), display_name, and children.
+    """  # noqa: E501
+    dir_mtime_ns = _stat_mtime_ns(path)
+    meta_path = os.path.join(path, META_FILE)
+    meta_mtime_ns = _stat_mtime_ns(meta_path)
+
+    reuse = previous is not None and previous.get('type') == 'folder' and \
+        previous.get('dir_mtime_ns') == dir_mtime_ns
+
+    previous_children = {c['name']: c for c in previous.get('children', [])} if previous else {}
+    children = []
+
+    if reuse:
+        # Entries of this directory are unchanged, only subdirectories need to be checked
+        for child in previous['children']:
+            if child['type'] == 'folder':
+                child = scan_directory(os.path.join(path, child['name']), child)
+            children.append(child)
+    else:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=True):
+                    children.append(scan_directory(entry.path, previous_children.get(entry.name)))
+                else:
+                    try:
+                        st = entry.stat(follow_symlinks=True)
+                    except OSError:
+                        continue
+                    children.append({
+                        'name': entry.name,
+                        'type': 'file',
+                        'size': st.st_size,
+                        'date_modified': st.st_mtime,
+                    })
+
+    if reuse and previous.get('meta_mtime_ns') == meta_mtime_ns:
+        display_name = previous.get('display_name')
+    else:
+        display_name = _read_display_name(meta_path) if meta_mtime_ns is not None else None
+
+    folder_dates = [c['date_modified'] for c in children if c['type'] == 'folder']
+
+    return {
+        'name': os.path.basename(path),
+        'type': 'folder',
+        'size': sum(c['size'] for c in children),
+        'date_modified': max([dir_mtime_ns / 1e9] + folder_dates),
+        'dir_mtime_ns': dir_mtime_ns,
+        'meta_mtime_ns': meta_mtime_ns,
+        'display_name': display_name,
+        'children': children,
+    }
+
+
+class DirectoryIndexCache(object):
+    """
+    Process-wide least recently used cache of directory indexes keyed by absolute path. Indexes are refreshed incrementally on access.
+    """  # noqa: E501
+    DEFAULT_MAX_SIZE = 64
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        Constructor.
+
+        Args:
+            max_size(int): maximum number of directory indexes kept.
+        """
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._indexes = OrderedDict()
+
+    def get(self, path):
+        """
+        Get the index of a directory. The mtime of every directory in the tree is checked on each access and only the directories that have changed are rescanned.
+
+        Args:
+            path(str): path to the directory.
+
+        Returns:
+            dict: the index returned by scan_directory.
+        """  # noqa: E501
+        path = os.path.abspath(path)
+
+        with self._lock:
+            previous = self._indexes.get(path)
+
+        index = scan_directory(path, previous)
+
+        with self._lock:
+            self._indexes[path] = index
+            self._indexes.move_to_end(path)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def invalidate(self, path=None):
+        """
+        Mark cached entries as stale. Required after files are modified in place, which does not change directory mtimes.
+
+        Args:
+            path(str): path of the file or directory that changed. All indexes are forgotten if not given.
+        """  # noqa: E501
+        with self._lock:
+            if path is None:
+                self._indexes.clear()
+                return
+
+            path = os.path.abspath(path)
+            for key in list(self._indexes.keys()):
+                if path == key or key.startswith(path + os.sep):
+                    del self._indexes[key]
+                elif path.startswith(key + os.sep):
+                    # Force a rescan of every directory between the cached root and the changed path
+                    node = self._indexes[key]
+                    node['dir_mtime_ns'] = None
+                    for part in os.path.relpath(path, key).split(os.sep):
+                        node = next((c for c in node['children'] if c['type'] == 'folder' and c['name'] == part), None)
+                        if node is None:
+                            break
+                        node['dir_mtime_ns'] = None
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+#: Default process-wide cache.
+directory_index_cache = DirectoryIndexCache()
@@ -0,0 +1,261 @@
+"""
+********************************************************************************
+* Name: engine_registry.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import QueuePool
+
+# Default of arguments for which None is a valid value
+_UNSET = object()
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait to check out a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.checkout_count = 0
+
+    def _do_get(self):
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            wait_time = time.monotonic() - start
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+            self.checkout_count += 1
+
+    def recreate(self):
+        # Called by engine.dispose(), return a pool of the same type.
+        pool = super().recreate()
+        pool.wait_time_total = self.wait_time_total
+        pool.wait_time_max = self.wait_time_max
+        pool.checkout_count = self.checkout_count
+        return pool
+
+
+class EngineRegistry(object):
+    """
+    Process-wide registry of pooled SQLAlchemy engines keyed by database url and engine kwargs.
+    """
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 10
+    DEFAULT_POOL_PRE_PING = True
+    DEFAULT_POOL_RECYCLE = 1800
+    DEFAULT_IDLE_TIMEOUT = 600
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_overflow=DEFAULT_MAX_OVERFLOW,
+                 pool_pre_ping=DEFAULT_POOL_PRE_PING, pool_recycle=DEFAULT_POOL_RECYCLE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Constructor.
+
+        Args:
+            pool_size(int): number of connections to keep open in each engine's pool.
+            max_overflow(int): number of connections allowed beyond pool_size.
+            pool_pre_ping(bool): test connections for liveness on checkout.
+            pool_recycle(int): seconds after which a pooled connection is recycled. -1 to disable.
+            idle_timeout(int): seconds an engine may go unused before it is disposed. None to disable eviction.
+        """
+        self._lock = threading.RLock()
+        self._engines = {}
+        self._last_used = {}
+        self._last_sweep = time.monotonic()
+        self.idle_timeout = idle_timeout
+        self.configure(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
+            idle_timeout=idle_timeout,
+        )
+
+    def configure(self, pool_size=None, max_overflow=None, pool_pre_ping=None, pool_recycle=None,
+                  idle_timeout=_UNSET):
+        """
+        Update the pool settings used for engines created after this call. Arguments left as None are unchanged, except idle_timeout, for which None disables eviction.
+        """  # noqa: E501
+        with self._lock:
+            if pool_size is not None:
+                self.pool_size = pool_size
+            if max_overflow is not None:
+                self.max_overflow = max_overflow
+            if pool_pre_ping is not None:
+                self.pool_pre_ping = pool_pre_ping
+            if pool_recycle is not None:
+                self.pool_recycle = pool_recycle
+            if idle_timeout is not _UNSET:
+                self.idle_timeout = idle_timeout
+
+    @staticmethod
+    def make_key(db_url, engine_kwargs=None):
+        """
+        Build the registry key for the given url and engine kwargs.
+
+        Args:
+            db_url(str): SQLAlchemy url connection string.
+            engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method.
+
+        Returns:
+            tuple: hashable key.
+        """
+        engine_kwargs = engine_kwargs or {}
+        return str(db_url), tuple(sorted((k, repr(v)) for k, v in engine_kwargs.items()))
+
+    def get_engine(self, db_url, engine_kwargs=None):
+        """
+        Get the pooled engine for the given url, creating it on first use.
+
+        Args:
+            db_url(str): SQLAlchemy url connection string.
+            engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method.
+
+        Returns:
+            sqlalchemy.engine.Engine: shared engine.
+        """
+        key = self.make_key(db_url, engine_kwargs)
+
+        with self._lock:
+            self._maybe_evict_idle()
+            engine = self._engines.get(key)
+
+            if engine is None:
+                engine = create_engine(db_url, **self._build_engine_kwargs(db_url, engine_kwargs))
+                self._engines[key] = engine
+
+            self._last_used[key] = time.monotonic()
+
+        return engine
+
+    def _build_engine_kwargs(self, db_url, engine_kwargs):
+        """
+        Merge the registry pool settings into the caller's engine kwargs. Caller values take precedence.
+        """
+        kwargs = dict(engine_kwargs or {})
+        poolclass = kwargs.get('poolclass')
+
+        # Pool sizing only applies to queue pools; sqlite and explicit non-queue pools manage themselves.
+        if make_url(db_url).get_backend_name() == 'sqlite' or \
+                (poolclass is not None and not issubclass(poolclass, QueuePool)):
+            return kwargs
+
+        kwargs.setdefault('poolclass', TimedQueuePool)
+        kwargs.setdefault('pool_size', self.pool_size)
+        kwargs.setdefault('max_overflow', self.max_overflow)
+        kwargs.setdefault('pool_pre_ping', self.pool_pre_ping)
+        kwargs.setdefault('pool_recycle', self.pool_recycle)
+        return kwargs
+
+    def _maybe_evict_idle(self):
+        """
+        Run an idle sweep if one hasn't been run in the last idle_timeout seconds.
+        """
+        if not self.idle_timeout:
+            return
+
+        if time.monotonic() - self._last_sweep >= self.idle_timeout:
+            self.evict_idle()
+
+    def evict_idle(self, max_idle=None):
+        """
+        Dispose of engines that have not been used recently and have no checked-out connections.
+
+        Args:
+            max_idle(int): seconds of inactivity before eviction. Defaults to idle_timeout.
+
+        Returns:
+            int: number of engines evicted.
+        """
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        evicted = 0
+
+        with self._lock:
+            now = time.monotonic()
+            self._last_sweep = now
+
+            for key in list(self._engines.keys()):
+                engine = self._engines[key]
+                if now - self._last_used.get(key, now) < max_idle:
+                    continue
+
+                checkedout = getattr(engine.pool, 'checkedout', None)
+                if checkedout is not None and checkedout() > 0:
+                    continue
+
+                engine.dispose()
+                del self._engines[key]
+                self._last_used.pop(key, None)
+                evicted += 1
+
+        return evicted
+
+    def dispose(self, db_url=None):
+        """
+        Dispose of and forget registered engines.
+
+        Args:
+            db_url(str): only dispose engines for this url if given, otherwise dispose all engines.
+        """
+        with self._lock:
+            for key in list(self._engines.keys()):
+                if db_url is not None and key[0] != str(db_url):
+                    continue
+                self._engines.pop(key).dispose()
+                self._last_used.pop(key, None)
+
+    def get_pool_stats(self, db_url=None):
+        """
+        Get connection pool statistics for registered engines.
+
+        Args:
+            db_url(str): only report engines for this url if given.
+
+        Returns:
+            list<dict>: one dictionary of statistics per engine.
+        """
+        stats = []
+
+        with self._lock:
+            now = time.monotonic()
+            for key, engine in self._engines.items():
+                if db_url is not None and key[0] != str(db_url):
+                    continue
+
+                pool = engine.pool
+                checkout_count = getattr(pool, 'checkout_count', 0)
+                wait_time_total = getattr(pool, 'wait_time_total', 0.0)
+                stats.append({
+                    'db_url': repr(engine.url),
+                    'pool_class': pool.__class__.__name__,
+                    'size': pool.size() if hasattr(pool, 'size') else None,
+                    'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+                    'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                    'overflow': pool.overflow() if hasattr(pool, 'overflow') else None,
+                    'checkouts': checkout_count,
+                    'wait_time_total': wait_time_total,
+                    'wait_time_avg': wait_time_total / checkout_count if checkout_count else 0.0,
+                    'wait_time_max': getattr(pool, 'wait_time_max', 0.0),
+                    'idle_seconds': now - self._last_used.get(key, now),
+                })
+
+        return stats
+
+    def __len__(self):
+        return len(self._engines)
+
+
+#: Default process-wide registry.
+engine_registry = EngineRegistry()
@@ -12,6 +12,7 @@ import shutil
 from contextlib import contextmanager
 from shutil import Error as ShutilErrors
 import uuid
+import zipfile
 from typing import Generator
 
 from sqlalchemy.orm import Session
@@ -21,11 +22,35 @@ from tethysext.atcore.exceptions import FileCollectionNotFoundError, FileDatabas
     FileCollectionItemAlreadyExistsError
 from tethysext.atcore.mixins.meta_mixin import MetaMixin
 from tethysext.atcore.models.file_database import FileCollection, FileDatabase
+from tethysext.atcore.services.directory_index import directory_index_cache
 
 __all__ = ['FileDatabaseClient', 'FileCollectionClient']
 
 log = logging.getLogger('tethys.' + __name__)
 
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer(object):
+    """
+    Write-only file-like object that holds written bytes until they are popped.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
 
 class FileDatabaseClient(MetaMixin):
     def __init__(self, session: Session, root_directory: str, file_database_id: uuid.UUID):
@@ -195,6 +220,7 @@ class FileCollectionClient(MetaMixin):
         self._collection_id = file_collection_id
         self._file_database_client = file_database_client
         self._instance = None
+        self._path = None
         self._session = session
         self.__deleted = False
 
@@ -252,8 +278,12 @@ class FileCollectionClient(MetaMixin):
     @property
     def path(self) -> str:
         """Path to the FileCollection directory."""
-        return os.path.join(self.file_database_client.root_directory, str(self.instance.database.id),
-                            str(self._collection_id))
+        if self.__deleted:
+            raise UnboundFileCollectionError('The collection has been deleted.')
+        if not self._path:
+            self._path = os.path.join(self.file_database_client.root_directory, str(self.instance.database.id),
+                                      str(self._collection_id))
+        return self._path
 
     @property
     def files(self) -> Generator[str, None, None]:
@@ -267,8 +297,27 @@ class FileCollectionClient(MetaMixin):
             for file in files:
                 yield os.path.relpath(os.path.join(root, file), self.path)
 
+    def get_directory_index(self):
+        """
+        Get a cached index of the contents of the FileCollection. Only directories that have changed since the last call are rescanned.
+
+        Returns:
+            dict: nested index of the FileCollection directory (see directory_index.scan_directory).
+        """  # noqa: E501
+        return directory_index_cache.get(self.path)
+
+    def invalidate_directory_index(self, item: str = None):
+        """
+        Mark the cached index of the FileCollection as stale.
+
+        Args:
+            item (str): Path to the item that changed, relative to the collection. The entire index is invalidated if not given.
+        """  # noqa: E501
+        directory_index_cache.invalidate(os.path.join(self.path, item) if item else self.path)
+
     def delete(self):
         """Delete this CollectionInstance"""
+        self.invalidate_directory_index()
         shutil.rmtree(self.path)
         self._session.delete(self.instance)
         self._session.commit()
@@ -343,6 +392,8 @@ class FileCollectionClient(MetaMixin):
             else:
                 shutil.copy(item, dst)
 
+        self.invalidate_directory_index(os.path.relpath(os.path.join(dst, os.path.basename(item)), self.path))
+
     def delete_item(self, item: str):
         """
         Delete an item from the file collection.
@@ -359,6 +410,8 @@ class FileCollectionClient(MetaMixin):
         else:
             os.remove(item_path)
 
+        self.invalidate_directory_index(item)
+
     def export_item(self, item: str, target: str):
         """
         Export an item from the collection to a new location.
@@ -405,6 +458,8 @@ class FileCollectionClient(MetaMixin):
         except (FileExistsError, IsADirectoryError):
             raise FileCollectionItemAlreadyExistsError('Collection duplication target already exists.')
 
+        self.invalidate_directory_index(new_item)
+
     @contextmanager
     def open_file(self, file, *args, **kwargs):
         """
@@ -426,6 +481,74 @@ class FileCollectionClient(MetaMixin):
             yield f
         finally:
             f.close()
+            # Writing to a file in place does not change the mtime of its directory
+            if set(f.mode) & set('wax+'):
+                self.invalidate_directory_index(file)
+
+    def iter_file(self, file: str, start: int = 0, end: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Generator that reads a file in the collection in chunks.
+
+        Args:
+            file (str): The file to be read, relative to the collection.
+            start (int): Offset of the first byte to read.
+            end (int): Offset of the last byte to read (inclusive). Read to the end of the file if not given.
+            chunk_size (int): Maximum number of bytes in each chunk.
+
+        Returns:
+            Generator giving the bytes of the file.
+        """
+        with self.open_file(file, 'rb') as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def iter_zip(self, item: str = '', chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Generator that builds a zip archive of a directory in the collection as it is read. Neither the files nor the archive are held in memory or written to disk.
+
+        Args:
+            item (str): Path to the directory to archive, relative to the collection. Archive the entire collection if not given.
+            chunk_size (int): Size of the chunks in which files are read.
+
+        Returns:
+            Generator giving the bytes of the zip archive.
+        """  # noqa: E501
+        item = os.path.normpath(item) if item else os.curdir
+        if not os.path.isdir(os.path.join(self.path, item)):
+            raise FileCollectionItemNotFoundError(f'"{item}" not found in this collection.')
+
+        buffer = _StreamBuffer()
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+            for relative_root, _, files in self.walk():
+                if item != os.curdir and relative_root != item and not relative_root.startswith(item + os.sep):
+                    continue
+
+                for file in files:
+                    relative_file = os.path.normpath(os.path.join(relative_root, file))
+                    info = zipfile.ZipInfo.from_file(os.path.join(self.path, relative_file),
+                                                     arcname=os.path.relpath(relative_file, item))
+                    info.compress_type = zipfile.ZIP_DEFLATED
+
+                    with zf.open(info, 'w') as dst:
+                        for chunk in self.iter_file(relative_file, chunk_size=chunk_size):
+                            dst.write(chunk)
+                            data = buffer.pop()
+                            if data:
+                                yield data
+
+            data = buffer.pop()
+            if data:
+                yield data
+
+        # Central directory is written when the archive is closed
+        yield buffer.pop()
 
     def walk(self):
         """Walk through the files, and directories of the collection recursively."""
@@ -0,0 +1,92 @@
+"""
+********************************************************************************
+* Name: job_database.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from tethysext.atcore.services.engine_registry import engine_registry
+from tethysext.atcore.utilities import import_from_string
+
+__all__ = ['JOB_ENGINE_KWARGS', 'get_job_engine', 'get_job_session', 'get_statuses_by_id', 'update_status_by_id']
+
+#: Default engine arguments for job scripts. Connections are closed as soon as they are released rather than held
+#: in a pool for the life of the job, which keeps many concurrent jobs from exhausting the connections of the
+#: database and works with transaction-pooling proxies such as PgBouncer.
+JOB_ENGINE_KWARGS = {
+    'poolclass': NullPool,
+}
+
+
+def _get_model(model):
+    return import_from_string(model) if isinstance(model, str) else model
+
+
+def get_job_engine(db_url, engine_kwargs=None):
+    """
+    Get the engine for a database from a job script. Engines are shared by all callers in the process.
+
+    Args:
+        db_url(str): SQLAlchemy url connection string.
+        engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method. Override JOB_ENGINE_KWARGS.
+
+    Returns:
+        sqlalchemy.engine.Engine: shared engine.
+    """
+    kwargs = dict(JOB_ENGINE_KWARGS)
+    kwargs.update(engine_kwargs or {})
+    return engine_registry.get_engine(db_url, kwargs)
+
+
+def get_job_session(db_url, engine_kwargs=None):
+    """
+    Get a new session for a database from a job script. No connection is opened until the session is first used.
+
+    Args:
+        db_url(str): SQLAlchemy url connection string.
+        engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method. Override JOB_ENGINE_KWARGS.
+
+    Returns:
+        sqlalchemy.orm.Session: new session.
+    """
+    return sessionmaker(bind=get_job_engine(db_url, engine_kwargs))()
+
+
+def get_statuses_by_id(db_url, model, ids, engine_kwargs=None):
+    """
+    Get the status dictionaries of the given objects reading only the status column.
+
+    Args:
+        db_url(str): SQLAlchemy url connection string.
+        model(StatusMixin or str): mapped class with the StatusMixin or dot-path to it, imported on first use.
+        ids(list): primary keys of the objects.
+        engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method. Override JOB_ENGINE_KWARGS.
+
+    Returns:
+        dict: status dictionary keyed by primary key of each object found.
+    """
+    with get_job_engine(db_url, engine_kwargs).connect() as connection:
+        return _get_model(model).get_statuses_by_id(connection, ids)
+
+
+def update_status_by_id(db_url, model, ids, key, status, engine_kwargs=None):
+    """
+    Set status for given key of the given objects in a single short transaction without loading them.
+
+    Args:
+        db_url(str): SQLAlchemy url connection string.
+        model(StatusMixin or str): mapped class with the StatusMixin or dot-path to it, imported on first use.
+        ids(list): primary keys of the objects.
+        key(str): status key.
+        status(str): one of the valid statuses.
+        engine_kwargs(dict): arguments passed to SQLAlchemy create_engine method. Override JOB_ENGINE_KWARGS.
+
+    Returns:
+        dict: new value of the status column keyed by primary key of each object updated.
+    """
+    with get_job_engine(db_url, engine_kwargs).begin() as connection:
+        return _get_model(model).update_status_by_id(connection, ids, key, status)
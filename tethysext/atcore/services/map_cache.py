@@ -0,0 +1,308 @@
+"""
+********************************************************************************
+* Name: map_cache.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+from tethys_gizmos.gizmo_options.base import SecondaryGizmoOptions, TethysGizmoOptions
+
+
+def _restore_gizmo_options(value):
+    """
+    Restore the attribute access of unpickled gizmo options, which store their attributes in the dictionary itself.
+    """
+    if isinstance(value, (TethysGizmoOptions, SecondaryGizmoOptions)):
+        value.__dict__ = value
+
+    if isinstance(value, dict):
+        for item in value.values():
+            _restore_gizmo_options(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _restore_gizmo_options(item)
+
+    return value
+
+
+def dumps(value):
+    """
+    Serialize a value for a map cache.
+
+    Args:
+        value: the value (e.g.: MapView, extent and layer groups).
+
+    Returns:
+        bytes: the serialized value.
+    """
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data):
+    """
+    Deserialize a value from a map cache. Every call returns a new copy that can be modified by the caller.
+
+    Args:
+        data(bytes): the serialized value.
+
+    Returns:
+        the value.
+    """
+    return _restore_gizmo_options(pickle.loads(data))
+
+
+class MapCacheBackend(object):
+    """
+    Base class for the backends of the map cache. Values are stored serialized.
+    """
+    __metaclass__ = ABCMeta
+
+    DEFAULT_TIMEOUT = 3600
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Constructor.
+
+        Args:
+            timeout(int): seconds values are kept. None to keep them until they are evicted.
+        """
+        self.timeout = timeout
+
+    def get(self, key, default=None):
+        """
+        Get a value.
+
+        Args:
+            key(str): the key.
+            default: value returned if the key is not in the cache.
+
+        Returns:
+            the value.
+        """
+        data = self.get_raw(key)
+        return default if data is None else loads(data)
+
+    def set(self, key, value):
+        """
+        Set a value.
+
+        Args:
+            key(str): the key.
+            value: the value.
+        """
+        self.set_raw(key, dumps(value))
+
+    @abstractmethod
+    def get_raw(self, key):
+        """
+        Get a serialized value.
+
+        Args:
+            key(str): the key.
+
+        Returns:
+            bytes: the serialized value or None if the key is not in the cache or has expired.
+        """
+
+    @abstractmethod
+    def set_raw(self, key, data):
+        """
+        Set a serialized value.
+
+        Args:
+            key(str): the key.
+            data(bytes): the serialized value.
+        """
+
+    @abstractmethod
+    def delete(self, key):
+        """
+        Delete a value. Keys that are not in the cache are ignored.
+
+        Args:
+            key(str): the key.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Delete all values.
+        """
+
+
+class LocalMapCache(MapCacheBackend):
+    """
+    Least recently used cache in the memory of the process, bounded by the number of values and optionally by their total size.
+    """  # noqa: E501
+    DEFAULT_MAX_SIZE = 128
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, timeout=MapCacheBackend.DEFAULT_TIMEOUT, max_bytes=None):
+        """
+        Constructor.
+
+        Args:
+            max_size(int): maximum number of values kept.
+            timeout(int): seconds values are kept. None to keep them until they are evicted.
+            max_bytes(int): maximum total size of the serialized values kept, in bytes. None for no limit.
+        """
+        super().__init__(timeout=timeout)
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+        self._nbytes = 0
+
+    def get_raw(self, key):
+        with self._lock:
+            if key not in self._values:
+                return None
+
+            expires, data = self._values[key]
+
+            if expires is not None and expires < time.monotonic():
+                del self._values[key]
+                self._nbytes -= len(data)
+                return None
+
+            self._values.move_to_end(key)
+            return data
+
+    def set_raw(self, key, data):
+        expires = time.monotonic() + self.timeout if self.timeout is not None else None
+
+        with self._lock:
+            if key in self._values:
+                self._nbytes -= len(self._values[key][1])
+
+            self._values[key] = (expires, data)
+            self._values.move_to_end(key)
+            self._nbytes += len(data)
+
+            while len(self._values) > self.max_size or \
+                    (self.max_bytes is not None and self._nbytes > self.max_bytes and self._values):
+                _, (_, evicted) = self._values.popitem(last=False)
+                self._nbytes -= len(evicted)
+
+    def delete(self, key):
+        with self._lock:
+            value = self._values.pop(key, None)
+
+            if value is not None:
+                self._nbytes -= len(value[1])
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._nbytes = 0
+
+
+class FileMapCache(MapCacheBackend):
+    """
+    Cache in files of a directory, shared by the processes of the server.
+    """
+
+    def __init__(self, directory, timeout=MapCacheBackend.DEFAULT_TIMEOUT):
+        """
+        Constructor.
+
+        Args:
+            directory(str): path to the directory of the files. Created if it doesn't exist.
+            timeout(int): seconds values are kept. None to keep them until they are deleted.
+        """
+        super().__init__(timeout=timeout)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+    def get_raw(self, key):
+        path = self._get_path(key)
+
+        try:
+            if self.timeout is not None and os.path.getmtime(path) + self.timeout < time.time():
+                return None
+
+            with open(path, 'rb') as f:
+                return f.read()
+
+        except OSError:
+            return None
+
+    def set_raw(self, key, data):
+        # Write to a temporary file and rename it, so other processes never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._get_path(key))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.pickle'):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+
+class DjangoMapCache(MapCacheBackend):
+    """
+    Cache in one of the caches configured in the CACHES setting of Django (e.g.: memcached or redis).
+    """
+
+    def __init__(self, alias='default', timeout=MapCacheBackend.DEFAULT_TIMEOUT, key_prefix='atcore_map'):
+        """
+        Constructor.
+
+        Args:
+            alias(str): name of the cache in the CACHES setting.
+            timeout(int): seconds values are kept. None to keep them until they are evicted.
+            key_prefix(str): prefix of the keys of the values.
+        """
+        super().__init__(timeout=timeout)
+        self.alias = alias
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def _get_key(self, key):
+        # Hashed to keep keys valid for memcached. The generation changes when the cache is cleared.
+        generation = self.cache.get_or_set('{}:generation'.format(self.key_prefix), time.time_ns, timeout=None)
+        return '{}:{}:{}'.format(self.key_prefix, generation, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get_raw(self, key):
+        return self.cache.get(self._get_key(key))
+
+    def set_raw(self, key, data):
+        self.cache.set(self._get_key(key), data, timeout=self.timeout)
+
+    def delete(self, key):
+        self.cache.delete(self._get_key(key))
+
+    def clear(self):
+        # Only values with the prefix are cleared by changing the generation, the old values expire on their own
+        self.cache.set('{}:generation'.format(self.key_prefix), time.time_ns(), timeout=None)
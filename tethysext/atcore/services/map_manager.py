@@ -7,6 +7,7 @@
 ********************************************************************************
 """
 import copy
+import hashlib
 import json
 from abc import ABCMeta, abstractmethod
 from tethys_gizmos.gizmo_options import MVView, MVLayer
@@ -72,6 +73,13 @@ class MapManagerBase(object):
 
     _DEFAULT_POPUP_EXCLUDED_PROPERTIES = ['id', 'type', 'layer_name']
 
+    #: Backend of the cross-request cache of composed maps and extents (see services.map_cache). None to disable.
+    map_cache = None
+    #: Increment to invalidate the cached maps when compose_map or get_map_extent change.
+    map_cache_version = 1
+    #: GeoJSON layers with more features are served as vector tiles when a vector tile url is given.
+    VECTOR_TILE_FEATURE_THRESHOLD = 5000
+
     def __init__(self, spatial_manager, resource):
         self.spatial_manager = spatial_manager
         self.resource = resource
@@ -81,17 +89,30 @@ class MapManagerBase(object):
     @property
     def map_extent(self):
         if not self._map_extent:
-            _, extent = self.get_map_extent()
-            self._map_extent = extent
+            self._load_map_extent()
         return self._map_extent
 
     @property
     def default_view(self):
         if not self._default_view:
-            view, _ = self.get_map_extent()
-            self._default_view = view
+            self._load_map_extent()
         return self._default_view
 
+    def _load_map_extent(self):
+        """
+        Load the default view and extent, from the map cache if enabled.
+        """
+        key = self.get_map_cache_key('map_extent') if self.map_cache is not None else None
+        view_extent = self.map_cache.get(key) if key else None
+
+        if view_extent is None:
+            view_extent = self.get_map_extent()
+
+            if key:
+                self.map_cache.set(key, view_extent)
+
+        self._default_view, self._map_extent = view_extent
+
     @abstractmethod
     def compose_map(self, request, *args, **kwargs):
         """
@@ -119,6 +140,108 @@ class MapManagerBase(object):
             those fields here has no effect.
         """
 
+    def get_composed_map(self, *args, **kwargs):
+        """
+        Get the result of compose_map from the map cache, composing and caching it if it is not cached. Takes the same arguments as compose_map. The map is recomposed when the resource or its attributes change, when invalidate_map_cache is called or when map_cache_version is incremented.
+
+        Returns:
+            tuple: A 3-tuple of ``(MapView, 4-list<float>, list<dict>)``. See compose_map.
+        """  # noqa: E501
+        if self.map_cache is None:
+            return self.compose_map(*args, **kwargs)
+
+        key = self.get_map_cache_key('compose_map', *args, **kwargs)
+        composed = self.map_cache.get(key) if key else None
+
+        if composed is None:
+            composed = self.compose_map(*args, **kwargs)
+
+            if key:
+                # Serialized, so changes made by the caller to the map view and layer groups are not cached
+                self.map_cache.set(key, composed)
+
+        return composed
+
+    def get_map_cache_key(self, name, *args, request=None, resource_id=None, scenario_id=None, **kwargs):
+        """
+        Get the key of a value in the map cache. Override to add values the cached value depends on.
+
+        Args:
+            name(str): name of the value (e.g.: compose_map).
+            request(HttpRequest): A Django request object.
+            resource_id(str): id of the resource of the map. Defaults to the id of the resource of the map manager.
+            scenario_id(int): id of the scenario of the map.
+            *args: other arguments of compose_map.
+            **kwargs: other keyword arguments of compose_map.
+
+        Returns:
+            str: the key or None to not cache the value.
+        """
+        if resource_id is None and self.resource is not None:
+            resource_id = self.resource.id
+
+        return ':'.join(str(part) for part in (
+            '{}.{}'.format(self.__class__.__module__, self.__class__.__qualname__),
+            self.map_cache_version,
+            name,
+            resource_id,
+            scenario_id,
+            self.get_resource_change_token(resource_id),
+            self.get_map_cache_variant(request),
+            hashlib.sha1(repr((args, sorted(kwargs.items()))).encode('utf-8')).hexdigest(),
+        ))
+
+    def get_map_cache_variant(self, request):
+        """
+        Get a value that distinguishes the maps composed for different requests of the same resource and scenario. Override if compose_map depends on the request (e.g.: the permissions of the user).
+
+        Args:
+            request(HttpRequest): A Django request object.
+
+        Returns:
+            str: the variant.
+        """  # noqa: E501
+        return ''
+
+    def get_resource_change_token(self, resource_id):
+        """
+        Get a token that changes when the resource or its attributes change or invalidate_map_cache is called.
+
+        Args:
+            resource_id(str): id of the resource.
+
+        Returns:
+            str: the token.
+        """
+        parts = [self.map_cache.get(self._get_map_cache_generation_key(resource_id), 0)]
+        resource = self.resource
+
+        if resource is not None and str(resource.id) == str(resource_id):
+            parts.extend([
+                resource.name, resource.type, resource.status, resource.public,
+                json.dumps(resource.attributes, sort_keys=True, default=str)
+            ])
+
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _get_map_cache_generation_key(resource_id):
+        return 'generation:{}'.format(resource_id)
+
+    @classmethod
+    def invalidate_map_cache(cls, resource_id):
+        """
+        Invalidate the cached maps of a resource, for changes not made to the resource itself (e.g.: the data of its layers). Call on the class with the map_cache.
+
+        Args:
+            resource_id(str): id of the resource.
+        """  # noqa: E501
+        if cls.map_cache is None:
+            return
+
+        key = cls._get_map_cache_generation_key(resource_id)
+        cls.map_cache.set(key, cls.map_cache.get(key, 0) + 1)
+
     def get_cesium_token(self):
         """
         Get the cesium token for Cesium Views
@@ -150,7 +273,8 @@ class MapManagerBase(object):
 
     def build_geojson_layer(self, geojson, layer_name, layer_title, layer_variable, layer_id='', visible=True,
                             public=True, selectable=False, plottable=False, has_action=False, extent=None,
-                            popup_title=None, excluded_properties=None, show_download=False, label_options=None):
+                            popup_title=None, excluded_properties=None, show_download=False, label_options=None,
+                            vector_tile_url=None):
         """
         Build an MVLayer object with supplied arguments.
         Args:
@@ -170,10 +294,29 @@ class MapManagerBase(object):
             show_download(boolean): enable download geojson as shapefile. Default is False.
             label_options(dict): Dictionary for labeling.  Possibilities include label_property (the name of the
                 property to label), font (label font), text_align (alignment of the label), offset_x (x offset). Optional.
+            vector_tile_url(str): XYZ url template of vector tiles of the layer (e.g.: /my-map/?method=get-vector-tile&z={z}&x={x}&y={y}). The layer is served as vector tiles instead of inline GeoJSON if it has more than VECTOR_TILE_FEATURE_THRESHOLD features. Optional.
 
         Returns:
             MVLayer: the MVLayer object.
         """  # noqa: E501
+        if vector_tile_url and len(geojson['features']) > self.VECTOR_TILE_FEATURE_THRESHOLD:
+            return self.build_vector_tile_layer(
+                endpoint=vector_tile_url,
+                layer_name=layer_name,
+                layer_title=layer_title,
+                layer_variable=layer_variable,
+                layer_id=layer_id,
+                visible=visible,
+                public=public,
+                selectable=selectable,
+                plottable=plottable,
+                has_action=has_action,
+                extent=extent,
+                popup_title=popup_title,
+                excluded_properties=excluded_properties,
+                label_options=label_options,
+            )
+
         # Define default styles for layers
         style_map = self.get_vector_style_map()
 
@@ -203,6 +346,54 @@ class MapManagerBase(object):
 
         return mv_layer
 
+    def build_vector_tile_layer(self, endpoint, layer_name, layer_title, layer_variable, layer_id='', visible=True,
+                                public=True, selectable=False, plottable=False, has_action=False, extent=None,
+                                popup_title=None, excluded_properties=None, label_options=None):
+        """
+        Build an MVLayer object for a layer of Mapbox Vector Tiles, so only the features in view are sent to the browser at the resolution of the view. The layer is built as an empty GeoJSON layer that is replaced with a vector tile layer by the map view.
+        Args:
+            endpoint(str): XYZ url template of the tiles (e.g.: /my-map/?method=get-vector-tile&z={z}&x={x}&y={y}).
+            layer_name(str): Name of the layer in the tiles.
+            layer_title(str): Title of MVLayer (e.g.: Model Boundaries).
+            layer_variable(str): Variable type of the layer (e.g.: model_boundaries).
+            layer_id(UUID, int, str): layer_id for non geoserver layer where layer_name may not be unique.
+            visible(bool): Layer is visible when True. Defaults to True.
+            public(bool): Layer is publicly accessible when app is running in Open Portal Mode if True. Defaults to True.
+            selectable(bool): Enable feature selection. Defaults to False.
+            plottable(bool): Enable "Plot" button on pop-up properties. Defaults to False.
+            has_action(bool): Enable "Action" button on pop-up properties. Defaults to False.
+            extent(list): Extent for the layer. Optional.
+            popup_title(str): Title to display on feature popups. Defaults to layer title.
+            excluded_properties(list): List of properties to exclude from feature popups.
+            label_options(dict): Dictionary for labeling.  Possibilities include label_property (the name of the
+                property to label), font (label font), text_align (alignment of the label), offset_x (x offset). Optional.
+
+        Returns:
+            MVLayer: the MVLayer object.
+        """  # noqa: E501
+        mv_layer = self._build_mv_layer(
+            layer_source='GeoJSON',
+            layer_id=layer_id,
+            layer_name=layer_name,
+            layer_title=layer_title,
+            layer_variable=layer_variable,
+            options={'type': 'FeatureCollection', 'features': []},
+            extent=extent,
+            visible=visible,
+            public=public,
+            selectable=selectable,
+            plottable=plottable,
+            has_action=has_action,
+            popup_title=popup_title,
+            excluded_properties=excluded_properties,
+            style_map=self.get_vector_style_map(),
+            label_options=label_options,
+        )
+
+        mv_layer.data['vector_tile_url'] = endpoint
+
+        return mv_layer
+
     def build_cesium_layer(self, cesium_type, cesium_json, layer_name, layer_title, layer_variable, layer_id='',
                            visible=True, public=True, selectable=False, plottable=False, has_action=False, extent=None,
                            popup_title=None, excluded_properties=None, show_download=False):
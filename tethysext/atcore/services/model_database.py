@@ -6,16 +6,31 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
-import operator
+import logging
 
+from tethysext.atcore.services import template_database
+from tethysext.atcore.services.cluster_stats import cluster_stats_cache, least_count
 from tethysext.atcore.services.model_database_connection import ModelDatabaseConnection
 from tethysext.atcore.services.model_database_base import ModelDatabaseBase
 
+log = logging.getLogger(f'tethys.{__name__}')
+
 
 class ModelDatabase(ModelDatabaseBase):
     """
     Manages the creation of databases for models and will load-balance between multiple database connections if defined by the app.  # noqa: E501
     """
+    #: Selects the cluster to create new databases on from a list of ClusterStats (see services.cluster_stats). Override with a function or staticmethod(function), it is never bound to the instance.  # noqa: E501
+    cluster_selection_strategy = least_count
+    #: Cache of the statistics of the clusters.
+    cluster_stats_cache = cluster_stats_cache
+    #: Provision new databases by copying a template database built once per schema on each cluster (see initialize).
+    use_template_database = False
+    #: Increment to rebuild the template databases when pre_initialize or post_initialize change. Templates of previous
+    #: versions and their warm pools are dropped when the new template is created on a cluster.
+    template_version = 1
+    #: Number of copies of each template database to keep ready on each cluster. 0 to disable the warm pool.
+    warm_pool_size = 0
 
     def get_name(self):
         """
@@ -58,7 +73,6 @@ class ModelDatabase(ModelDatabaseBase):
             size = result.fetchone().size
 
         result.close()
-        engine.dispose()
 
         return size
 
@@ -110,17 +124,21 @@ class ModelDatabase(ModelDatabaseBase):
         """
         return self.model_db_connection.get_session_maker()
 
-    def initialize(self, declarative_bases=(), spatial=False):
+    def initialize(self, declarative_bases=(), spatial=False, use_template=None):
         """
         Creates a new model database if it doesn't exist and initializes it with the data models passed in (if any).
 
         Args:
             declarative_bases(tuple): one or more SQLAlchemy declarative base classes used to initialize tables.
             spatial(bool): enable postgis extension on model database if True.
+            use_template(bool): copy a template database initialized with the same declarative bases instead of creating the tables and running pre_initialize and post_initialize. The template is created from the first database initialized on each cluster. Defaults to use_template_database.
 
         Returns:
             database_id of the model database
-        """
+        """  # noqa: E501
+        if use_template is None:
+            use_template = self.use_template_database
+
         # Get database cluster name to create new database on.
         cluster_connection_name = self._get_cluster_connection_name_for_new_database()
 
@@ -135,6 +153,13 @@ class ModelDatabase(ModelDatabaseBase):
         if not result:
             return False
 
+        self.cluster_stats_cache.record_database_created(self._app, cluster_connection_name)
+
+        template_name = self.get_template_name(declarative_bases, spatial) if use_template else None
+
+        if template_name and self._copy_template(cluster_connection_name, template_name):
+            return self.database_id
+
         engine = self._app.get_persistent_store_database(self.database_id)
 
         self.pre_initialize(engine)
@@ -146,61 +171,133 @@ class ModelDatabase(ModelDatabaseBase):
 
         engine.dispose()
 
+        if template_name:
+            self._create_template(cluster_connection_name, template_name, self.get_template_prefix(spatial))
+
         return self.database_id
 
-    def delete(self):
+    def get_template_name(self, declarative_bases=(), spatial=False):
         """
-        Delete the database associated with this model database.
+        Get the name of the template database of the given declarative bases (e.g.: my_app_template_012345_0123456789ab).
+
+        Args:
+            declarative_bases(tuple): one or more SQLAlchemy declarative base classes used to initialize tables.
+            spatial(bool): postgis extension enabled on model database if True.
 
         Returns:
-            bool: True if successfully deleted, otherwise False.
+            str: the name.
+        """  # noqa: E501
+        schema_hash = template_database.get_schema_hash(
+            declarative_bases, spatial, self.template_version,
+            '{}.{}'.format(self.__class__.__module__, self.__class__.__qualname__)
+        )
+        return self.get_template_prefix(spatial) + schema_hash
+
+    def get_template_prefix(self, spatial=False):
         """
-        return self._app.drop_persistent_store(self.database_id)
+        Get the prefix of the names of the template databases of this class of model database, shared by the templates of all versions of its schema (e.g.: my_app_template_012345_).
 
-    def _get_cluster_connection_name_for_new_database(self):
+        Args:
+            spatial(bool): postgis extension enabled on model database if True.
+
+        Returns:
+            str: the prefix.
+        """  # noqa: E501
+        class_hash = template_database.get_schema_hash(
+            (), spatial, '{}.{}'.format(self.__class__.__module__, self.__class__.__qualname__)
+        )
+        return '{}_template_{}_'.format(self._app.package, class_hash[:6])
+
+    def _copy_template(self, cluster_connection_name, template_name):
         """
-        Determine which database to connection to use based on a simple load balancing algorithm: (1) least number of databases and (2) least size if tied on number of database.  # noqa: E501
+        Replace the new, empty database with a copy of the template database, taken from the warm pool if possible.
+
         Returns:
-            Name of connection to use for creation of next database.
+            bool: True if the database was copied, False if the template doesn't exist yet or the copy failed.
         """
-        db_stats = []
-        connection_names = self._app.list_persistent_store_connections()
+        cluster_engine = self._app.get_persistent_store_connection(cluster_connection_name)
+        db_name = self.get_name()
+        dropped = False
 
-        for connection_name in connection_names:
-            count = None
-            size_bytes = None
-            curr_engine = self._app.get_persistent_store_connection(connection_name)
+        try:
+            owner = template_database.get_database_owner(cluster_engine, template_name)
 
-            if not curr_engine:
-                continue
+            if owner is None:
+                return False
 
-            # Get count of all databases: SELECT count(*) FROM pg_database;
-            response = curr_engine.execute(
-                'SELECT count(*) AS count '
-                'FROM pg_database;'
-            )
+            template_database.drop_database(cluster_engine, db_name)
+            dropped = True
 
-            for row in response:
-                count = row.count
+            pool = template_database.WarmDatabasePool(template_name, self.warm_pool_size) \
+                if self.warm_pool_size else None
 
-            # Get total cluster size (pretty): SELECT pg_catalog.pg_size_pretty(sum(pg_catalog.pg_database_size(d.datname))) AS Size FROM pg_catalog.pg_database d  # noqa: E501
-            # Get total cluster size (bytes): SELECT sum(pg_catalog.pg_database_size(d.datname)) AS Size FROM pg_catalog.pg_database d  # noqa: E501
-            response = curr_engine.execute(
-                'SELECT sum(pg_catalog.pg_database_size(d.datname)) AS size '
-                'FROM pg_catalog.pg_database d;'
-            )
+            if not (pool and pool.take(cluster_engine, db_name)):
+                template_database.create_database(cluster_engine, db_name, template=template_name, owner=owner)
 
-            for row in response:
-                size_bytes = row.size
+            if pool:
+                pool.top_up_async(
+                    lambda: self._app.get_persistent_store_connection(cluster_connection_name), owner=owner
+                )
 
-            db_stats.append((connection_name, count, size_bytes))
+            return True
 
-            curr_engine.dispose()
+        except Exception:
+            log.exception('Unable to copy template database "%s", initializing "%s" instead.', template_name, db_name)
 
-        # Logic for which connection here
-        if not db_stats:
-            return None
+            if dropped and not template_database.database_exists(cluster_engine, db_name):
+                template_database.create_database(cluster_engine, db_name, owner=owner)
 
-        db_stats.sort(key=operator.itemgetter(1, 2))
+            return False
+
+        finally:
+            cluster_engine.dispose()
+
+    def _create_template(self, cluster_connection_name, template_name, template_prefix):
+        """
+        Create the template database as a copy of the newly initialized database, then drop the templates of previous versions of the schema and their warm pools.
+        """  # noqa: E501
+        # The database must not have any open connections to be copied
+        self.model_db_connection.registry.dispose(self.db_url)
+        cluster_engine = self._app.get_persistent_store_connection(cluster_connection_name)
+
+        try:
+            template_database.create_database(cluster_engine, template_name, template=self.get_name())
+
+        except Exception:
+            # Created by another process or the database is in use
+            log.warning('Unable to create template database "%s".', template_name)
+
+        else:
+            template_database.drop_stale_templates(cluster_engine, template_prefix, template_name)
+
+        finally:
+            cluster_engine.dispose()
+
+    def delete(self):
+        """
+        Delete the database associated with this model database.
+
+        Returns:
+            bool: True if successfully deleted, otherwise False.
+        """
+        # The database can't be dropped while the pooled connections to it are open
+        self.model_db_connection.registry.dispose(self.db_url)
+        return self._app.drop_persistent_store(self.database_id)
+
+    def _get_cluster_connection_name_for_new_database(self):
+        """
+        Determine which database connection to use with the cluster_selection_strategy, by default: (1) least number of databases and (2) least size if tied on number of database. The statistics of the clusters are gathered concurrently and cached.  # noqa: E501
+        Returns:
+            Name of connection to use for creation of next database.
+        """
+        connection_names = self._app.list_persistent_store_connections()
+        db_stats = self.cluster_stats_cache.get_stats(self._app, connection_names)
+
+        # Logic for which connection here. Looked up on the class, so functions aren't bound as methods
+        strategy = vars(self).get('cluster_selection_strategy') or getattr(type(self), 'cluster_selection_strategy')
+        selected = strategy(db_stats)
+
+        if selected is None:
+            return None
 
-        return db_stats[0][0]
+        return selected.connection_name
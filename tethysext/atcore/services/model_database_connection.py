@@ -8,8 +8,8 @@
 """
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
 
+from tethysext.atcore.services.engine_registry import engine_registry
 from tethysext.atcore.services.model_database_connection_base import ModelDatabaseConnectionBase
 
 
@@ -18,7 +18,7 @@ class ModelDatabaseConnection(ModelDatabaseConnectionBase):
     Represents a Model Database.
     """
 
-    def __init__(self, db_url, db_app_namespace=None, db_engine_kwargs=None):
+    def __init__(self, db_url, db_app_namespace=None, db_engine_kwargs=None, registry=None):
         """
         Constructor
 
@@ -26,7 +26,9 @@ class ModelDatabaseConnection(ModelDatabaseConnectionBase):
             db_url(str): SQLAlchemy url connection string.
             db_app_namespace(str): namespace prepended by persistent store API if applicable.
             db_engine_kwargs(dict): Optional arguments to pass to SQLAlchemy create_engine method.
+            registry(EngineRegistry): registry used to share pooled engines. Defaults to the process-wide registry.
         """
+        self.registry = registry if registry is not None else engine_registry
         self.db_url = db_url
         self.db_url_obj = make_url(self.db_url)
         self.db_name = self.db_url_obj.database
@@ -47,21 +49,25 @@ class ModelDatabaseConnection(ModelDatabaseConnectionBase):
 
     def get_engine(self):
         """
-        Returns an SQLAlchemy engine for the model database.
+        Returns the shared, pooled SQLAlchemy engine for the model database.
         """
-        return create_engine(self.db_url, **self.db_engine_kwargs)
+        return self.registry.get_engine(self.db_url, self.db_engine_kwargs)
 
     def get_session_maker(self):
         """
         Returns an SQLAlchemy session maker for the model database.
         """
-        engine = create_engine(self.db_url, **self.db_engine_kwargs)
-        return sessionmaker(bind=engine)
+        return sessionmaker(bind=self.get_engine())
 
     def get_session(self):
         """
         Returns an SQLAlchemy session for the model database.
         """
-        engine = create_engine(self.db_url, **self.db_engine_kwargs)
-        make_session = sessionmaker(bind=engine)
+        make_session = self.get_session_maker()
         return make_session()
+
+    def get_pool_stats(self):
+        """
+        Returns connection pool statistics for the model database engine(s).
+        """
+        return self.registry.get_pool_stats(self.db_url)
@@ -7,15 +7,32 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import threading
 from abc import abstractmethod
 from tethysext.atcore.services.exceptions import UnitsNotFound, UnknownUnits
 from tethysext.atcore.services.base_spatial_manager import BaseSpatialManager
 
+#: Process-wide cache of projection strings keyed by (database, srid, format). Spatial managers are created for every
+#: request. Strings read from the spatial_ref_sys table of a model database are keyed by the name of the database, as
+#: apps may insert custom SRIDs, and strings resolved from EPSG codes with pyproj by None.
+_projection_cache = {}
+_projection_cache_lock = threading.Lock()
+
+
+def _import_pyproj():
+    try:
+        import pyproj
+    except ImportError:
+        return None
+    return pyproj
+
 
 class ModelDBSpatialManager(BaseSpatialManager):
     """
     Class for Spatial Managers using a postgres database.
     """
+    #: Resolve projection strings with pyproj, if it is installed, instead of querying spatial_ref_sys.
+    resolve_projections_with_pyproj = False
 
     @abstractmethod
     def get_extent_for_project(self, model_db):
@@ -27,6 +44,101 @@ class ModelDBSpatialManager(BaseSpatialManager):
             4-list: Extent bounding box (e.g.: [minx, miny, maxx, maxy] ).
         """
 
+    @classmethod
+    def clear_projection_cache(cls, model_db=None):
+        """
+        Clear the process-wide cache of projection strings. Apps that insert or update rows of the spatial_ref_sys table of a model database must clear the cache of the database, so the new projection strings are read from the table. SRIDs missing from the table are never cached.
+
+        Args:
+            model_db(ModelDatabase): only clear the projection strings read from this model database if given.
+        """  # noqa: E501
+        with _projection_cache_lock:
+            if model_db is None:
+                _projection_cache.clear()
+                return
+
+            database = cls._get_database_key(model_db)
+
+            for key in [k for k in _projection_cache if k[0] == database]:
+                del _projection_cache[key]
+
+    @staticmethod
+    def _get_database_key(model_db):
+        return model_db.get_name()
+
+    @staticmethod
+    def _get_cached_projection(database, srid, proj_format):
+        return _projection_cache.get((database, int(srid), proj_format), None)
+
+    @staticmethod
+    def _cache_projection(database, srid, proj_format, projection_string):
+        # Missing SRIDs are not cached, they may be added to spatial_ref_sys later
+        if projection_string:
+            with _projection_cache_lock:
+                _projection_cache[(database, int(srid), proj_format)] = projection_string
+
+    def _get_projection(self, model_db, srid, proj_format):
+        """
+        Get a projection string from the cache of the model database or resolve it with pyproj if enabled.
+
+        Returns:
+            str: projection string or None if it has not been read from the database and could not be resolved.
+        """
+        return self._get_cached_projection(self._get_database_key(model_db), srid, proj_format) or \
+            self._resolve_projection(srid, proj_format)
+
+    def _resolve_projection(self, srid, proj_format):
+        """
+        Resolve the projection string with pyproj if enabled and installed.
+
+        Returns:
+            str: projection string or None if it could not be resolved.
+        """
+        if not self.resolve_projections_with_pyproj:
+            return None
+
+        # EPSG codes mean the same projection in every database
+        projection_string = self._get_cached_projection(None, srid, proj_format)
+
+        if projection_string:
+            return projection_string
+
+        pyproj = _import_pyproj()
+
+        if pyproj is None:
+            return None
+
+        try:
+            crs = pyproj.CRS.from_epsg(int(srid))
+        except pyproj.exceptions.CRSError:
+            return None
+
+        projection_string = crs.to_wkt(version='WKT1_GDAL') if proj_format == self.PRO_WKT else crs.to_proj4()
+        self._cache_projection(None, srid, proj_format, projection_string)
+        return projection_string
+
+    def _get_units(self, proj4text, srid):
+        """
+        Parse the units from a proj4 string.
+        e.g.: +proj=utm +zone=21 +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs
+        """
+        units = ''
+
+        for part in (proj4text or '').split('+'):
+            spart = part.strip()
+            if 'units' in spart:
+                units = spart.replace('units=', '')
+
+        if not units:
+            raise UnitsNotFound('Unable to determine units of project with srid: {}'.format(srid))
+
+        if 'ft' in units:
+            return self.U_IMPERIAL
+        elif 'm' in units:
+            return self.U_METRIC
+
+        raise UnknownUnits('"{}" is an unrecognized form of units. From srid: {}'.format(units, srid))
+
     def get_projection_units(self, model_db, srid):
         """
         Get units of the given projection.
@@ -38,40 +150,19 @@ class ModelDBSpatialManager(BaseSpatialManager):
         Returns:
             str: SpatialManager.U_METRIC or SpatialManager.U_IMPERIAL
         """
-        if srid not in self._projection_units:
-            db_engine = model_db.get_engine()
-            try:
-                sql = "SELECT srid, proj4text FROM spatial_ref_sys WHERE srid = {}".format(srid)
-                ret = db_engine.execute(sql)
-
-                # Parse proj4text to get units
-                # e.g.: +proj=utm +zone=21 +ellps=GRS80 +towgs84=0,0,0,0,0,0,0 +units=m +no_defs
-                proj4text = ''
-                units = ''
+        proj4text = self._get_projection(model_db, srid, self.PRO_PROJ4)
 
-                for row in ret:
-                    proj4text = row.proj4text
-            finally:
-                db_engine.dispose()
-
-            proj4parts = proj4text.split('+')
-
-            for part in proj4parts:
-                spart = part.strip()
-                if 'units' in spart:
-                    units = spart.replace('units=', '')
+        if proj4text is None:
+            db_engine = model_db.get_engine()
+            sql = "SELECT srid, proj4text FROM spatial_ref_sys WHERE srid = {}".format(int(srid))
+            proj4text = ''
 
-            if not units:
-                raise UnitsNotFound('Unable to determine units of project with srid: {}'.format(srid))
+            for row in db_engine.execute(sql):
+                proj4text = row.proj4text
 
-            if 'ft' in units:
-                self._projection_units[srid] = self.U_IMPERIAL
-            elif 'm' in units:
-                self._projection_units[srid] = self.U_METRIC
-            else:
-                raise UnknownUnits('"{}" is an unrecognized form of units. From srid: {}'.format(units, srid))
+            self._cache_projection(self._get_database_key(model_db), srid, self.PRO_PROJ4, proj4text)
 
-        return self._projection_units[srid]
+        return self._get_units(proj4text, srid)
 
     def get_projection_string(self, model_db, srid, proj_format=''):
         """
@@ -92,28 +183,68 @@ class ModelDBSpatialManager(BaseSpatialManager):
             raise ValueError('Invalid projection format given: {}. Use either SpatialManager.PRO_WKT or '
                              'SpatialManager.PRO_PROJ4.'.format(proj_format))
 
-        if srid not in self._projection_string or proj_format not in self._projection_string[srid]:
+        projection_string = self._get_projection(model_db, srid, proj_format)
+
+        if projection_string is None:
             db_engine = model_db.get_engine()
-            try:
-                if proj_format is self.PRO_WKT:
-                    sql = "SELECT srtext AS proj_string FROM spatial_ref_sys WHERE srid = {}".format(srid)
-                else:
-                    sql = "SELECT proj4text AS proj_string FROM spatial_ref_sys WHERE srid = {}".format(srid)
+            sql = "SELECT {} AS proj_string FROM spatial_ref_sys WHERE srid = {}".format(proj_format, int(srid))
+            projection_string = ''
+
+            for row in db_engine.execute(sql):
+                projection_string = row.proj_string
+
+            self._cache_projection(self._get_database_key(model_db), srid, proj_format, projection_string)
 
-                ret = db_engine.execute(sql)
-                projection_string = ''
+        return projection_string
 
-                for row in ret:
-                    projection_string = row.proj_string
-            finally:
-                db_engine.dispose()
+    def get_projection_info(self, model_db, srids):
+        """
+        Get the projection strings and units of several projections, querying the database at most once.
+
+        Args:
+            model_db(ModelDatabase): the object representing the model database.
+            srids(list<int>): EPSG spatial reference identifiers.
+
+        Returns:
+            dict: dictionary with the SpatialManager.PRO_WKT and SpatialManager.PRO_PROJ4 strings and the units (SpatialManager.U_METRIC, SpatialManager.U_IMPERIAL or None if unknown) of each projection keyed by srid. Projections that don't exist are omitted.
+        """  # noqa: E501
+        formats = (self.PRO_WKT, self.PRO_PROJ4)
+        srids = {int(srid) for srid in srids}
+        projections = {}
+
+        for srid in srids:
+            projection = {f: self._get_projection(model_db, srid, f) for f in formats}
+            projections[srid] = projection
+
+        missing = sorted(srid for srid, projection in projections.items() if not all(projection.values()))
 
-            if srid not in self._projection_string:
-                self._projection_string[srid] = {}
+        if missing:
+            db_engine = model_db.get_engine()
+            sql = "SELECT srid, srtext, proj4text FROM spatial_ref_sys WHERE srid IN ({})".format(
+                ', '.join(str(srid) for srid in missing)
+            )
+
+            for row in db_engine.execute(sql):
+                for proj_format in formats:
+                    if not projections[row.srid][proj_format]:
+                        projections[row.srid][proj_format] = getattr(row, proj_format)
+                        self._cache_projection(self._get_database_key(model_db), row.srid, proj_format,
+                                               getattr(row, proj_format))
+
+        info = {}
+
+        for srid, projection in projections.items():
+            if not any(projection.values()):
+                continue
+
+            try:
+                units = self._get_units(projection[self.PRO_PROJ4], srid)
+            except (UnitsNotFound, UnknownUnits):
+                units = None
 
-            self._projection_string[srid].update({proj_format: projection_string})
+            info[srid] = dict(projection, units=units)
 
-        return self._projection_string[srid][proj_format]
+        return info
 
     def link_geoserver_to_db(self, model_db, reload_config=True):
         """
@@ -8,27 +8,32 @@
 """
 
 
-def paginate(objects, results_per_page, page, result_name, sort_by_raw=None, sort_reversed=False):
+def paginate(objects, results_per_page, page, result_name, sort_by_raw=None, sort_reversed=False, num_results=None):
     """
     Paginate given list of objects.
     Args:
-        objects(list): list of objects to paginate.
+        objects(list): list of objects to paginate or the objects of the current page only if num_results is given.
         results_per_page(int): maximum number of results to show on a page.
         page(int): page to view.
         result_name(str): name to use when referencing the objects.
         sort_by_raw(str): sort field if applicable.
         sort_reversed(boo): indicates whether the sort is reversed or not.
+        num_results(int): total number of objects if objects has already been limited to the current page.
 
     Returns:
         list, dict: list of objects for current page, metadata form paginantion page.
     """
     results_per_page_options = [5, 10, 20, 40, 80, 120]
-    num_objects = len(objects)
+    num_objects = len(objects) if num_results is None else num_results
     if num_objects <= results_per_page:
         page = 1
     min_index = (page - 1) * results_per_page
     max_index = min(page * results_per_page, num_objects)
-    paginated_objects = objects[min_index:max_index]
+
+    if num_results is None:
+        paginated_objects = objects[min_index:max_index]
+    else:
+        paginated_objects = objects
     enable_next_button = max_index < num_objects
     enable_previous_button = min_index > 0
 
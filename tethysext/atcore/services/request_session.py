@@ -0,0 +1,148 @@
+"""
+********************************************************************************
+* Name: request_session.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+from contextlib import contextmanager
+
+__all__ = ['is_request_scoped', 'request_scope', 'request_session', 'get_request_session', 'release_request_session',
+           'close_request_sessions', 'RequestSessionMiddleware']
+
+_SESSIONS_ATTR = '_atcore_sessions'
+
+
+def _get_sessions(request):
+    return request.__dict__.get(_SESSIONS_ATTR, None)
+
+
+def _get_session_key(make_session):
+    """
+    Get the key of the sessions made by the given sessionmaker. Sessionmakers bound to the same database share a key, because a new sessionmaker is created every time the persistent store is retrieved from the app.
+    """  # noqa: E501
+    kw = getattr(make_session, 'kw', None)
+    bind = kw.get('bind', None) if kw is not None else None
+
+    if bind is None:
+        return make_session
+
+    return str(getattr(bind, 'engine', bind).url)
+
+
+def is_request_scoped(request):
+    """
+    Check if database sessions are shared among everything handling the given request.
+
+    Args:
+        request(HttpRequest): The request.
+
+    Returns:
+        bool: True if the request is scoped.
+    """
+    return _get_sessions(request) is not None
+
+
+@contextmanager
+def request_scope(request):
+    """
+    Share one database session per database among the decorators, controllers and methods handling the request until the block exits. Nested scopes use the sessions of the outermost scope.
+
+    Args:
+        request(HttpRequest): The request.
+    """  # noqa: E501
+    if is_request_scoped(request):
+        yield
+        return
+
+    request.__dict__[_SESSIONS_ATTR] = {}
+
+    try:
+        yield
+    finally:
+        close_request_sessions(request)
+
+
+def get_request_session(request, make_session):
+    """
+    Get the session shared by everything handling the request. A new session is returned if the request is not scoped.
+
+    Args:
+        request(HttpRequest): The request.
+        make_session(sqlalchemy.orm.sessionmaker): sessionmaker used to make the session if one doesn't exist for its database.
+
+    Returns:
+        sqlalchemy.orm.Session: the session.
+    """  # noqa: E501
+    sessions = _get_sessions(request)
+
+    if sessions is None:
+        return make_session()
+
+    key = _get_session_key(make_session)
+
+    if key not in sessions:
+        sessions[key] = make_session()
+
+    return sessions[key]
+
+
+@contextmanager
+def request_session(request, make_session):
+    """
+    Get the session shared by everything handling the request for the duration of the block. The session is closed when the block exits only if the request is not scoped, otherwise it is closed at the end of the scope.
+
+    Args:
+        request(HttpRequest): The request.
+        make_session(sqlalchemy.orm.sessionmaker): sessionmaker used to make the session if one doesn't exist for its database.
+
+    Yields:
+        sqlalchemy.orm.Session: the session.
+    """  # noqa: E501
+    session = get_request_session(request, make_session)
+
+    try:
+        yield session
+    finally:
+        release_request_session(request, session)
+
+
+def release_request_session(request, session):
+    """
+    Release a session returned by get_request_session. The session is closed unless it is shared by the request scope, in which case it is closed at the end of the scope.
+
+    Args:
+        request(HttpRequest): The request.
+        session(sqlalchemy.orm.Session): the session.
+    """  # noqa: E501
+    sessions = _get_sessions(request) or {}
+
+    if not any(session is shared for shared in sessions.values()):
+        session.close()
+
+
+def close_request_sessions(request):
+    """
+    Close the sessions shared by everything handling the request and end the scope.
+
+    Args:
+        request(HttpRequest): The request.
+    """
+    sessions = request.__dict__.pop(_SESSIONS_ATTR, None) or {}
+
+    for session in sessions.values():
+        session.close()
+
+
+class RequestSessionMiddleware:
+    """
+    Django middleware that scopes database sessions to the entire request, so middleware, decorators and controllers outside of the atcore controllers share them too. Add "tethysext.atcore.services.request_session.RequestSessionMiddleware" to the MIDDLEWARE setting.
+    """  # noqa: E501
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope(request):
+            return self.get_response(request)
@@ -3,8 +3,6 @@ import json
 import logging
 import traceback
 from pprint import pprint
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import StatementError, ArgumentError
 from sqlalchemy.orm.exc import NoResultFound
 from django.http import JsonResponse
@@ -12,6 +10,8 @@ from django.utils.functional import wraps
 from django.shortcuts import redirect
 from django.contrib import messages
 from tethysext.atcore.exceptions import ATCoreException
+from tethysext.atcore.services.job_database import get_job_session
+from tethysext.atcore.services.request_session import get_request_session, release_request_session
 from tethysext.atcore.services.resource_workflows.helpers import set_step_status, parse_workflow_step_args
 from tethysext.atcore.utilities import clean_request, import_from_string
 from tethysext.atcore.models.app_users import ResourceWorkflowStep
@@ -35,8 +35,7 @@ def workflow_step_controller(is_rest_controller=False):
 
             try:
                 if manage_session:
-                    make_session = self.get_sessionmaker()
-                    session = make_session()
+                    session = get_request_session(request, self.get_sessionmaker())
 
                 # Assign the resource id if resource given
                 if resource and not resource_id:
@@ -105,7 +104,7 @@ def workflow_step_controller(is_rest_controller=False):
                     return JsonResponse({'success': False, 'error': str(e)})
 
             finally:
-                session and manage_session and session.close()
+                session and manage_session and release_request_session(request, session)
 
         return wraps(controller_func)(_wrapped_controller)
     return decorator
@@ -122,22 +121,18 @@ def workflow_step_job(job_func=None, *, db_engine_kwargs=None):
 
                 # Session vars
                 step = None
-                model_db_engine = None
                 model_db_session = None
                 resource_db_session = None
                 ret_val = None
 
                 try:
                     # Get the resource database session
+                    # Job engines don't pool connections (see JOB_ENGINE_KWARGS) unless db_engine_kwargs says otherwise
                     engine_kwargs = db_engine_kwargs if db_engine_kwargs else {}
-                    resource_db_engine = create_engine(args.resource_db_url, **engine_kwargs)
-                    make_resource_db_session = sessionmaker(bind=resource_db_engine)
-                    resource_db_session = make_resource_db_session()
+                    resource_db_session = get_job_session(args.resource_db_url, engine_kwargs)
 
                     try:
-                        model_db_engine = create_engine(args.model_db_url, **engine_kwargs)
-                        make_model_db_session = sessionmaker(bind=model_db_engine)
-                        model_db_session = make_model_db_session()
+                        model_db_session = get_job_session(args.model_db_url, engine_kwargs)
                     except ArgumentError:
                         sys.stderr.write(repr('invalid model_db_url'))
 
@@ -194,7 +189,7 @@ def workflow_step_job(job_func=None, *, db_engine_kwargs=None):
                             try:
                                 step_cls = type(step)
                                 step_id = step.id
-                                fallback_session = sessionmaker(bind=resource_db_engine)()
+                                fallback_session = get_job_session(args.resource_db_url, engine_kwargs)
                                 try:
                                     fallback_step = fallback_session.query(step_cls).get(step_id)
                                     set_step_status(fallback_session, fallback_step, step.STATUS_FAILED)
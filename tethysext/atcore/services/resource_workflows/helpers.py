@@ -6,7 +6,7 @@ from sqlalchemy.orm import sessionmaker
 
 def set_step_status(resource_db_session, step, status):
     """
-    Sets the status on the provided step to the provided status.
+    Records the provided status as the status of one sub-job of the provided step.
 
     Recovers once from a dead connection (e.g., the server terminated the
     backend, the network dropped) by invalidating the bad connection,
@@ -18,7 +18,7 @@ def set_step_status(resource_db_session, step, status):
         status(str): The status to set.
     """
     try:
-        _append_status(resource_db_session, step, status)
+        _add_job_status(resource_db_session, step, status)
         return
     except (OperationalError, PendingRollbackError):
         pass
@@ -32,16 +32,14 @@ def set_step_status(resource_db_session, step, status):
     fresh_session = sessionmaker(bind=engine)()
     try:
         fresh_step = fresh_session.query(step_cls).get(step_id)
-        _append_status(fresh_session, fresh_step, status)
+        _add_job_status(fresh_session, fresh_step, status)
     finally:
         fresh_session.close()
 
 
-def _append_status(session, step, status):
-    session.refresh(step)
-    step_statuses = step.get_attribute('condor_job_statuses')
-    step_statuses.append(status)
-    step.set_attribute('condor_job_statuses', step_statuses)
+def _add_job_status(session, step, status):
+    # Insert-only, so parallel jobs of the same step never overwrite each other
+    step.add_job_status(session, status)
     session.commit()
 
 
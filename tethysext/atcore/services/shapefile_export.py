@@ -0,0 +1,439 @@
+"""
+********************************************************************************
+* Name: shapefile_export.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import datetime
+import json
+import math
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+__all__ = ['geojson_to_shapefile_zip', 'infer_fields']
+
+WGS84_PRJ = 'GEOGCS["GCS_WGS_1984",DATUM["D_WGS_1984",SPHEROID["WGS_1984",6378137,298.257223563]],' \
+            'PRIMEM["Greenwich",0],UNIT["Degree",0.017453292519943295]]'
+
+# Component files larger than this are spooled to a private temporary file instead of memory
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+MAX_FIELD_NAME_LENGTH = 10
+MAX_CHARACTER_WIDTH = 254
+MAX_INTEGER_WIDTH = 18
+FLOAT_WIDTH = 24
+FLOAT_DECIMAL = 15
+
+SHAPE_POINT = 1
+SHAPE_POLYLINE = 3
+SHAPE_POLYGON = 5
+SHAPE_MULTIPOINT = 8
+
+# Shapefile headers and record headers are big-endian, record contents are little-endian
+_HEADER_BE = struct.Struct('>7i')
+_HEADER_LE = struct.Struct('<2i8d')
+_RECORD_HEADER = struct.Struct('>2i')
+_POINT = struct.Struct('<i2d')
+_MULTIPOINT_HEADER = struct.Struct('<i4di')
+_POLY_HEADER = struct.Struct('<i4d2i')
+_POINT_RECORD = np.dtype([('number', '>i4'), ('length', '>i4'), ('type', '<i4'), ('x', '<f8'), ('y', '<f8')])
+_SHX_RECORD = np.dtype([('offset', '>i4'), ('length', '>i4')])
+_DBF_HEADER = struct.Struct('<4BI2H20x')
+_DBF_FIELD = struct.Struct('<11sc4x2B14x')
+
+# Kinds of property values used to infer field types: logical, integer, float, and character
+_VALUE_KINDS = {bool: 'L', int: 'I', float: 'F'}
+
+_GEOMETRY_FAMILIES = {
+    'Point': 'Point',
+    'MultiPoint': 'Point',
+    'LineString': 'LineString',
+    'MultiLineString': 'LineString',
+    'Polygon': 'Polygon',
+    'MultiPolygon': 'Polygon',
+}
+
+
+def _truncate(text, size):
+    """
+    Encode the text as UTF-8 and truncate it to the given number of bytes without splitting characters.
+    """
+    return text.encode('utf-8')[:size].decode('utf-8', 'ignore').encode('utf-8')
+
+
+def _field_names(keys):
+    """
+    Truncate property names to the dBase limit, keeping them unique.
+    """
+    names = []
+    used = set()
+    for key in keys:
+        name = _truncate(str(key), MAX_FIELD_NAME_LENGTH).decode('utf-8')
+        suffix = 1
+        while name.lower() in used:
+            tag = f'_{suffix}'
+            name = _truncate(str(key), MAX_FIELD_NAME_LENGTH - len(tag)).decode('utf-8') + tag
+            suffix += 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def infer_fields(features):
+    """
+    Infer the dBase field definitions for the properties of the given features in a single pass.
+
+    Args:
+        features(list<dict>): GeoJSON features.
+
+    Returns:
+        list<tuple>: (property key, field name, field type, size, decimal) for each property, in order of first appearance.
+    """  # noqa: E501
+    kinds = {}
+    widths = {}
+
+    for feature in features:
+        for key, value in (feature.get('properties') or {}).items():
+            if key not in kinds:
+                kinds[key] = None
+                widths[key] = 1
+
+            if value is None:
+                continue
+
+            kind = kinds[key]
+            value_kind = _VALUE_KINDS.get(type(value), 'C')
+
+            if kind is None or kind == value_kind:
+                kinds[key] = value_kind
+            elif {kind, value_kind} == {'I', 'F'}:
+                kinds[key] = 'F'
+            else:
+                kinds[key] = 'C'
+
+            if value_kind == 'C':
+                text = value if isinstance(value, str) else json.dumps(value)
+                widths[key] = max(widths[key], len(text.encode('utf-8')))
+            else:
+                widths[key] = max(widths[key], len(str(value)))
+
+    fields = []
+    for key, name in zip(kinds, _field_names(kinds)):
+        kind = kinds[key]
+        if kind == 'L':
+            fields.append((key, name, 'L', 1, 0))
+        elif kind == 'I' and widths[key] <= MAX_INTEGER_WIDTH:
+            fields.append((key, name, 'N', widths[key], 0))
+        elif kind in ('I', 'F'):
+            fields.append((key, name, 'N', FLOAT_WIDTH, FLOAT_DECIMAL))
+        else:
+            fields.append((key, name, 'C', min(widths[key], MAX_CHARACTER_WIDTH), 0))
+
+    return fields
+
+
+def _get_geometry_family(features):
+    """
+    Get the geometry family (Point, LineString, or Polygon) of the first feature with a supported geometry.
+    """
+    for feature in features:
+        geometry = feature.get('geometry') or {}
+        family = _GEOMETRY_FAMILIES.get(geometry.get('type'))
+        if family is not None:
+            return family
+    return None
+
+
+def _get_parts(geometry):
+    """
+    Get the parts of a geometry as coordinate sequences. Polygon rings are closed.
+
+    Returns:
+        list, list<bool>: the parts and whether each part is the outer ring of a polygon.
+    """
+    geometry_type = geometry['type']
+    coordinates = geometry['coordinates']
+
+    if geometry_type == 'Point':
+        return [[coordinates] if coordinates else []], [False]
+    if geometry_type in ('MultiPoint', 'LineString'):
+        return [coordinates], [False]
+    if geometry_type == 'MultiLineString':
+        return coordinates, [False] * len(coordinates)
+
+    polygons = [coordinates] if geometry_type == 'Polygon' else coordinates
+    parts, outer = [], []
+    for polygon in polygons:
+        for i, ring in enumerate(polygon):
+            if ring and list(ring[0]) != list(ring[-1]):
+                ring = list(ring) + [ring[0]]
+            parts.append(ring)
+            outer.append(i == 0)
+    return parts, outer
+
+
+def _flatten(geometries):
+    """
+    Flatten the coordinates of all geometries into a single array.
+
+    Returns:
+        numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray: (n, 2) coordinates, number of points in each part, number of parts in each geometry, and whether each part is the outer ring of a polygon.
+    """  # noqa: E501
+    coordinates = []
+    part_lengths = []
+    part_counts = []
+    outer_rings = []
+
+    for geometry in geometries:
+        parts, outer = _get_parts(geometry)
+        count = 0
+        for part, is_outer in zip(parts, outer):
+            if not part:
+                continue
+            coordinates.extend(part)
+            part_lengths.append(len(part))
+            outer_rings.append(is_outer)
+            count += 1
+        part_counts.append(count)
+
+    try:
+        points = np.array(coordinates, dtype='<f8')
+        if points.ndim != 2:
+            raise ValueError
+    except ValueError:
+        # Some positions have z or m values and others don't
+        points = np.array([position[:2] for position in coordinates], dtype='<f8')
+
+    if not len(points):
+        points = np.empty((0, 2), dtype='<f8')
+
+    # Only x and y are written, z and m values are dropped
+    return np.ascontiguousarray(points[:, :2]), np.array(part_lengths, dtype=np.int64), \
+        np.array(part_counts, dtype=np.int64), np.array(outer_rings, dtype=bool)
+
+
+def _orient_rings(points, part_starts, part_lengths, outer_rings):
+    """
+    Orient polygon rings for shapefiles: outer rings clockwise and holes counterclockwise, the opposite of GeoJSON.
+
+    Returns:
+        numpy.ndarray: the points with rings reversed where needed.
+    """
+    x, y = points[:, 0], points[:, 1]
+    # Shoelace terms, padded so the term spanning the boundary between two rings can be removed from each sum
+    cross = np.append(x[:-1] * y[1:] - x[1:] * y[:-1], 0.0)
+    part_ends = part_starts + part_lengths
+    signed_area = np.add.reduceat(cross, part_starts) - cross[part_ends - 1]
+    reverse = (signed_area > 0) == outer_rings
+
+    if not reverse.any():
+        return points
+
+    part_ids = np.repeat(np.arange(len(part_lengths)), part_lengths)
+    index = np.arange(len(points))
+    reversed_index = part_starts[part_ids] + part_ends[part_ids] - 1 - index
+    return points[np.where(reverse[part_ids], reversed_index, index)]
+
+
+def _write_shp_header(f, shape_type, file_length, bbox):
+    """
+    Write the 100 byte header shared by .shp and .shx files. The file length is in bytes.
+    """
+    f.seek(0)
+    f.write(_HEADER_BE.pack(9994, 0, 0, 0, 0, 0, file_length // 2))
+    f.write(_HEADER_LE.pack(1000, shape_type, *bbox, 0.0, 0.0, 0.0, 0.0))
+
+
+def _write_shapes(shp, shx, geometries, shape_type):
+    """
+    Write the .shp and .shx files for the given geometries. Coordinates, ring orientation, and bounding boxes are processed as whole arrays.
+
+    Returns:
+        numpy.ndarray: mask of the geometries that were written. Geometries without coordinates are skipped.
+    """  # noqa: E501
+    points, part_lengths, part_counts, outer_rings = _flatten(geometries)
+    written = part_counts > 0
+    part_counts = part_counts[written]
+    num_shapes = len(part_counts)
+
+    part_starts = np.concatenate(([0], np.cumsum(part_lengths)[:-1])).astype(np.int64)
+    if shape_type == SHAPE_POLYGON and len(points):
+        points = _orient_rings(points, part_starts, part_lengths, outer_rings)
+
+    point_counts = np.add.reduceat(part_lengths, np.concatenate(([0], np.cumsum(part_counts)[:-1]))) \
+        if num_shapes else np.empty(0, dtype=np.int64)
+    shape_starts = np.concatenate(([0], np.cumsum(point_counts)[:-1])).astype(np.int64)
+
+    if num_shapes:
+        x, y = points[:, 0], points[:, 1]
+        bboxes = np.column_stack((np.minimum.reduceat(x, shape_starts), np.minimum.reduceat(y, shape_starts),
+                                  np.maximum.reduceat(x, shape_starts), np.maximum.reduceat(y, shape_starts)))
+        bbox = (bboxes[:, 0].min(), bboxes[:, 1].min(), bboxes[:, 2].max(), bboxes[:, 3].max())
+    else:
+        bboxes = np.empty((0, 4))
+        bbox = (0.0, 0.0, 0.0, 0.0)
+
+    # Content lengths in bytes
+    if shape_type == SHAPE_POINT:
+        content_lengths = np.full(num_shapes, _POINT.size, dtype=np.int64)
+    elif shape_type == SHAPE_MULTIPOINT:
+        content_lengths = _MULTIPOINT_HEADER.size + 16 * point_counts
+    else:
+        content_lengths = _POLY_HEADER.size + 4 * part_counts + 16 * point_counts
+    offsets = 100 + np.concatenate(([0], np.cumsum(8 + content_lengths)[:-1])).astype(np.int64)
+
+    shp.write(bytes(100))
+    if shape_type == SHAPE_POINT:
+        records = np.empty(num_shapes, dtype=_POINT_RECORD)
+        records['number'] = np.arange(1, num_shapes + 1)
+        records['length'] = content_lengths // 2
+        records['type'] = SHAPE_POINT
+        records['x'] = points[:, 0]
+        records['y'] = points[:, 1]
+        shp.write(records.tobytes())
+    else:
+        point_bytes = np.ascontiguousarray(points).tobytes()
+        relative_starts = (part_starts - np.repeat(shape_starts, part_counts)).astype('<i4').tobytes()
+        part_index = 0
+        for i in range(num_shapes):
+            num_parts, num_points, start = int(part_counts[i]), int(point_counts[i]), int(shape_starts[i])
+            shp.write(_RECORD_HEADER.pack(i + 1, int(content_lengths[i]) // 2))
+            if shape_type == SHAPE_MULTIPOINT:
+                shp.write(_MULTIPOINT_HEADER.pack(shape_type, *bboxes[i], num_points))
+            else:
+                shp.write(_POLY_HEADER.pack(shape_type, *bboxes[i], num_parts, num_points))
+                shp.write(relative_starts[4 * part_index:4 * (part_index + num_parts)])
+            shp.write(point_bytes[16 * start:16 * (start + num_points)])
+            part_index += num_parts
+
+    index = np.empty(num_shapes, dtype=_SHX_RECORD)
+    index['offset'] = offsets // 2
+    index['length'] = content_lengths // 2
+    shx.write(bytes(100))
+    shx.write(index.tobytes())
+
+    _write_shp_header(shp, shape_type, int(offsets[-1] + 8 + content_lengths[-1]) if num_shapes else 100, bbox)
+    _write_shp_header(shx, shape_type, 100 + 8 * num_shapes, bbox)
+
+    return written
+
+
+def _format_column(values, field_type, size, decimal):
+    """
+    Format the values of one field as fixed-width dBase bytes. Missing values are left blank.
+    """
+    blank = b' ' * size
+
+    if field_type == 'L':
+        return [b'?' if v is None else (b'T' if v else b'F') for v in values]
+
+    if field_type == 'C':
+        return [
+            blank if v is None else _truncate(
+                v if isinstance(v, str) else json.dumps(v) if isinstance(v, (dict, list)) else str(v), size
+            ).ljust(size)
+            for v in values
+        ]
+
+    if decimal == 0:
+        return [blank if v is None else str(v).rjust(size).encode('ascii') for v in values]
+
+    column = []
+    for v in values:
+        if v is None or not math.isfinite(v):
+            column.append(blank)
+            continue
+        text = f'{v:.{decimal}f}'
+        if len(text) > size:
+            text = f'{v:.{size - 8}e}'
+        column.append(text.rjust(size).encode('ascii'))
+    return column
+
+
+def _write_records(dbf, features, fields):
+    """
+    Write the .dbf (dBase III) file for the properties of the given features. Records are built one column at a time in a fixed-width array.
+    """  # noqa: E501
+    today = datetime.date.today()
+    header_length = 32 + 32 * len(fields) + 1
+    record_length = 1 + sum(size for _, _, _, size, _ in fields)
+
+    dbf.write(_DBF_HEADER.pack(3, today.year - 1900, today.month, today.day, len(features), header_length,
+                               record_length))
+    for _, field_name, field_type, size, decimal in fields:
+        dbf.write(_DBF_FIELD.pack(field_name.encode('utf-8'), field_type.encode('ascii'), size, decimal))
+    dbf.write(b'\r')
+
+    records = np.empty(len(features), dtype=[('deleted', 'S1')] + [
+        (f'f{i}', f'S{size}') for i, (_, _, _, size, _) in enumerate(fields)
+    ])
+    records['deleted'] = b' '
+    properties = [feature.get('properties') or {} for feature in features]
+    for i, (key, _, field_type, size, decimal) in enumerate(fields):
+        records[f'f{i}'] = _format_column([p.get(key, None) for p in properties], field_type, size, decimal)
+
+    dbf.write(records.tobytes())
+    dbf.write(b'\x1a')
+
+
+def geojson_to_shapefile_zip(geojson, name):
+    """
+    Convert a GeoJSON FeatureCollection in WGS 84 to a zipped shapefile. Shapefiles can only contain one type of geometry, so only features with the same type of geometry as the first feature are exported. Multi* geometries are written as multi-part shapes.
+
+    Args:
+        geojson(dict): GeoJSON FeatureCollection.
+        name(str): base name of the files in the archive.
+
+    Returns:
+        tempfile.SpooledTemporaryFile: the zip archive, positioned at the beginning. The caller is responsible for closing it.
+    """  # noqa: E501
+    features = geojson.get('features') or []
+    family = _get_geometry_family(features)
+    if family is None:
+        raise ValueError('No features with a supported geometry type were found.')
+
+    features = [f for f in features if _GEOMETRY_FAMILIES.get((f.get('geometry') or {}).get('type')) == family]
+
+    if family == 'Point':
+        # Points and MultiPoints are different shape types, so mixed layers are written as MultiPoints
+        is_multi = any(f['geometry']['type'] == 'MultiPoint' for f in features)
+        shape_type = SHAPE_MULTIPOINT if is_multi else SHAPE_POINT
+    elif family == 'LineString':
+        shape_type = SHAPE_POLYLINE
+    else:
+        shape_type = SHAPE_POLYGON
+
+    # Component files are written to private spooled files, so concurrent exports never share file names
+    shp, shx, dbf = (tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) for _ in range(3))
+    archive = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+    try:
+        written = _write_shapes(shp, shx, [f['geometry'] for f in features], shape_type)
+        features = [f for f, w in zip(features, written) if w]
+        _write_records(dbf, features, infer_fields(features))
+
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for ext, component in (('shp', shp), ('shx', shx), ('dbf', dbf)):
+                component.seek(0)
+                with zf.open(f'{name}.{ext}', 'w') as dst:
+                    shutil.copyfileobj(component, dst, CHUNK_SIZE)
+            zf.writestr(f'{name}.prj', WGS84_PRJ)
+            zf.writestr(f'{name}.cpg', 'UTF-8')
+
+    except Exception:
+        archive.close()
+        raise
+
+    finally:
+        for component in (shp, shx, dbf):
+            component.close()
+
+    archive.seek(0)
+    return archive
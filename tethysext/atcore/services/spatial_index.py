@@ -0,0 +1,188 @@
+"""
+********************************************************************************
+* Name: spatial_index.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import hashlib
+import json
+import math
+
+
+def get_geojson_version(geojson):
+    """
+    Get a version of a GeoJSON object that changes when its contents change, for the urls and cache keys of its tiles and to tell if its index is current.
+
+    Args:
+        geojson(dict): Python equivalent GeoJSON object.
+
+    Returns:
+        str: the version.
+    """  # noqa: E501
+    return hashlib.sha1(json.dumps(geojson, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+
+
+def get_bounds(geometry):
+    """
+    Get the bounds of a GeoJSON geometry.
+
+    Args:
+        geometry(dict): Python equivalent GeoJSON geometry.
+
+    Returns:
+        tuple: minx, miny, maxx, maxy or None if the geometry has no coordinates.
+    """
+    xs, ys = [], []
+
+    def collect(coordinates):
+        if coordinates and isinstance(coordinates[0], (int, float)):
+            xs.append(coordinates[0])
+            ys.append(coordinates[1])
+        else:
+            for c in coordinates:
+                collect(c)
+
+    for g in geometry.get('geometries', [geometry]):
+        collect(g.get('coordinates') or [])
+
+    if not xs:
+        return None
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _intersects(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _union(boxes):
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
+
+
+class PackedRTree(object):
+    """
+    Static R-tree of bounding boxes packed with the Sort-Tile-Recursive algorithm. Built once, it is stored as plain lists so it can be persisted with the data it indexes.
+    """  # noqa: E501
+    NODE_SIZE = 16
+
+    def __init__(self, items, nodes, node_size=NODE_SIZE):
+        """
+        Constructor. Use build to make a tree.
+
+        Args:
+            items(list): minx, miny, maxx, maxy and index of the indexed boxes, in tree order.
+            nodes(list<list>): bounding boxes of the nodes of each level, from the leaves up.
+            node_size(int): maximum number of children of a node.
+        """
+        self.items = items
+        self.nodes = nodes
+        self.node_size = node_size
+
+    @classmethod
+    def build(cls, boxes, node_size=NODE_SIZE):
+        """
+        Build a tree.
+
+        Args:
+            boxes(list): minx, miny, maxx, maxy of each item. None for items without bounds, which are not indexed.
+            node_size(int): maximum number of children of a node.
+
+        Returns:
+            PackedRTree: the tree.
+        """
+        items = [(b[0], b[1], b[2], b[3], i) for i, b in enumerate(boxes) if b is not None]
+
+        # Sort into vertical slices by center x, then each slice by center y, so each node covers a compact area
+        num_leaves = math.ceil(len(items) / node_size)
+        slice_size = node_size * max(math.ceil(math.sqrt(num_leaves)), 1)
+        items.sort(key=lambda b: b[0] + b[2])
+        items = [item for s in range(0, len(items), slice_size)
+                 for item in sorted(items[s:s + slice_size], key=lambda b: b[1] + b[3])]
+
+        nodes = []
+        level = items
+
+        while len(level) > node_size:
+            level = [_union(level[s:s + node_size]) for s in range(0, len(level), node_size)]
+            nodes.append(level)
+
+        return cls(items, nodes, node_size)
+
+    def query(self, bbox):
+        """
+        Find the items with boxes that intersect a bounding box.
+
+        Args:
+            bbox(tuple): minx, miny, maxx, maxy.
+
+        Returns:
+            list<int>: indexes of the items, sorted.
+        """
+        levels = [self.items] + self.nodes
+        candidates = range(len(levels[-1]))
+
+        # Descend from the top level, keeping the children of the nodes that intersect the box
+        for depth in range(len(levels) - 1, 0, -1):
+            level, size = levels[depth], len(levels[depth - 1])
+            candidates = [c for n in candidates if _intersects(level[n], bbox)
+                          for c in range(n * self.node_size, min((n + 1) * self.node_size, size))]
+
+        return sorted(self.items[c][4] for c in candidates if _intersects(self.items[c], bbox))
+
+    def to_dict(self):
+        """
+        Get the tree as a dictionary of lists to persist it.
+
+        Returns:
+            dict: the tree.
+        """
+        return {'node_size': self.node_size, 'items': self.items, 'nodes': self.nodes}
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        Load a tree persisted with to_dict.
+
+        Args:
+            d(dict): the tree.
+
+        Returns:
+            PackedRTree: the tree.
+        """
+        return cls(d['items'], d['nodes'], d['node_size'])
+
+
+def build_geojson_index(geojson):
+    """
+    Build an index of the features of a GeoJSON FeatureCollection by id and by bounding box.
+
+    Args:
+        geojson(dict): Python equivalent GeoJSON FeatureCollection.
+
+    Returns:
+        dict: the index, with the version of the GeoJSON, the position of each feature by id and the R-tree of the bounding boxes of the features.
+    """  # noqa: E501
+    ids = {}
+    boxes = []
+
+    for i, feature in enumerate(geojson.get('features') or []):
+        feature_id = (feature.get('properties') or {}).get('id', feature.get('id'))
+
+        if feature_id is not None:
+            ids.setdefault(str(feature_id), i)
+
+        geometry = feature.get('geometry')
+        boxes.append(get_bounds(geometry) if geometry else None)
+
+    return {
+        'version': get_geojson_version(geojson),
+        'ids': ids,
+        'tree': PackedRTree.build(boxes).to_dict(),
+    }
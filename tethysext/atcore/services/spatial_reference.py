@@ -6,6 +6,234 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import bisect
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import text
+
+
+def _get_db_key(db_engine):
+    """
+    Get the key of the database of the given engine, connection or session.
+    """
+    bind = db_engine.get_bind() if hasattr(db_engine, 'get_bind') else db_engine
+    return str(getattr(bind, 'engine', bind).url)
+
+
+class SpatialReferenceCatalog(object):
+    """
+    In-process catalog of the spatial reference systems in a spatial_ref_sys table. The names of all systems and a prefix index of the words in their well known text are loaded on first use, so lookups and searches don't query the database. The catalog is reloaded only if the table has changed, which is checked at most once every refresh_interval seconds. Well known text is fetched by id and kept in a LRU cache.
+    """  # noqa: E501
+    DEFAULT_REFRESH_INTERVAL = 300
+    DEFAULT_WKT_CACHE_SIZE = 256
+
+    _SIGNATURE_QUERY = text('SELECT count(*), coalesce(max(srid), 0), coalesce(sum(length(srtext)), 0) '
+                            'FROM spatial_ref_sys')
+    _CATALOG_QUERY = text('SELECT srid, srtext FROM spatial_ref_sys')
+    _WKT_QUERY = text('SELECT srtext FROM spatial_ref_sys WHERE srid = :srid')
+
+    def __init__(self, refresh_interval=DEFAULT_REFRESH_INTERVAL, wkt_cache_size=DEFAULT_WKT_CACHE_SIZE):
+        """
+        Constructor.
+
+        Args:
+            refresh_interval(int): seconds between checks for changes to the table.
+            wkt_cache_size(int): number of well known texts to keep in the cache.
+        """
+        self.refresh_interval = refresh_interval
+        self.wkt_cache_size = wkt_cache_size
+        self._lock = threading.RLock()
+        self._signature = None
+        self._last_check = None
+        self._names = {}
+        self._tokens = []
+        self._postings = {}
+        self._wkt_cache = OrderedDict()
+
+    @staticmethod
+    def get_name(srtext):
+        """
+        Get the name of a spatial reference system from its well known text.
+
+        Args:
+            srtext(str): well known text.
+
+        Returns:
+            str: the name (e.g.: NAD83 / Colorado Central (ftUS)).
+        """
+        parts = (srtext or '').split('"')
+        return parts[1] if len(parts) > 1 else ''
+
+    @staticmethod
+    def tokenize(value):
+        """
+        Split a string into lower case words.
+
+        Args:
+            value(str): the string.
+
+        Returns:
+            list<str>: the words.
+        """
+        return re.findall(r'[^\W_]+', (value or '').lower())
+
+    def get_tokens(self, srid, srtext):
+        """
+        Get the words a spatial reference system is indexed by: the id, the words of the name and the words of the well known text that contain letters (numeric parameters are left out to keep the index small).
+        """  # noqa: E501
+        tokens = {str(srid)}
+        tokens.update(self.tokenize(self.get_name(srtext)))
+        tokens.update(token for token in self.tokenize(srtext) if not token.isdigit())
+        return tokens
+
+    def refresh(self, db_engine, force=False):
+        """
+        Load the catalog if it has not been loaded or the table has changed since it was.
+
+        Args:
+            db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+            force(bool): check the table for changes even if it was checked less than refresh_interval seconds ago.
+        """  # noqa: E501
+        with self._lock:
+            now = time.monotonic()
+
+            if not force and self._last_check is not None and now - self._last_check < self.refresh_interval:
+                return
+
+            signature = tuple(db_engine.execute(self._SIGNATURE_QUERY).first())
+            self._last_check = now
+
+            if signature != self._signature:
+                self.load(db_engine)
+                self._signature = signature
+
+    def load(self, db_engine):
+        """
+        Load the names and build the index of all spatial reference systems in the table.
+
+        Args:
+            db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+        """  # noqa: E501
+        names = {}
+        postings = {}
+
+        for srid, srtext in db_engine.execute(self._CATALOG_QUERY):
+            names[srid] = self.get_name(srtext)
+            for token in self.get_tokens(srid, srtext):
+                postings.setdefault(token, []).append(srid)
+
+        with self._lock:
+            self._names = names
+            self._postings = {token: tuple(srids) for token, srids in postings.items()}
+            self._tokens = sorted(postings)
+            self._wkt_cache.clear()
+
+    def get(self, db_engine, srid):
+        """
+        Get the name of a spatial reference system.
+
+        Args:
+            db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+            srid(int): spatial reference id.
+
+        Returns:
+            str: the name or None if the system does not exist.
+        """  # noqa: E501
+        self.refresh(db_engine)
+        return self._names.get(srid, None)
+
+    def search(self, db_engine, query_words):
+        """
+        Find the spatial reference systems with words starting with every one of the query words.
+
+        Args:
+            db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+            query_words(list<str>): query words (e.g.: ['Utah', 'Central']).
+
+        Returns:
+            list<tuple>: srid and name of the matching systems ordered by srid.
+        """  # noqa: E501
+        words = [token for word in query_words for token in self.tokenize(word)]
+
+        if not words:
+            return []
+
+        self.refresh(db_engine)
+
+        with self._lock:
+            tokens, postings, names = self._tokens, self._postings, self._names
+
+        matches = None
+
+        # Most selective (longest) words first to keep the intersection small
+        for word in sorted(set(words), key=len, reverse=True):
+            word_matches = set()
+            index = bisect.bisect_left(tokens, word)
+
+            while index < len(tokens) and tokens[index].startswith(word):
+                word_matches.update(postings[tokens[index]])
+                index += 1
+
+            matches = word_matches if matches is None else matches & word_matches
+
+            if not matches:
+                return []
+
+        return [(srid, names[srid]) for srid in sorted(matches)]
+
+    def get_wkt(self, db_engine, srid):
+        """
+        Get the well known text of a spatial reference system.
+
+        Args:
+            db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+            srid(int): spatial reference id.
+
+        Returns:
+            str: the well known text or None if the system does not exist.
+        """  # noqa: E501
+        if self.get(db_engine, srid) is None:
+            return None
+
+        with self._lock:
+            if srid in self._wkt_cache:
+                self._wkt_cache.move_to_end(srid)
+                return self._wkt_cache[srid]
+
+        wkt = db_engine.execute(self._WKT_QUERY, {'srid': srid}).scalar()
+
+        with self._lock:
+            self._wkt_cache[srid] = wkt
+            while len(self._wkt_cache) > self.wkt_cache_size:
+                self._wkt_cache.popitem(last=False)
+
+        return wkt
+
+
+_catalogs_lock = threading.Lock()
+_catalogs = {}
+
+
+def get_spatial_reference_catalog(db_engine):
+    """
+    Get the process-wide catalog of the database of the given engine, creating it on first use.
+
+    Args:
+        db_engine(sqlalchemy.engine.Engine or sqlalchemy.orm.Session): connection to the database with the spatial_ref_sys table.
+
+    Returns:
+        SpatialReferenceCatalog: the catalog.
+    """  # noqa: E501
+    key = _get_db_key(db_engine)
+
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = SpatialReferenceCatalog()
+
+        return _catalogs[key]
 
 
 class SpatialReferenceService:
@@ -20,6 +248,23 @@ class SpatialReferenceService:
             db_engine(sqlalchemy.engine): engine with connection to spatial database with spatial_ref_sys table.
         """
         self.db_engine = db_engine
+        self._catalog = None
+
+    @property
+    def catalog(self):
+        """
+        SpatialReferenceCatalog: catalog of the spatial reference systems of the database.
+        """
+        if self._catalog is None:
+            self._catalog = get_spatial_reference_catalog(self.db_engine)
+        return self._catalog
+
+    @staticmethod
+    def _parse_srid(srid):
+        try:
+            return int(srid)
+        except (TypeError, ValueError):
+            return None
 
     def get_spatial_reference_system_by_srid(self, srid):
         """"
@@ -35,20 +280,11 @@ class SpatialReferenceService:
             json = {'results': spatial_ref_list}
             return json
 
-        # Retrieve a list of SRIDs from database
-        get_spatial_ref_list = "SELECT * FROM spatial_ref_sys WHERE ({0} = @srid)".format(srid)
-
-        spatial_ref_object_result = self.db_engine.execute(get_spatial_ref_list)
+        srid = self._parse_srid(srid)
+        name = self.catalog.get(self.db_engine, srid) if srid is not None else None
 
-        # Parse out the wanted items into the list for the select input
-        for spatial_reference in spatial_ref_object_result:
-            spatial_ref_list.append(
-                {
-                    "text": "{0} {1}".format(spatial_reference[0], spatial_reference[3].split('"')[1]),
-                    "id": str(spatial_reference[0])
-                }
-            )
-        spatial_ref_object_result.close()
+        if name is not None:
+            spatial_ref_list.append({"text": "{0} {1}".format(srid, name), "id": str(srid)})
 
         json = {'results': spatial_ref_list}
         return json
@@ -69,15 +305,11 @@ class SpatialReferenceService:
             json = {'results': wkt}
             return json
 
-        # Retrieve a list of SRIDs from database
-        get_spatial_ref_list = "SELECT srtext FROM spatial_ref_sys WHERE ({0} = @srid)".format(srid)
+        srid = self._parse_srid(srid)
 
-        spatial_ref_object_result = self.db_engine.execute(get_spatial_ref_list)
+        if srid is not None:
+            wkt = self.catalog.get_wkt(self.db_engine, srid) or ''
 
-        # Get the WKT
-        for spatial_reference in spatial_ref_object_result:
-            wkt = spatial_reference[0]
-        spatial_ref_object_result.close()
         json = {'results': wkt}
         return json
 
@@ -90,27 +322,8 @@ class SpatialReferenceService:
         """
         spatial_ref_list = []
 
-        if len(query_words) == 1:
-            sql_query_input = query_words[0]
-        else:
-            sql_query_input = ' & '.join(query_words)
-
-        # Retrieve a list of SRIDs from database
-        get_spatial_ref_list = "SELECT * FROM spatial_ref_sys " \
-                               "WHERE to_tsvector('english', srtext) @@ " \
-                               "to_tsquery('english', '{0}');".format(sql_query_input)
-
-        spatial_ref_object_result = self.db_engine.execute(get_spatial_ref_list)
-
-        # Parse out the wanted items into the list for the select input
-        for spatial_reference in spatial_ref_object_result:
-            spatial_ref_list.append(
-                {
-                    "text": "{0} {1}".format(spatial_reference[0], spatial_reference[3].split('"')[1]),
-                    "id": str(spatial_reference[0])
-                }
-            )
-        spatial_ref_object_result.close()
+        for srid, name in self.catalog.search(self.db_engine, query_words):
+            spatial_ref_list.append({"text": "{0} {1}".format(srid, name), "id": str(srid)})
 
         json = {'results': spatial_ref_list}
 
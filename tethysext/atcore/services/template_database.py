@@ -0,0 +1,299 @@
+"""
+********************************************************************************
+* Name: template_database.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import hashlib
+import logging
+import threading
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+log = logging.getLogger(f'tethys.{__name__}')
+
+
+def get_schema_hash(declarative_bases, *args):
+    """
+    Get a hash of the tables and indexes of the given declarative bases and any additional values the contents of the database depend on. Databases initialized with the same declarative bases and values have the same hash.
+
+    Args:
+        declarative_bases(tuple): SQLAlchemy declarative base classes used to initialize tables.
+        *args: additional values (e.g.: version, spatial).
+
+    Returns:
+        str: the hash.
+    """  # noqa: E501
+    dialect = postgresql.dialect()
+    schema_hash = hashlib.sha1()
+
+    for declarative_base in declarative_bases:
+        for table in declarative_base.metadata.sorted_tables:
+            schema_hash.update(str(CreateTable(table).compile(dialect=dialect)).encode('utf-8'))
+            for index in sorted(table.indexes, key=lambda i: i.name or ''):
+                schema_hash.update(str(CreateIndex(index).compile(dialect=dialect)).encode('utf-8'))
+
+    for arg in args:
+        schema_hash.update(repr(arg).encode('utf-8'))
+
+    # Short enough for the names of templates and pooled databases to fit in the 63 character limit of PostgreSQL
+    return schema_hash.hexdigest()[:12]
+
+
+def _execute_autocommit(cluster_engine, statement, **params):
+    # CREATE, DROP and ALTER DATABASE can't run inside a transaction
+    with cluster_engine.connect() as connection:
+        result = connection.execution_options(isolation_level='AUTOCOMMIT').execute(text(statement), params)
+        return result.fetchall() if result.returns_rows else None
+
+
+def _quote(cluster_engine, name):
+    return cluster_engine.dialect.identifier_preparer.quote(name)
+
+
+def database_exists(cluster_engine, name):
+    """
+    Check if a database exists on a cluster.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        name(str): name of the database.
+
+    Returns:
+        bool: True if the database exists.
+    """
+    rows = _execute_autocommit(cluster_engine, 'SELECT 1 FROM pg_database WHERE datname = :name', name=name)
+    return len(rows) > 0
+
+
+def list_databases(cluster_engine, prefix):
+    """
+    List the databases on a cluster with names starting with the given prefix.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        prefix(str): the prefix.
+
+    Returns:
+        list<str>: names of the databases.
+    """
+    rows = _execute_autocommit(
+        cluster_engine,
+        'SELECT datname FROM pg_database WHERE left(datname, length(:prefix)) = :prefix ORDER BY datname',
+        prefix=prefix
+    )
+    return [row[0] for row in rows]
+
+
+def get_database_owner(cluster_engine, name):
+    """
+    Get the name of the owner of a database.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        name(str): name of the database.
+
+    Returns:
+        str: name of the owner or None if the database does not exist.
+    """
+    rows = _execute_autocommit(
+        cluster_engine,
+        'SELECT pg_catalog.pg_get_userbyid(datdba) FROM pg_database WHERE datname = :name',
+        name=name
+    )
+    return rows[0][0] if rows else None
+
+
+def create_database(cluster_engine, name, template=None, owner=None):
+    """
+    Create a database, optionally as a copy of a template database.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        name(str): name of the new database.
+        template(str): name of the database to copy. Must not have any open connections.
+        owner(str): name of the owner of the new database. Defaults to the user of the cluster engine.
+    """
+    statement = 'CREATE DATABASE {}'.format(_quote(cluster_engine, name))
+
+    if template:
+        statement += ' TEMPLATE {}'.format(_quote(cluster_engine, template))
+
+    if owner:
+        statement += ' OWNER {}'.format(_quote(cluster_engine, owner))
+
+    _execute_autocommit(cluster_engine, statement)
+
+
+def drop_database(cluster_engine, name):
+    """
+    Drop a database, closing any open connections to it on PostgreSQL 13 or later.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        name(str): name of the database.
+    """
+    statement = 'DROP DATABASE IF EXISTS {}'.format(_quote(cluster_engine, name))
+
+    with cluster_engine.connect() as connection:
+        if (connection.dialect.server_version_info or (0,)) >= (13,):
+            statement += ' WITH (FORCE)'
+
+        connection.execution_options(isolation_level='AUTOCOMMIT').execute(text(statement))
+
+
+def rename_database(cluster_engine, name, new_name):
+    """
+    Rename a database.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        name(str): name of the database.
+        new_name(str): new name of the database.
+    """
+    _execute_autocommit(cluster_engine, 'ALTER DATABASE {} RENAME TO {}'.format(
+        _quote(cluster_engine, name), _quote(cluster_engine, new_name)
+    ))
+
+
+def drop_stale_templates(cluster_engine, template_prefix, template_name):
+    """
+    Drop the template databases with the given prefix that aren't the current template, and their warm pools. Templates are named after the hash of their schema, so templates of previous versions of the schema or of template_version are left behind when it changes.
+
+    Args:
+        cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+        template_prefix(str): prefix shared by the names of all versions of the template (e.g.: my_app_template_012345_).
+        template_name(str): name of the current template database, kept with its warm pool.
+
+    Returns:
+        list<str>: names of the dropped databases.
+    """  # noqa: E501
+    current_pool_prefix = WarmDatabasePool.get_prefix(template_name)
+    dropped = []
+
+    for name in list_databases(cluster_engine, template_prefix):
+        if name == template_name or name.startswith(current_pool_prefix):
+            continue
+
+        try:
+            drop_database(cluster_engine, name)
+            dropped.append(name)
+        except Exception:
+            # Dropped by another process or in use
+            log.warning('Unable to drop stale template database "%s".', name)
+
+    return dropped
+
+
+class WarmDatabasePool(object):
+    """
+    Pool of databases copied from a template database ahead of time. Taking a database from the pool renames it, which is instant, while copying the template takes as long as writing its files. The pool is topped up in a background thread. Pooled databases are plain databases on the cluster named after the template, so the pool is shared by all processes.
+    """  # noqa: E501
+
+    _top_up_locks_lock = threading.Lock()
+    _top_up_locks = {}
+
+    def __init__(self, template_name, size):
+        """
+        Constructor.
+
+        Args:
+            template_name(str): name of the template database.
+            size(int): number of databases to keep in the pool.
+        """
+        self.template_name = template_name
+        self.size = size
+        self.prefix = self.get_prefix(template_name)
+
+    @staticmethod
+    def get_prefix(template_name):
+        """
+        Get the prefix of the names of the pooled databases of a template database.
+
+        Args:
+            template_name(str): name of the template database.
+
+        Returns:
+            str: the prefix.
+        """
+        return '{}_pool_'.format(template_name)
+
+    def take(self, cluster_engine, name):
+        """
+        Take a database from the pool, renaming it to the given name.
+
+        Args:
+            cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+            name(str): the new name of the database. A database with this name must not exist.
+
+        Returns:
+            bool: True if a database was taken, False if the pool is empty.
+        """
+        for pooled_name in list_databases(cluster_engine, self.prefix):
+            try:
+                rename_database(cluster_engine, pooled_name, name)
+                return True
+            except Exception:
+                # Taken by another process
+                log.debug('Unable to take pooled database "%s".', pooled_name)
+
+        return False
+
+    def top_up(self, cluster_engine, owner=None):
+        """
+        Copy the template until the pool has the configured number of databases.
+
+        Args:
+            cluster_engine(sqlalchemy.engine.Engine): engine connected to the cluster.
+            owner(str): name of the owner of the databases.
+
+        Returns:
+            int: number of databases added to the pool.
+        """
+        added = 0
+        missing = self.size - len(list_databases(cluster_engine, self.prefix))
+
+        for _ in range(missing):
+            create_database(cluster_engine, self.prefix + uuid.uuid4().hex[:8], template=self.template_name,
+                            owner=owner)
+            added += 1
+
+        return added
+
+    def top_up_async(self, get_cluster_engine, owner=None):
+        """
+        Top up the pool in a background thread, unless it is already being topped up by this process.
+
+        Args:
+            get_cluster_engine(callable): returns a new engine connected to the cluster, disposed when done.
+            owner(str): name of the owner of the databases.
+
+        Returns:
+            threading.Thread: the thread or None if the pool is already being topped up.
+        """
+        with self._top_up_locks_lock:
+            lock = self._top_up_locks.setdefault(self.prefix, threading.Lock())
+
+        if not lock.acquire(blocking=False):
+            return None
+
+        def run():
+            cluster_engine = None
+            try:
+                cluster_engine = get_cluster_engine()
+                self.top_up(cluster_engine, owner=owner)
+            except Exception:
+                log.exception('Unable to top up pool of template database "%s".', self.template_name)
+            finally:
+                if cluster_engine is not None:
+                    cluster_engine.dispose()
+                lock.release()
+
+        thread = threading.Thread(target=run, name='atcore-warm-database-pool', daemon=True)
+        thread.start()
+        return thread
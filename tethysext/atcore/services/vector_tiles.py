@@ -0,0 +1,355 @@
+"""
+********************************************************************************
+* Name: vector_tiles.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import json
+import math
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import text
+
+from tethysext.atcore.services.map_cache import LocalMapCache
+from tethysext.atcore.services.spatial_index import PackedRTree, get_bounds
+
+#: Content type of Mapbox Vector Tiles.
+MVT_CONTENT_TYPE = 'application/vnd.mapbox-vector-tile'
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+EARTH_HALF_CIRCUMFERENCE = 20037508.342789244
+
+#: Approximate memory used by a GeoJSONTileSource for each coordinate and each feature, measured with tracemalloc.
+COORDINATE_NBYTES = 128
+FEATURE_NBYTES = 512
+
+
+def _import_mapbox_vector_tile():
+    try:
+        import mapbox_vector_tile
+        from shapely import geometry  # noqa: F401
+    except ImportError:
+        raise ImportError('The mapbox-vector-tile package is required to serve GeoJSON layers as vector tiles. '
+                          'Install it with "pip install mapbox-vector-tile".')
+    return mapbox_vector_tile
+
+
+def tile_bounds(z, x, y):
+    """
+    Get the bounds of a tile of the XYZ tiling scheme in web mercator (EPSG:3857).
+
+    Args:
+        z(int): zoom level.
+        x(int): column of the tile.
+        y(int): row of the tile, from the top.
+
+    Returns:
+        tuple: minx, miny, maxx, maxy.
+    """
+    size = 2 * EARTH_HALF_CIRCUMFERENCE / (2 ** z)
+    minx = -EARTH_HALF_CIRCUMFERENCE + x * size
+    maxy = EARTH_HALF_CIRCUMFERENCE - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def to_web_mercator(lon, lat):
+    """
+    Project geographic coordinates (EPSG:4326) to web mercator (EPSG:3857).
+
+    Args:
+        lon(float): longitude.
+        lat(float): latitude.
+
+    Returns:
+        tuple: x, y.
+    """
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    x = lon * EARTH_HALF_CIRCUMFERENCE / 180.0
+    y = math.log(math.tan((90.0 + lat) * math.pi / 360.0)) * EARTH_HALF_CIRCUMFERENCE / math.pi
+    return x, y
+
+
+def _project_coordinates(coordinates):
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        return list(to_web_mercator(coordinates[0], coordinates[1]))
+    return [_project_coordinates(c) for c in coordinates]
+
+
+def _count_coordinates(coordinates):
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        return 1
+    return sum(_count_coordinates(c) for c in coordinates)
+
+
+def _project_geometry(geometry):
+    if geometry['type'] == 'GeometryCollection':
+        return {'type': 'GeometryCollection', 'geometries': [_project_geometry(g) for g in geometry['geometries']]}
+    return {'type': geometry['type'], 'coordinates': _project_coordinates(geometry['coordinates'])}
+
+
+def _to_tile_value(value):
+    # Vector tiles only support scalar property values
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(value, default=str)
+
+
+class GeoJSONTileSource(object):
+    """
+    Cuts a GeoJSON FeatureCollection in geographic coordinates into vector tiles. The features are projected and indexed by their bounds once, when the source is created. A source uses about COORDINATE_NBYTES per coordinate and FEATURE_NBYTES per feature of memory (e.g.: 30 MB for 10,000 polygons of 20 vertices), estimated by its nbytes attribute.
+    """  # noqa: E501
+
+    def __init__(self, geojson, layer_name, properties=None):
+        """
+        Constructor.
+
+        Args:
+            geojson(dict): Python equivalent GeoJSON FeatureCollection in EPSG:4326.
+            layer_name(str): name of the layer in the tiles.
+            properties(dict): properties added to every feature (e.g.: {'layer_name': 'foo'}).
+        """
+        self.layer_name = layer_name
+        self.features = []
+        num_coordinates = 0
+
+        for feature in geojson.get('features', []):
+            geometry = feature.get('geometry')
+
+            if not geometry:
+                continue
+
+            projected = _project_geometry(geometry)
+            bounds = get_bounds(projected)
+
+            if bounds is None:
+                continue
+
+            feature_properties = {k: _to_tile_value(v) for k, v in (feature.get('properties') or {}).items()
+                                  if v is not None}
+            feature_properties.update(properties or {})
+            self.features.append((bounds, projected, feature_properties))
+            num_coordinates += sum(_count_coordinates(g['coordinates'])
+                                   for g in projected.get('geometries', [projected]))
+
+        self.tree = PackedRTree.build([bounds for bounds, _, _ in self.features])
+        self.nbytes = num_coordinates * COORDINATE_NBYTES + len(self.features) * FEATURE_NBYTES
+
+    def get_tile(self, z, x, y):
+        """
+        Get a tile.
+
+        Args:
+            z(int): zoom level.
+            x(int): column of the tile.
+            y(int): row of the tile, from the top.
+
+        Returns:
+            bytes: the encoded Mapbox Vector Tile, empty if no features are in the tile.
+        """
+        mapbox_vector_tile = _import_mapbox_vector_tile()
+        from shapely.geometry import box, shape
+
+        bounds = tile_bounds(z, x, y)
+        resolution = (bounds[2] - bounds[0]) / TILE_EXTENT
+        buffer = TILE_BUFFER * resolution
+        minx, miny, maxx, maxy = bounds[0] - buffer, bounds[1] - buffer, bounds[2] + buffer, bounds[3] + buffer
+        clip_box = box(minx, miny, maxx, maxy)
+        features = []
+
+        for i in self.tree.query((minx, miny, maxx, maxy)):
+            (fminx, fminy, fmaxx, fmaxy), geometry, properties = self.features[i]
+            geom = shape(geometry)
+
+            # Only clip features that cross the buffered tile, clipping is the most expensive step
+            if fminx < minx or fmaxx > maxx or fminy < miny or fmaxy > maxy:
+                geom = geom.intersection(clip_box)
+
+            # Details smaller than a pixel of the tile are lost when the coordinates are quantized
+            geom = geom.simplify(resolution, preserve_topology=True)
+
+            if not geom.is_empty:
+                features.append({'geometry': geom, 'properties': properties})
+
+        if not features:
+            return b''
+
+        return mapbox_vector_tile.encode(
+            [{'name': self.layer_name, 'features': features}],
+            default_options={'quantize_bounds': bounds, 'extents': TILE_EXTENT}
+        )
+
+
+class PostGISTileSource(object):
+    """
+    Cuts the geometries of a PostGIS table into vector tiles in the database with ST_AsMVT. Requires PostGIS 3.0 or later.
+    """  # noqa: E501
+
+    def __init__(self, engine, table, layer_name, geometry_column='geometry', properties=(), srid=4326, schema=None):
+        """
+        Constructor.
+
+        Args:
+            engine(sqlalchemy.engine.Engine): engine connected to the database with the table.
+            table(str): name of the table.
+            layer_name(str): name of the layer in the tiles.
+            geometry_column(str): name of the geometry column.
+            properties(tuple<str>): names of the columns included as feature properties.
+            srid(int): spatial reference id of the geometry column.
+            schema(str): schema of the table. Optional.
+        """
+        self.engine = engine
+        self.table = table
+        self.layer_name = layer_name
+        self.geometry_column = geometry_column
+        self.properties = tuple(properties)
+        self.srid = int(srid)
+        self.schema = schema
+        #: The features stay in the database, so the source uses next to no memory.
+        self.nbytes = 0
+
+    def get_query(self):
+        """
+        Get the query that encodes a tile, with the :z, :x, :y and :layer_name parameters.
+
+        Returns:
+            sqlalchemy.sql.expression.TextClause: the query.
+        """
+        quote = self.engine.dialect.identifier_preparer.quote
+        table = quote(self.table) if not self.schema else '{}.{}'.format(quote(self.schema), quote(self.table))
+        geometry = 't.{}'.format(quote(self.geometry_column))
+        columns = ''.join(', t.{}'.format(quote(p)) for p in self.properties)
+
+        return text(
+            'WITH bounds AS (SELECT ST_TileEnvelope(:z, :x, :y) AS geom), '
+            'tile_features AS ('
+            'SELECT ST_AsMVTGeom(ST_Transform({geometry}, 3857), bounds.geom, {extent}, {buffer}, true) AS geom'
+            '{columns} FROM {table} t, bounds '
+            'WHERE {geometry} && ST_Transform(bounds.geom, {srid})'
+            ') '
+            'SELECT ST_AsMVT(tile_features.*, :layer_name, {extent}, \'geom\') FROM tile_features'.format(
+                geometry=geometry, columns=columns, table=table, srid=self.srid, extent=TILE_EXTENT,
+                buffer=TILE_BUFFER
+            )
+        )
+
+    def get_tile(self, z, x, y):
+        """
+        Get a tile.
+
+        Args:
+            z(int): zoom level.
+            x(int): column of the tile.
+            y(int): row of the tile, from the top.
+
+        Returns:
+            bytes: the encoded Mapbox Vector Tile, empty if no features are in the tile.
+        """
+        tile = self.engine.execute(self.get_query(), {'z': z, 'x': x, 'y': y, 'layer_name': self.layer_name}).scalar()
+        return bytes(tile or b'')
+
+
+class TileSourceCache(object):
+    """
+    Process-wide least recently used cache of tile sources, so the features of a GeoJSON layer are loaded and projected once instead of for every tile. Bounded by the number of sources and by the memory of the sources, estimated by their nbytes attribute.
+    """  # noqa: E501
+    DEFAULT_MAX_SIZE = 16
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Constructor.
+
+        Args:
+            max_size(int): maximum number of sources kept.
+            max_bytes(int): maximum estimated memory of the sources kept, in bytes. The most recently used source is kept even if it is larger. None for no limit.
+        """  # noqa: E501
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sources = OrderedDict()
+        self._nbytes = 0
+
+    def get(self, key, make_source):
+        """
+        Get a source, making it if it is not cached.
+
+        Args:
+            key(str): key of the source, must change when the data of the layer changes.
+            make_source(callable): returns the source or None if the layer does not exist.
+
+        Returns:
+            the source or None.
+        """
+        with self._lock:
+            if key in self._sources:
+                self._sources.move_to_end(key)
+                return self._sources[key]
+
+        source = make_source()
+
+        if source is not None:
+            with self._lock:
+                if key in self._sources:
+                    self._nbytes -= getattr(self._sources[key], 'nbytes', 0)
+
+                self._sources[key] = source
+                self._sources.move_to_end(key)
+                self._nbytes += getattr(source, 'nbytes', 0)
+
+                while len(self._sources) > 1 and (len(self._sources) > self.max_size or
+                                                  (self.max_bytes is not None and self._nbytes > self.max_bytes)):
+                    _, evicted = self._sources.popitem(last=False)
+                    self._nbytes -= getattr(evicted, 'nbytes', 0)
+
+        return source
+
+    def clear(self):
+        """
+        Discard all cached sources.
+        """
+        with self._lock:
+            self._sources.clear()
+            self._nbytes = 0
+
+
+#: Default process-wide cache of tile sources, using up to 256 MB. Change its max_size and max_bytes to tune it.
+tile_source_cache = TileSourceCache()
+
+#: Default process-wide cache of encoded tiles, using up to 64 MB (tiles are typically 1 to 50 KB). Change its
+#: max_size and max_bytes to tune it or set MapView.vector_tile_cache to use another backend.
+tile_cache = LocalMapCache(max_size=4096, max_bytes=64 * 1024 * 1024)
+
+
+def get_tile(key, z, x, y, get_source, cache=None):
+    """
+    Get an encoded tile from the tile cache, cutting and caching it if it is not cached.
+
+    Args:
+        key(str): key of the layer, must change when the data of the layer changes.
+        z(int): zoom level.
+        x(int): column of the tile.
+        y(int): row of the tile, from the top.
+        get_source(callable): returns the tile source of the layer or None if the layer does not exist.
+        cache(MapCacheBackend): cache of the tiles. Defaults to the process-wide tile cache.
+
+    Returns:
+        bytes: the tile or None if the layer does not exist.
+    """
+    cache = cache if cache is not None else tile_cache
+    tile_key = '{}:{}/{}/{}'.format(key, z, x, y)
+    tile = cache.get_raw(tile_key)
+
+    if tile is None:
+        source = get_source()
+
+        if source is None:
+            return None
+
+        tile = source.get_tile(z, x, y)
+        cache.set_raw(tile_key, tile)
+
+    return tile
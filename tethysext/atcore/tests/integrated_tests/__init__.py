@@ -57,7 +57,7 @@ from .models.app_users.organization_tests import OrganizationTests  # noqa: F401
 from .models.app_users.resource_tests import ResourceTests  # noqa: F401
 from .models.app_users.spatial_resource_tests import SpatialResourceTests  # noqa: F401
 from .models.app_users.resource_workflow_tests import ResourceWorkflowBaseMethodsTests  # noqa: F401
-from .models.controller_metadata_tests import ControllerMetadataTests  # noqa: F401
+from .models.controller_metadata_tests import ControllerMetadataTests, ControllerRegistryTests  # noqa: F401
 from .models.files_database.file_collection_tests import FileCollectionTests  # noqa: F401
 from .models.files_database.file_database_tests import FileDatabaseTests  # noqa: F401
 from .models.initializer import AppUserInitializerTests  # noqa: F401
@@ -159,6 +159,9 @@ class ManageResourcesTests(SqlAlchemyTestCase):
         self.assertEqual(session, update_settings_call_args[1][1]['session'])
         self.assertEqual('date_created:', update_settings_call_args[1][1]['value'])
         self.assertEqual('resources', update_settings_call_args[0][1]['page'])
+        self.assertFalse(update_settings_call_args[0][1]['commit'])
+        self.assertFalse(update_settings_call_args[1][1]['commit'])
+        session.commit.assert_called_once()
 
         mock_get_resource_action.assert_called_with(session=session, request=mock_request,
                                                     request_app_user=request_app_user, resource=self.resource)
@@ -186,6 +189,42 @@ class ManageResourcesTests(SqlAlchemyTestCase):
         self.assertTrue(render_args[0][0][2]['show_new_button'])
         self.assertTrue(render_args[0][0][2]['show_users_link'])
 
+    @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.reverse')
+    @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.render')
+    @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.paginate')
+    @mock.patch.object(ManageResources, 'get_resource_action')
+    @mock.patch.object(ManageResources, 'can_delete_resource', return_value=True)
+    @mock.patch.object(ManageResources, 'can_edit_resource', return_value=True)
+    @mock.patch.object(ManageResources, 'get_resources_query')
+    @mock.patch.object(AppUsersViewMixin, 'get_sessionmaker')
+    @mock.patch.object(AppUsersViewMixin, 'get_app_user_model')
+    @mock.patch('tethys_apps.utilities.get_active_app')
+    def test_handle_get_setting_changed_cards(self, _, mock_app_user, mock_session_maker, mock_get_resources_query, __,
+                                              ___, mock_get_resource_action, mock_paginate, ____, _____):
+        resource_id = self.resource.id
+        mock_session_maker.return_value = lambda: self.session
+        mock_app_user().get_app_user_from_request.return_value = self.app_user
+        mock_request = mock.MagicMock(spec=WSGIRequest)
+        mock_request.user = self.django_user
+        mock_request.GET = {'page': '1', 'show': '15', 'sort_by': 'name', 'search': ''}
+        mock_get_resources_query.side_effect = lambda session, *args: session.query(Resource)
+        mock_get_resource_action.return_value = {'action': 'a', 'title': 't', 'href': 'h', 'icon': 'i'}
+        mock_paginate.return_value = [mock.MagicMock(), mock.MagicMock()]
+
+        manage_resources = ManageResources()
+        manage_resources._app = mock.MagicMock(url_namespace='foo')
+        manage_resources._handle_get(mock_request)
+
+        # The settings are saved
+        self.assertEqual('15', self.app_user.get_setting(self.session, 'setting_resources-per-page', as_value=True,
+                                                         page='resources'))
+
+        # The cards keep the columns of the resources after the settings are committed
+        card = mock_paginate.call_args[1]['objects'][0]
+        self.assertEqual('test_organization', card['name'])
+        self.assertEqual(resource_id, card['id'])
+        self.assertIn('date_created', card)
+
     @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.reverse')
     @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.hasattr')
     @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.render')
@@ -205,7 +244,10 @@ class ManageResourcesTests(SqlAlchemyTestCase):
         session = mock_session_maker()()
 
         request_app_user = mock.MagicMock()
-        request_app_user.get_setting.return_value = None
+        request_app_user.get_settings.return_value = {
+            'setting_resources-per-page': None,
+            'setting_sort-resources-by': None,
+        }
         mock_app_user().get_app_user_from_request.return_value = request_app_user
 
         mock_request = mock.MagicMock(spec=WSGIRequest)
@@ -238,15 +280,14 @@ class ManageResourcesTests(SqlAlchemyTestCase):
         manage_resources._handle_get(mock_request)
 
         # test result
-        update_settings_call_args = request_app_user.get_setting.call_args_list
-
-        self.assertEqual('setting_resources-per-page', update_settings_call_args[0][1]['key'])
-        self.assertEqual(session, update_settings_call_args[0][1]['session'])
-        self.assertEqual('resources', update_settings_call_args[0][1]['page'])
-
-        self.assertEqual('setting_sort-resources-by', update_settings_call_args[1][1]['key'])
-        self.assertEqual(session, update_settings_call_args[1][1]['session'])
-        self.assertEqual('resources', update_settings_call_args[0][1]['page'])
+        request_app_user.get_settings.assert_called_once_with(
+            session=session,
+            page='resources',
+            keys=['setting_resources-per-page', 'setting_sort-resources-by'],
+            as_value=True
+        )
+        request_app_user.update_setting.assert_not_called()
+        session.commit.assert_not_called()
 
         mock_get_resource_action.assert_called_with(session=session, request=mock_request,
                                                     request_app_user=request_app_user, resource=self.resource)
@@ -510,6 +551,79 @@ class ManageResourcesTests(SqlAlchemyTestCase):
         mock_request_app_user.get_resources.assert_called_with(mock_session, mock_request, of_type='resource_type',
                                                                include_children=False)
 
+    def test_get_resources_query(self):
+        mock_request = self.request_factory.get('/foo/bar/')
+        mock_session = mock.MagicMock()
+        mock_request_app_user = mock.MagicMock()
+        with mock.patch.object(ResourceViewMixin, 'get_resource_model') as mock_get_resource_model:
+            mock_get_resource_model.return_value = 'resource_type'
+            manage_resources = ManageResources()
+            ret = manage_resources.get_resources_query(mock_session, mock_request, mock_request_app_user)
+
+        mock_request_app_user.get_resources_query.assert_called_with(
+            mock_session, mock_request, of_type='resource_type', include_children=True
+        )
+        self.assertEqual(mock_request_app_user.get_resources_query(), ret)
+
+    def test_use_query_pagination(self):
+        manage_resources = ManageResources()
+        self.assertTrue(manage_resources.use_query_pagination(self.app_user, use_datatable=False))
+        self.assertFalse(manage_resources.use_query_pagination(self.app_user, use_datatable=True))
+        manage_resources.enable_groups = True
+        self.assertFalse(manage_resources.use_query_pagination(self.app_user, use_datatable=False))
+
+    def test_use_query_pagination_get_resources_customized(self):
+        class CustomManageResources(ManageResources):
+            def get_resources(self, session, request, request_app_user):
+                return []
+
+        manage_resources = CustomManageResources()
+        self.assertFalse(manage_resources.use_query_pagination(self.app_user, use_datatable=False))
+
+    def test_filter_hidden_resources(self):
+        hidden_resource = Resource(name='hidden')
+        hidden_resource.set_status(Resource.ROOT_STATUS_KEY, Resource.STATUS_ARCHIVED)
+        available_resource = Resource(name='available')
+        available_resource.set_status(Resource.ROOT_STATUS_KEY, Resource.STATUS_AVAILABLE)
+        self.session.add_all([hidden_resource, available_resource])
+        self.session.commit()
+
+        ret = ManageResources.filter_hidden_resources(self.session.query(Resource), Resource).all()
+
+        self.assertIn(self.resource, ret)
+        self.assertIn(available_resource, ret)
+        self.assertNotIn(hidden_resource, ret)
+
+    def test_search_resources_query(self):
+        self.session.add_all([
+            Resource(name='Alpha Model', description='foo'),
+            Resource(name='beta', description='An ALPHA description'),
+            Resource(name='gamma', created_by='alpha_user'),
+            Resource(name='delta'),
+        ])
+        self.session.commit()
+
+        manage_resources = ManageResources()
+        ret = manage_resources.search_resources_query(self.session.query(Resource), Resource, 'alpha').all()
+
+        self.assertEqual({'Alpha Model', 'beta', 'gamma'}, {r.name for r in ret})
+
+    def test_sort_resources_query(self):
+        self.session.add_all([Resource(name='b'), Resource(name='a'), Resource(name=None)])
+        self.session.commit()
+        query = self.session.query(Resource)
+
+        ret = ManageResources.sort_resources_query(query, Resource, 'name', False).all()
+        self.assertEqual(['a', 'b', 'test_organization', None], [r.name for r in ret])
+
+        ret = ManageResources.sort_resources_query(query, Resource, 'name', True).all()
+        self.assertEqual([None, 'test_organization', 'b', 'a'], [r.name for r in ret])
+
+    def test_sort_resources_query_invalid_field(self):
+        query = self.session.query(Resource)
+        ret = ManageResources.sort_resources_query(query, Resource, 'not_a_field', False).all()
+        self.assertEqual([self.resource], ret)
+
     @mock.patch('tethysext.atcore.controllers.app_users.manage_resources.has_permission')
     def test_can_edit_resource(self, mock_has_permission):
         mock_request = self.request_factory.get('/foo/bar/')
@@ -69,7 +69,7 @@ class ManageUsersTests(SqlAlchemyTestCase):
 
         user_get_permission_patcher = mock.patch.object(AppUsersViewMixin, 'get_permissions_manager')  # noqa: E501
         self.mock_user_get_permission = user_get_permission_patcher.start()
-        self.mock_user_get_permission.return_value = True
+        self.mock_user_get_permission.return_value = mock.MagicMock()
         self.addCleanup(user_get_permission_patcher.stop)
 
         get_session_patcher = mock.patch.object(AppUsersViewMixin, 'get_sessionmaker')  # noqa: E501
@@ -6,16 +6,20 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import io
 import json
 from unittest import mock
+import zipfile
 from tethysext.atcore.controllers.app_users.mixins import AppUsersViewMixin, ResourceViewMixin
 from tethysext.atcore.controllers.resource_view import ResourceView
 from tethysext.atcore.tests.factories.django_user import UserFactory
 from django.test import RequestFactory
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from tethys_sdk.base import TethysAppBase
 from tethysext.atcore.controllers.map_view import MapView
 from tethysext.atcore.models.app_users import AppUser, Organization, Resource
+from tethysext.atcore.services import vector_tiles
+from tethysext.atcore.services.map_cache import LocalMapCache
 from tethysext.atcore.services.map_manager import MapManagerBase
 from tethysext.atcore.services.model_db_spatial_manager import ModelDBSpatialManager
 from tethysext.atcore.services.app_users.permissions_manager import AppPermissionsManager
@@ -46,7 +50,7 @@ class MapViewTests(SqlAlchemyTestCase):
         mock_map_view.layers = [{'source': 'ImageWMS', 'layer': 'ImageWMS'},
                                 {'source': 'TileWMS', 'layer': 'TileWMS'},
                                 {'source': 'GeoJSON', 'layer': 'GeoJSON'}]
-        self.mock_map_manager().compose_map.return_value = (
+        self.mock_map_manager().get_composed_map.return_value = (
             mock_map_view, mock.MagicMock(), mock.MagicMock()
         )
 
@@ -206,7 +210,7 @@ class MapViewTests(SqlAlchemyTestCase):
         resource_id = '12345'
         mock_request = self.request_factory.get('/foo/bar/map-view/')
         mock_request.user = self.django_user
-        self.mock_map_manager().compose_map.return_value = (
+        self.mock_map_manager().get_composed_map.return_value = (
             mock.MagicMock(), mock.MagicMock(), [{'id': 'custom_layers'}]
         )
 
@@ -1028,5 +1032,59 @@ class MapViewTests(SqlAlchemyTestCase):
         mv = MapView()
         mv.get_map_manager = mock.MagicMock(return_value=mock_map_manager)
 
-        # TODO: this method only works with pyshape 1.x, not 2.x
-        # response = mv.convert_geojson_to_shapefile(mock_request, self.session, mock_resource)
+        response = mv.convert_geojson_to_shapefile(mock_request, self.session, mock_resource)
+
+        self.assertEqual('attachment; filename="layer_id_Point.zip"', response['Content-Disposition'])
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as zf:
+            self.assertEqual(
+                ['layer_id_Point.shp', 'layer_id_Point.shx', 'layer_id_Point.dbf', 'layer_id_Point.prj',
+                 'layer_id_Point.cpg'],
+                zf.namelist()
+            )
+
+    def test_get_vector_tile(self):
+        mock_request = self.request_factory.get('/foo/bar/map-view', data={
+            'method': 'get-vector-tile', 'layer_id': 'roads', 'v': 'abc', 'z': 12, 'x': 800, 'y': 1500
+        })
+        mock_request.user = self.django_user
+        mock_resource = mock.MagicMock(spec=Resource)
+        mock_source = mock.MagicMock()
+        mock_source.get_tile.return_value = b'tile'
+        vector_tiles.tile_source_cache.clear()
+
+        mv = MapView(vector_tile_cache=LocalMapCache())
+        mv.get_vector_tile_source = mock.MagicMock(return_value=mock_source)
+
+        response = mv.get_vector_tile(mock_request, self.session, mock_resource, back_url='/foo/')
+        mv.get_vector_tile(mock_request, self.session, mock_resource, back_url='/foo/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b'tile', response.content)
+        self.assertEqual('application/vnd.mapbox-vector-tile', response['Content-Type'])
+        self.assertEqual('private, max-age=3600', response['Cache-Control'])
+        # Cut once, then served from the tile cache
+        mv.get_vector_tile_source.assert_called_once_with(
+            mock_request, self.session, mock_resource, 'roads', 'abc', back_url='/foo/'
+        )
+        mock_source.get_tile.assert_called_once_with(12, 800, 1500)
+
+    def test_get_vector_tile_invalid(self):
+        mv = MapView(vector_tile_cache=LocalMapCache())
+
+        invalid_params = (
+            {'z': 1, 'x': 0},
+            {'z': 'a', 'x': 0, 'y': 0},
+            {'z': 1, 'x': 2, 'y': 0},
+            {'z': -1, 'x': 0, 'y': 0},
+        )
+
+        for params in invalid_params:
+            mock_request = self.request_factory.get('/foo/bar/map-view', data=params)
+            response = mv.get_vector_tile(mock_request, self.session, mock.MagicMock(spec=Resource))
+            self.assertEqual(400, response.status_code)
+
+    def test_get_vector_tile_not_found(self):
+        mock_request = self.request_factory.get('/foo/bar/map-view', data={'layer_id': 'roads', 'z': 0, 'x': 0, 'y': 0})
+        mv = MapView(vector_tile_cache=LocalMapCache())
+
+        self.assertRaises(Http404, mv.get_vector_tile, mock_request, self.session, mock.MagicMock(spec=Resource))
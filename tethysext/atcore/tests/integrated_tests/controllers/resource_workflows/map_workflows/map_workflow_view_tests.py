@@ -72,7 +72,7 @@ class MapWorkflowViewTests(WorkflowViewTestCase):
         self.mock_app.root_url = 'test'
 
         self.mock_map_manager = mock.MagicMock(spec=MapManagerBase)
-        self.mock_map_manager().compose_map.return_value = (
+        self.mock_map_manager().get_composed_map.return_value = (
             mock.MagicMock(), mock.MagicMock(), mock.MagicMock()
         )
         self.controller = MapWorkflowView.as_controller(
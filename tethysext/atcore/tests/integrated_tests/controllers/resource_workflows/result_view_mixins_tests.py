@@ -6,11 +6,13 @@
 * Copyright: (c) Aquaveo 2019
 ********************************************************************************
 """
+import json
 from unittest import mock
+import pandas as pd
 from tethysext.atcore.controllers.app_users.mixins import AppUsersViewMixin
 from tethysext.atcore.models.app_users import ResourceWorkflow
 from tethysext.atcore.controllers.resource_workflows.mixins import WorkflowViewMixin
-from tethysext.atcore.controllers.resource_workflows.mixins import ResultViewMixin
+from tethysext.atcore.controllers.resource_workflows.mixins import ResultViewMixin, DatasetTableViewMixin
 from tethysext.atcore.models.app_users.resource_workflow_result import ResourceWorkflowResult
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
@@ -65,3 +67,112 @@ class ResultViewMixinTests(SqlAlchemyTestCase):
         mock_get_session.return_value = query
 
         ClassWithResultViewMixin().get_result(request, 'a')
+
+
+class ClassWithDatasetTableViewMixin(DatasetTableViewMixin):
+    server_side_row_threshold = 2
+
+
+class DatasetTableViewMixinTests(SqlAlchemyTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.instance = ClassWithDatasetTableViewMixin()
+        self.request = mock.MagicMock(path='/apps/foo/results/')
+        self.result = mock.MagicMock(id='abc', num_datasets=1)
+        self.data_frame = pd.DataFrame({'x': [3, 1, 2], 'y': ['c', 'a', 'b']})
+        self.result.get_dataset.return_value = {'dataset': self.data_frame}
+        self.result.get_dataset_shape.return_value = (['x', 'y'], 3)
+
+    def test_get_server_side_table_kwargs_small(self):
+        self.result.get_dataset_shape.return_value = (['x', 'y'], 2)
+        ret = self.instance.get_server_side_table_kwargs(self.request, self.result, 0)
+        self.assertIsNone(ret)
+
+    def test_get_server_side_table_kwargs_large(self):
+        ret = self.instance.get_server_side_table_kwargs(self.request, self.result, 0)
+        self.assertTrue(ret['serverSide'])
+        self.assertTrue(ret['paging'])
+        self.assertEqual('/apps/foo/results/?method=get-dataset-rows&result-id=abc&dataset=0', ret['ajax'])
+
+    def test_get_data_table_dataset_small(self):
+        self.result.get_dataset_shape.return_value = (['x', 'y'], 2)
+        self.result.get_dataset.return_value = {'title': 'foo', 'dataset': self.data_frame.iloc[:2]}
+
+        ret_dataset, ret_kwargs = self.instance.get_data_table_dataset(self.request, self.result, 0)
+
+        self.result.get_dataset.assert_called_with(0)
+        self.assertEqual('foo', ret_dataset['title'])
+        self.assertListEqual(['x', 'y'], list(ret_kwargs['column_names']))
+        self.assertListEqual([[3, 'c'], [1, 'a']], ret_kwargs['rows'])
+        self.assertNotIn('serverSide', ret_kwargs)
+
+    def test_get_data_table_dataset_large(self):
+        self.result.get_dataset_metadata.return_value = {'title': 'foo'}
+
+        ret_dataset, ret_kwargs = self.instance.get_data_table_dataset(self.request, self.result, 0)
+
+        # The rows of the dataset are never loaded
+        self.result.get_dataset.assert_not_called()
+        self.result.get_dataset_metadata.assert_called_with(0)
+        self.assertDictEqual({'title': 'foo'}, ret_dataset)
+        self.assertListEqual(['x', 'y'], ret_kwargs['column_names'])
+        self.assertListEqual([], ret_kwargs['rows'])
+        self.assertTrue(ret_kwargs['serverSide'])
+
+    @mock.patch.object(ClassWithDatasetTableViewMixin, 'get_result')
+    def test_get_dataset_rows(self, mock_get_result):
+        mock_get_result.return_value = self.result
+        self.request.GET = {
+            'result-id': 'abc',
+            'dataset': '0',
+            'draw': '2',
+            'start': '0',
+            'length': '2',
+            'order[0][column]': '0',
+            'order[0][dir]': 'asc',
+        }
+
+        ret = self.instance.get_dataset_rows(self.request, self.session, mock.MagicMock())
+
+        mock_get_result.assert_called_with(self.request, 'abc', self.session)
+        self.result.get_dataset.assert_called_with(0, columns=None)
+        self.assertDictEqual({
+            'draw': 2,
+            'recordsTotal': 3,
+            'recordsFiltered': 3,
+            'data': [[1, 'a'], [2, 'b']],
+        }, json.loads(ret.content))
+
+    @mock.patch.object(ClassWithDatasetTableViewMixin, 'get_result')
+    def test_get_dataset_rows_invalid_dataset(self, mock_get_result):
+        mock_get_result.return_value = self.result
+        self.request.GET = {'result-id': 'abc', 'dataset': '5'}
+        ret = self.instance.get_dataset_rows(self.request, self.session, mock.MagicMock())
+        self.assertEqual(400, ret.status_code)
+
+        self.request.GET = {'result-id': 'abc', 'dataset': 'foo'}
+        ret = self.instance.get_dataset_rows(self.request, self.session, mock.MagicMock())
+        self.assertEqual(400, ret.status_code)
+
+    @mock.patch.object(ClassWithDatasetTableViewMixin, 'get_result')
+    def test_get_dataset_rows_fields(self, mock_get_result):
+        mock_get_result.return_value = self.result
+        self.result.get_dataset.return_value = {'dataset': self.data_frame[['y']]}
+        self.request.GET = {'result-id': 'abc', 'dataset': '0', 'fields': 'y'}
+
+        ret = self.instance.get_dataset_rows(self.request, self.session, mock.MagicMock())
+
+        self.result.get_dataset.assert_called_with(0, columns=['y'])
+        self.assertListEqual([['c'], ['a'], ['b']], json.loads(ret.content)['data'])
+
+    @mock.patch.object(ClassWithDatasetTableViewMixin, 'get_result')
+    def test_get_dataset_rows_invalid_fields(self, mock_get_result):
+        mock_get_result.return_value = self.result
+        self.request.GET = {'result-id': 'abc', 'dataset': '0', 'fields': 'y,foo'}
+
+        ret = self.instance.get_dataset_rows(self.request, self.session, mock.MagicMock())
+
+        self.assertEqual(400, ret.status_code)
+        self.assertDictEqual({'error': 'Invalid fields: foo.'}, json.loads(ret.content))
+        self.result.get_dataset.assert_not_called()
@@ -2,6 +2,7 @@ from unittest import mock
 import pandas as pd
 from tethysext.atcore.controllers.resource_workflows.results_views.dataset_workflow_results_view import DatasetWorkflowResultView  # noqa: E501
 from tethysext.atcore.controllers.resource_workflows.workflow_results_view import WorkflowResultsView
+from tethysext.atcore.models.resource_workflow_results import DatasetWorkflowResult
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
     tear_down_module_for_sqlalchemy_tests
@@ -37,11 +38,13 @@ class DatasetWorkflowResultViewTests(SqlAlchemyTestCase):
 
         mock_pandas_data = mock.MagicMock(spec=pd.DataFrame)
         mock_pandas_data.columns = ['foo', 'bar', 'baz']
+        mock_result.get_dataset_shape.return_value = (['foo', 'bar', 'baz'], 0)
         mock_result.name = 'bar'
-        mock_result.datasets = [{
+        mock_result.num_datasets = 1
+        mock_result.get_dataset.return_value = {
             'dataset': mock_pandas_data,
             'show_export_button': True,
-        }]
+        }
         mock_permission.return_value = True
         mock_options = mock.MagicMock()
         mock_result.options = mock_options
@@ -53,7 +56,7 @@ class DatasetWorkflowResultViewTests(SqlAlchemyTestCase):
         baseline = {
             'no_dataset_message': 'baz',
             'page_title': 'bar',
-            'datasets': mock_result.datasets
+            'datasets': [mock_result.get_dataset.return_value]
         }
         mock_options.get.side_effect = ['bar', data_table_options, 'baz']
         mock_sup_get_context.return_value = {}
@@ -113,11 +116,13 @@ class DatasetWorkflowResultViewTests(SqlAlchemyTestCase):
 
         mock_pandas_data = mock.MagicMock(spec=pd.DataFrame)
         mock_pandas_data.columns = ['foo', 'bar', 'baz']
+        mock_result.get_dataset_shape.return_value = (['foo', 'bar', 'baz'], 0)
         mock_result.name = 'bar'
-        mock_result.datasets = [{
+        mock_result.num_datasets = 1
+        mock_result.get_dataset.return_value = {
             'dataset': mock_pandas_data,
             'show_export_button': True,
-        }]
+        }
         # User does NOT have export permission
         mock_permission.return_value = False
         mock_options = mock.MagicMock()
@@ -130,7 +135,7 @@ class DatasetWorkflowResultViewTests(SqlAlchemyTestCase):
         baseline = {
             'no_dataset_message': 'baz',
             'page_title': 'bar',
-            'datasets': mock_result.datasets
+            'datasets': [mock_result.get_dataset.return_value]
         }
         mock_options.get.side_effect = ['bar', data_table_options, 'baz']
         mock_sup_get_context.return_value = {}
@@ -171,3 +176,55 @@ class DatasetWorkflowResultViewTests(SqlAlchemyTestCase):
         mock_permission.assert_called_with(mock_request, 'can_export_datatable')
 
         self.assertDictEqual(baseline, ret)
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.read_dataframe')
+    @mock.patch('tethysext.atcore.controllers.resource_workflows.results_views.dataset_workflow_results_view.has_permission')  # noqa: E501
+    @mock.patch.object(DatasetWorkflowResultView, 'get_result')
+    @mock.patch.object(WorkflowResultsView, 'get_context')
+    def test_get_context_large_dataset_not_loaded(self, mock_sup_get_context, mock_get_result, mock_permission,
+                                                  mock_read_dataframe):
+        mock_request = mock.MagicMock(path='/apps/foo/results/')
+        small_data_frame = pd.DataFrame({'x': [1, 2], 'y': ['a', 'b']})
+        result = DatasetWorkflowResult(name='bar')
+        result.datasets = [
+            {
+                'title': 'Large',
+                'dataset': {
+                    '__dataset_reference__': True,
+                    'path': 'large.parquet',
+                    'columns': ['x', 'y'],
+                    'num_rows': self.instance.server_side_row_threshold + 1,
+                },
+                'show_export_button': False,
+            },
+            {
+                'title': 'Small',
+                'dataset': small_data_frame,
+                'show_export_button': False,
+            },
+        ]
+        mock_get_result.return_value = result
+        mock_permission.return_value = True
+        mock_sup_get_context.return_value = {}
+
+        ret = self.instance.get_context(
+            request=mock_request,
+            session=mock.MagicMock(),
+            resource=mock.MagicMock(),
+            context=mock.MagicMock(),
+            workflow_id=mock.MagicMock(),
+            step_id=mock.MagicMock(),
+            result_id=mock.MagicMock()
+        )
+
+        # The large dataset is processed on the server and never read
+        mock_read_dataframe.assert_not_called()
+
+        large, small = ret['datasets']
+        self.assertEqual('Large', large['title'])
+        self.assertNotIn('dataset', large)
+        self.assertListEqual(['x', 'y'], list(large['data_table'].column_names))
+        self.assertListEqual([], large['data_table'].rows)
+        self.assertEqual('true', large['data_table'].datatable_options['server-side'])
+        self.assertEqual('Small', small['title'])
+        self.assertListEqual([[1, 'a'], [2, 'b']], small['data_table'].rows)
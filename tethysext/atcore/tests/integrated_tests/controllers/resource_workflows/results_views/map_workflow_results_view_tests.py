@@ -1,4 +1,5 @@
 import copy
+import json
 from unittest import mock
 from django.http import JsonResponse
 from tethys_sdk.gizmos import MapView
@@ -414,12 +415,123 @@ class MapWorkflowResultViewTests(SqlAlchemyTestCase):
         ret = instance.get_plot_data(mock_request, mock_session, mock_resource, result_id)
 
         mock_get_result.assert_called_with(mock_request, result_id, mock_session)
-        mock_result.get_layer.assert_called_with(mock_post['layer_name'])
+        mock_result.get_layer.assert_called_with(mock_post['layer_name'], feature_id=mock_post['feature_id'])
         mock_gpfg.assert_called_with(self.layer, mock_post['feature_id'])
         self.assertIsInstance(ret, JsonResponse)
         self.assertEqual(b'{"title": "Mock Title", "data": ["mock", "data"], "layout": {"mock": "layout"}}',
                          ret.content)
 
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_plot_data_geojson_overridden(self, mock_get_result):
+        self.perpare_geojson_layers()
+        mock_post = {
+            'layer_name': self.layer['layer_name'],
+            'feature_id': '1'
+        }
+        mock_request = mock.MagicMock(POST=mock_post)
+        result_id = '123'
+        mock_result = mock.MagicMock(id=result_id)
+        mock_result.get_layer.return_value = self.layer
+        mock_get_result.return_value = mock_result
+
+        class OverriddenMapWorkflowResultsView(MapWorkflowResultsView):
+            def get_plot_for_geojson(self, layer, feature_id):
+                return 'Overridden', [], {}
+
+        instance = OverriddenMapWorkflowResultsView()
+        ret = instance.get_plot_data(mock_request, mock.MagicMock(), mock.MagicMock(), result_id)
+
+        self.assertDictEqual({'title': 'Overridden', 'data': [], 'layout': {}}, json.loads(ret.content))
+
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_layer_features_by_id(self, mock_get_result):
+        self.perpare_geojson_layers()
+        feature = self.layer['geojson']['features'][0]
+        mock_request = mock.MagicMock(method='GET', GET={'layer_id': 'foo', 'feature_id': '1'})
+        mock_result = mock.MagicMock()
+        mock_result.get_feature.return_value = feature
+        mock_get_result.return_value = mock_result
+
+        instance = MapWorkflowResultsView()
+        ret = instance.get_layer_features(mock_request, mock.MagicMock(), mock.MagicMock(), '123')
+
+        mock_result.get_feature.assert_called_with('foo', '1')
+        self.assertDictEqual({'type': 'FeatureCollection', 'features': [feature]}, json.loads(ret.content))
+
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_layer_features_by_bbox(self, mock_get_result):
+        mock_request = mock.MagicMock(method='GET', GET={'layer_id': 'foo', 'bbox': '-88,30,-87,31'})
+        mock_result = mock.MagicMock()
+        mock_result.query_features.return_value = []
+        mock_get_result.return_value = mock_result
+
+        instance = MapWorkflowResultsView()
+        ret = instance.get_layer_features(mock_request, mock.MagicMock(), mock.MagicMock(), '123')
+
+        mock_result.query_features.assert_called_with('foo', (-88.0, 30.0, -87.0, 31.0))
+        self.assertDictEqual({'type': 'FeatureCollection', 'features': []}, json.loads(ret.content))
+
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_layer_features_invalid_bbox(self, _):
+        instance = MapWorkflowResultsView()
+
+        for bbox in ('', '1,2,3', 'a,b,c,d'):
+            mock_request = mock.MagicMock(method='GET', GET={'layer_id': 'foo', 'bbox': bbox})
+            ret = instance.get_layer_features(mock_request, mock.MagicMock(), mock.MagicMock(), '123')
+            self.assertEqual(400, ret.status_code)
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.spatial_workflow_result.get_geojson_version')
+    def test_get_vector_tile_url(self, mock_get_geojson_version):
+        self.perpare_geojson_layers()
+        result = SpatialWorkflowResult(geoserver_name='', map_manager=None, spatial_manager=None)
+        result.layers = [self.layer]
+        version = result.data['layer_indexes'][self.layer['layer_name']]['version']
+        mock_get_geojson_version.reset_mock()
+        mock_request = mock.MagicMock(path='/apps/foo/results/')
+        mock_map_manager = mock.MagicMock(VECTOR_TILE_FEATURE_THRESHOLD=0)
+
+        ret = self.instance.get_vector_tile_url(mock_request, mock_map_manager, result, self.layer)
+
+        # The version stored with the index of the layer is used instead of hashing the features again
+        mock_get_geojson_version.assert_not_called()
+        self.assertEqual(f'/apps/foo/results/?method=get-vector-tile&layer_id={self.layer["layer_name"]}&v={version}'
+                         f'&z={{z}}&x={{x}}&y={{y}}', ret)
+
+    def test_get_vector_tile_url_small_layer(self):
+        self.perpare_geojson_layers()
+        mock_map_manager = mock.MagicMock(VECTOR_TILE_FEATURE_THRESHOLD=1000)
+
+        ret = self.instance.get_vector_tile_url(mock.MagicMock(), mock_map_manager, mock.MagicMock(), self.layer)
+
+        self.assertIsNone(ret)
+
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_vector_tile_source(self, mock_get_result):
+        self.perpare_geojson_layers()
+        mock_result = mock.MagicMock()
+        mock_result.get_layer_version.return_value = 'abc'
+        mock_result.get_layer.return_value = self.layer
+        mock_get_result.return_value = mock_result
+
+        ret = self.instance.get_vector_tile_source(mock.MagicMock(), mock.MagicMock(), mock.MagicMock(), 'foo',
+                                                   'abc', '123')
+
+        mock_result.get_layer_version.assert_called_with('foo')
+        self.assertEqual(len(self.layer['geojson']['features']), len(ret.features))
+
+    @mock.patch.object(MapWorkflowResultsView, 'get_result')
+    def test_get_vector_tile_source_changed(self, mock_get_result):
+        mock_result = mock.MagicMock()
+        mock_result.get_layer_version.return_value = 'def'
+        mock_get_result.return_value = mock_result
+
+        ret = self.instance.get_vector_tile_source(mock.MagicMock(), mock.MagicMock(), mock.MagicMock(), 'foo',
+                                                   'abc', '123')
+
+        self.assertIsNone(ret)
+        # The features of a changed layer are not copied
+        mock_result.get_layer.assert_not_called()
+
     @mock.patch.object(MapWorkflowView, 'get_plot_data')
     @mock.patch.object(MapWorkflowResultsView, 'get_result')
     def test_get_plot_data_wms(self, mock_get_result, mock_mwv_get_plot_data):
@@ -441,7 +553,7 @@ class MapWorkflowResultViewTests(SqlAlchemyTestCase):
         ret = instance.get_plot_data(mock_request, mock_session, mock_resource, result_id)
 
         mock_get_result.assert_called_with(mock_request, result_id, mock_session)
-        mock_result.get_layer.assert_called_with(mock_post['layer_name'])
+        mock_result.get_layer.assert_called_with(mock_post['layer_name'], feature_id=mock_post['feature_id'])
         mock_mwv_get_plot_data.assert_called_with(mock_request, mock_session, mock_resource)
         self.assertIsInstance(ret, JsonResponse)
         self.assertEqual(b'{"title": "Mock Title", "data": ["mock", "data"], "layout": {"mock": "layout"}}',
@@ -467,7 +579,7 @@ class MapWorkflowResultViewTests(SqlAlchemyTestCase):
             self.assertRaises(TypeError, instance.get_plot_data, mock_request, mock_session, mock_resource, result_id)
 
         mock_get_result.assert_called_with(mock_request, result_id, mock_session)
-        mock_result.get_layer.assert_called_with(mock_post['layer_name'])
+        mock_result.get_layer.assert_called_with(mock_post['layer_name'], feature_id=mock_post['feature_id'])
 
     def test_get_plot_for_geojson(self):
         self.perpare_geojson_layers()
@@ -6,11 +6,13 @@
 * Copyright: (c) Aquaveo 2020
 ********************************************************************************
 """
+import io
 import os
 from unittest import mock
 import uuid
+import zipfile
 
-from django.http import HttpResponse, Http404
+from django.http import Http404, StreamingHttpResponse
 from django.test import RequestFactory
 
 from tethysext.atcore.models.file_database import FileCollection, FileDatabase
@@ -151,9 +153,136 @@ class FilesTabTests(SqlAlchemyTestCase):
                                                '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2')
 
             ret = instance.download_file(request, self.resource, self.session)
-            self.assertTrue(isinstance(ret, HttpResponse))
-            self.assertEqual(ret.content, b'Text for test to check.')
+            self.assertTrue(isinstance(ret, StreamingHttpResponse))
+            self.assertEqual(b''.join(ret.streaming_content), b'Text for test to check.')
             self.assertEqual(ret['Content-Disposition'], 'filename=file1.txt')
+            self.assertEqual(ret['Content-Length'], '23')
+            self.assertEqual(ret['Accept-Ranges'], 'bytes')
+            self.assertIn('ETag', ret)
+            self.assertIn('Last-Modified', ret)
+
+    def test_download_file_range(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_file'
+                                               '&file-path=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir1/file1.txt'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2',
+                                               HTTP_RANGE='bytes=5-7')
+
+            ret = instance.download_file(request, self.resource, self.session)
+            self.assertEqual(ret.status_code, 206)
+            self.assertEqual(b''.join(ret.streaming_content), b'for')
+            self.assertEqual(ret['Content-Range'], 'bytes 5-7/23')
+            self.assertEqual(ret['Content-Length'], '3')
+
+    def test_download_file_range_suffix(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_file'
+                                               '&file-path=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir1/file1.txt'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2',
+                                               HTTP_RANGE='bytes=-6')
+
+            ret = instance.download_file(request, self.resource, self.session)
+            self.assertEqual(ret.status_code, 206)
+            self.assertEqual(b''.join(ret.streaming_content), b'check.')
+            self.assertEqual(ret['Content-Range'], 'bytes 17-22/23')
+
+    def test_download_file_range_not_satisfiable(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_file'
+                                               '&file-path=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir1/file1.txt'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2',
+                                               HTTP_RANGE='bytes=100-')
+
+            ret = instance.download_file(request, self.resource, self.session)
+            self.assertEqual(ret.status_code, 416)
+            self.assertEqual(ret['Content-Range'], 'bytes */23')
+
+    def test_download_file_not_modified(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            url = '/foo/12345/bar/files/?tab_action=download_file' \
+                  '&file-path=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir1/file1.txt' \
+                  '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2'
+            etag = instance.download_file(self.request_factory.get(url), self.resource, self.session)['ETag']
+
+            ret = instance.download_file(self.request_factory.get(url, HTTP_IF_NONE_MATCH=etag),
+                                         self.resource, self.session)
+            self.assertEqual(ret.status_code, 304)
+
+    def test_download_file_outside_collection(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_file'
+                                               '&file-path=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/../__meta__.json'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2')
+
+            with self.assertRaises(Http404):
+                instance.download_file(request, self.resource, self.session)
+
+    def test_download_folder(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_folder'
+                                               '&folder-path=/d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir1'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2')
+
+            ret = instance.download_folder(request, self.resource, self.session)
+            self.assertTrue(isinstance(ret, StreamingHttpResponse))
+            self.assertEqual(ret['Content-Disposition'], 'attachment; filename=dir1.zip')
+            with zipfile.ZipFile(io.BytesIO(b''.join(ret.streaming_content))) as zf:
+                self.assertEqual(sorted(zf.namelist()), ['file1.txt', 'file2.txt'])
+                self.assertEqual(zf.read('file1.txt'), b'Text for test to check.')
+
+    def test_download_folder_collection(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_folder'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2')
+
+            ret = instance.download_folder(request, self.resource, self.session)
+            self.assertEqual(ret['Content-Disposition'],
+                             'attachment; filename=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2.zip')
+            with zipfile.ZipFile(io.BytesIO(b''.join(ret.streaming_content))) as zf:
+                self.assertEqual(sorted(zf.namelist()), ['dir1/file1.txt', 'dir1/file2.txt', 'file5.txt'])
+
+    def test_download_folder_fail(self):
+        with mock.patch.object(ResourceFilesTab, 'get_file_collections') as mock_get_file_collection:
+            instance = ResourceFilesTab()
+
+            mock_get_file_collection.return_value = [self.file_collection_client]
+
+            request = self.request_factory.get('/foo/12345/bar/files/?tab_action=download_folder'
+                                               '&folder-path=/d6fa7e10-d8aa-4b3d-b08a-62384d3daca2/dir9'
+                                               '&collection-id=d6fa7e10-d8aa-4b3d-b08a-62384d3daca2')
+
+            with self.assertRaises(Http404) as exc:
+                instance.download_folder(request, self.resource, self.session)
+
+            self.assertTrue('Unable to download folder.' in str(exc.exception))
 
     def test_download_file_fail(self):
         """Test default implementation of get_summary_tab_info."""
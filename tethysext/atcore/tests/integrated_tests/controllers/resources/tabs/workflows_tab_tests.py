@@ -387,6 +387,28 @@ class ResourceWorkflowsTabTests(SqlAlchemyTestCase):
 
         self.verify_workflow_cards(context['workflow_cards'][0], ResourceWorkflow.STATUS_COMPLETE)
 
+    def test_get_context_workflow_status_stale(self):
+        """Verify workflow cards for workflow with a status that was set in SQL."""
+        instance = ResourceWorkflowsTab()
+        request = self.request_factory.get('/foo/12345/bar/workflows/')
+
+        # Set request user
+        user = self.get_user(return_app_user=True, user_role=Roles.ORG_USER)  # User is ORG_USER
+        request.user = user.django_user
+
+        # Set status of step without loading the workflow, which marks the stored status of the workflow stale
+        self.step1.set_status_atomic(self.session, status=ResourceWorkflowStep.STATUS_COMPLETE)
+        self.session.commit()
+        self.assertIsNone(self.workflow._status)
+
+        context = instance.get_context(request, self.session, self.resource, {})
+
+        self.assertIn('workflow_cards', context)
+        self.assertEqual(1, len(context['workflow_cards']))
+
+        self.verify_workflow_cards(context['workflow_cards'][0], ResourceWorkflow.STATUS_COMPLETE)
+        self.assertEqual(ResourceWorkflow.STATUS_COMPLETE, self.workflow._status)
+
     def test_get_context_workflow_status_error(self):
         """Verify workflow cards for workflow that has error status."""
         instance = ResourceWorkflowsTab()
@@ -1,5 +1,8 @@
 import json
-from tethysext.atcore.models.app_users import AppUser
+from unittest import mock
+from sqlalchemy import text
+from sqlalchemy.exc import DataError
+from tethysext.atcore.models.app_users import AppUser, Resource
 from tethysext.atcore.mixins.attributes_mixin import AttributesMixin
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
@@ -98,3 +101,152 @@ class AttributesMixinTests(SqlAlchemyTestCase):
         self.assertEqual(1, len(val))
         self.assertIn('user', val)
         self.assertEqual(str(app_user.id), val['user'])
+
+    def test_get_attribute_decodes_once(self):
+        self.instance._attributes = self.attributes_json
+
+        with mock.patch('tethysext.atcore.mixins.attributes_mixin.json.loads', wraps=json.loads) as mock_loads:
+            for _ in range(10):
+                self.instance.get_attribute('foo')
+                self.instance.get_attribute('num')
+
+        mock_loads.assert_called_once()
+
+    def test_get_attribute_decodes_after_change(self):
+        self.instance._attributes = self.attributes_json
+        self.assertEqual('bar', self.instance.get_attribute('foo'))
+        self.instance._attributes = json.dumps({'foo': 'baz'})
+        self.assertEqual('baz', self.instance.get_attribute('foo'))
+
+    def test_get_attribute_returns_copy(self):
+        self.instance.set_attribute('files', ['a.txt'])
+        files = self.instance.get_attribute('files')
+        files.append('b.txt')
+        self.instance.attributes['files'].append('c.txt')
+        self.assertListEqual(['a.txt'], self.instance.get_attribute('files'))
+
+    def test_set_attribute_mapped_serialized_on_flush(self):
+        resource = Resource(name='foo')
+        resource.set_attribute('foo', 'foo')
+        self.session.add(resource)
+        self.session.commit()
+
+        with mock.patch('tethysext.atcore.mixins.attributes_mixin.json.dumps', wraps=json.dumps) as mock_dumps:
+            resource.set_attribute('foo', 'bar')
+            resource.set_attribute('num', 1)
+            resource.set_attribute('files', ['a.txt'])
+            # Only the values are checked, the attributes are serialized once when the session is flushed
+            self.assertListEqual(
+                [mock.call('bar', allow_nan=False), mock.call(1, allow_nan=False),
+                 mock.call(['a.txt'], allow_nan=False)],
+                mock_dumps.call_args_list
+            )
+            self.assertIn(resource, self.session.dirty)
+
+            self.session.commit()
+
+        self.assertEqual(4, mock_dumps.call_count)
+        self.session.expire(resource)
+        self.assertDictEqual({'foo': 'bar', 'num': 1, 'files': ['a.txt']}, json.loads(resource._attributes))
+        self.assertEqual('bar', resource.get_attribute('foo'))
+
+    def test_set_attribute_mapped_visible_to_queries(self):
+        resource = Resource(name='foo')
+        self.session.add(resource)
+        self.session.commit()
+
+        resource.set_attribute('foo', 'bar')
+        ret = self.session.query(Resource).filter(Resource._attributes.contains('"foo": "bar"')).all()
+        self.assertListEqual([resource], ret)
+
+    def test_set_attribute_mapped_expired(self):
+        resource = Resource(name='foo')
+        resource.set_attribute('foo', 'bar')
+        self.session.add(resource)
+        self.session.commit()
+
+        resource.set_attribute('foo', 'baz')
+        self.session.expire(resource)
+        self.assertEqual('bar', resource.get_attribute('foo'))
+
+    def test_set_attribute_not_serializable(self):
+        self.instance.set_attribute('foo', 'bar')
+
+        with self.assertRaises(TypeError):
+            self.instance.set_attribute('foo', object())
+
+        with self.assertRaises(TypeError):
+            self.instance.attributes = {'foo': object()}
+
+        self.assertDictEqual({'foo': 'bar'}, self.instance.attributes)
+
+    def test_set_attribute_not_finite(self):
+        for value in (float('nan'), float('inf'), [1, float('-inf')]):
+            with self.assertRaises(ValueError):
+                self.instance.set_attribute('foo', value)
+
+        self.assertDictEqual({}, self.instance.attributes)
+
+    def test_set_attribute_detached_merged(self):
+        resource = Resource(name='foo')
+        resource.set_attribute('foo', 'bar')
+        self.session.add(resource)
+        self.session.commit()
+        self.session.refresh(resource)
+        self.session.expunge(resource)
+
+        # Serialized immediately, the instance is not in a session
+        resource.set_attribute('num', 1)
+        self.assertDictEqual({'foo': 'bar', 'num': 1}, json.loads(resource._attributes))
+
+        merged = self.session.merge(resource)
+        self.session.commit()
+        self.session.expire(merged)
+        self.assertDictEqual({'foo': 'bar', 'num': 1}, merged.attributes)
+
+    def test_attributes_contain(self):
+        resource_1 = Resource(name='foo')
+        resource_1.set_attribute('database_id', '1234')
+        resource_1.set_attribute('files', ['a.txt'])
+        resource_2 = Resource(name='bar')
+        resource_2.set_attribute('database_id', '5678')
+        self.session.add_all([resource_1, resource_2])
+        self.session.commit()
+
+        ret = self.session.query(Resource).filter(Resource.attributes_contain(database_id='1234')).all()
+        self.assertListEqual([resource_1], ret)
+        ret = self.session.query(Resource).filter(Resource.attributes_contain(files=['a.txt'])).all()
+        self.assertListEqual([resource_1], ret)
+        ret = self.session.query(Resource).filter(Resource.attributes_contain(database_id='0000')).all()
+        self.assertListEqual([], ret)
+
+    def test_create_attributes_index(self):
+        Resource.create_attributes_index(self.connection)
+        Resource.create_attributes_index(self.connection)
+        indexes = self.connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'app_users_resources'")
+        ).scalars().all()
+        self.assertIn('ix_app_users_resources_attributes_gin', indexes)
+
+    def test_attributes_contain_empty_attributes(self):
+        resource_1 = Resource(name='foo')
+        resource_1.set_attribute('database_id', '1234')
+        self.session.add(resource_1)
+        self.session.commit()
+        # Empty attributes are valid and must not break the index or the filter
+        self.session.execute(text("INSERT INTO app_users_resources (id, name, type, public, _attributes) "
+                                  "VALUES ('0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0', 'bar', 'resource', false, '')"))
+        Resource.create_attributes_index(self.session.connection())
+
+        ret = self.session.query(Resource).filter(Resource.attributes_contain(database_id='1234')).all()
+        self.assertListEqual([resource_1], ret)
+
+    @mock.patch('tethysext.atcore.mixins.attributes_mixin.log')
+    def test_create_attributes_index_error(self, mock_log):
+        error = DataError('CREATE INDEX', {}, Exception('invalid input syntax for type json'))
+        mock_ddl = mock.MagicMock(side_effect=error)
+
+        with mock.patch.object(Resource, 'get_attributes_index_ddl', return_value=mock_ddl):
+            Resource.create_attributes_index(mock.MagicMock())
+
+        mock_log.warning.assert_called_once()
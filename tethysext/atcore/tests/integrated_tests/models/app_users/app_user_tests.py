@@ -214,6 +214,15 @@ class AppUserTests(SqlAlchemyTestCase):
         returned_django_user = self.user.get_django_user()
         self.assertIsNone(returned_django_user)
 
+    def test_prefetch_django_users(self):
+        missing_user = AppUser(username='missing', role=AppUser.ROLES.ORG_USER)
+        self.user._django_user = None
+
+        AppUser.prefetch_django_users([self.user, missing_user])
+
+        self.assertEqual(self.django_user, self.user._django_user)
+        self.assertIsNone(missing_user._django_user)
+
     def test_validate_role_valid(self):
         self.user.role = AppUser.ROLES.ORG_ADMIN
         self.assertEqual(AppUser.ROLES.ORG_ADMIN, self.user.role)
@@ -260,6 +269,24 @@ class AppUserTests(SqlAlchemyTestCase):
         self.assertIsNotNone(app_user)
         self.assertEqual(anonymous_username, app_user.username)
 
+    def test_get_app_user_from_request_cached(self):
+        app_user = AppUser.get_app_user_from_request(self.user_request, self.session)
+
+        with patch.object(self.session, 'query') as mock_query:
+            ret = AppUser.get_app_user_from_request(self.user_request, self.session)
+
+        mock_query.assert_not_called()
+        self.assertIs(app_user, ret)
+
+    def test_get_app_user_from_request_cached_other_session(self):
+        AppUser.get_app_user_from_request(self.user_request, self.session)
+        other_session = MagicMock()
+
+        ret = AppUser.get_app_user_from_request(self.user_request, other_session)
+
+        other_session.query.assert_called()
+        self.assertEqual(other_session.query().filter().one_or_none(), ret)
+
     def test_get_organization_model_default(self):
         organization_model = AppUser.get_organization_model()
         self.assertEqual(Organization, organization_model)
@@ -750,6 +777,68 @@ class AppUserTests(SqlAlchemyTestCase):
         self.assertIsInstance(return_val, UserSetting)
         self.assertEqual('bar', return_val.value)
 
+    def test_get_setting_cached(self):
+        setting = UserSetting(
+            user_id=self.user.id,
+            key='foo',
+            value='bar'
+        )
+        self.session.add(setting)
+        self.session.commit()
+        return_val = self.user.get_setting(self.session, key='foo')
+
+        with patch.object(self.session, 'query') as mock_query:
+            self.assertIs(return_val, self.user.get_setting(self.session, key='foo'))
+            self.assertIsNone(self.user.get_setting(self.session, key='foo', page='a_page'))
+
+        self.assertEqual(1, mock_query.call_count)
+
+    def test_get_setting_cached_other_session(self):
+        self.user.get_setting(self.session, key='foo')
+        other_session = MagicMock()
+
+        self.assertIsNone(self.user.get_setting(other_session, key='foo'))
+        other_session.query.assert_called_once()
+
+    def test_get_setting_cached_deleted(self):
+        settings = self._init_settings_same_keys()
+        self.assertIs(settings[0], self.user.get_setting(self.session, 'one'))
+        self.user.delete_existing_settings(self.session, [settings[0]])
+        self.assertIsNone(self.user.get_setting(self.session, 'one'))
+
+    def test_get_settings(self):
+        self._init_settings_different_keys()
+        return_val = self.user.get_settings(self.session, ['one', 'two', 'three'], page='a_page')
+        self.assertListEqual(['one', 'two', 'three'], list(return_val.keys()))
+        self.assertIsNone(return_val['one'])
+        self.assertIsInstance(return_val['two'], UserSetting)
+        self.assertEqual('two', return_val['two'].key)
+
+    def test_get_settings_as_value(self):
+        self._init_settings_different_keys()
+        return_val = self.user.get_settings(self.session, ['one', 'two'], as_value=True)
+        self.assertDictEqual({'one': '1', 'two': None}, return_val)
+
+    def test_get_settings_one_query(self):
+        self._init_settings_different_keys()
+        self.user.get_setting(self.session, 'one')
+
+        with patch.object(self.session, 'query', wraps=self.session.query) as mock_query:
+            self.user.get_settings(self.session, ['one', 'two'])
+            self.user.get_settings(self.session, ['one', 'two'])
+
+        self.assertEqual(1, mock_query.call_count)
+
+    def test_clear_settings_cache(self):
+        self.user.get_setting(self.session, 'one')
+        self.session.add(UserSetting(user_id=self.user.id, key='one', value='1'))
+        self.session.commit()
+        self.assertIsNone(self.user.get_setting(self.session, 'one'))
+
+        self.user.clear_settings_cache()
+
+        self.assertEqual('1', self.user.get_setting(self.session, 'one', as_value=True))
+
     def test_get_all_settings(self):
         self._init_settings_different_keys()
         return_val = self.user.get_all_settings(self.session)
@@ -812,6 +901,18 @@ class AppUserTests(SqlAlchemyTestCase):
         all_one_settings = self.session.query(UserSetting).filter(UserSetting.key == 'one').all()
         self.assertEqual(1, len(all_one_settings))
 
+    def test_update_setting_no_commit_cached(self):
+        self.user.update_setting(self.session, 'one', '1', commit=False)
+        self.user.update_setting(self.session, 'two', '2', commit=False)
+        self.assertEqual('1', self.user.get_setting(self.session, 'one', as_value=True))
+        self.session.commit()
+        self.assertEqual(2, self.session.query(UserSetting).count())
+
+    def test_update_setting_rollback(self):
+        self.user.update_setting(self.session, 'one', '1', commit=False)
+        self.session.rollback()
+        self.assertIsNone(self.user.get_setting(self.session, 'one'))
+
     @patch('tethys_sdk.permissions.has_permission', side_effect=mock_has_permission_false)
     def test_can_view_direct_true(self, mock_has_permission_function):
         return_val = self.user.can_view(self.session, self.user_request, self.rsrc1)
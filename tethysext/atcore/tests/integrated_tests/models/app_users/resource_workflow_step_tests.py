@@ -1,9 +1,10 @@
 import json
 from unittest import mock
+from sqlalchemy import inspect, update
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
     tear_down_module_for_sqlalchemy_tests
-from tethysext.atcore.models.app_users import ResourceWorkflow, ResourceWorkflowStep
+from tethysext.atcore.models.app_users import ResourceWorkflow, ResourceWorkflowStep, ResourceWorkflowStepParameter
 
 
 def setUpModule():
@@ -147,9 +148,8 @@ class ResourceWorkflowStepTests(SqlAlchemyTestCase):
         calls = [mock.call('param_1', True), mock.call('not_found_param', 'foo')]
         mock_set_param.assert_has_calls(calls)
 
-    @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.deepcopy')
     @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.ResourceWorkflowStep.init_parameters')
-    def test_set_parameter(self, mock_init_params, mock_dc):
+    def test_set_parameter(self, mock_init_params):
         parameters = {
             'param_1': {
                 'help': 'test parameter',
@@ -161,7 +161,119 @@ class ResourceWorkflowStepTests(SqlAlchemyTestCase):
         self.step = ResourceWorkflowStep(name='bar', help='step_1', order=1)
 
         self.step.set_parameter(name='param_1', value=True)
-        mock_dc.assert_called()
+
+        self.assertTrue(self.step.get_parameter('param_1'))
+        self.assertTrue(self.step.dirty)
+
+    @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.ResourceWorkflowStep.init_parameters')
+    def test_set_parameter_changed_in_place(self, mock_init_params):
+        mock_init_params.return_value = {
+            'param_1': {'help': 'test parameter', 'value': {'a': 1}, 'required': False},
+        }
+        self.step = ResourceWorkflowStep(name='bar', help='step_1', order=1)
+        self.session.add(self.step)
+        self.session.commit()
+
+        value = self.step.get_parameter('param_1')
+        value['b'] = 2
+        self.step.set_parameter('param_1', value)
+        self.session.commit()
+
+        # Saved with a single commit
+        self.session.expire_all()
+        self.assertDictEqual({'a': 1, 'b': 2}, self.step.get_parameter('param_1'))
+
+    @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.ResourceWorkflowStep.init_parameters')
+    def test_parameters_stored_per_parameter(self, mock_init_params):
+        mock_init_params.return_value = {
+            'form': {'help': 'small', 'value': 'foo', 'required': True},
+            'geometry': {'help': 'large', 'value': {'type': 'FeatureCollection', 'features': []}, 'required': False},
+        }
+        self.step = ResourceWorkflowStep(name='bar', help='step_1', order=1)
+        self.session.add(self.step)
+        self.session.commit()
+        self.session.expire_all()
+
+        self.assertEqual('foo', self.step.get_parameter('form'))
+
+        # Only the value that was read is loaded
+        rows = self.step._parameter_rows
+        self.assertNotIn('value', inspect(rows['form']).unloaded)
+        self.assertIn('value', inspect(rows['geometry']).unloaded)
+
+        stored = self.session.query(ResourceWorkflowStepParameter).\
+            filter(ResourceWorkflowStepParameter.resource_workflow_step_id == self.step.id).\
+            order_by(ResourceWorkflowStepParameter.name).\
+            all()
+        self.assertListEqual(['form', 'geometry'], [p.name for p in stored])
+        self.assertDictEqual({'help': 'small', 'required': True}, stored[0].definition)
+
+    @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.ResourceWorkflowStep.init_parameters')
+    def test_get_parameters_loads_values(self, mock_init_params):
+        parameters = {
+            'param_1': {'help': 'first', 'value': 1, 'required': False},
+            'param_2': {'help': 'second', 'value': [1, 2], 'required': True},
+        }
+        mock_init_params.return_value = parameters
+        self.step = ResourceWorkflowStep(name='bar', help='step_1', order=1)
+        self.session.add(self.step)
+        self.session.commit()
+        self.session.expire_all()
+
+        self.assertDictEqual(parameters, self.step.get_parameters())
+
+    def test_set_parameters_replaces_parameters(self):
+        step_id = self.step.id
+        self.step._parameters = {
+            'param_1': {'help': 'first', 'value': 1, 'required': False},
+            'param_2': {'help': 'second', 'value': 2, 'required': False},
+        }
+        self.session.commit()
+
+        # Names are kept unique when replaced in the same flush
+        self.step._parameters = {
+            'param_2': {'help': 'second', 'value': 3, 'required': False},
+            'param_3': 'not a dictionary',
+        }
+        self.session.commit()
+        self.session.expire_all()
+
+        self.assertDictEqual({
+            'param_2': {'help': 'second', 'value': 3, 'required': False},
+            'param_3': 'not a dictionary',
+        }, self.step._parameters)
+        stored = self.session.query(ResourceWorkflowStepParameter).filter_by(resource_workflow_step_id=step_id)
+        self.assertEqual(2, stored.count())
+
+    def test_legacy_parameters(self):
+        step_id = self.step.id
+        # Parameters saved in the column of the step before they were stored per parameter
+        self.session.execute(
+            update(ResourceWorkflowStep.__table__).
+            where(ResourceWorkflowStep.__table__.c.id == self.step.id).
+            values(_parameters={'param_1': {'help': 'test parameter', 'value': 'foo', 'required': False}})
+        )
+        self.session.commit()
+        self.session.expire_all()
+
+        self.assertEqual('foo', self.step.get_parameter('param_1'))
+        self.session.commit()
+
+        self.assertIsNone(self.step._legacy_parameters)
+        stored = self.session.query(ResourceWorkflowStepParameter).filter_by(resource_workflow_step_id=step_id)
+        self.assertEqual(1, stored.count())
+        self.assertEqual('foo', self.step.get_parameter('param_1'))
+
+    def test_delete_step_deletes_parameters(self):
+        step_id = self.step.id
+        self.step._parameters = {'param_1': {'help': 'test parameter', 'value': 1, 'required': False}}
+        self.session.commit()
+
+        self.session.delete(self.step)
+        self.session.commit()
+
+        stored = self.session.query(ResourceWorkflowStepParameter).filter_by(resource_workflow_step_id=step_id)
+        self.assertEqual(0, stored.count())
 
     @mock.patch('tethysext.atcore.models.app_users.resource_workflow_step.ResourceWorkflowStep.init_parameters')
     def test_set_parameter_name_not_found(self, mock_init_params):
@@ -281,3 +393,93 @@ class ResourceWorkflowStepTests(SqlAlchemyTestCase):
             value_error_raised = True
             self.assertEqual('Property "active_roles" must be a list of strings. Got "[1, 2, 3]" instead.', str(e))
         self.assertTrue(value_error_raised)
+
+    def test_set_status_atomic(self):
+        # Simulate another process updating a different key after the step was loaded
+        self.session.execute(
+            update(ResourceWorkflowStep.__table__).
+            where(ResourceWorkflowStep.__table__.c.id == self.step.id).
+            values(status=json.dumps({'root': self.step.STATUS_PENDING, 'other': self.step.STATUS_WORKING}))
+        )
+
+        self.step.set_status_atomic(self.session, self.step.ROOT_STATUS_KEY, self.step.STATUS_COMPLETE)
+
+        self.assertNotIn(self.step, self.session.dirty)
+        self.assertEqual(self.step.STATUS_COMPLETE, self.step.get_status())
+        self.assertEqual(self.step.STATUS_WORKING, self.step.get_status('other'))
+
+        self.session.commit()
+        self.session.expire(self.step)
+        self.assertEqual(self.step.STATUS_COMPLETE, self.step.get_status())
+        self.assertEqual(self.step.STATUS_WORKING, self.step.get_status('other'))
+
+    def test_set_status_atomic_marks_workflow_status_stale(self):
+        self.assertEqual(self.workflow.STATUS_PENDING, self.workflow._status)
+
+        self.step.set_status_atomic(self.session, self.step.ROOT_STATUS_KEY, self.step.STATUS_COMPLETE)
+        self.session.commit()
+
+        self.assertIsNone(self.workflow._status)
+        self.assertEqual(self.workflow.STATUS_COMPLETE, self.workflow.get_stored_status())
+
+    def test_set_status_atomic_other_key_workflow_status_not_stale(self):
+        self.step.set_status_atomic(self.session, 'other', self.step.STATUS_COMPLETE)
+        self.session.commit()
+
+        self.assertEqual(self.workflow.STATUS_PENDING, self.workflow._status)
+
+    def test_set_status_atomic_null_status(self):
+        self.step.status = None
+        self.session.commit()
+
+        self.step.set_status_atomic(self.session, 'other', self.step.STATUS_FAILED)
+        self.session.commit()
+        self.session.expire(self.step)
+
+        self.assertEqual(self.step.STATUS_FAILED, self.step.get_status('other'))
+        self.assertIsNone(self.step.get_status())
+
+    def test_set_status_atomic_transient(self):
+        instance = ResourceWorkflowStep(name='foo', help='step_0', order=1)
+        instance.set_status_atomic(self.session, self.step.ROOT_STATUS_KEY, self.step.STATUS_WORKING)
+        self.assertEqual(self.step.STATUS_WORKING, instance.get_status())
+
+    def test_set_status_atomic_invalid(self):
+        with self.assertRaises(ValueError):
+            self.step.set_status_atomic(self.session, self.step.ROOT_STATUS_KEY, 'not-a-status')
+
+    def test_job_statuses(self):
+        self.assertDictEqual({}, self.step.get_job_status_counts(self.session))
+        self.assertEqual(self.step.STATUS_COMPLETE, self.step.get_job_status(self.session))
+
+        self.step.add_job_status(self.session, self.step.STATUS_COMPLETE)
+        self.step.add_job_status(self.session, self.step.STATUS_COMPLETE)
+        self.session.commit()
+
+        self.assertDictEqual({self.step.STATUS_COMPLETE: 2}, self.step.get_job_status_counts(self.session))
+        self.assertEqual(self.step.STATUS_COMPLETE, self.step.get_job_status(self.session))
+
+        self.step.add_job_status(self.session, self.step.STATUS_FAILED)
+        self.session.commit()
+
+        self.assertDictEqual({self.step.STATUS_COMPLETE: 2, self.step.STATUS_FAILED: 1},
+                             self.step.get_job_status_counts(self.session))
+        self.assertEqual(self.step.STATUS_FAILED, self.step.get_job_status(self.session))
+
+        self.step.clear_job_statuses(self.session)
+        self.session.commit()
+
+        self.assertDictEqual({}, self.step.get_job_status_counts(self.session))
+
+    def test_job_statuses_legacy_attribute(self):
+        self.step.set_attribute(self.step.ATTR_CONDOR_JOB_STATUSES, [self.step.STATUS_FAILED])
+        self.step.add_job_status(self.session, self.step.STATUS_COMPLETE)
+        self.session.commit()
+
+        self.assertDictEqual({self.step.STATUS_COMPLETE: 1, self.step.STATUS_FAILED: 1},
+                             self.step.get_job_status_counts(self.session))
+        self.assertEqual(self.step.STATUS_FAILED, self.step.get_job_status(self.session))
+
+    def test_add_job_status_invalid(self):
+        with self.assertRaises(ValueError):
+            self.step.add_job_status(self.session, 'not-a-status')
@@ -161,20 +161,107 @@ class ResourceWorkflowBaseMethodsTests(SqlAlchemyTestCase):
 
     @mock.patch('tethysext.atcore.models.app_users.resource_workflow.ResourceWorkflow.get_next_step')
     def test_get_status_first_step_not_pending(self, mock_next_step):
+        mock_next_step.return_value = (0, self.step_1)
         self.step_1.set_status(self.step_1.ROOT_STATUS_KEY, self.step_1.STATUS_ERROR)
         self.step_2.set_status(self.step_2.ROOT_STATUS_KEY, self.step_2.STATUS_PENDING)
-        mock_next_step.return_value = (0, self.step_1)
         ret = self.workflow.get_status()
         self.assertEqual(self.workflow.STATUS_ERROR, ret)
 
     @mock.patch('tethysext.atcore.models.app_users.resource_workflow.ResourceWorkflow.get_next_step')
     def test_get_status_not_first_step(self, mock_next_step):
+        mock_next_step.return_value = (1, self.step_2)
         self.step_1.set_status(self.step_1.ROOT_STATUS_KEY, self.step_1.STATUS_COMPLETE)
         self.step_2.set_status(self.step_2.ROOT_STATUS_KEY, self.step_2.STATUS_PENDING)
-        mock_next_step.return_value = (1, self.step_2)
         ret = self.workflow.get_status()
         self.assertEqual(self.workflow.STATUS_CONTINUE, ret)
 
+    def test_update_status(self):
+        self.step_1.set_status(self.step_1.ROOT_STATUS_KEY, self.step_1.STATUS_COMPLETE)
+        self.step_2.set_status(self.step_2.ROOT_STATUS_KEY, self.step_2.STATUS_WORKING)
+
+        ret = self.workflow.update_status()
+
+        self.assertEqual(self.workflow.STATUS_WORKING, ret)
+        self.assertEqual(self.workflow.STATUS_WORKING, self.workflow._status)
+        self.assertEqual(1, self.workflow._next_step_index)
+
+    def test_update_status_no_steps(self):
+        workflow = ResourceWorkflow(name='foo')
+        self.assertEqual(ResourceWorkflowStep.STATUS_NONE, workflow.update_status())
+        self.assertIsNone(workflow._next_step_index)
+
+    def test_stored_status_updated_on_flush(self):
+        self.assertEqual(self.workflow.STATUS_PENDING, self.workflow._status)
+        self.assertEqual(0, self.workflow._next_step_index)
+
+        self.step_1.set_status(self.step_1.ROOT_STATUS_KEY, self.step_1.STATUS_COMPLETE)
+        self.session.commit()
+
+        self.assertEqual(self.workflow.STATUS_CONTINUE, self.workflow._status)
+        self.assertEqual(1, self.workflow.next_step_index)
+
+        self.step_2.set_status(self.step_2.ROOT_STATUS_KEY, self.step_2.STATUS_FAILED)
+        self.session.commit()
+
+        self.assertEqual(self.workflow.STATUS_FAILED, self.workflow.get_stored_status())
+
+    def test_stored_status_updated_on_flush_new_step(self):
+        for step in (self.step_1, self.step_2, self.step_3):
+            step.set_status(step.ROOT_STATUS_KEY, step.STATUS_COMPLETE)
+        self.session.commit()
+        self.assertEqual(self.workflow.STATUS_COMPLETE, self.workflow._status)
+
+        self.workflow.steps.append(self.step_4)
+        self.session.commit()
+
+        self.assertEqual(self.workflow.STATUS_CONTINUE, self.workflow._status)
+        self.assertEqual(3, self.workflow._next_step_index)
+
+    def test_stored_status_stale_on_step_deleted(self):
+        self.step_1.set_status(self.step_1.ROOT_STATUS_KEY, self.step_1.STATUS_WORKING)
+        self.session.commit()
+
+        self.session.delete(self.step_1)
+        self.session.commit()
+
+        self.assertIsNone(self.workflow._status)
+        self.assertEqual(self.workflow.STATUS_PENDING, self.workflow.get_stored_status())
+        self.assertEqual(0, self.workflow.next_step_index)
+
+    def test_get_stored_status_stale(self):
+        self.workflow._status = None
+
+        with mock.patch.object(ResourceWorkflow, 'update_status', return_value='foo') as mock_update_status:
+            ret = self.workflow.get_stored_status()
+
+        self.assertEqual('foo', ret)
+        mock_update_status.assert_called_once()
+
+    def test_get_stored_status_not_stale(self):
+        with mock.patch.object(ResourceWorkflow, 'update_status') as mock_update_status:
+            ret = self.workflow.get_stored_status()
+
+        self.assertEqual(self.workflow.STATUS_PENDING, ret)
+        mock_update_status.assert_not_called()
+
+    def test_update_stale_statuses(self):
+        self.session.add(self.another_workflow)
+        self.session.commit()
+        self.step_5.set_status_atomic(self.session, self.step_5.ROOT_STATUS_KEY, self.step_5.STATUS_COMPLETE)
+        self.session.commit()
+
+        ret = ResourceWorkflow.update_stale_statuses(self.session, [self.workflow, self.another_workflow])
+
+        self.assertListEqual([self.another_workflow], ret)
+        self.assertEqual(self.workflow.STATUS_COMPLETE, self.another_workflow._status)
+        self.assertEqual(self.workflow.STATUS_PENDING, self.workflow._status)
+
+    def test_update_stale_statuses_none_stale(self):
+        session = mock.MagicMock()
+        ret = ResourceWorkflow.update_stale_statuses(session, [self.workflow])
+        self.assertListEqual([], ret)
+        session.query.assert_not_called()
+
     def test_get_adjacent_steps_first_step(self):
         prev_step, next_step = self.workflow.get_adjacent_steps(self.step_1)
         self.assertIsNone(prev_step)
@@ -1,9 +1,11 @@
+import sys
+import unittest
 from unittest import mock
 from tethys_sdk.base import TethysController
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
     tear_down_module_for_sqlalchemy_tests
-from tethysext.atcore.models.controller_metadata import ControllerMetadata
+from tethysext.atcore.models.controller_metadata import ControllerMetadata, ControllerRegistry, controller_registry
 from tethysext.atcore.controllers.app_users.mixins import ResourceViewMixin
 from tethysext.atcore.controllers.resource_workflows.workflow_view import ResourceWorkflowView
 
@@ -35,6 +37,7 @@ class ControllerMetadataTests(SqlAlchemyTestCase):
 
     def setUp(self):
         super().setUp()
+        controller_registry.clear()
         self.controller_kwargs = {'foo': 'goo'}
 
         self.instance = ControllerMetadata(
@@ -95,3 +98,103 @@ class ControllerMetadataTests(SqlAlchemyTestCase):
     def test_instantiate_ImportError_module_dne(self):
         self.instance.path = 'tethysext.atcore.tests.integrated_tests.models.fake_module.FakeController'
         self.assertRaises(ImportError, self.instance.instantiate)
+
+    @mock.patch('tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeController.as_controller')  # noqa: E501
+    def test_instantiate_registered(self, mock_as_controller):
+        self.instance.path = 'tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeController'
+        ret1 = self.instance.instantiate(bar='baz')
+        ret2 = self.instance.instantiate(bar='baz')
+        mock_as_controller.assert_called_once_with(foo='goo', bar='baz')
+        self.assertIs(ret1, ret2)
+
+        self.instance.instantiate(bar='qux')
+        mock_as_controller.assert_called_with(foo='goo', bar='qux')
+        self.assertEqual(2, mock_as_controller.call_count)
+
+
+FAKE_CONTROLLER_PATH = 'tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeController'
+
+
+class ControllerRegistryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ControllerRegistry(max_size=2)
+
+    @mock.patch('tethysext.atcore.models.controller_metadata.import_from_string')
+    def test_resolve(self, mock_import):
+        mock_import.return_value = FakeController
+
+        self.assertIs(FakeController, self.registry.resolve(FAKE_CONTROLLER_PATH))
+        self.assertIs(FakeController, self.registry.resolve(FAKE_CONTROLLER_PATH))
+
+        mock_import.assert_called_once_with(FAKE_CONTROLLER_PATH)
+
+    def test_resolve_module_reloaded(self):
+        self.assertIs(FakeController, self.registry.resolve(FAKE_CONTROLLER_PATH))
+
+        class ReloadedController(TethysController):
+            pass
+
+        # Replaced in its module, as when the module is reloaded
+        with mock.patch.object(sys.modules[__name__], 'FakeController', ReloadedController):
+            self.assertIs(ReloadedController, self.registry.resolve(FAKE_CONTROLLER_PATH))
+
+        self.assertIs(FakeController, self.registry.resolve(FAKE_CONTROLLER_PATH))
+
+    def test_resolve_ImportError(self):
+        self.assertRaises(ImportError, self.registry.resolve, 'tethysext.atcore.tests.fake_module.FakeController')
+        self.assertRaises(ImportError, self.registry.resolve, 'FakeController')
+
+    @mock.patch.object(FakeController, 'as_controller')
+    def test_get_controller(self, mock_as_controller):
+        mock_as_controller.side_effect = ['a', 'b', 'c', 'd']
+
+        self.assertEqual('a', self.registry.get_controller(FakeController, {'foo': 1}))
+        self.assertEqual('a', self.registry.get_controller(FakeController, {'foo': 1}))
+        self.assertEqual('b', self.registry.get_controller(FakeController, {'foo': 2}))
+        self.assertEqual('c', self.registry.get_controller(FakeController, {'foo': 3}))
+        # Least recently used discarded
+        self.assertEqual('d', self.registry.get_controller(FakeController, {'foo': 1}))
+        self.assertEqual(4, mock_as_controller.call_count)
+
+    @mock.patch.object(FakeController, 'as_controller')
+    def test_get_controller_unhashable_kwargs(self, mock_as_controller):
+        self.registry.get_controller(FakeController, {'foo': {'bar': 1}})
+        self.registry.get_controller(FakeController, {'foo': {'bar': 1}})
+
+        self.assertEqual(2, mock_as_controller.call_count)
+        mock_as_controller.assert_called_with(foo={'bar': 1})
+
+    @mock.patch.object(FakeResourceViewMixin, 'as_controller')
+    def test_warm(self, mock_as_controller):
+        self.registry.warm(
+            ['', 'tethysext.atcore.tests.fake_module.FakeController',
+             'tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeResourceViewMixin'],
+            foo='goo', _ResourceWorkflowStep='step'
+        )
+
+        mock_as_controller.assert_called_once_with(foo='goo')
+        self.registry.instantiate(
+            'tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeResourceViewMixin', {},
+            foo='goo', _ResourceWorkflowStep='step'
+        )
+        mock_as_controller.assert_called_once()
+
+    @mock.patch('tethysext.atcore.models.controller_metadata.log')
+    @mock.patch.object(FakeController, 'as_controller')
+    @mock.patch.object(FakeResourceViewMixin, 'as_controller')
+    def test_warm_error(self, mock_as_controller, mock_fake_as_controller, mock_log):
+        mock_as_controller.side_effect = ValueError('foo')
+
+        self.registry.warm(
+            ['tethysext.atcore.tests.integrated_tests.models.controller_metadata_tests.FakeResourceViewMixin',
+             FAKE_CONTROLLER_PATH]
+        )
+
+        mock_log.exception.assert_called_once()
+        mock_fake_as_controller.assert_called_once()
+
+    def test_clear(self):
+        self.registry.resolve(FAKE_CONTROLLER_PATH)
+        self.registry.clear()
+        self.assertDictEqual({}, self.registry._classes)
@@ -1,6 +1,11 @@
 from unittest import mock
+import os
+import shutil
+import tempfile
 import pandas as pd
 from tethysext.atcore.models.resource_workflow_results import DatasetWorkflowResult
+from tethysext.atcore.models.resource_workflow_results.dataset_workflow_result import PENDING_DATASET_DELETES
+from tethysext.atcore.services.file_database import FileCollectionClient, FileDatabaseClient
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
     tear_down_module_for_sqlalchemy_tests
@@ -84,3 +89,112 @@ class DatasetWorkflowResultTests(SqlAlchemyTestCase):
     def test_add_pandas_dataframe_empty_dataframe(self):
         mock_dataframe = mock.MagicMock(spec=pd.DataFrame, empty=True)
         self.assertRaises(ValueError, self.instance.add_pandas_dataframe, 'foo', mock_dataframe)
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.write_dataframe')
+    def test_add_pandas_dataframe_out_of_row(self, mock_write_dataframe):
+        mock_dataframe = mock.MagicMock(spec=pd.DataFrame, empty=False)
+        mock_client = mock.MagicMock()
+        self.instance.add_pandas_dataframe('foo', mock_dataframe, file_collection_client=mock_client,
+                                           storage_format='arrow')
+        mock_write_dataframe.assert_called_with(mock_client, mock_dataframe, storage_format='arrow')
+        self.assertEqual(mock_write_dataframe(), self.instance.data['datasets'][0]['dataset'])
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.read_dataframe')
+    def test_get_dataset_out_of_row(self, mock_read_dataframe):
+        ref = {'__dataset_reference__': True, 'storage_format': 'parquet', 'path': 'foo.parquet'}
+        self.instance._add_dataset({'title': 'foo', 'dataset': ref})
+        self.instance._add_dataset({'title': 'bar', 'dataset': pd.DataFrame({'x': [1], 'y': [2]})})
+
+        ret = self.instance.get_dataset(0, columns=['x'])
+        mock_read_dataframe.assert_called_once_with(ref, columns=['x'], file_collection_client=None)
+        self.assertEqual(mock_read_dataframe(), ret['dataset'])
+        # Stored reference is not replaced by the loaded DataFrame
+        self.assertEqual(ref, self.instance.data['datasets'][0]['dataset'])
+
+        ret = self.instance.get_dataset(1, columns=['y'])
+        self.assertListEqual(['y'], list(ret['dataset'].columns))
+        self.assertEqual(2, self.instance.num_datasets)
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.read_dataframe')
+    def test_get_dataset_shape(self, mock_read_dataframe):
+        ref = {'__dataset_reference__': True, 'storage_format': 'parquet', 'path': 'foo.parquet',
+               'columns': ['x', 'y'], 'num_rows': 5}
+        self.instance._add_dataset({'title': 'foo', 'dataset': ref})
+        self.instance._add_dataset({'title': 'bar', 'dataset': pd.DataFrame({'x': [1, 2], 'y': [3, 4]})})
+
+        self.assertEqual((['x', 'y'], 5), self.instance.get_dataset_shape(0))
+        self.assertEqual((['x', 'y'], 2), self.instance.get_dataset_shape(1))
+        mock_read_dataframe.assert_not_called()
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.read_dataframe')
+    def test_get_dataset_metadata(self, mock_read_dataframe):
+        ref = {'__dataset_reference__': True, 'storage_format': 'parquet', 'path': 'foo.parquet',
+               'columns': ['x', 'y'], 'num_rows': 5}
+        self.instance._add_dataset({'title': 'foo', 'dataset': ref, 'show_export_button': True})
+
+        self.assertDictEqual({'title': 'foo', 'show_export_button': True}, self.instance.get_dataset_metadata(0))
+        mock_read_dataframe.assert_not_called()
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.delete_dataframe')
+    def test_reset_out_of_row(self, mock_delete_dataframe):
+        ref = {'__dataset_reference__': True, 'storage_format': 'parquet', 'path': 'foo.parquet'}
+        self.instance._add_dataset({'title': 'foo', 'dataset': ref})
+        self.instance.reset()
+        mock_delete_dataframe.assert_called_with(ref, file_collection_client=None)
+        self.assertListEqual([], self.instance.datasets)
+
+    def add_out_of_row_dataset(self):
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir)
+        database_client = FileDatabaseClient.new(self.session, root_dir)
+        collection_client = FileCollectionClient.new(self.session, database_client)
+        self.instance.add_pandas_dataframe('foo', pd.DataFrame({'x': [1, 2, 3]}),
+                                           file_collection_client=collection_client)
+        self.bind_instance_to_session()
+        return collection_client, self.instance.data['datasets'][0]['dataset']
+
+    def test_reset_out_of_row_bound_commit(self):
+        collection_client, ref = self.add_out_of_row_dataset()
+
+        with mock.patch.object(FileCollectionClient, 'invalidate_directory_index') as mock_invalidate:
+            self.instance.reset()
+            self.assertTrue(os.path.isfile(ref['path']))
+
+            self.session.commit()
+
+        self.assertFalse(os.path.exists(ref['path']))
+        mock_invalidate.assert_called_once_with(ref['item'])
+        self.assertListEqual([], self.instance.datasets)
+
+    def test_reset_out_of_row_bound_rollback(self):
+        collection_client, ref = self.add_out_of_row_dataset()
+
+        self.instance.reset()
+        self.session.rollback()
+        self.assertNotIn(PENDING_DATASET_DELETES, self.session.info)
+        self.session.commit()
+
+        self.assertTrue(os.path.isfile(ref['path']))
+
+    def test_reset_out_of_row_bound_file_collection_client(self):
+        collection_client, ref = self.add_out_of_row_dataset()
+        mock_client = mock.MagicMock()
+
+        self.instance.reset(file_collection_client=mock_client)
+        mock_client.delete_item.assert_not_called()
+        self.session.commit()
+
+        mock_client.delete_item.assert_called_once_with(ref['item'])
+        self.assertTrue(os.path.isfile(ref['path']))
+
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.log')
+    @mock.patch('tethysext.atcore.models.resource_workflow_results.dataset_workflow_result.delete_dataframe')
+    def test_reset_out_of_row_bound_delete_error(self, mock_delete_dataframe, mock_log):
+        collection_client, ref = self.add_out_of_row_dataset()
+        mock_delete_dataframe.side_effect = OSError
+
+        self.instance.reset()
+        self.session.commit()
+
+        mock_log.exception.assert_called_once()
+        self.assertListEqual([], self.instance.datasets)
@@ -1,5 +1,7 @@
+import copy
 from unittest import mock
 from tethysext.atcore.models.resource_workflow_results import SpatialWorkflowResult
+from tethysext.atcore.services.spatial_index import get_geojson_version
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import SqlAlchemyTestCase
 from tethysext.atcore.tests.utilities.sqlalchemy_helpers import setup_module_for_sqlalchemy_tests, \
     tear_down_module_for_sqlalchemy_tests
@@ -185,3 +187,142 @@ class SpatialWorkflowResultTests(SqlAlchemyTestCase):
 
         ret = self.instance.layers
         self.assertEqual(ret, expected_result)
+
+    def prepare_geojson_layer(self):
+        return {
+            'type': 'geojson',
+            'geojson': {
+                'type': 'FeatureCollection',
+                'features': [
+                    {
+                        'type': 'Feature',
+                        'geometry': {'type': 'Point', 'coordinates': [-111.9, 40.7]},
+                        'properties': {'id': 1, 'name': 'Salt Lake City'},
+                    },
+                    {
+                        'type': 'Feature',
+                        'geometry': {'type': 'Point', 'coordinates': [-104.9, 39.7]},
+                        'properties': {'id': 2, 'name': 'Denver'},
+                    },
+                ]
+            },
+            'layer_name': 'cities',
+            'layer_id': 'cities_id',
+        }
+
+    def test_layer_indexes(self):
+        self.instance.layers = [self.prepare_geojson_layer(), {'type': 'wms', 'layer_name': 'foo'}]
+
+        self.assertListEqual(['cities_id'], list(self.instance.data['layer_indexes'].keys()))
+        self.assertDictEqual({'1': 0, '2': 1}, self.instance.data['layer_indexes']['cities_id']['ids'])
+        # Indexes are not part of the layers passed to the map manager
+        self.assertNotIn('index', self.instance.layers[0])
+
+    def test_layer_indexes_reused(self):
+        self.instance.layers = [self.prepare_geojson_layer()]
+        index = self.instance.data['layer_indexes']['cities_id']
+
+        with mock.patch('tethysext.atcore.models.resource_workflow_results.spatial_workflow_result.build_geojson_index') as mock_build:  # noqa: E501
+            self.instance._add_layer({'type': 'wms', 'layer_name': 'foo'})
+            mock_build.assert_not_called()
+
+        self.assertDictEqual(index, self.instance.data['layer_indexes']['cities_id'])
+
+    def test_layer_indexes_rebuilt(self):
+        layer = self.prepare_geojson_layer()
+        self.instance.layers = [layer]
+        layer['geojson']['features'].pop(0)
+
+        self.instance.update_layer(layer)
+
+        self.assertDictEqual({'2': 0}, self.instance.data['layer_indexes']['cities_id']['ids'])
+
+    def test_get_feature(self):
+        self.instance.layers = [self.prepare_geojson_layer()]
+
+        ret = self.instance.get_feature('cities_id', '2')
+
+        self.assertEqual('Denver', ret['properties']['name'])
+        # Copies of the stored features
+        ret['properties']['name'] = 'foo'
+        self.assertEqual('Denver', self.instance.get_feature('cities_id', 2)['properties']['name'])
+
+    def test_get_feature_not_found(self):
+        self.instance.layers = [self.prepare_geojson_layer(), {'type': 'wms', 'layer_name': 'foo'}]
+
+        self.assertIsNone(self.instance.get_feature('cities_id', '3'))
+        self.assertIsNone(self.instance.get_feature('bar', '1'))
+        self.assertIsNone(self.instance.get_feature('foo', '1'))
+
+    def test_get_layer_with_feature_id(self):
+        layer = self.prepare_geojson_layer()
+        self.instance.layers = [layer, {'type': 'wms', 'layer_name': 'foo'}]
+
+        ret = self.instance.get_layer('cities_id', feature_id='2')
+        self.assertEqual(layer['layer_name'], ret['layer_name'])
+        self.assertListEqual(['Denver'], [f['properties']['name'] for f in ret['geojson']['features']])
+
+        ret = self.instance.get_layer('cities_id', feature_id='3')
+        self.assertListEqual([], ret['geojson']['features'])
+
+        # Stored layer is not changed
+        self.assertEqual(2, len(self.instance.layers[0]['geojson']['features']))
+        self.assertDictEqual({'type': 'wms', 'layer_name': 'foo'}, self.instance.get_layer('foo', feature_id='1'))
+
+    def test_get_feature_without_index(self):
+        self.instance.data = {'layers': [self.prepare_geojson_layer()]}
+
+        ret = self.instance.get_feature('cities_id', '1')
+
+        self.assertEqual('Salt Lake City', ret['properties']['name'])
+
+    def test_get_feature_stale_index(self):
+        layer = self.prepare_geojson_layer()
+        self.instance.layers = [layer]
+        # Features removed without updating the index
+        data = copy.deepcopy(self.instance.data)
+        data['layers'][0]['geojson']['features'].pop(0)
+        self.instance.data = data
+
+        self.assertIsNone(self.instance.get_feature('cities_id', '1'))
+        self.assertEqual('Denver', self.instance.get_feature('cities_id', '2')['properties']['name'])
+        self.assertListEqual(['Denver'], [f['properties']['name'] for f in
+                                          self.instance.query_features('cities_id', (-115.0, 35.0, -100.0, 45.0))])
+
+    def test_get_layer_version(self):
+        self.instance.layers = [self.prepare_geojson_layer(), {'type': 'wms', 'layer_name': 'foo'}]
+
+        with mock.patch('tethysext.atcore.models.resource_workflow_results.spatial_workflow_result.get_geojson_version') as mock_version:  # noqa: E501
+            ret = self.instance.get_layer_version('cities_id')
+            mock_version.assert_not_called()
+
+        self.assertEqual(get_geojson_version(self.prepare_geojson_layer()['geojson']), ret)
+        self.assertIsNone(self.instance.get_layer_version('foo'))
+        self.assertIsNone(self.instance.get_layer_version('bar'))
+
+    def test_get_layer_version_without_index(self):
+        layer = self.prepare_geojson_layer()
+        self.instance.data = {'layers': [layer]}
+
+        self.assertEqual(get_geojson_version(layer['geojson']), self.instance.get_layer_version('cities_id'))
+
+    def test_query_features(self):
+        self.instance.layers = [self.prepare_geojson_layer()]
+
+        ret = self.instance.query_features('cities_id', (-112.0, 40.0, -111.0, 41.0))
+        self.assertListEqual(['Salt Lake City'], [f['properties']['name'] for f in ret])
+
+        ret = self.instance.query_features('cities_id', (-115.0, 35.0, -100.0, 45.0))
+        self.assertListEqual(['Salt Lake City', 'Denver'], [f['properties']['name'] for f in ret])
+
+        self.assertListEqual([], self.instance.query_features('cities_id', (0.0, 0.0, 1.0, 1.0)))
+        self.assertListEqual([], self.instance.query_features('bar', (-115.0, 35.0, -100.0, 45.0)))
+
+    def test_query_features_bound(self):
+        self.instance.layers = [self.prepare_geojson_layer()]
+        self.bind_instance_to_session()
+        self.session.expire(self.instance)
+
+        ret = self.instance.query_features('cities_id', (-112.0, 40.0, -111.0, 41.0))
+
+        self.assertListEqual(['Salt Lake City'], [f['properties']['name'] for f in ret])
@@ -182,6 +182,58 @@ class AppPermissionsManagerTests(SqlAlchemyTestCase):
         self.assertNotIn(self.apm.get_display_name_for(self.apm.STANDARD_ADMIN_PERMS), permission_groups)
         self.assertNotIn("boo", permission_groups)
 
+    def test_get_all_permissions_groups_for_users(self):
+        other_user = AppUser(username='other', role=self.roles.ORG_ADMIN)
+        self.session.add(other_user)
+        self.session.commit()
+        other_django_user = User.objects.create_user(username='other', password='pass')
+        django_user = User.objects.get(username=self.username)
+
+        Group.objects.get_or_create(name=self.apm.STANDARD_USER_PERMS)[0].user_set.add(django_user)
+        Group.objects.get_or_create(name=self.apm.STANDARD_ADMIN_PERMS)[0].user_set.add(other_django_user)
+        Group.objects.get_or_create(name=self.apm.ADVANCED_ADMIN_PERMS)[0].user_set.add(other_django_user)
+        Group.objects.get_or_create(name="boo")[0].user_set.add(django_user)
+
+        ret = self.apm.get_all_permissions_groups_for_users([self.user, other_user, self.staff_app_user])
+
+        self.assertListEqual([self.apm.STANDARD_USER_PERMS], ret[self.username])
+        self.assertListEqual([self.apm.STANDARD_ADMIN_PERMS, self.apm.ADVANCED_ADMIN_PERMS], ret['other'])
+        self.assertIn(self.apm.ADVANCED_ADMIN_PERMS, ret[AppUser.STAFF_USERNAME])
+        self.assertNotIn('boo', ret[AppUser.STAFF_USERNAME])
+
+    def test_get_all_permissions_groups_for_users_memoized(self):
+        django_user = User.objects.get(username=self.username)
+        Group.objects.get_or_create(name=self.apm.STANDARD_USER_PERMS)[0].user_set.add(django_user)
+        self.apm.get_all_permissions_groups_for_users([self.user])
+
+        # Changes made outside of the manager are not seen until the cache is cleared
+        Group.objects.get_or_create(name=self.apm.STANDARD_ADMIN_PERMS)[0].user_set.add(django_user)
+        self.assertListEqual([self.apm.STANDARD_USER_PERMS], self.apm.get_all_permissions_groups_for(self.user))
+
+        self.apm.clear_cache(self.user)
+        self.assertListEqual([self.apm.STANDARD_USER_PERMS, self.apm.STANDARD_ADMIN_PERMS],
+                             self.apm.get_all_permissions_groups_for(self.user))
+
+    def test_get_all_permissions_groups_for_after_assign_user_permission(self):
+        self.assertListEqual([], self.apm.get_all_permissions_groups_for(self.user))
+        self.apm.assign_user_permission(self.user, self.roles.ORG_USER, self.licenses.STANDARD)
+        self.assertListEqual([self.apm.STANDARD_USER_PERMS], self.apm.get_all_permissions_groups_for(self.user))
+        self.apm.remove_user_permission(self.user, self.roles.ORG_USER, self.licenses.STANDARD)
+        self.assertListEqual([], self.apm.get_all_permissions_groups_for(self.user))
+
+    def test_get_ranks_for_users(self):
+        django_user = User.objects.get(username=self.username)
+        Group.objects.get_or_create(name=self.apm.STANDARD_USER_PERMS)[0].user_set.add(django_user)
+        Group.objects.get_or_create(name=self.apm.ADVANCED_ADMIN_PERMS)[0].user_set.add(django_user)
+        Group.objects.get_or_create(name=self.apm.APP_ADMIN_PERMS)
+        no_groups_user = AppUser(username='no_groups', role=self.roles.ORG_USER)
+
+        ret = self.apm.get_ranks_for_users([self.user, no_groups_user, self.staff_app_user])
+
+        self.assertEqual(2300.0, ret[self.username])
+        self.assertEqual(-1, ret['no_groups'])
+        self.assertEqual(10000.0, ret[AppUser.STAFF_USERNAME])
+
     def test_assign_user_permission(self):
         self.apm.assign_user_permission(self.user, self.roles.ORG_USER, self.licenses.STANDARD)
         django_user = User.objects.get(username=self.username)
@@ -1,7 +1,9 @@
 from unittest import mock
+import io
 import os
 import shutil
 import uuid
+import zipfile
 
 from tethysext.atcore.exceptions import FileCollectionNotFoundError, UnboundFileCollectionError, \
     FileCollectionItemNotFoundError, FileCollectionItemAlreadyExistsError
@@ -820,6 +822,42 @@ class FileCollectionClientTests(SqlAlchemyTestCase):
             file_text = of.read()
             self.assertEqual('This text should be written to file.', file_text)
 
+    def test_get_directory_index_open_file_write(self):
+        """Test the directory index is updated after a file is written in place."""
+        test_dir_name = 'test_open_file_write'
+        base_files_root_dir = os.path.join(self.test_files_base, test_dir_name)
+        root_dir = os.path.join(self.test_files_base, 'temp', test_dir_name)
+        self.copy_files_to_temp_directory(base_files_root_dir, root_dir)
+        database_client, collection_instance = self.get_database_and_collection(
+            database_id=self.general_database_id, collection_id=self.general_collection_id,
+            root_directory=root_dir, database_meta={}, collection_meta={}
+        )
+        collection_client = FileCollectionClient(self.session, database_client, self.general_collection_id)
+        index = collection_client.get_directory_index()
+        self.assertIn('file1.txt', [c['name'] for c in index['children']])
+        with collection_client.open_file('file1.txt', 'w') as f:
+            f.write('This text should be written to file.')
+        index = collection_client.get_directory_index()
+        file1 = next(c for c in index['children'] if c['name'] == 'file1.txt')
+        self.assertEqual(len('This text should be written to file.'), file1['size'])
+
+    def test_get_directory_index_delete_item(self):
+        """Test the directory index is updated after an item is deleted."""
+        test_dir_name = 'test_delete_item'
+        base_files_root_dir = os.path.join(self.test_files_base, test_dir_name)
+        root_dir = os.path.join(self.test_files_base, 'temp', test_dir_name)
+        self.copy_files_to_temp_directory(base_files_root_dir, root_dir)
+        database_client, collection_instance = self.get_database_and_collection(
+            database_id=self.general_database_id, collection_id=self.general_collection_id,
+            root_directory=root_dir, database_meta={}, collection_meta={}
+        )
+        collection_client = FileCollectionClient(self.session, database_client, self.general_collection_id)
+        index = collection_client.get_directory_index()
+        self.assertIn('file1.txt', [c['name'] for c in index['children']])
+        collection_client.delete_item('file1.txt')
+        index = collection_client.get_directory_index()
+        self.assertNotIn('file1.txt', [c['name'] for c in index['children']])
+
     def test_open_file_does_not_exist(self):
         """Test opening a file that doesn't exist throws the correct error."""
         test_dir_name = 'test_open_file_does_not_exist'
@@ -851,6 +889,54 @@ class FileCollectionClientTests(SqlAlchemyTestCase):
             with collection_client.open_file('dir1', 'r') as _:
                 pass
 
+    def test_iter_file(self):
+        """Test reading a file in chunks."""
+        test_dir_name = 'test_open_file_read'
+        base_files_root_dir = os.path.join(self.test_files_base, test_dir_name)
+        root_dir = os.path.join(self.test_files_base, 'temp', test_dir_name)
+        self.copy_files_to_temp_directory(base_files_root_dir, root_dir)
+        database_client, collection_instance = self.get_database_and_collection(
+            database_id=self.general_database_id, collection_id=self.general_collection_id,
+            root_directory=root_dir, database_meta={}, collection_meta={}
+        )
+        collection_client = FileCollectionClient(self.session, database_client, self.general_collection_id)
+        chunks = list(collection_client.iter_file('file1.txt', chunk_size=10))
+        self.assertEqual(4, len(chunks))
+        self.assertEqual(b'This text should be read from file.', b''.join(chunks))
+        self.assertEqual(b'text', b''.join(collection_client.iter_file('file1.txt', start=5, end=8, chunk_size=2)))
+
+    def test_iter_zip(self):
+        """Test streaming a zip archive of a directory."""
+        test_dir_name = 'test_walk'
+        base_files_root_dir = os.path.join(self.test_files_base, test_dir_name)
+        root_dir = os.path.join(self.test_files_base, 'temp', test_dir_name)
+        self.copy_files_to_temp_directory(base_files_root_dir, root_dir)
+        database_client, collection_instance = self.get_database_and_collection(
+            database_id=self.general_database_id, collection_id=self.general_collection_id,
+            root_directory=root_dir, database_meta={}, collection_meta={}
+        )
+        collection_client = FileCollectionClient(self.session, database_client, self.general_collection_id)
+        with zipfile.ZipFile(io.BytesIO(b''.join(collection_client.iter_zip()))) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(['dir1/dir2/file3.txt', 'dir1/dir3/file4.txt', 'dir1/file2.txt', 'file1.txt'],
+                             sorted(zf.namelist()))
+        with zipfile.ZipFile(io.BytesIO(b''.join(collection_client.iter_zip('dir1')))) as zf:
+            self.assertEqual(['dir2/file3.txt', 'dir3/file4.txt', 'file2.txt'], sorted(zf.namelist()))
+
+    def test_iter_zip_does_not_exist(self):
+        """Test streaming a zip archive of a directory that doesn't exist throws the correct error."""
+        test_dir_name = 'test_walk'
+        base_files_root_dir = os.path.join(self.test_files_base, test_dir_name)
+        root_dir = os.path.join(self.test_files_base, 'temp', test_dir_name)
+        self.copy_files_to_temp_directory(base_files_root_dir, root_dir)
+        database_client, collection_instance = self.get_database_and_collection(
+            database_id=self.general_database_id, collection_id=self.general_collection_id,
+            root_directory=root_dir, database_meta={}, collection_meta={}
+        )
+        collection_client = FileCollectionClient(self.session, database_client, self.general_collection_id)
+        with self.assertRaises(FileCollectionItemNotFoundError):
+            next(collection_client.iter_zip('dir9'))
+
     def test_walk(self):
         """Test walking a collection."""
         test_dir_name = 'test_walk'
@@ -10,6 +10,7 @@ import unittest
 from unittest import mock
 import sqlalchemy
 from tethys_sdk.base import TethysAppBase
+from tethysext.atcore.services.cluster_stats import cluster_stats_cache, least_size
 from tethysext.atcore.services.model_database import ModelDatabase
 from tethysext.atcore.services.model_database_connection import ModelDatabaseConnection
 
@@ -128,9 +129,10 @@ class ModelDatabaseTests(unittest.TestCase):
             side_effect=mock_get_engine
         )
         self.md = ModelDatabase(self.mock_app)
+        cluster_stats_cache.clear()
 
     def tearDown(self):
-        pass
+        cluster_stats_cache.clear()
 
     def test_create_with_id(self):
         pass
@@ -138,6 +140,23 @@ class ModelDatabaseTests(unittest.TestCase):
     def test_create_without_id(self):
         pass
 
+    def test_delete(self):
+        self.mock_app.drop_persistent_store = mock.MagicMock(return_value=True)
+        md = ModelDatabase(self.mock_app, self.database_id)
+        manager = mock.MagicMock()
+        manager.attach_mock(self.mock_app.drop_persistent_store, 'drop_persistent_store')
+
+        with mock.patch.object(md.model_db_connection.registry, 'dispose') as mock_dispose:
+            manager.attach_mock(mock_dispose, 'dispose')
+            result = md.delete()
+
+        self.assertTrue(result)
+        # The pooled connections are closed before the database is dropped
+        self.assertListEqual(
+            [mock.call.dispose(md.db_url), mock.call.drop_persistent_store(self.database_id)],
+            manager.mock_calls
+        )
+
     def test_get_name(self):
         md = ModelDatabase(self.mock_app, self.database_id)
         result = md.get_name()
@@ -267,6 +286,100 @@ class ModelDatabaseTests(unittest.TestCase):
         result = md.initialize(declarative_bases=(MockDeclarativeBase(),))
         self.assertEqual(database_id, result)
 
+    @mock.patch('tethysext.atcore.services.model_database.template_database')
+    def test_initialize_template_created(self, mock_template_database):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(return_value=[CONN_1])
+        self.mock_app.create_persistent_store = mock.MagicMock(return_value=True)
+        mock_template_database.get_schema_hash.return_value = '0123456789ab'
+        mock_template_database.get_database_owner.return_value = None
+        md = ModelDatabase(self.mock_app, self.database_id)
+        md.pre_initialize = mock.MagicMock()
+        result = md.initialize(declarative_bases=(MockDeclarativeBase(),), use_template=True)
+        self.assertEqual(self.database_id, result)
+        md.pre_initialize.assert_called_once()
+        mock_template_database.create_database.assert_called_once_with(
+            mock.ANY, '{}_template_012345_0123456789ab'.format(self.mock_app.package), template=md.get_name()
+        )
+        # Templates of previous versions of the schema are dropped
+        mock_template_database.drop_stale_templates.assert_called_once_with(
+            mock.ANY, '{}_template_012345_'.format(self.mock_app.package),
+            '{}_template_012345_0123456789ab'.format(self.mock_app.package)
+        )
+
+    @mock.patch('tethysext.atcore.services.model_database.template_database')
+    def test_initialize_template_not_created(self, mock_template_database):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(return_value=[CONN_1])
+        self.mock_app.create_persistent_store = mock.MagicMock(return_value=True)
+        mock_template_database.get_schema_hash.return_value = '0123456789ab'
+        mock_template_database.get_database_owner.return_value = None
+        mock_template_database.create_database.side_effect = Exception('already exists')
+        md = ModelDatabase(self.mock_app, self.database_id)
+        result = md.initialize(declarative_bases=(MockDeclarativeBase(),), use_template=True)
+        self.assertEqual(self.database_id, result)
+        mock_template_database.drop_stale_templates.assert_not_called()
+
+    def test_get_template_prefix(self):
+        md = ModelDatabase(self.mock_app, self.database_id)
+        ret = md.get_template_prefix()
+        self.assertRegex(ret, r'^{}_template_[0-9a-f]{{6}}_$'.format(self.mock_app.package))
+        self.assertRegex(md.get_template_name(), r'^{}[0-9a-f]{{12}}$'.format(ret))
+        self.assertNotEqual(ret, md.get_template_prefix(spatial=True))
+
+        # Changing the template version changes the name of the template, but not its prefix
+        md.template_version = 2
+        self.assertEqual(ret, md.get_template_prefix())
+        self.assertNotEqual(ModelDatabase(self.mock_app, self.database_id).get_template_name(), md.get_template_name())
+
+    @mock.patch('tethysext.atcore.services.model_database.template_database')
+    def test_initialize_template_copied(self, mock_template_database):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(return_value=[CONN_1])
+        self.mock_app.create_persistent_store = mock.MagicMock(return_value=True)
+        mock_template_database.get_schema_hash.return_value = '0123456789ab'
+        mock_template_database.get_database_owner.return_value = 'tethys'
+        md = ModelDatabase(self.mock_app, self.database_id)
+        md.pre_initialize = mock.MagicMock()
+        md.use_template_database = True
+        result = md.initialize(declarative_bases=(MockDeclarativeBase(),))
+        self.assertEqual(self.database_id, result)
+        md.pre_initialize.assert_not_called()
+        mock_template_database.drop_database.assert_called_once_with(mock.ANY, md.get_name())
+        mock_template_database.create_database.assert_called_once_with(
+            mock.ANY, md.get_name(), template='{}_template_012345_0123456789ab'.format(self.mock_app.package),
+            owner='tethys'
+        )
+        mock_template_database.WarmDatabasePool.assert_not_called()
+
+    @mock.patch('tethysext.atcore.services.model_database.template_database')
+    def test_initialize_template_warm_pool(self, mock_template_database):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(return_value=[CONN_1])
+        self.mock_app.create_persistent_store = mock.MagicMock(return_value=True)
+        mock_template_database.get_database_owner.return_value = 'tethys'
+        mock_pool = mock_template_database.WarmDatabasePool.return_value
+        mock_pool.take.return_value = True
+        md = ModelDatabase(self.mock_app, self.database_id)
+        md.warm_pool_size = 2
+        result = md.initialize(use_template=True)
+        self.assertEqual(self.database_id, result)
+        mock_pool.take.assert_called_once_with(mock.ANY, md.get_name())
+        mock_template_database.create_database.assert_not_called()
+        mock_pool.top_up_async.assert_called_once_with(mock.ANY, owner='tethys')
+
+    @mock.patch('tethysext.atcore.services.model_database.template_database')
+    def test_initialize_template_copy_failed(self, mock_template_database):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(return_value=[CONN_1])
+        self.mock_app.create_persistent_store = mock.MagicMock(return_value=True)
+        mock_template_database.get_database_owner.return_value = 'tethys'
+        mock_template_database.create_database.side_effect = [Exception('in use'), None, None]
+        mock_template_database.database_exists.return_value = False
+        md = ModelDatabase(self.mock_app, self.database_id)
+        md.pre_initialize = mock.MagicMock()
+        result = md.initialize(use_template=True)
+        self.assertEqual(self.database_id, result)
+        # Empty database recreated and initialized
+        self.assertEqual(mock.call(mock.ANY, md.get_name(), owner='tethys'),
+                         mock_template_database.create_database.call_args_list[1])
+        md.pre_initialize.assert_called_once()
+
     def test__get_cluster_connection_name_for_new_database_no_connections(self):
         self.mock_app.list_persistent_store_connections = mock.MagicMock(
             return_value=[]
@@ -315,6 +428,52 @@ class ModelDatabaseTests(unittest.TestCase):
         result = md._get_cluster_connection_name_for_new_database()
         self.assertEqual(CONN_4, result)
 
+    def test__get_cluster_connection_name_for_new_database_cached(self):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(
+            return_value=[CONN_1, CONN_2]
+        )
+        md = ModelDatabase(self.mock_app)
+        md._get_cluster_connection_name_for_new_database()
+        result = md._get_cluster_connection_name_for_new_database()
+        self.assertEqual(CONN_2, result)
+        self.assertEqual(2, self.mock_app.get_persistent_store_connection.call_count)
+
+    def test__get_cluster_connection_name_for_new_database_strategy(self):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(
+            return_value=[CONN_1, CONN_2]
+        )
+        md = ModelDatabase(self.mock_app)
+        md.cluster_selection_strategy = least_size
+        result = md._get_cluster_connection_name_for_new_database()
+        self.assertEqual(CONN_1, result)
+
+    def test__get_cluster_connection_name_for_new_database_strategy_subclass(self):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(
+            return_value=[CONN_1, CONN_2]
+        )
+
+        class FunctionStrategyModelDatabase(ModelDatabase):
+            cluster_selection_strategy = least_size
+
+        class StaticMethodStrategyModelDatabase(ModelDatabase):
+            cluster_selection_strategy = staticmethod(least_size)
+
+        for model_database_class in (FunctionStrategyModelDatabase, StaticMethodStrategyModelDatabase):
+            result = model_database_class(self.mock_app)._get_cluster_connection_name_for_new_database()
+            self.assertEqual(CONN_1, result)
+
+    def test_initialize_records_database_created(self):
+        self.mock_app.list_persistent_store_connections = mock.MagicMock(
+            return_value=[CONN_2, CONN_4]
+        )
+        self.mock_app.create_persistent_store = mock.MagicMock(
+            return_value=True
+        )
+        ModelDatabase(self.mock_app).initialize()
+        ModelDatabase(self.mock_app).initialize()
+        self.assertEqual(CONN_2, self.mock_app.create_persistent_store.call_args_list[0][1]['connection_name'])
+        self.assertEqual(CONN_4, self.mock_app.create_persistent_store.call_args_list[1][1]['connection_name'])
+
     def test_exists(self):
         self.mock_app.persistent_store_exists = mock.MagicMock(
             return_value=True
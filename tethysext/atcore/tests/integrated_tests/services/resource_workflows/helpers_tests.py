@@ -22,27 +22,34 @@ class HelpersTests(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def assert_job_status_inserted(self, session, step, status):
+        statement = session.execute.call_args[0][0]
+        self.assertEqual('app_users_resource_workflow_step_job_statuses', statement.table.name)
+        params = statement.compile().params
+        self.assertEqual(step.id, params['resource_workflow_step_id'])
+        self.assertEqual(status, params['status'])
+
     def test_set_step_status(self):
         session = mock.MagicMock()
         step = ResourceWorkflowStep(name='name1', help='help1', order=1)
-        step.attributes = {'condor_job_statuses': [step.STATUS_PENDING]}
 
         helpers.set_step_status(session, step, step.STATUS_COMPLETE)
 
-        self.assertEqual([step.STATUS_PENDING, step.STATUS_COMPLETE], step.get_attribute('condor_job_statuses'))
+        self.assert_job_status_inserted(session, step, step.STATUS_COMPLETE)
+        session.commit.assert_called_once()
+        session.refresh.assert_not_called()
 
     @mock.patch('tethysext.atcore.services.resource_workflows.helpers.sessionmaker')
     def test_set_step_status_recovers_from_operational_error(self, mock_sessionmaker):
-        # First session raises on refresh (simulating a dead connection).
+        # First session raises on execute (simulating a dead connection).
         bad_session = mock.MagicMock()
-        bad_session.refresh.side_effect = OperationalError('SELECT 1', {}, Exception('SSL closed'))
+        bad_session.execute.side_effect = OperationalError('SELECT 1', {}, Exception('SSL closed'))
 
         # Fresh session built via sessionmaker() succeeds.
         fresh_session = mock.MagicMock()
         mock_sessionmaker.return_value.return_value = fresh_session
 
         step = ResourceWorkflowStep(name='n', help='h', order=1)
-        step.attributes = {'condor_job_statuses': [step.STATUS_PENDING]}
         fresh_session.query.return_value.get.return_value = step
 
         helpers.set_step_status(bad_session, step, step.STATUS_COMPLETE)
@@ -51,37 +58,35 @@ class HelpersTests(unittest.TestCase):
         mock_sessionmaker.assert_called_once_with(bind=bad_session.get_bind.return_value)
         fresh_session.commit.assert_called_once()
         fresh_session.close.assert_called_once()
-        self.assertEqual([step.STATUS_PENDING, step.STATUS_COMPLETE], step.get_attribute('condor_job_statuses'))
+        self.assert_job_status_inserted(fresh_session, step, step.STATUS_COMPLETE)
 
     @mock.patch('tethysext.atcore.services.resource_workflows.helpers.sessionmaker')
     def test_set_step_status_recovers_from_pending_rollback(self, mock_sessionmaker):
         bad_session = mock.MagicMock()
-        bad_session.refresh.side_effect = PendingRollbackError('rollback required')
+        bad_session.execute.side_effect = PendingRollbackError('rollback required')
 
         fresh_session = mock.MagicMock()
         mock_sessionmaker.return_value.return_value = fresh_session
 
         step = ResourceWorkflowStep(name='n', help='h', order=1)
-        step.attributes = {'condor_job_statuses': [step.STATUS_PENDING]}
         fresh_session.query.return_value.get.return_value = step
 
         helpers.set_step_status(bad_session, step, step.STATUS_FAILED)
 
         bad_session.invalidate.assert_called_once()
         fresh_session.commit.assert_called_once()
-        self.assertEqual([step.STATUS_PENDING, step.STATUS_FAILED], step.get_attribute('condor_job_statuses'))
+        self.assert_job_status_inserted(fresh_session, step, step.STATUS_FAILED)
 
     @mock.patch('tethysext.atcore.services.resource_workflows.helpers.sessionmaker')
     def test_set_step_status_propagates_if_retry_also_fails(self, mock_sessionmaker):
         bad_session = mock.MagicMock()
-        bad_session.refresh.side_effect = OperationalError('q', {}, Exception('boom'))
+        bad_session.execute.side_effect = OperationalError('q', {}, Exception('boom'))
 
         fresh_session = mock.MagicMock()
-        fresh_session.refresh.side_effect = OperationalError('q', {}, Exception('still dead'))
+        fresh_session.execute.side_effect = OperationalError('q', {}, Exception('still dead'))
         mock_sessionmaker.return_value.return_value = fresh_session
 
         step = ResourceWorkflowStep(name='n', help='h', order=1)
-        step.attributes = {'condor_job_statuses': []}
         fresh_session.query.return_value.get.return_value = step
 
         with self.assertRaises(OperationalError):
@@ -91,10 +96,9 @@ class HelpersTests(unittest.TestCase):
 
     def test_set_step_status_propagates_non_recoverable_error(self):
         session = mock.MagicMock()
-        session.refresh.side_effect = ValueError('not a connection error')
+        session.execute.side_effect = ValueError('not a connection error')
 
         step = ResourceWorkflowStep(name='n', help='h', order=1)
-        step.attributes = {'condor_job_statuses': []}
 
         with self.assertRaises(ValueError):
             helpers.set_step_status(session, step, step.STATUS_COMPLETE)
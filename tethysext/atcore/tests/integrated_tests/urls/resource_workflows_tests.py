@@ -11,6 +11,8 @@ import unittest
 from tethysext.atcore.tests.mock.url_map_maker import MockUrlMapMaker
 from tethysext.atcore.urls.resource_workflows import urls
 from tethysext.atcore.models.app_users.resource_workflow import ResourceWorkflow
+from tethysext.atcore.models.app_users.resource_workflow_result import ResourceWorkflowResult
+from tethysext.atcore.models.resource_workflow_steps import SpatialInputRWS
 from tethysext.atcore.controllers.resource_workflows.resource_workflow_router import ResourceWorkflowRouter
 from tethysext.atcore.models.app_users.app_user import AppUser
 from tethysext.atcore.models.app_users.organization import Organization
@@ -153,6 +155,20 @@ class ResourceWorkflowsTests(unittest.TestCase):
 
         self.verify_url_maps(url_maps, self.generic_urls)
 
+    @mock.patch('tethysext.atcore.urls.resource_workflows.controller_registry')
+    def test_urls_warms_controllers(self, mock_registry):
+        urls(MockUrlMapMaker, self.app, self.persistent_store_name, self.workflow_pairs)
+
+        mock_registry.warm.assert_called_once()
+        paths = mock_registry.warm.call_args[0][0]
+        kwargs = mock_registry.warm.call_args[1]
+        self.assertIn(ResourceWorkflowResult.CONTROLLER, paths)
+        self.assertIn(SpatialInputRWS.CONTROLLER, paths)
+        self.assertNotIn('', paths)
+        self.assertIs(self.app, kwargs['_app'])
+        self.assertIs(ResourceWorkflow, kwargs['_ResourceWorkflow'])
+        self.assertIs(ResourceWorkflowRouter._ResourceWorkflowStep, kwargs['_ResourceWorkflowStep'])
+
     def test_urls_no_workflow_pairs(self):
         url_maps = urls(MockUrlMapMaker, self.app, self.persistent_store_name, [])
 
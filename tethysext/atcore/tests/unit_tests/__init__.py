@@ -2,15 +2,29 @@ from .mixins.status_mixin import StatusMixinTests  # noqa: F401
 from .mixins.options_mixin import OptionsMixinTests  # noqa: F401
 from .mixins.results_mixin import ResultMixinTests  # noqa: F401
 from .model_types.guid_tests import GuidTests  # noqa: F401
+from .model_types.compressed_pickle_tests import CompressedPickleTests  # noqa: F401
 from .services.app_users.licenses import LicensesTests  # noqa: F401
 from .services.app_users.user_roles_tests import AppUserRoleTests  # noqa: F401
 from .services.paginate import PaginateTests  # noqa: F401
 from .services.model_database_connection_base import ModelDatabaseConnectionBaseTests  # noqa: F401, E501
 from .services.model_database_connection import ModelDatabaseConnectionTests  # noqa: F401, E501
+from .services.engine_registry import EngineRegistryTests  # noqa: F401
+from .services.cluster_stats import ClusterStatsCacheTests  # noqa: F401
+from .services.template_database import TemplateDatabaseTests  # noqa: F401
+from .services.job_database import JobDatabaseTests  # noqa: F401
+from .services.request_session import RequestSessionTests  # noqa: F401
+from .services.spatial_reference import SpatialReferenceCatalogTests  # noqa: F401
+from .services.dataset_storage import DatasetStorageTests  # noqa: F401
+from .services.dataframe_query import DataFrameQueryTests  # noqa: F401
+from .services.directory_index import DirectoryIndexTests  # noqa: F401
+from .services.shapefile_export import ShapefileExportTests  # noqa: F401
 from .services.model_file_database_connection import ModelFileDatabaseConnectionTests  # noqa: F401, E501
 from .services.resource_spatial_manager import ResourceSpatialManagerTests  # noqa: F401
 from .services.base_spatial_manager import BaseSpatialManagerTests  # noqa: F401
 from .services.model_db_spatial_manager import ModelDBSpatialManagerTests  # noqa: F401
 from .services.model_file_db_spatial_manager import ModelFileDBSpatialManagerTests  # noqa: F401, E501
+from .services.map_cache import MapCacheTests  # noqa: F401
+from .services.spatial_index import SpatialIndexTests  # noqa: F401
+from .services.vector_tiles import VectorTilesTests  # noqa: F401
 from .services.map_manager import MapManagerBaseTests  # noqa: F401
 from .gizmos.slide_sheet import SlideSheetTests  # noqa: F401
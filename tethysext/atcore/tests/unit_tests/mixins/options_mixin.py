@@ -1,4 +1,7 @@
+import pickle
+import pandas as pd
 import unittest
+from unittest import mock
 from tethysext.atcore.mixins import OptionsMixin
 
 
@@ -6,6 +9,20 @@ class ClassWithOptions(OptionsMixin):
     _options = None
 
 
+class ClassWithDefaultOptions(OptionsMixin):
+    _options = None
+
+    @property
+    def default_options(self):
+        default_options = super().default_options
+        default_options.update({
+            'title': 'Default',
+            'shapes': ['points', 'lines'],
+            'layer': {'name': 'default', 'style': {'color': 'red'}}
+        })
+        return default_options
+
+
 class OptionsMixinTests(unittest.TestCase):
 
     def setUp(self):
@@ -136,3 +153,78 @@ class OptionsMixinTests(unittest.TestCase):
     def test__merge_options_none_for_dict(self):
         ret = self.instance._merge_options(self.a_none, self.b)
         self.assertEqual(self.b_on_a_none, ret)
+
+    def test_default_options_view(self):
+        instance = ClassWithDefaultOptions()
+
+        ret = instance.default_options_view
+
+        self.assertEqual(instance.default_options, ret)
+        self.assertIs(ret, ClassWithDefaultOptions().default_options_view)
+        self.assertEqual({}, self.instance.default_options_view)
+
+        with self.assertRaises(TypeError):
+            ret['title'] = 'Changed'
+
+        with self.assertRaises(TypeError):
+            ret['layer']['style']['color'] = 'blue'
+
+    def test_default_options_view_built_once(self):
+        class ClassWithCountedOptions(ClassWithDefaultOptions):
+            pass
+
+        with mock.patch.object(ClassWithDefaultOptions, 'default_options', new_callable=mock.PropertyMock) as mock_do:
+            mock_do.return_value = {'foo': 1}
+            ClassWithCountedOptions().options = {}
+            ClassWithCountedOptions().options = {'bar': 2}
+
+        mock_do.assert_called_once()
+
+    def test_options_setter_defaults(self):
+        instance = ClassWithDefaultOptions()
+        instance.options = {'layer': {'style': {'width': 2}}, 'foo': 1}
+
+        expected = {
+            'title': 'Default',
+            'shapes': ['points', 'lines'],
+            'layer': {'name': 'default', 'style': {'color': 'red', 'width': 2}},
+            'foo': 1
+        }
+        self.assertDictEqual(expected, instance.options)
+        self.assertIs(dict, type(instance.options['layer']['style']))
+        # Must be picklable to be stored in the database
+        self.assertEqual(expected, pickle.loads(pickle.dumps(instance.options)))
+
+    def test_options_setter_no_shared_references(self):
+        value = {'layer': {'style': {'width': 2}}, 'list': [{'a': 1}]}
+        instance = ClassWithDefaultOptions()
+        instance.options = value
+
+        instance.options['shapes'].append('polygons')
+        instance.options['layer']['style']['color'] = 'blue'
+        instance.options['list'][0]['a'] = 2
+
+        self.assertEqual(['points', 'lines'], ClassWithDefaultOptions().default_options_view['shapes'])
+        self.assertEqual('red', ClassWithDefaultOptions().default_options_view['layer']['style']['color'])
+        self.assertDictEqual({'layer': {'style': {'width': 2}}, 'list': [{'a': 1}]}, value)
+
+        other = ClassWithDefaultOptions()
+        other.options = {}
+        self.assertEqual(['points', 'lines'], other.options['shapes'])
+
+    def test_options_setter_copies_mutable_values(self):
+        class ClassWithMutableOptions(OptionsMixin):
+            @property
+            def default_options(self):
+                return {'dataset': pd.DataFrame({'x': [1, 2]}), 'tags': {'a'}, 'extent': (1, 2)}
+
+        instance = ClassWithMutableOptions()
+        instance.options = {}
+        instance.options['dataset'].loc[0, 'x'] = 10
+        instance.options['tags'].add('b')
+
+        view = ClassWithMutableOptions().default_options_view
+        self.assertListEqual([1, 2], view['dataset']['x'].tolist())
+        self.assertSetEqual({'a'}, view['tags'])
+        # Immutable values are shared
+        self.assertIs(view['extent'], instance.options['extent'])
@@ -0,0 +1,125 @@
+import pickle
+import unittest
+import zlib
+from unittest import mock
+
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, PickleType, Table, create_engine, select, type_coerce
+
+from tethysext.atcore.models.types import CompressedPickleType
+from tethysext.atcore.models.types import compressed_pickle
+
+
+class CompressedPickleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.value = {'type': 'FeatureCollection', 'features': [{'id': i, 'name': 'feature'} for i in range(100)]}
+        self.pickled = pickle.dumps(self.value, pickle.HIGHEST_PROTOCOL)
+
+    def test_compress(self):
+        ret = compressed_pickle.compress(self.pickled, codec='zlib')
+
+        self.assertTrue(compressed_pickle.is_compressed(ret))
+        self.assertEqual(compressed_pickle.MAGIC + bytes([1, 1]), ret[:compressed_pickle.HEADER_SIZE])
+        self.assertLess(len(ret), len(self.pickled))
+        self.assertEqual(self.pickled, compressed_pickle.decompress(ret))
+
+    def test_compress_small(self):
+        pickled = pickle.dumps({'a': 1})
+        self.assertEqual(pickled, compressed_pickle.compress(pickled, codec='zlib'))
+
+    def test_compress_already_compressed(self):
+        compressed = compressed_pickle.compress(self.pickled, codec='zlib')
+        self.assertEqual(compressed, compressed_pickle.compress(compressed, codec='zlib'))
+
+    def test_compress_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            compressed_pickle.compress(self.pickled, codec='foo')
+
+    @mock.patch.object(compressed_pickle, '_import_zstandard')
+    def test_compress_zstd(self, mock_import):
+        mock_import.return_value.ZstdCompressor.return_value.compress.return_value = b'zstd'
+        mock_import.return_value.ZstdDecompressor.return_value.decompress.return_value = self.pickled
+
+        ret = compressed_pickle.compress(self.pickled, codec='zstd')
+
+        self.assertEqual(compressed_pickle.MAGIC + bytes([1, 2]) + b'zstd', ret)
+        self.assertEqual(self.pickled, compressed_pickle.decompress(ret))
+        mock_import.return_value.ZstdDecompressor.return_value.decompress.assert_called_with(b'zstd')
+
+    @mock.patch.object(compressed_pickle, '_import_lz4')
+    def test_compress_lz4(self, mock_import):
+        mock_import.return_value.compress.return_value = b'lz4'
+        mock_import.return_value.decompress.return_value = self.pickled
+
+        ret = compressed_pickle.compress(self.pickled, codec='lz4')
+
+        self.assertEqual(compressed_pickle.MAGIC + bytes([1, 3]) + b'lz4', ret)
+        self.assertEqual(self.pickled, compressed_pickle.decompress(ret))
+
+    @mock.patch.object(compressed_pickle, '_import_zstandard', side_effect=ImportError)
+    def test_get_default_codec_no_zstandard(self, _):
+        self.assertEqual('zlib', compressed_pickle.get_default_codec())
+
+    def test_decompress_legacy(self):
+        self.assertEqual(self.pickled, compressed_pickle.decompress(memoryview(self.pickled)))
+
+    def test_decompress_unsupported_version(self):
+        data = compressed_pickle.MAGIC + bytes([2, 1]) + zlib.compress(self.pickled)
+        with self.assertRaises(ValueError):
+            compressed_pickle.decompress(data)
+
+    def test_decompress_unsupported_codec(self):
+        data = compressed_pickle.MAGIC + bytes([1, 9]) + zlib.compress(self.pickled)
+        with self.assertRaises(ValueError):
+            compressed_pickle.decompress(data)
+
+    def test_column_type(self):
+        engine = create_engine('sqlite://')
+        metadata = MetaData()
+        table = Table('things', metadata, Column('id', Integer, primary_key=True),
+                      Column('data', CompressedPickleType(codec='zlib')))
+        metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            connection.execute(table.insert(), [{'id': 1, 'data': self.value}, {'id': 2, 'data': [1]}])
+            # Stored by PickleType before the column was compressed
+            connection.execute(table.insert().values(id=3, data=type_coerce(self.pickled, LargeBinary)))
+
+        with engine.connect() as connection:
+            rows = connection.execute(select(table.c.id, table.c.data).order_by(table.c.id)).fetchall()
+            raw = connection.execute(select(type_coerce(table.c.data, LargeBinary)).order_by(table.c.id)).scalars()
+            raw = [bytes(r) for r in raw]
+
+        self.assertEqual([(1, self.value), (2, [1]), (3, self.value)], [tuple(r) for r in rows])
+        self.assertTrue(compressed_pickle.is_compressed(raw[0]))
+        self.assertFalse(compressed_pickle.is_compressed(raw[1]))
+        self.assertFalse(compressed_pickle.is_compressed(raw[2]))
+
+    def test_compress_columns(self):
+        engine = create_engine('sqlite://')
+        metadata = MetaData()
+        table = Table('things', metadata, Column('id', Integer, primary_key=True),
+                      Column('data', CompressedPickleType(codec='zlib')), Column('other', PickleType))
+        metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            for i in range(5):
+                connection.execute(table.insert().values(id=i, data=type_coerce(self.pickled, LargeBinary)))
+            connection.execute(table.insert().values(id=5, data=None))
+            connection.execute(table.insert().values(id=6, data=[1]))
+
+        self.assertListEqual([table.c.data], compressed_pickle.get_compressed_pickle_columns(metadata))
+
+        ret = compressed_pickle.compress_columns(engine, metadata, batch_size=2)
+
+        self.assertDictEqual({'things.data': 5}, ret)
+
+        with engine.connect() as connection:
+            rows = connection.execute(select(table.c.data).order_by(table.c.id)).scalars().all()
+            raw = connection.execute(select(type_coerce(table.c.data, LargeBinary)).where(table.c.id == 0)).scalar()
+
+        self.assertEqual([self.value] * 5 + [None, [1]], rows)
+        self.assertTrue(compressed_pickle.is_compressed(raw))
+
+        # Nothing left to compress
+        self.assertDictEqual({'things.data': 0}, compressed_pickle.compress_columns(engine, metadata))
@@ -0,0 +1,117 @@
+"""
+********************************************************************************
+* Name: cluster_stats.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import threading
+import unittest
+from unittest import mock
+
+from tethysext.atcore.services.cluster_stats import ClusterStats, ClusterStatsCache, least_count, least_size, weighted
+
+STATS = {
+    'conn_1': (5, 10),
+    'conn_2': (3, 15),
+    'conn_3': (5, 15),
+}
+
+
+class MockEngine(object):
+
+    def __init__(self, connection_name, barrier=None):
+        self.connection_name = connection_name
+        self.barrier = barrier
+        self.disposed = False
+
+    def execute(self, query):
+        if self.barrier is not None:
+            # Blocks until all clusters are queried at the same time
+            self.barrier.wait(timeout=5)
+
+        count, size = STATS[self.connection_name]
+        if 'count' in query:
+            return [mock.MagicMock(count=count)]
+        return [mock.MagicMock(size=size)]
+
+    def dispose(self):
+        self.disposed = True
+
+
+class ClusterStatsCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.app = mock.MagicMock(package='foo')
+        self.engines = {}
+        self.barrier = None
+        self.app.get_persistent_store_connection.side_effect = self.get_engine
+        self.cache = ClusterStatsCache()
+
+    def get_engine(self, connection_name):
+        if connection_name not in STATS:
+            return None
+        self.engines[connection_name] = MockEngine(connection_name, self.barrier)
+        return self.engines[connection_name]
+
+    def test_least_count(self):
+        stats = [ClusterStats('a', 5, 10), ClusterStats('b', 3, 15), ClusterStats('c', 3, 15)]
+        self.assertEqual('b', least_count(stats).connection_name)
+        self.assertIsNone(least_count([]))
+
+    def test_least_count_none(self):
+        stats = [ClusterStats('a', None, None), ClusterStats('b', 3, None)]
+        self.assertEqual('b', least_count(stats).connection_name)
+
+    def test_least_size(self):
+        stats = [ClusterStats('a', 5, 10), ClusterStats('b', 3, 15)]
+        self.assertEqual('a', least_size(stats).connection_name)
+        self.assertIsNone(least_size([]))
+
+    def test_weighted(self):
+        stats = [ClusterStats('a', 10, 100), ClusterStats('b', 9, 1000)]
+        self.assertEqual('a', weighted()(stats).connection_name)
+        self.assertEqual('b', weighted(count_weight=1, size_weight=0)(stats).connection_name)
+        self.assertIsNone(weighted()([]))
+
+    def test_get_stats(self):
+        ret = self.cache.get_stats(self.app, ['conn_1', 'conn_2', 'conn_4'])
+        self.assertListEqual([ClusterStats('conn_1', 5, 10), ClusterStats('conn_2', 3, 15)], ret)
+        self.assertTrue(all(engine.disposed for engine in self.engines.values()))
+
+    def test_get_stats_concurrent(self):
+        self.barrier = threading.Barrier(len(STATS))
+        ret = self.cache.get_stats(self.app, list(STATS))
+        self.assertEqual(3, len(ret))
+
+    def test_get_stats_cached(self):
+        self.cache.get_stats(self.app, ['conn_1', 'conn_2'])
+        self.cache.get_stats(self.app, ['conn_1', 'conn_3'])
+        self.assertEqual(3, self.app.get_persistent_store_connection.call_count)
+
+    def test_get_stats_expired(self):
+        self.cache.ttl = 0
+        self.cache.get_stats(self.app, ['conn_1'])
+        self.cache.get_stats(self.app, ['conn_1'])
+        self.assertEqual(2, self.app.get_persistent_store_connection.call_count)
+
+    def test_get_stats_per_app(self):
+        self.cache.get_stats(self.app, ['conn_1'])
+        other_app = mock.MagicMock(package='bar')
+        other_app.get_persistent_store_connection.side_effect = self.get_engine
+        self.cache.get_stats(other_app, ['conn_1'])
+        other_app.get_persistent_store_connection.assert_called_once_with('conn_1')
+
+    def test_record_database_created(self):
+        self.cache.get_stats(self.app, ['conn_1'])
+        self.cache.record_database_created(self.app, 'conn_1')
+        self.cache.record_database_created(self.app, 'conn_2')
+        ret = self.cache.get_stats(self.app, ['conn_1'])
+        self.assertListEqual([ClusterStats('conn_1', 6, 10)], ret)
+
+    def test_clear(self):
+        self.cache.get_stats(self.app, ['conn_1'])
+        self.cache.clear()
+        self.cache.get_stats(self.app, ['conn_1'])
+        self.assertEqual(2, self.app.get_persistent_store_connection.call_count)
@@ -0,0 +1,88 @@
+"""
+********************************************************************************
+* Name: dataframe_query.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tethysext.atcore.services.dataframe_query import parse_datatables_params, query_dataframe
+
+
+class DataFrameQueryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data_frame = pd.DataFrame({
+            'name': ['alpha', 'Bravo', 'charlie', 'delta', 'echo'],
+            'value': [3, 1, np.nan, 5, 2],
+            'group': ['a', 'b', 'a', 'b', 'a'],
+        })
+
+    def test_parse_datatables_params(self):
+        params = {
+            'draw': '3',
+            'start': '20',
+            'length': '10',
+            'search[value]': ' foo ',
+            'order[0][column]': '1',
+            'order[0][dir]': 'desc',
+            'order[1][column]': '0',
+            'order[1][dir]': 'asc',
+            'fields': 'name,value',
+        }
+        ret = parse_datatables_params(params)
+        self.assertDictEqual({
+            'draw': 3,
+            'start': 20,
+            'length': 10,
+            'search': 'foo',
+            'order': [(1, False), (0, True)],
+            'fields': ['name', 'value'],
+        }, ret)
+
+    def test_parse_datatables_params_defaults(self):
+        ret = parse_datatables_params({'start': 'bad'})
+        self.assertDictEqual({
+            'draw': 0,
+            'start': 0,
+            'length': -1,
+            'search': '',
+            'order': [],
+            'fields': None,
+        }, ret)
+
+    def test_query_dataframe_page(self):
+        total, filtered, rows = query_dataframe(self.data_frame, start=1, length=2)
+        self.assertEqual(5, total)
+        self.assertEqual(5, filtered)
+        self.assertListEqual([['Bravo', 1.0, 'b'], ['charlie', None, 'a']], rows)
+
+    def test_query_dataframe_all_rows(self):
+        _, _, rows = query_dataframe(self.data_frame, start=3, length=-1)
+        self.assertEqual(2, len(rows))
+
+    def test_query_dataframe_search(self):
+        total, filtered, rows = query_dataframe(self.data_frame, search='B')
+        self.assertEqual(5, total)
+        self.assertEqual(2, filtered)
+        self.assertListEqual(['Bravo', 'delta'], [r[0] for r in rows])
+
+    def test_query_dataframe_order(self):
+        _, _, rows = query_dataframe(self.data_frame, order=[(1, False)])
+        self.assertListEqual(['delta', 'alpha', 'echo', 'Bravo', 'charlie'], [r[0] for r in rows])
+
+        _, _, rows = query_dataframe(self.data_frame, order=[(2, True), (1, True)])
+        self.assertListEqual(['echo', 'alpha', 'charlie', 'Bravo', 'delta'], [r[0] for r in rows])
+
+    def test_query_dataframe_order_invalid_column(self):
+        _, _, rows = query_dataframe(self.data_frame, order=[(10, True)])
+        self.assertListEqual(list(self.data_frame['name']), [r[0] for r in rows])
+
+    def test_query_dataframe_fields(self):
+        _, _, rows = query_dataframe(self.data_frame, length=1, fields=['group', 'name', 'not_a_column'])
+        self.assertListEqual([['a', 'alpha']], rows)
@@ -0,0 +1,105 @@
+"""
+********************************************************************************
+* Name: dataset_storage.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import uuid
+
+import pandas as pd
+
+from tethysext.atcore.services.dataset_storage import delete_dataframe, get_file_collection_client, \
+    is_dataset_reference, read_dataframe, write_dataframe
+
+
+class DatasetStorageTests(unittest.TestCase):
+
+    def setUp(self):
+        self.collection_dir = tempfile.mkdtemp()
+        self.file_collection_client = mock.MagicMock(path=self.collection_dir)
+        self.file_collection_client.instance.id = uuid.uuid4()
+        self.file_collection_client.instance.file_database_id = uuid.uuid4()
+
+        def add_item(item, move=False, relative_to=''):
+            dst = os.path.join(self.collection_dir, os.path.relpath(os.path.dirname(item), start=relative_to))
+            os.makedirs(dst, exist_ok=True)
+            shutil.move(item, dst)
+
+        self.file_collection_client.add_item.side_effect = add_item
+        self.data_frame = pd.DataFrame({'x': [1, 2, 3], 'y': [4.0, 5.0, 6.0], 'z': ['a', 'b', 'c']},
+                                       index=[10, 20, 30])
+
+    def tearDown(self):
+        shutil.rmtree(self.collection_dir)
+
+    def test_write_read_parquet(self):
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        self.assertTrue(is_dataset_reference(ref))
+        self.assertEqual('parquet', ref['storage_format'])
+        self.assertEqual(3, ref['num_rows'])
+        self.assertEqual(['x', 'y', 'z'], ref['columns'])
+        self.assertTrue(os.path.isfile(ref['path']))
+        pd.testing.assert_frame_equal(self.data_frame, read_dataframe(ref))
+
+    def test_write_read_arrow(self):
+        ref = write_dataframe(self.file_collection_client, self.data_frame, storage_format='arrow')
+        self.assertTrue(ref['path'].endswith('.arrow'))
+        pd.testing.assert_frame_equal(self.data_frame, read_dataframe(ref))
+        pd.testing.assert_frame_equal(self.data_frame, read_dataframe(ref, memory_map=False))
+
+    def test_read_columns(self):
+        for storage_format in ('parquet', 'arrow'):
+            ref = write_dataframe(self.file_collection_client, self.data_frame, storage_format=storage_format)
+            ret = read_dataframe(ref, columns=['y'])
+            pd.testing.assert_frame_equal(self.data_frame[['y']], ret)
+
+    def test_read_file_collection_client(self):
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        ref['path'] = '/does/not/exist.parquet'
+        ret = read_dataframe(ref, file_collection_client=self.file_collection_client)
+        pd.testing.assert_frame_equal(self.data_frame, ret)
+
+    def test_write_invalid_format(self):
+        self.assertRaises(ValueError, write_dataframe, self.file_collection_client, self.data_frame, 'csv')
+
+    def test_delete_dataframe(self):
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        delete_dataframe(ref)
+        self.assertFalse(os.path.exists(ref['path']))
+        # Missing files are ignored
+        delete_dataframe(ref)
+
+    @mock.patch('tethysext.atcore.services.dataset_storage.directory_index_cache')
+    def test_delete_dataframe_invalidates_directory_index(self, mock_cache):
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        delete_dataframe(ref)
+        mock_cache.invalidate.assert_called_once_with(ref['path'])
+
+    def test_delete_dataframe_file_collection_client(self):
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        self.file_collection_client.has_item.return_value = True
+        delete_dataframe(ref, file_collection_client=self.file_collection_client)
+        self.file_collection_client.delete_item.assert_called_once_with(ref['item'])
+
+    def test_get_file_collection_client(self):
+        session = mock.MagicMock()
+        ref = write_dataframe(self.file_collection_client, self.data_frame)
+        ref['path'] = os.path.join('root', ref['file_database_id'], ref['file_collection_id'], ref['item'])
+
+        ret = get_file_collection_client(session, ref)
+
+        self.assertEqual(uuid.UUID(ref['file_collection_id']), ret._collection_id)
+        self.assertEqual('root', ret.file_database_client.root_directory)
+        self.assertEqual(uuid.UUID(ref['file_database_id']), ret.file_database_client._database_id)
+
+    def test_is_dataset_reference(self):
+        self.assertFalse(is_dataset_reference(self.data_frame))
+        self.assertFalse(is_dataset_reference({'x': [1, 2]}))
+        self.assertFalse(is_dataset_reference(None))
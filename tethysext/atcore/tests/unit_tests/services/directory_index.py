@@ -0,0 +1,152 @@
+"""
+********************************************************************************
+* Name: directory_index.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from tethysext.atcore.services import directory_index
+from tethysext.atcore.services.directory_index import DirectoryIndexCache, scan_directory
+
+
+class DirectoryIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, 'dir1', 'dir2'))
+        with open(os.path.join(self.root, 'dir1', 'file1.txt'), 'w') as f:
+            f.write('12345')
+        with open(os.path.join(self.root, 'dir1', 'dir2', 'file2.txt'), 'w') as f:
+            f.write('123')
+        with open(os.path.join(self.root, 'dir1', '__meta__.json'), 'w') as f:
+            json.dump({'display_name': 'Directory 1'}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get_child(self, node, name):
+        return next(c for c in node['children'] if c['name'] == name)
+
+    def test_scan_directory(self):
+        index = scan_directory(self.root)
+
+        self.assertEqual('folder', index['type'])
+        self.assertIsNone(index['display_name'])
+        dir1 = self.get_child(index, 'dir1')
+        self.assertEqual('Directory 1', dir1['display_name'])
+        self.assertEqual(3, len(dir1['children']))
+        file1 = self.get_child(dir1, 'file1.txt')
+        self.assertEqual('file', file1['type'])
+        self.assertEqual(5, file1['size'])
+        self.assertEqual(os.path.getmtime(os.path.join(self.root, 'dir1', 'file1.txt')), file1['date_modified'])
+        dir2 = self.get_child(dir1, 'dir2')
+        self.assertEqual(3, dir2['size'])
+        self.assertEqual(index['size'], dir1['size'])
+
+        # Folder dates are the most recent modified date of any directory in the tree
+        expected = max(os.path.getmtime(r) for r, _, _ in os.walk(self.root))
+        self.assertAlmostEqual(expected, index['date_modified'], places=3)
+
+    def test_scan_directory_display_name_error(self):
+        with open(os.path.join(self.root, 'dir1', '__meta__.json'), 'w') as f:
+            f.write('{not json')
+
+        index = scan_directory(self.root)
+
+        self.assertIsNone(self.get_child(index, 'dir1')['display_name'])
+
+    def test_scan_directory_unchanged_reuses_previous(self):
+        previous = scan_directory(self.root)
+
+        with mock.patch.object(directory_index.os, 'scandir') as mock_scandir:
+            index = scan_directory(self.root, previous)
+
+        mock_scandir.assert_not_called()
+        self.assertEqual(previous, index)
+
+    def test_scan_directory_rescans_changed_directory_only(self):
+        previous = scan_directory(self.root)
+        with open(os.path.join(self.root, 'dir1', 'dir2', 'file3.txt'), 'w') as f:
+            f.write('1')
+
+        with mock.patch.object(directory_index.os, 'scandir', wraps=os.scandir) as mock_scandir:
+            index = scan_directory(self.root, previous)
+
+        mock_scandir.assert_called_once_with(os.path.join(self.root, 'dir1', 'dir2'))
+        dir2 = self.get_child(self.get_child(index, 'dir1'), 'dir2')
+        self.assertEqual(2, len(dir2['children']))
+        self.assertEqual(4, dir2['size'])
+
+    def test_cache_get(self):
+        cache = DirectoryIndexCache()
+
+        index = cache.get(self.root)
+
+        self.assertEqual(1, len(cache))
+        self.assertEqual(index, cache.get(self.root))
+
+    def test_cache_get_revalidates(self):
+        cache = DirectoryIndexCache()
+        cache.get(self.root)
+
+        # Adding a file changes the mtime of its directory, so no invalidation is needed
+        with open(os.path.join(self.root, 'dir1', 'dir2', 'file3.txt'), 'w') as f:
+            f.write('89')
+
+        index = cache.get(self.root)
+
+        self.assertIsNotNone(self.get_child(self.get_child(self.get_child(index, 'dir1'), 'dir2'), 'file3.txt'))
+
+    def test_cache_max_size(self):
+        cache = DirectoryIndexCache(max_size=2)
+        dir1 = os.path.join(self.root, 'dir1')
+        dir2 = os.path.join(dir1, 'dir2')
+
+        cache.get(self.root)
+        cache.get(dir1)
+        cache.get(self.root)
+        cache.get(dir2)
+
+        # Least recently used discarded
+        self.assertEqual(2, len(cache))
+        self.assertListEqual([self.root, dir2], list(cache._indexes.keys()))
+
+    def test_cache_invalidate_modified_file(self):
+        cache = DirectoryIndexCache()
+        cache.get(self.root)
+
+        # Modifying a file in place does not change the mtime of its directory
+        file_path = os.path.join(self.root, 'dir1', 'dir2', 'file2.txt')
+        with open(file_path, 'a') as f:
+            f.write('4567')
+        cache.invalidate(file_path)
+
+        index = cache.get(self.root)
+
+        self.assertEqual(1, len(cache))
+        self.assertEqual(7, self.get_child(self.get_child(self.get_child(index, 'dir1'), 'dir2'), 'file2.txt')['size'])
+
+    def test_cache_invalidate_root(self):
+        cache = DirectoryIndexCache()
+        cache.get(os.path.join(self.root, 'dir1'))
+        cache.get(os.path.join(self.root, 'dir1', 'dir2'))
+
+        cache.invalidate(os.path.join(self.root, 'dir1'))
+
+        self.assertEqual(0, len(cache))
+
+    def test_cache_invalidate_all(self):
+        cache = DirectoryIndexCache()
+        cache.get(self.root)
+
+        cache.invalidate()
+
+        self.assertEqual(0, len(cache))
@@ -0,0 +1,145 @@
+"""
+********************************************************************************
+* Name: job_database.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import Column, String
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from tethysext.atcore.mixins.status_mixin import StatusMixin
+from tethysext.atcore.services import job_database
+
+Base = declarative_base()
+
+
+class ThingWithStatus(Base, StatusMixin):
+    __tablename__ = 'things_with_status'
+
+    id = Column(String, primary_key=True)
+    status = Column(String)
+
+
+class JobDatabaseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_url = 'sqlite:///' + os.path.join(self.temp_dir, 'jobs.db')
+        self.engine = job_database.get_job_engine(self.db_url)
+        Base.metadata.create_all(self.engine)
+
+        self.session = sessionmaker(bind=self.engine)()
+        self.session.add_all([
+            ThingWithStatus(id='a', status=json.dumps({'root': StatusMixin.STATUS_PENDING, 'other': 'Working'})),
+            ThingWithStatus(id='b', status=None),
+            ThingWithStatus(id='c', status=''),
+        ])
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        job_database.engine_registry.dispose(self.db_url)
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_job_engine(self):
+        self.assertIsInstance(self.engine.pool, NullPool)
+        self.assertIs(self.engine, job_database.get_job_engine(self.db_url))
+
+    def test_get_job_engine_engine_kwargs(self):
+        engine = job_database.get_job_engine(self.db_url, {'poolclass': StaticPool})
+        self.assertIsInstance(engine.pool, StaticPool)
+        self.assertIsNot(self.engine, engine)
+
+    def test_get_job_session(self):
+        session = job_database.get_job_session(self.db_url)
+        self.assertIs(self.engine, session.get_bind())
+        session.close()
+
+    def test_get_statuses_by_id(self):
+        ret = job_database.get_statuses_by_id(self.db_url, ThingWithStatus, ['a', 'b', 'c', 'd'])
+        self.assertDictEqual({
+            'a': {'root': StatusMixin.STATUS_PENDING, 'other': 'Working'},
+            'b': {},
+            'c': {},
+        }, ret)
+
+    def test_update_status_by_id(self):
+        ret = job_database.update_status_by_id(
+            self.db_url, ThingWithStatus, ['a', 'b', 'c', 'd'], 'root', StatusMixin.STATUS_SUCCESS
+        )
+        self.assertListEqual(['a', 'b', 'c'], sorted(ret.keys()))
+
+        self.session.expire_all()
+        a, b, c = self.session.query(ThingWithStatus).order_by(ThingWithStatus.id).all()
+        self.assertEqual(StatusMixin.STATUS_SUCCESS, a.get_status())
+        self.assertEqual('Working', a.get_status('other'))
+        self.assertEqual(StatusMixin.STATUS_SUCCESS, b.get_status())
+        self.assertEqual(StatusMixin.STATUS_SUCCESS, c.get_status())
+
+    def test_update_status_by_id_model_path(self):
+        with mock.patch.object(job_database, 'import_from_string', return_value=ThingWithStatus) as mock_import:
+            job_database.update_status_by_id(self.db_url, 'foo.ThingWithStatus', ['b'], 'root', None)
+
+        mock_import.assert_called_with('foo.ThingWithStatus')
+        self.session.expire_all()
+        self.assertEqual('{"root": null}', self.session.query(ThingWithStatus).get('b').status)
+
+    def test_update_status_by_id_invalid_status(self):
+        with self.assertRaises(ValueError):
+            job_database.update_status_by_id(self.db_url, ThingWithStatus, ['a'], 'root', 'not-a-status')
+
+    def test_update_status_by_id_concurrent_update(self):
+        # Another writer changes the row between the read and the compare-and-swap update of the first attempt
+        connection = self.engine.connect()
+        original_execute = connection.execute
+        calls = []
+
+        def execute(statement, *args, **kwargs):
+            calls.append(statement)
+            if len(calls) == 2:
+                original_execute(
+                    ThingWithStatus.__table__.update().
+                    where(ThingWithStatus.__table__.c.id == 'a').
+                    values(status=json.dumps({'root': StatusMixin.STATUS_PENDING, 'other': 'Complete'}))
+                )
+            return original_execute(statement, *args, **kwargs)
+
+        with mock.patch.object(connection, 'execute', side_effect=execute):
+            ThingWithStatus.update_status_by_id(connection, ['a'], 'root', StatusMixin.STATUS_FAILED)
+
+        connection.close()
+        self.assertEqual(4, len(calls))
+        a = self.session.query(ThingWithStatus).get('a')
+        self.assertEqual(StatusMixin.STATUS_FAILED, a.get_status())
+        self.assertEqual('Complete', a.get_status('other'))
+
+    def test_set_status_atomic(self):
+        a = self.session.query(ThingWithStatus).get('a')
+        self.session.execute(
+            ThingWithStatus.__table__.update().
+            where(ThingWithStatus.__table__.c.id == 'a').
+            values(status=json.dumps({'root': StatusMixin.STATUS_PENDING, 'other': 'Complete'}))
+        )
+
+        a.set_status_atomic(self.session, 'root', StatusMixin.STATUS_SUCCESS)
+
+        self.assertNotIn(a, self.session.dirty)
+        self.assertEqual(StatusMixin.STATUS_SUCCESS, a.get_status())
+        self.assertEqual('Complete', a.get_status('other'))
+        self.session.commit()
+
+    def test_set_status_atomic_transient(self):
+        thing = ThingWithStatus(id='e')
+        thing.set_status_atomic(self.session, 'root', StatusMixin.STATUS_SUCCESS)
+        self.assertEqual(StatusMixin.STATUS_SUCCESS, thing.get_status())
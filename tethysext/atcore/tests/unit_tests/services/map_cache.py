@@ -0,0 +1,135 @@
+"""
+********************************************************************************
+* Name: map_cache.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from tethys_gizmos.gizmo_options import MVLayer, MVView
+
+from tethysext.atcore.services import map_cache
+from tethysext.atcore.services.map_cache import DjangoMapCache, FileMapCache, LocalMapCache
+
+
+class MapCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_loads_gizmo_options(self):
+        layer = MVLayer(source='GeoJSON', options={'type': 'FeatureCollection'}, legend_title='Foo')
+        ret = map_cache.loads(map_cache.dumps([layer]))
+
+        self.assertIsNot(layer, ret[0])
+        self.assertEqual('Foo', ret[0].legend_title)
+        ret[0].legend_title = 'Bar'
+        self.assertEqual('Bar', ret[0]['legend_title'])
+
+    def test_local_map_cache(self):
+        cache = LocalMapCache()
+        value = {'view': MVView(projection='EPSG:4326', extent=[-10, -10, 10, 10])}
+        self.assertIsNone(cache.get('foo'))
+
+        cache.set('foo', value)
+        ret = cache.get('foo')
+
+        self.assertEqual(value, ret)
+        self.assertIsNot(value, ret)
+        self.assertEqual('bar', cache.get('bar', 'bar'))
+
+    def test_local_map_cache_max_size(self):
+        cache = LocalMapCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
+    def test_local_map_cache_max_bytes(self):
+        cache = LocalMapCache(max_bytes=10)
+        cache.set_raw('a', b'1234')
+        cache.set_raw('b', b'1234')
+        cache.get_raw('a')
+        cache.set_raw('c', b'1234')
+        self.assertEqual(b'1234', cache.get_raw('a'))
+        self.assertIsNone(cache.get_raw('b'))
+        self.assertEqual(b'1234', cache.get_raw('c'))
+
+        # Replaced and deleted values are not counted
+        cache.set_raw('a', b'12')
+        cache.delete('c')
+        cache.set_raw('d', b'12345678')
+        self.assertEqual(b'12', cache.get_raw('a'))
+        self.assertEqual(b'12345678', cache.get_raw('d'))
+
+        # Values larger than the limit are not kept
+        cache.set_raw('e', b'12345678901')
+        self.assertIsNone(cache.get_raw('e'))
+        self.assertIsNone(cache.get_raw('a'))
+
+    def test_local_map_cache_timeout(self):
+        cache = LocalMapCache(timeout=-1)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_local_map_cache_delete_clear(self):
+        cache = LocalMapCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+
+    def test_file_map_cache(self):
+        cache = FileMapCache(os.path.join(self.directory, 'maps'))
+        self.assertIsNone(cache.get('foo'))
+
+        cache.set('foo', {'extent': [-10, -10, 10, 10]})
+
+        self.assertDictEqual({'extent': [-10, -10, 10, 10]}, FileMapCache(cache.directory).get('foo'))
+        self.assertEqual(1, len(os.listdir(cache.directory)))
+
+    def test_file_map_cache_timeout(self):
+        cache = FileMapCache(self.directory, timeout=-1)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_file_map_cache_delete_clear(self):
+        cache = FileMapCache(self.directory)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.delete('a')
+        cache.delete('c')
+        self.assertIsNone(cache.get('a'))
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+        self.assertListEqual([], os.listdir(self.directory))
+
+    @mock.patch.object(DjangoMapCache, 'cache', new_callable=mock.PropertyMock)
+    def test_django_map_cache(self, mock_cache):
+        values = {}
+        mock_cache.return_value.get.side_effect = lambda key, default=None: values.get(key, default)
+        mock_cache.return_value.set.side_effect = lambda key, value, timeout=None: values.__setitem__(key, value)
+        mock_cache.return_value.get_or_set.side_effect = lambda key, default, timeout=None: \
+            values.setdefault(key, default())
+        cache = DjangoMapCache(timeout=60)
+
+        cache.set('foo', [1, 2])
+        self.assertListEqual([1, 2], cache.get('foo'))
+        self.assertTrue(all(key.startswith('atcore_map:') for key in values))
+
+        cache.clear()
+        self.assertIsNone(cache.get('foo'))
@@ -14,6 +14,7 @@ import unittest
 from tethys_gizmos.gizmo_options import MVLayer
 from tethysext.atcore.models.app_users import Resource
 from tethysext.atcore.services.model_db_spatial_manager import ModelDBSpatialManager
+from tethysext.atcore.services.map_cache import LocalMapCache
 from tethysext.atcore.services.map_manager import MapManagerBase
 
 
@@ -67,6 +68,95 @@ class MapManagerBaseTests(unittest.TestCase):
         self.map_manager.get_map_extent.assert_not_called()
         self.assertEqual('foo', ret)
 
+    def test_map_extent_property_map_cache(self):
+        self.map_manager.map_cache = LocalMapCache()
+        self.map_manager.get_map_extent = mock.MagicMock(
+            return_value=('test_view', [-10, -10, 10, 10])
+        )
+        self.assertEqual([-10, -10, 10, 10], self.map_manager.map_extent)
+        self.assertEqual('test_view', self.map_manager.default_view)
+
+        other_map_manager = _MapManager(self.spatial_manager, self.resource)
+        other_map_manager.map_cache = self.map_manager.map_cache
+        other_map_manager.get_map_extent = mock.MagicMock()
+        self.assertEqual([-10, -10, 10, 10], other_map_manager.map_extent)
+        self.assertEqual('test_view', other_map_manager.default_view)
+        self.map_manager.get_map_extent.assert_called_once()
+        other_map_manager.get_map_extent.assert_not_called()
+
+    def test_get_composed_map_no_map_cache(self):
+        self.map_manager.compose_map = mock.MagicMock(return_value=('map_view', 'extent', []))
+        ret = self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.assertEqual(('map_view', 'extent', []), ret)
+        self.map_manager.compose_map.assert_called_once_with(request='request', resource_id='123', scenario_id=1)
+
+    def test_get_composed_map(self):
+        self.map_manager.map_cache = LocalMapCache()
+        self.map_manager.compose_map = mock.MagicMock(return_value=({'layers': ['a']}, [-10, -10, 10, 10], []))
+
+        ret = self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        ret[2].append('custom_layers')
+        cached = self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+
+        self.assertEqual(({'layers': ['a']}, [-10, -10, 10, 10], []), cached)
+        self.assertIsNot(ret[0], cached[0])
+        self.map_manager.compose_map.assert_called_once()
+
+    def test_get_composed_map_keys(self):
+        self.map_manager.map_cache = LocalMapCache()
+        self.map_manager.compose_map = mock.MagicMock(return_value=({}, None, []))
+
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=2)
+        self.map_manager.get_composed_map(request='request', resource_id='456', scenario_id=1)
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1, foo='bar')
+
+        self.assertEqual(4, self.map_manager.compose_map.call_count)
+
+    def test_get_composed_map_resource_changed(self):
+        self.resource.id = '123'
+        self.resource.name = 'Foo'
+        self.resource.attributes = {'scenario_id': 1}
+        self.map_manager.map_cache = LocalMapCache()
+        self.map_manager.compose_map = mock.MagicMock(return_value=({}, None, []))
+
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.resource.attributes = {'scenario_id': 2}
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.resource.name = 'Bar'
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+
+        self.assertEqual(3, self.map_manager.compose_map.call_count)
+
+    def test_get_composed_map_invalidate_map_cache(self):
+        class _CachedMapManager(_MapManager):
+            map_cache = LocalMapCache()
+
+        map_manager = _CachedMapManager(self.spatial_manager, self.resource)
+        map_manager.compose_map = mock.MagicMock(return_value=({}, None, []))
+
+        map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        _CachedMapManager.invalidate_map_cache('456')
+        map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        _CachedMapManager.invalidate_map_cache('123')
+        map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+
+        self.assertEqual(2, map_manager.compose_map.call_count)
+
+    def test_get_composed_map_no_key(self):
+        self.map_manager.map_cache = LocalMapCache()
+        self.map_manager.get_map_cache_key = mock.MagicMock(return_value=None)
+        self.map_manager.compose_map = mock.MagicMock(return_value=({}, None, []))
+
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+        self.map_manager.get_composed_map(request='request', resource_id='123', scenario_id=1)
+
+        self.assertEqual(2, self.map_manager.compose_map.call_count)
+
+    def test_invalidate_map_cache_no_map_cache(self):
+        _MapManager.invalidate_map_cache('123')
+
     def test_build_layer_group(self):
         ret = self.map_manager.build_layer_group(id='ID001', display_name='Foo', layers='Layer1')
         self.assertEqual('Foo', ret['display_name'])
@@ -549,6 +639,95 @@ class MapManagerBaseTests(unittest.TestCase):
         # IMPORTANT: Test this AFTER assert_called_with
         self.assertEqual(ret, mock_bvl())
 
+    @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase.build_vector_tile_layer')
+    @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase._build_mv_layer')
+    def test_build_geojson_layer_vector_tiles(self, mock_bvl, mock_bvtl):
+        geojson = {
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [-87.89832948468124, 30.651451015987234]},
+                    'properties': {'id': i}
+                } for i in range(3)
+            ]
+        }
+        map_manager = _MapManager(
+            spatial_manager=self.spatial_manager,
+            resource=self.resource
+        )
+        map_manager.VECTOR_TILE_FEATURE_THRESHOLD = 2
+
+        ret = map_manager.build_geojson_layer(
+            geojson=geojson,
+            layer_name='foo',
+            layer_title='Foo',
+            layer_variable='Bar',
+            selectable=True,
+            vector_tile_url='/map/?method=get-vector-tile&z={z}&x={x}&y={y}'
+        )
+
+        mock_bvl.assert_not_called()
+        mock_bvtl.assert_called_with(
+            endpoint='/map/?method=get-vector-tile&z={z}&x={x}&y={y}',
+            layer_name='foo',
+            layer_title='Foo',
+            layer_variable='Bar',
+            layer_id='',
+            visible=True,
+            public=True,
+            selectable=True,
+            plottable=False,
+            has_action=False,
+            extent=None,
+            popup_title=None,
+            excluded_properties=None,
+            label_options=None,
+        )
+        self.assertEqual(ret, mock_bvtl())
+        self.assertNotIn('layer_name', geojson['features'][0]['properties'])
+
+    @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase.build_vector_tile_layer')
+    @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase._build_mv_layer')
+    def test_build_geojson_layer_vector_tiles_below_threshold(self, mock_bvl, mock_bvtl):
+        geojson = {'type': 'FeatureCollection', 'features': []}
+        map_manager = _MapManager(
+            spatial_manager=self.spatial_manager,
+            resource=self.resource
+        )
+
+        ret = map_manager.build_geojson_layer(
+            geojson=geojson,
+            layer_name='foo',
+            layer_title='Foo',
+            layer_variable='Bar',
+            vector_tile_url='/map/?method=get-vector-tile&z={z}&x={x}&y={y}'
+        )
+
+        mock_bvtl.assert_not_called()
+        self.assertEqual(ret, mock_bvl())
+
+    @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase.get_vector_style_map')
+    def test_build_vector_tile_layer(self, mock_gvsm):
+        mock_gvsm.return_value = {}
+        map_manager = _MapManager(
+            spatial_manager=self.spatial_manager,
+            resource=self.resource
+        )
+
+        ret = map_manager.build_vector_tile_layer(
+            endpoint='/map/?method=get-vector-tile&z={z}&x={x}&y={y}',
+            layer_name='foo',
+            layer_title='Foo',
+            layer_variable='Bar',
+            extent=[-1, -1, 1, 1],
+        )
+
+        self.assertEqual('GeoJSON', ret.source)
+        self.assertDictEqual({'type': 'FeatureCollection', 'features': []}, ret.options)
+        self.assertEqual('/map/?method=get-vector-tile&z={z}&x={x}&y={y}', ret.data['vector_tile_url'])
+        self.assertEqual('foo', ret.data['layer_name'])
+
     @mock.patch('tethysext.atcore.services.map_manager.MapManagerBase._build_mv_layer')
     def test_build_wms_layer(self, mock_bvl):
         endpoint = 'http://www.example.com/geoserver/wms'
@@ -45,6 +45,11 @@ class ModelDatabaseConnectionTests(unittest.TestCase):
         self.assertEqual(mdc.db_url_obj, result.url)
         result.dispose()
 
+    def test_get_engine_shared(self):
+        mdc_1 = ModelDatabaseConnection(self.db_url, self.app_namespace)
+        mdc_2 = ModelDatabaseConnection(self.db_url, self.app_namespace)
+        self.assertIs(mdc_1.get_engine(), mdc_2.get_engine())
+
     def test_get_session_maker(self):
         mdc = ModelDatabaseConnection(self.db_url, self.app_namespace)
         result = mdc.get_session_maker()
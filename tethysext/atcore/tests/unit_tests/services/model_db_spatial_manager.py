@@ -28,9 +28,10 @@ class ModelDBSpatialManagerTests(unittest.TestCase):
 
     def setUp(self):
         self.geoserver_engine = mock.MagicMock()
+        ModelDBSpatialManager.clear_projection_cache()
 
     def tearDown(self):
-        pass
+        ModelDBSpatialManager.clear_projection_cache()
 
     def test_get_projection_units_ft(self):
         srid = 2232
@@ -190,6 +191,161 @@ class ModelDBSpatialManagerTests(unittest.TestCase):
         self.assertIn("srtext", execute_calls[0][0][0])
         self.assertIn("proj4text", execute_calls[1][0][0])
 
+    def test_get_projection_string_shared_across_instances(self):
+        srid = 2232
+        mock_row = mock.MagicMock(proj_string="FAKE PROJECTION STRING")
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = [mock_row]
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        ret_1 = ModelDBSpatialManager(self.geoserver_engine).get_projection_string(mock_model_db, srid)
+        ret_2 = ModelDBSpatialManager(self.geoserver_engine).get_projection_string(mock_model_db, srid)
+        self.assertEqual("FAKE PROJECTION STRING", ret_1)
+        self.assertEqual(ret_1, ret_2)
+        mock_engine.execute.assert_called_once()
+        mock_engine.dispose.assert_not_called()
+
+    def make_model_db(self, name, proj_string):
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = [mock.MagicMock(proj_string=proj_string)]
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_name.return_value = name
+        mock_model_db.get_engine.return_value = mock_engine
+        return mock_model_db, mock_engine
+
+    def test_get_projection_string_per_database(self):
+        # Custom SRIDs inserted into spatial_ref_sys may differ between databases
+        mock_model_db_1, mock_engine_1 = self.make_model_db('db_1', 'CUSTOM 1')
+        mock_model_db_2, mock_engine_2 = self.make_model_db('db_2', 'CUSTOM 2')
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+
+        self.assertEqual('CUSTOM 1', model_db_spatial_manager.get_projection_string(mock_model_db_1, 990000))
+        self.assertEqual('CUSTOM 2', model_db_spatial_manager.get_projection_string(mock_model_db_2, 990000))
+        self.assertEqual('CUSTOM 1', model_db_spatial_manager.get_projection_string(mock_model_db_1, 990000))
+        mock_engine_1.execute.assert_called_once()
+        mock_engine_2.execute.assert_called_once()
+
+    def test_clear_projection_cache_model_db(self):
+        mock_model_db_1, mock_engine_1 = self.make_model_db('db_1', 'CUSTOM 1')
+        mock_model_db_2, mock_engine_2 = self.make_model_db('db_2', 'CUSTOM 2')
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.get_projection_string(mock_model_db_1, 990000)
+        model_db_spatial_manager.get_projection_string(mock_model_db_2, 990000)
+
+        ModelDBSpatialManager.clear_projection_cache(mock_model_db_1)
+        model_db_spatial_manager.get_projection_string(mock_model_db_1, 990000)
+        model_db_spatial_manager.get_projection_string(mock_model_db_2, 990000)
+
+        self.assertEqual(2, mock_engine_1.execute.call_count)
+        mock_engine_2.execute.assert_called_once()
+
+    def test_get_projection_string_not_found_not_cached(self):
+        srid = 2232
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = []
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        self.assertEqual('', model_db_spatial_manager.get_projection_string(mock_model_db, srid))
+        self.assertEqual('', model_db_spatial_manager.get_projection_string(mock_model_db, srid))
+        self.assertEqual(2, mock_engine.execute.call_count)
+
+    def test_get_projection_units_uses_cached_proj4(self):
+        srid = 2232
+        mock_row = mock.MagicMock(proj_string="+proj=utm +zone=20 +datum=WGS84 +units=m +no_defs ")
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = [mock_row]
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.get_projection_string(mock_model_db, srid, ModelDBSpatialManager.PRO_PROJ4)
+        ret = model_db_spatial_manager.get_projection_units(mock_model_db, srid)
+        self.assertEqual(ModelDBSpatialManager.U_METRIC, ret)
+        mock_engine.execute.assert_called_once()
+
+    def test_get_projection_info(self):
+        mock_rows = [
+            mock.MagicMock(srid=2232, srtext='WKT 2232', proj4text='+proj=lcc +units=us-ft +no_defs'),
+            mock.MagicMock(srid=32612, srtext='WKT 32612', proj4text='+proj=utm +zone=12 +units=m +no_defs'),
+            mock.MagicMock(srid=9999, srtext='WKT 9999', proj4text='+proj=longlat +no_defs'),
+        ]
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = mock_rows
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+
+        ret = model_db_spatial_manager.get_projection_info(mock_model_db, [2232, '32612', 9999, 1234])
+
+        self.assertDictEqual({
+            2232: {'srtext': 'WKT 2232', 'proj4text': '+proj=lcc +units=us-ft +no_defs', 'units': 'imperial'},
+            32612: {'srtext': 'WKT 32612', 'proj4text': '+proj=utm +zone=12 +units=m +no_defs', 'units': 'metric'},
+            9999: {'srtext': 'WKT 9999', 'proj4text': '+proj=longlat +no_defs', 'units': None},
+        }, ret)
+        mock_engine.execute.assert_called_once()
+        self.assertIn("IN (1234, 2232, 9999, 32612)", mock_engine.execute.call_args[0][0])
+
+        # Served from the cache
+        self.assertEqual('WKT 32612', model_db_spatial_manager.get_projection_string(mock_model_db, 32612))
+        self.assertEqual(ModelDBSpatialManager.U_IMPERIAL,
+                         model_db_spatial_manager.get_projection_units(mock_model_db, 2232))
+        mock_engine.execute.assert_called_once()
+
+    def test_get_projection_info_cached(self):
+        mock_rows = [mock.MagicMock(srid=2232, srtext='WKT 2232', proj4text='+proj=lcc +units=us-ft +no_defs')]
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = mock_rows
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.get_projection_info(mock_model_db, [2232])
+        ret = model_db_spatial_manager.get_projection_info(mock_model_db, [2232])
+        self.assertEqual('WKT 2232', ret[2232]['srtext'])
+        mock_engine.execute.assert_called_once()
+
+    @mock.patch('tethysext.atcore.services.model_db_spatial_manager._import_pyproj')
+    def test_get_projection_string_pyproj(self, mock_import_pyproj):
+        mock_pyproj = mock_import_pyproj.return_value
+        mock_pyproj.CRS.from_epsg.return_value.to_wkt.return_value = 'PYPROJ WKT'
+        mock_model_db = mock.MagicMock()
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.resolve_projections_with_pyproj = True
+        ret = model_db_spatial_manager.get_projection_string(mock_model_db, 2232)
+        self.assertEqual('PYPROJ WKT', ret)
+        mock_pyproj.CRS.from_epsg.assert_called_with(2232)
+        mock_model_db.get_engine.assert_not_called()
+
+    @mock.patch('tethysext.atcore.services.model_db_spatial_manager._import_pyproj')
+    def test_get_projection_string_pyproj_shared_across_databases(self, mock_import_pyproj):
+        mock_pyproj = mock_import_pyproj.return_value
+        mock_pyproj.CRS.from_epsg.return_value.to_wkt.return_value = 'PYPROJ WKT'
+        mock_model_db_1, _ = self.make_model_db('db_1', 'DB WKT')
+        mock_model_db_2, _ = self.make_model_db('db_2', 'DB WKT')
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.resolve_projections_with_pyproj = True
+
+        self.assertEqual('PYPROJ WKT', model_db_spatial_manager.get_projection_string(mock_model_db_1, 2232))
+        self.assertEqual('PYPROJ WKT', model_db_spatial_manager.get_projection_string(mock_model_db_2, 2232))
+        mock_pyproj.CRS.from_epsg.assert_called_once_with(2232)
+
+        # Not used by managers that read projections from the database
+        self.assertEqual('DB WKT', ModelDBSpatialManager(self.geoserver_engine).get_projection_string(
+            mock_model_db_1, 2232
+        ))
+
+    @mock.patch('tethysext.atcore.services.model_db_spatial_manager._import_pyproj')
+    def test_get_projection_string_pyproj_not_installed(self, mock_import_pyproj):
+        mock_import_pyproj.return_value = None
+        mock_engine = mock.MagicMock()
+        mock_engine.execute.return_value = [mock.MagicMock(proj_string="FAKE PROJECTION STRING")]
+        mock_model_db = mock.MagicMock()
+        mock_model_db.get_engine.return_value = mock_engine
+        model_db_spatial_manager = ModelDBSpatialManager(self.geoserver_engine)
+        model_db_spatial_manager.resolve_projections_with_pyproj = True
+        ret = model_db_spatial_manager.get_projection_string(mock_model_db, 2232)
+        self.assertEqual("FAKE PROJECTION STRING", ret)
+        mock_engine.execute.assert_called_once()
+
     def test_link_geoserver_to_db_store_exists(self):
         model_db_spatial_manager = _ModelDBSpatialManager(self.geoserver_engine)
         mock_url = mock.MagicMock(
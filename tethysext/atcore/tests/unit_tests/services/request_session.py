@@ -0,0 +1,139 @@
+"""
+********************************************************************************
+* Name: request_session.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from tethysext.atcore.services import request_session
+
+
+class MockRequest(object):
+    pass
+
+
+class RequestSessionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.request = MockRequest()
+        self.engine = create_engine('sqlite://')
+        self.make_session = sessionmaker(bind=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_get_request_session_not_scoped(self):
+        session_1 = request_session.get_request_session(self.request, self.make_session)
+        session_2 = request_session.get_request_session(self.request, self.make_session)
+        self.assertIsNot(session_1, session_2)
+        self.assertFalse(request_session.is_request_scoped(self.request))
+
+    def test_get_request_session_scoped(self):
+        with request_session.request_scope(self.request):
+            self.assertTrue(request_session.is_request_scoped(self.request))
+            session_1 = request_session.get_request_session(self.request, self.make_session)
+            # Sessionmakers bound to the same database share the session
+            session_2 = request_session.get_request_session(self.request, sessionmaker(bind=create_engine('sqlite://')))
+            session_3 = request_session.get_request_session(
+                self.request, sessionmaker(bind=create_engine('sqlite:///other.db'))
+            )
+
+        self.assertIs(session_1, session_2)
+        self.assertIsNot(session_1, session_3)
+        self.assertFalse(request_session.is_request_scoped(self.request))
+
+    def test_get_request_session_unbound_sessionmaker(self):
+        make_session = sessionmaker()
+
+        with request_session.request_scope(self.request):
+            session_1 = request_session.get_request_session(self.request, make_session)
+            session_2 = request_session.get_request_session(self.request, make_session)
+            session_3 = request_session.get_request_session(self.request, sessionmaker())
+
+        self.assertIs(session_1, session_2)
+        self.assertIsNot(session_1, session_3)
+
+    def test_request_scope_nested(self):
+        with request_session.request_scope(self.request):
+            session = request_session.get_request_session(self.request, self.make_session)
+
+            with mock.patch.object(session, 'close') as mock_close:
+                with request_session.request_scope(self.request):
+                    self.assertIs(session, request_session.get_request_session(self.request, self.make_session))
+
+                mock_close.assert_not_called()
+                self.assertTrue(request_session.is_request_scoped(self.request))
+
+    def test_request_scope_closes_sessions(self):
+        make_session = mock.MagicMock()
+
+        with request_session.request_scope(self.request):
+            session = request_session.get_request_session(self.request, make_session)
+            request_session.release_request_session(self.request, session)
+            session.close.assert_not_called()
+
+        session.close.assert_called_once()
+
+    def test_request_scope_exception(self):
+        make_session = mock.MagicMock()
+
+        with self.assertRaises(ValueError):
+            with request_session.request_scope(self.request):
+                session = request_session.get_request_session(self.request, make_session)
+                raise ValueError()
+
+        session.close.assert_called_once()
+        self.assertFalse(request_session.is_request_scoped(self.request))
+
+    def test_release_request_session_not_scoped(self):
+        make_session = mock.MagicMock()
+        session = request_session.get_request_session(self.request, make_session)
+        request_session.release_request_session(self.request, session)
+        session.close.assert_called_once()
+
+    def test_request_session(self):
+        make_session = mock.MagicMock()
+
+        with request_session.request_session(self.request, make_session) as session:
+            self.assertIs(make_session(), session)
+
+        session.close.assert_called_once()
+
+    def test_request_session_scoped(self):
+        make_session = mock.MagicMock()
+
+        with request_session.request_scope(self.request):
+            with request_session.request_session(self.request, make_session) as session_1:
+                pass
+
+            with request_session.request_session(self.request, make_session) as session_2:
+                pass
+
+            session_1.close.assert_not_called()
+
+        self.assertIs(session_1, session_2)
+        session_1.close.assert_called_once()
+
+    def test_middleware(self):
+        make_session = mock.MagicMock()
+        sessions = []
+
+        def get_response(request):
+            sessions.append(request_session.get_request_session(request, make_session))
+            sessions.append(request_session.get_request_session(request, make_session))
+            return 'RESPONSE'
+
+        middleware = request_session.RequestSessionMiddleware(get_response)
+        ret = middleware(self.request)
+
+        self.assertEqual('RESPONSE', ret)
+        self.assertIs(sessions[0], sessions[1])
+        sessions[0].close.assert_called_once()
+        self.assertFalse(request_session.is_request_scoped(self.request))
@@ -0,0 +1,155 @@
+"""
+********************************************************************************
+* Name: shapefile_export.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import io
+import unittest
+import zipfile
+
+import shapefile
+
+from tethysext.atcore.services.shapefile_export import geojson_to_shapefile_zip, infer_fields
+
+
+def feature(geometry_type, coordinates, **properties):
+    return {
+        'type': 'Feature',
+        'geometry': {'type': geometry_type, 'coordinates': coordinates} if geometry_type else None,
+        'properties': properties,
+    }
+
+
+class ShapefileExportTests(unittest.TestCase):
+
+    def read(self, archive, name='layer'):
+        with zipfile.ZipFile(archive) as zf:
+            self.assertEqual([f'{name}.shp', f'{name}.shx', f'{name}.dbf', f'{name}.prj', f'{name}.cpg'],
+                             zf.namelist())
+            return shapefile.Reader(
+                shp=io.BytesIO(zf.read(f'{name}.shp')),
+                shx=io.BytesIO(zf.read(f'{name}.shx')),
+                dbf=io.BytesIO(zf.read(f'{name}.dbf')),
+                encoding='utf-8',
+            )
+
+    def test_infer_fields(self):
+        features = [
+            feature('Point', [0, 0], name='a', count=1, value=1, flag=True, extra=None, long_property_name=[1]),
+            feature('Point', [0, 0], name='abcd', count=100, value=2.5, flag=False, long_property_other='x'),
+        ]
+
+        fields = infer_fields(features)
+
+        self.assertEqual([
+            ('name', 'name', 'C', 4, 0),
+            ('count', 'count', 'N', 3, 0),
+            ('value', 'value', 'N', 24, 15),
+            ('flag', 'flag', 'L', 1, 0),
+            ('extra', 'extra', 'C', 1, 0),
+            ('long_property_name', 'long_prope', 'C', 3, 0),
+            ('long_property_other', 'long_pro_1', 'C', 1, 0),
+        ], fields)
+
+    def test_geojson_to_shapefile_zip_points(self):
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('Point', [125.6, 10.1], name='Dinagat Islands', count=3, value=1.5, flag=True),
+            feature('Point', [120.0, 12.0, 5.0], name='Other', count=None, value=None, flag=False),
+            feature('LineString', [[0, 0], [1, 1]], name='Skipped'),
+            feature(None, None, name='No Geometry'),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('POINT', reader.shapeTypeName)
+        self.assertEqual(2, len(reader))
+        self.assertEqual([(125.6, 10.1)], reader.shape(0).points)
+        self.assertEqual([(120.0, 12.0)], reader.shape(1).points)
+        self.assertEqual(['Dinagat Islands', 3, 1.5, True], list(reader.record(0)))
+        self.assertEqual(['Other', None, None, False], list(reader.record(1)))
+        self.assertEqual([120.0, 10.1, 125.6, 12.0], list(reader.bbox))
+
+    def test_geojson_to_shapefile_zip_mixed_points(self):
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('Point', [1, 2], id=1),
+            feature('MultiPoint', [[3, 4], [5, 6]], id=2),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('MULTIPOINT', reader.shapeTypeName)
+        self.assertEqual([(1, 2)], reader.shape(0).points)
+        self.assertEqual([(3, 4), (5, 6)], reader.shape(1).points)
+
+    def test_geojson_to_shapefile_zip_lines(self):
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('LineString', [[0, 0], [1, 1]], id=1),
+            feature('MultiLineString', [[[0, 0], [1, 0]], [[2, 2], [3, 3], [4, 4]]], id=2),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('POLYLINE', reader.shapeTypeName)
+        self.assertEqual([0], list(reader.shape(0).parts))
+        self.assertEqual([0, 2], list(reader.shape(1).parts))
+        self.assertEqual([(0, 0), (1, 0), (2, 2), (3, 3), (4, 4)], reader.shape(1).points)
+        self.assertEqual([0, 0, 4, 4], list(reader.shape(1).bbox))
+
+    def test_geojson_to_shapefile_zip_polygons(self):
+        # GeoJSON outer rings are counterclockwise and holes clockwise
+        outer = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+        hole = [[2, 2], [2, 4], [4, 4], [4, 2]]
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('Polygon', [outer, hole], id=1),
+            feature('MultiPolygon', [[outer], [[[20, 20], [21, 20], [21, 21], [20, 20]]]], id=2),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('POLYGON', reader.shapeTypeName)
+        polygon = reader.shape(0)
+        self.assertEqual([0, 5], list(polygon.parts))
+        # Outer rings are written clockwise and holes counterclockwise, holes are closed
+        self.assertEqual([(0, 0), (0, 10), (10, 10), (10, 0), (0, 0)], polygon.points[:5])
+        self.assertEqual([(2, 2), (4, 2), (4, 4), (2, 4), (2, 2)], polygon.points[5:])
+        self.assertEqual([0, 5], list(reader.shape(1).parts))
+        self.assertEqual([0, 0, 21, 21], list(reader.bbox))
+
+    def test_geojson_to_shapefile_zip_3d_lines(self):
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('LineString', [[1, 2, 100], [3, 4, 200]], id=1),
+            feature('MultiLineString', [[[5, 6, 300], [7, 8, 400]]], id=2),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('POLYLINE', reader.shapeTypeName)
+        self.assertEqual([(1, 2), (3, 4)], reader.shape(0).points)
+        self.assertEqual([(5, 6), (7, 8)], reader.shape(1).points)
+
+    def test_geojson_to_shapefile_zip_3d_points(self):
+        geojson = {'type': 'FeatureCollection', 'features': [
+            feature('Point', [1, 2, 100], id=1),
+            feature('Point', [3, 4, 200], id=2),
+        ]}
+
+        with geojson_to_shapefile_zip(geojson, 'layer') as archive:
+            reader = self.read(archive)
+
+        self.assertEqual('POINT', reader.shapeTypeName)
+        self.assertEqual([(1, 2)], reader.shape(0).points)
+        self.assertEqual([(3, 4)], reader.shape(1).points)
+
+    def test_geojson_to_shapefile_zip_no_supported_geometry(self):
+        geojson = {'type': 'FeatureCollection', 'features': [feature(None, None, name='No Geometry')]}
+
+        with self.assertRaises(ValueError):
+            geojson_to_shapefile_zip(geojson, 'layer')
@@ -0,0 +1,105 @@
+"""
+********************************************************************************
+* Name: spatial_index.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import random
+import unittest
+
+from tethysext.atcore.services.spatial_index import PackedRTree, build_geojson_index, get_bounds, \
+    get_geojson_version
+
+
+class SpatialIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.geojson = {
+            'type': 'FeatureCollection',
+            'features': [
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'Point', 'coordinates': [-111.9, 40.7]},
+                    'properties': {'id': 1},
+                },
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'LineString', 'coordinates': [[-120.0, 35.0], [-100.0, 45.0]]},
+                    'properties': {'id': 'two'},
+                },
+                {'type': 'Feature', 'geometry': None, 'properties': {'id': 3}},
+                {
+                    'type': 'Feature',
+                    'id': 4,
+                    'geometry': {'type': 'Point', 'coordinates': [-104.9, 39.7]},
+                    'properties': {},
+                },
+            ]
+        }
+
+    def test_get_bounds(self):
+        self.assertEqual((-111.9, 40.7, -111.9, 40.7), get_bounds(self.geojson['features'][0]['geometry']))
+        self.assertEqual((-120.0, 35.0, -100.0, 45.0), get_bounds(self.geojson['features'][1]['geometry']))
+        self.assertEqual((0, 0, 2, 3), get_bounds({
+            'type': 'GeometryCollection',
+            'geometries': [
+                {'type': 'Polygon', 'coordinates': [[[0, 0], [2, 0], [2, 2], [0, 0]]]},
+                {'type': 'Point', 'coordinates': [1, 3]},
+            ]
+        }))
+        self.assertIsNone(get_bounds({'type': 'Point', 'coordinates': []}))
+
+    def test_get_geojson_version(self):
+        version = get_geojson_version(self.geojson)
+        self.assertEqual(12, len(version))
+        self.assertEqual(version, get_geojson_version(dict(reversed(list(self.geojson.items())))))
+
+        self.geojson['features'][0]['properties']['id'] = 5
+        self.assertNotEqual(version, get_geojson_version(self.geojson))
+
+    def test_packed_rtree(self):
+        random.seed(0)
+        boxes = []
+        for i in range(1000):
+            x, y = random.uniform(-120, -100), random.uniform(30, 45)
+            boxes.append(None if i % 50 == 0 else (x, y, x + random.uniform(0, 1), y + random.uniform(0, 1)))
+
+        tree = PackedRTree.build(boxes)
+
+        # Leaves, nodes of 16 leaves and nodes of 16 of those
+        self.assertEqual(980, len(tree.items))
+        self.assertListEqual([62, 4], [len(level) for level in tree.nodes])
+
+        for _ in range(100):
+            x, y = random.uniform(-122, -98), random.uniform(28, 47)
+            bbox = (x, y, x + random.uniform(0, 3), y + random.uniform(0, 3))
+            expected = [i for i, b in enumerate(boxes)
+                        if b and b[0] <= bbox[2] and b[2] >= bbox[0] and b[1] <= bbox[3] and b[3] >= bbox[1]]
+            self.assertListEqual(expected, tree.query(bbox))
+
+    def test_packed_rtree_small(self):
+        self.assertListEqual([], PackedRTree.build([]).query((0, 0, 1, 1)))
+
+        tree = PackedRTree.build([(0, 0, 1, 1), (2, 2, 3, 3)])
+        self.assertListEqual([], tree.nodes)
+        self.assertListEqual([1], tree.query((1.5, 1.5, 2, 2)))
+        self.assertListEqual([0, 1], tree.query((1, 1, 2, 2)))
+
+    def test_packed_rtree_to_dict(self):
+        tree = PackedRTree.build([(i, i, i + 1, i + 1) for i in range(100)], node_size=4)
+        ret = PackedRTree.from_dict(tree.to_dict())
+
+        self.assertEqual(4, ret.node_size)
+        self.assertListEqual([10, 11], ret.query((10.5, 10.5, 11.5, 11.5)))
+
+    def test_build_geojson_index(self):
+        ret = build_geojson_index(self.geojson)
+
+        self.assertEqual(get_geojson_version(self.geojson), ret['version'])
+        self.assertDictEqual({'1': 0, 'two': 1, '3': 2, '4': 3}, ret['ids'])
+
+        tree = PackedRTree.from_dict(ret['tree'])
+        self.assertListEqual([0, 1], tree.query((-112, 40, -111, 41)))
+        self.assertListEqual([1, 3], tree.query((-105, 39.5, -104, 40)))
@@ -0,0 +1,148 @@
+"""
+********************************************************************************
+* Name: spatial_reference.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from tethysext.atcore.services import spatial_reference
+from tethysext.atcore.services.spatial_reference import SpatialReferenceCatalog, SpatialReferenceService
+
+SPATIAL_REFERENCE_SYSTEMS = [
+    (2232, 'PROJCS["NAD83 / Colorado Central (ftUS)",GEOGCS["NAD83",DATUM["North_American_Datum_1983"]],'
+           'PARAMETER["standard_parallel_1",39.75],AUTHORITY["EPSG","2232"]]'),
+    (2233, 'PROJCS["NAD83 / Colorado South (ftUS)",GEOGCS["NAD83",DATUM["North_American_Datum_1983"]],'
+           'AUTHORITY["EPSG","2233"]]'),
+    (3566, 'PROJCS["NAD83 / Utah Central (ftUS)",GEOGCS["NAD83",DATUM["North_American_Datum_1983"]],'
+           'AUTHORITY["EPSG","3566"]]'),
+    (4326, 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563]],AUTHORITY["EPSG","4326"]]'),
+]
+
+
+class SpatialReferenceCatalogTests(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite://', poolclass=StaticPool)
+        self.engine.execute('CREATE TABLE spatial_ref_sys (srid INTEGER PRIMARY KEY, srtext VARCHAR)')
+        self.engine.execute('INSERT INTO spatial_ref_sys VALUES (?, ?)', SPATIAL_REFERENCE_SYSTEMS)
+
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self.record_statement)
+
+        self.catalog = SpatialReferenceCatalog()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def record_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_get_name(self):
+        ret = SpatialReferenceCatalog.get_name(SPATIAL_REFERENCE_SYSTEMS[2][1])
+        self.assertEqual('NAD83 / Utah Central (ftUS)', ret)
+        self.assertEqual('', SpatialReferenceCatalog.get_name('no name'))
+        self.assertEqual('', SpatialReferenceCatalog.get_name(None))
+
+    def test_get(self):
+        self.assertEqual('NAD83 / Colorado Central (ftUS)', self.catalog.get(self.engine, 2232))
+        self.assertIsNone(self.catalog.get(self.engine, 9999))
+        # Loaded once, checked for changes once
+        self.assertEqual(2, len(self.statements))
+
+    def test_search(self):
+        ret = self.catalog.search(self.engine, ['Colorado'])
+        self.assertListEqual([
+            (2232, 'NAD83 / Colorado Central (ftUS)'),
+            (2233, 'NAD83 / Colorado South (ftUS)'),
+        ], ret)
+
+    def test_search_multiple_words(self):
+        ret = self.catalog.search(self.engine, ['central', 'COLORADO'])
+        self.assertListEqual([(2232, 'NAD83 / Colorado Central (ftUS)')], ret)
+
+    def test_search_prefix(self):
+        ret = self.catalog.search(self.engine, ['Cent'])
+        self.assertListEqual([2232, 3566], [srid for srid, _ in ret])
+
+    def test_search_srid(self):
+        ret = self.catalog.search(self.engine, ['223'])
+        self.assertListEqual([2232, 2233], [srid for srid, _ in ret])
+
+    def test_search_wkt_words(self):
+        ret = self.catalog.search(self.engine, ['spheroid'])
+        self.assertListEqual([(4326, 'WGS 84')], ret)
+
+    def test_search_no_match(self):
+        self.assertListEqual([], self.catalog.search(self.engine, ['Colorado', 'Utah']))
+        self.assertListEqual([], self.catalog.search(self.engine, ['Nowhere']))
+
+    def test_search_empty(self):
+        self.assertListEqual([], self.catalog.search(self.engine, []))
+        self.assertListEqual([], self.catalog.search(self.engine, ['-']))
+        self.assertListEqual([], self.statements)
+
+    def test_refresh_interval(self):
+        self.catalog.search(self.engine, ['Colorado'])
+        self.catalog.search(self.engine, ['Utah'])
+        self.assertEqual(2, len(self.statements))
+
+        self.catalog.refresh_interval = 0
+        self.catalog.search(self.engine, ['Utah'])
+        # Table unchanged: checked but not reloaded
+        self.assertEqual(3, len(self.statements))
+
+    def test_refresh_table_changed(self):
+        self.catalog.refresh_interval = 0
+        self.assertListEqual([], self.catalog.search(self.engine, ['Wyoming']))
+
+        self.engine.execute('INSERT INTO spatial_ref_sys VALUES (32155, \'PROJCS["NAD83 / Wyoming East"]\')')
+
+        self.assertListEqual([(32155, 'NAD83 / Wyoming East')], self.catalog.search(self.engine, ['Wyoming']))
+
+    def test_get_wkt(self):
+        self.assertEqual(SPATIAL_REFERENCE_SYSTEMS[0][1], self.catalog.get_wkt(self.engine, 2232))
+        num_statements = len(self.statements)
+        self.assertEqual(SPATIAL_REFERENCE_SYSTEMS[0][1], self.catalog.get_wkt(self.engine, 2232))
+        self.assertEqual(num_statements, len(self.statements))
+
+    def test_get_wkt_not_found(self):
+        self.assertIsNone(self.catalog.get_wkt(self.engine, 9999))
+        # Not in the catalog, so the table is not queried
+        self.assertEqual(2, len(self.statements))
+
+    def test_get_wkt_cache_size(self):
+        self.catalog.wkt_cache_size = 2
+        for srid in (2232, 2233, 3566, 2233):
+            self.catalog.get_wkt(self.engine, srid)
+
+        self.assertListEqual([3566, 2233], list(self.catalog._wkt_cache.keys()))
+
+    def test_get_spatial_reference_catalog(self):
+        with mock.patch.object(spatial_reference, '_catalogs', {}):
+            catalog = spatial_reference.get_spatial_reference_catalog(self.engine)
+            self.assertIs(catalog, spatial_reference.get_spatial_reference_catalog(create_engine('sqlite://')))
+            other_catalog = spatial_reference.get_spatial_reference_catalog(create_engine('sqlite:///foo.db'))
+            self.assertIsNot(catalog, other_catalog)
+
+    def test_service(self):
+        srs = SpatialReferenceService(self.engine)
+        srs._catalog = self.catalog
+
+        self.assertDictEqual(
+            {'results': [{'text': '2232 NAD83 / Colorado Central (ftUS)', 'id': '2232'}]},
+            srs.get_spatial_reference_system_by_srid('2232')
+        )
+        self.assertDictEqual({'results': []}, srs.get_spatial_reference_system_by_srid('foo'))
+        self.assertDictEqual(
+            {'results': [{'text': '3566 NAD83 / Utah Central (ftUS)', 'id': '3566'}]},
+            srs.get_spatial_reference_system_by_query_string(['Utah'])
+        )
+        self.assertDictEqual({'results': SPATIAL_REFERENCE_SYSTEMS[2][1]}, srs.get_wkt_by_srid('3566'))
+        self.assertDictEqual({'results': ''}, srs.get_wkt_by_srid('-987654321'))
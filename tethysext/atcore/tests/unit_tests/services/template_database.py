@@ -0,0 +1,152 @@
+"""
+********************************************************************************
+* Name: template_database.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import unittest
+from unittest import mock
+
+from sqlalchemy import Column, Index, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from tethysext.atcore.services import template_database
+from tethysext.atcore.services.template_database import WarmDatabasePool, get_schema_hash
+
+
+def make_declarative_base(column_type=String, index=True):
+    Base = declarative_base()
+
+    class Model(Base):
+        __tablename__ = 'models'
+        __table_args__ = (Index('ix_models_name', 'name'),) if index else ()
+
+        id = Column(Integer, primary_key=True)
+        name = Column(column_type)
+
+    return Base
+
+
+class TemplateDatabaseTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cluster_engine = mock.MagicMock()
+        self.cluster_engine.dialect.identifier_preparer.quote.side_effect = lambda name: '"{}"'.format(name)
+        self.connection = self.cluster_engine.connect.return_value.__enter__.return_value
+        self.autocommit_connection = self.connection.execution_options.return_value
+
+    def get_statements(self):
+        return [str(c[0][0]) for c in self.autocommit_connection.execute.call_args_list]
+
+    def test_get_schema_hash(self):
+        ret = get_schema_hash((make_declarative_base(),), False, 1)
+        self.assertEqual(12, len(ret))
+        self.assertEqual(ret, get_schema_hash((make_declarative_base(),), False, 1))
+
+    def test_get_schema_hash_changed(self):
+        ret = get_schema_hash((make_declarative_base(),), False, 1)
+        self.assertNotEqual(ret, get_schema_hash((make_declarative_base(column_type=Integer),), False, 1))
+        self.assertNotEqual(ret, get_schema_hash((make_declarative_base(index=False),), False, 1))
+        self.assertNotEqual(ret, get_schema_hash((make_declarative_base(),), True, 1))
+        self.assertNotEqual(ret, get_schema_hash((make_declarative_base(),), False, 2))
+
+    def test_create_database(self):
+        template_database.create_database(self.cluster_engine, 'foo', template='foo_template', owner='tethys')
+        self.assertListEqual(['CREATE DATABASE "foo" TEMPLATE "foo_template" OWNER "tethys"'], self.get_statements())
+        self.connection.execution_options.assert_called_with(isolation_level='AUTOCOMMIT')
+
+    def test_create_database_no_template(self):
+        template_database.create_database(self.cluster_engine, 'foo')
+        self.assertListEqual(['CREATE DATABASE "foo"'], self.get_statements())
+
+    def test_drop_database(self):
+        self.connection.dialect.server_version_info = (14, 2)
+        template_database.drop_database(self.cluster_engine, 'foo')
+        self.assertListEqual(['DROP DATABASE IF EXISTS "foo" WITH (FORCE)'], self.get_statements())
+
+    def test_drop_database_old_server(self):
+        self.connection.dialect.server_version_info = (12, 9)
+        template_database.drop_database(self.cluster_engine, 'foo')
+        self.assertListEqual(['DROP DATABASE IF EXISTS "foo"'], self.get_statements())
+
+    def test_rename_database(self):
+        template_database.rename_database(self.cluster_engine, 'foo', 'bar')
+        self.assertListEqual(['ALTER DATABASE "foo" RENAME TO "bar"'], self.get_statements())
+
+    def test_get_database_owner(self):
+        self.autocommit_connection.execute.return_value.fetchall.return_value = [('tethys',)]
+        self.assertEqual('tethys', template_database.get_database_owner(self.cluster_engine, 'foo'))
+        self.autocommit_connection.execute.return_value.fetchall.return_value = []
+        self.assertIsNone(template_database.get_database_owner(self.cluster_engine, 'foo'))
+
+    @mock.patch.object(template_database, 'drop_database')
+    @mock.patch.object(template_database, 'list_databases')
+    def test_drop_stale_templates(self, mock_list, mock_drop):
+        mock_list.return_value = [
+            'foo_template_012345_aaaaaaaaaaaa',
+            'foo_template_012345_aaaaaaaaaaaa_pool_1',
+            'foo_template_012345_bbbbbbbbbbbb',
+            'foo_template_012345_bbbbbbbbbbbb_pool_1',
+            'foo_template_012345_bbbbbbbbbbbb_pool_2',
+        ]
+        mock_drop.side_effect = [None, Exception('in use'), None]
+
+        ret = template_database.drop_stale_templates(self.cluster_engine, 'foo_template_012345_',
+                                                     'foo_template_012345_aaaaaaaaaaaa')
+
+        mock_list.assert_called_with(self.cluster_engine, 'foo_template_012345_')
+        self.assertListEqual([
+            mock.call(self.cluster_engine, 'foo_template_012345_bbbbbbbbbbbb'),
+            mock.call(self.cluster_engine, 'foo_template_012345_bbbbbbbbbbbb_pool_1'),
+            mock.call(self.cluster_engine, 'foo_template_012345_bbbbbbbbbbbb_pool_2'),
+        ], mock_drop.call_args_list)
+        self.assertListEqual(['foo_template_012345_bbbbbbbbbbbb', 'foo_template_012345_bbbbbbbbbbbb_pool_2'], ret)
+
+    @mock.patch.object(template_database, 'rename_database')
+    @mock.patch.object(template_database, 'list_databases')
+    def test_pool_take(self, mock_list, mock_rename):
+        mock_list.return_value = ['foo_template_pool_1', 'foo_template_pool_2']
+        mock_rename.side_effect = [Exception('does not exist'), None]
+        pool = WarmDatabasePool('foo_template', 2)
+        self.assertTrue(pool.take(self.cluster_engine, 'foo_db'))
+        mock_list.assert_called_with(self.cluster_engine, 'foo_template_pool_')
+        mock_rename.assert_called_with(self.cluster_engine, 'foo_template_pool_2', 'foo_db')
+
+    @mock.patch.object(template_database, 'list_databases')
+    def test_pool_take_empty(self, mock_list):
+        mock_list.return_value = []
+        self.assertFalse(WarmDatabasePool('foo_template', 2).take(self.cluster_engine, 'foo_db'))
+
+    @mock.patch.object(template_database, 'create_database')
+    @mock.patch.object(template_database, 'list_databases')
+    def test_pool_top_up(self, mock_list, mock_create):
+        mock_list.return_value = ['foo_template_pool_1']
+        ret = WarmDatabasePool('foo_template', 3).top_up(self.cluster_engine, owner='tethys')
+        self.assertEqual(2, ret)
+        self.assertEqual(2, mock_create.call_count)
+        self.assertTrue(mock_create.call_args[0][1].startswith('foo_template_pool_'))
+        self.assertEqual({'template': 'foo_template', 'owner': 'tethys'}, mock_create.call_args[1])
+
+    @mock.patch.object(WarmDatabasePool, 'top_up')
+    def test_pool_top_up_async(self, mock_top_up):
+        pool = WarmDatabasePool('foo_template', 3)
+        thread = pool.top_up_async(lambda: self.cluster_engine, owner='tethys')
+        thread.join(timeout=5)
+        mock_top_up.assert_called_once_with(self.cluster_engine, owner='tethys')
+        self.cluster_engine.dispose.assert_called_once()
+        # Lock released
+        pool.top_up_async(lambda: self.cluster_engine).join(timeout=5)
+        self.assertEqual(2, mock_top_up.call_count)
+
+    @mock.patch.object(WarmDatabasePool, 'top_up')
+    def test_pool_top_up_async_in_progress(self, mock_top_up):
+        pool = WarmDatabasePool('bar_template', 3)
+        lock = WarmDatabasePool._top_up_locks.setdefault(pool.prefix, mock.MagicMock())
+        lock.acquire.return_value = False
+        try:
+            self.assertIsNone(pool.top_up_async(lambda: self.cluster_engine))
+        finally:
+            WarmDatabasePool._top_up_locks.pop(pool.prefix)
+        mock_top_up.assert_not_called()
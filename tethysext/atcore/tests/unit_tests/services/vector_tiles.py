@@ -0,0 +1,199 @@
+"""
+********************************************************************************
+* Name: vector_tiles.py
+* Author: nswain
+* Created On: October 17, 2026
+* Copyright: (c) Aquaveo 2026
+********************************************************************************
+"""
+import unittest
+from unittest import mock
+
+import mapbox_vector_tile
+from sqlalchemy.dialects import postgresql
+
+from tethysext.atcore.services import vector_tiles
+from tethysext.atcore.services.map_cache import LocalMapCache
+from tethysext.atcore.services.vector_tiles import GeoJSONTileSource, PostGISTileSource, TileSourceCache
+
+
+def point(lon, lat, **properties):
+    return {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [lon, lat]}, 'properties': properties}
+
+
+class VectorTilesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.geojson = {
+            'type': 'FeatureCollection',
+            'features': [
+                point(-111.9, 40.7, id=1, name='Salt Lake City', plot={'title': 'Plot 1'}),
+                point(-104.9, 39.7, id=2, name='Denver', missing=None),
+                {
+                    'type': 'Feature',
+                    'geometry': {'type': 'LineString', 'coordinates': [[-120.0, 35.0], [-100.0, 45.0]]},
+                    'properties': {'id': 3},
+                },
+                {'type': 'Feature', 'geometry': None, 'properties': {'id': 4}},
+            ]
+        }
+
+    def decode(self, tile):
+        return mapbox_vector_tile.decode(tile)
+
+    def test_tile_bounds(self):
+        e = vector_tiles.EARTH_HALF_CIRCUMFERENCE
+        self.assertEqual((-e, -e, e, e), vector_tiles.tile_bounds(0, 0, 0))
+        self.assertEqual((0.0, 0.0, e, e), vector_tiles.tile_bounds(1, 1, 0))
+        self.assertEqual((-e, -e, 0.0, 0.0), vector_tiles.tile_bounds(1, 0, 1))
+
+    def test_to_web_mercator(self):
+        x, y = vector_tiles.to_web_mercator(180.0, 0.0)
+        self.assertAlmostEqual(vector_tiles.EARTH_HALF_CIRCUMFERENCE, x)
+        self.assertAlmostEqual(0.0, y)
+        # Clamped to the latitude of the edge of the world in web mercator
+        self.assertAlmostEqual(vector_tiles.EARTH_HALF_CIRCUMFERENCE, vector_tiles.to_web_mercator(0.0, 90.0)[1], 2)
+
+    def test_geojson_source(self):
+        source = GeoJSONTileSource(self.geojson, 'cities', properties={'layer_name': 'cities'})
+
+        # Features without geometry are skipped, properties are scalars
+        self.assertEqual(3, len(source.features))
+        properties = source.features[0][2]
+        self.assertDictEqual(
+            {'id': 1, 'name': 'Salt Lake City', 'plot': '{"title": "Plot 1"}', 'layer_name': 'cities'},
+            properties
+        )
+        self.assertNotIn('missing', source.features[1][2])
+
+    def test_geojson_source_index(self):
+        source = GeoJSONTileSource(self.geojson, 'cities')
+
+        self.assertListEqual([0, 1, 2], source.tree.query(vector_tiles.tile_bounds(0, 0, 0)))
+        self.assertEqual(4 * vector_tiles.COORDINATE_NBYTES + 3 * vector_tiles.FEATURE_NBYTES, source.nbytes)
+
+    def test_get_tile(self):
+        source = GeoJSONTileSource(self.geojson, 'cities', properties={'layer_name': 'cities'})
+        ret = self.decode(source.get_tile(0, 0, 0))
+
+        features = ret['cities']['features']
+        self.assertEqual(3, len(features))
+        self.assertEqual('Salt Lake City', features[0]['properties']['name'])
+        self.assertEqual('cities', features[0]['properties']['layer_name'])
+
+    def test_get_tile_only_features_in_tile(self):
+        source = GeoJSONTileSource(self.geojson, 'cities')
+        # Zoom 6 tile containing Salt Lake City, the line crosses it, Denver is outside of it
+        ret = self.decode(source.get_tile(6, 12, 24))
+
+        self.assertListEqual([1, 3], sorted(f['properties']['id'] for f in ret['cities']['features']))
+
+    def test_get_tile_clipped(self):
+        source = GeoJSONTileSource(self.geojson, 'cities')
+        ret = self.decode(source.get_tile(6, 12, 24))
+        line = [f for f in ret['cities']['features'] if f['properties']['id'] == 3][0]
+
+        # Clipped to the tile and its buffer
+        low = -vector_tiles.TILE_BUFFER - 1
+        high = vector_tiles.TILE_EXTENT + vector_tiles.TILE_BUFFER + 1
+        for x, y in line['geometry']['coordinates']:
+            self.assertTrue(low <= x <= high)
+            self.assertTrue(low <= y <= high)
+
+    def test_get_tile_queries_index(self):
+        source = GeoJSONTileSource(self.geojson, 'cities')
+
+        with mock.patch.object(source.tree, 'query', return_value=[1]) as mock_query:
+            ret = self.decode(source.get_tile(0, 0, 0))
+
+        # Only the features found with the index of the source are read
+        mock_query.assert_called_once()
+        self.assertListEqual([2], [f['properties']['id'] for f in ret['cities']['features']])
+
+    def test_get_tile_empty(self):
+        source = GeoJSONTileSource(self.geojson, 'cities')
+        self.assertEqual(b'', source.get_tile(6, 0, 0))
+
+    def test_postgis_source(self):
+        engine = mock.MagicMock()
+        engine.dialect = postgresql.dialect()
+        engine.execute.return_value.scalar.return_value = memoryview(b'tile')
+        source = PostGISTileSource(engine, 'Roads', 'roads', properties=('id', 'name'), srid='2232', schema='model')
+
+        ret = source.get_tile(12, 800, 1500)
+
+        self.assertEqual(b'tile', ret)
+        query, params = engine.execute.call_args[0]
+        self.assertDictEqual({'z': 12, 'x': 800, 'y': 1500, 'layer_name': 'roads'}, params)
+        self.assertIn('FROM model."Roads" t', str(query))
+        self.assertIn('ST_AsMVTGeom(ST_Transform(t.geometry, 3857)', str(query))
+        self.assertIn(', t.id, t.name FROM', str(query))
+        self.assertIn('ST_Transform(bounds.geom, 2232)', str(query))
+
+    def test_postgis_source_empty(self):
+        engine = mock.MagicMock()
+        engine.dialect = postgresql.dialect()
+        engine.execute.return_value.scalar.return_value = None
+        source = PostGISTileSource(engine, 'roads', 'roads')
+
+        self.assertEqual(b'', source.get_tile(12, 800, 1500))
+
+    def test_tile_source_cache(self):
+        cache = TileSourceCache(max_size=2)
+        make_source = mock.MagicMock(side_effect=['a', 'b', 'c', 'a'])
+
+        self.assertEqual('a', cache.get('1', make_source))
+        self.assertEqual('a', cache.get('1', make_source))
+        self.assertEqual('b', cache.get('2', make_source))
+        self.assertEqual('c', cache.get('3', make_source))
+        # Least recently used evicted
+        self.assertEqual('a', cache.get('1', make_source))
+        self.assertEqual(4, make_source.call_count)
+
+    def test_tile_source_cache_max_bytes(self):
+        cache = TileSourceCache(max_bytes=10)
+        sources = {k: mock.MagicMock(nbytes=4) for k in 'abc'}
+
+        cache.get('a', lambda: sources['a'])
+        cache.get('b', lambda: sources['b'])
+        cache.get('a', mock.MagicMock())
+        cache.get('c', lambda: sources['c'])
+
+        # Least recently used evicted once the sources use more than max_bytes
+        self.assertIs(sources['a'], cache.get('a', mock.MagicMock()))
+        self.assertIs(sources['c'], cache.get('c', mock.MagicMock()))
+        make_source = mock.MagicMock(return_value=sources['b'])
+        cache.get('b', make_source)
+        make_source.assert_called_once()
+
+    def test_tile_source_cache_large_source(self):
+        cache = TileSourceCache(max_bytes=10)
+        source = mock.MagicMock(nbytes=20)
+
+        # The most recently used source is kept even if it is larger than max_bytes
+        self.assertIs(source, cache.get('a', lambda: source))
+        self.assertIs(source, cache.get('a', mock.MagicMock()))
+
+    def test_tile_source_cache_not_found(self):
+        cache = TileSourceCache()
+        make_source = mock.MagicMock(return_value=None)
+
+        self.assertIsNone(cache.get('1', make_source))
+        self.assertIsNone(cache.get('1', make_source))
+        self.assertEqual(2, make_source.call_count)
+
+    def test_get_tile_cached(self):
+        cache = LocalMapCache()
+        source = mock.MagicMock()
+        source.get_tile.return_value = b'tile'
+        get_source = mock.MagicMock(return_value=source)
+
+        self.assertEqual(b'tile', vector_tiles.get_tile('layer', 1, 0, 1, get_source, cache=cache))
+        self.assertEqual(b'tile', vector_tiles.get_tile('layer', 1, 0, 1, get_source, cache=cache))
+
+        get_source.assert_called_once()
+        source.get_tile.assert_called_once_with(1, 0, 1)
+
+    def test_get_tile_not_found(self):
+        cache = LocalMapCache()
+        self.assertIsNone(vector_tiles.get_tile('layer', 1, 0, 1, lambda: None, cache=cache))
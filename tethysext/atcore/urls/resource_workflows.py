@@ -15,7 +15,10 @@ from tethysext.atcore.models.app_users import (
     Organization,
     Resource,
     ResourceWorkflow,
+    ResourceWorkflowResult,
+    ResourceWorkflowStep,
 )
+from tethysext.atcore.models.controller_metadata import controller_registry
 from tethysext.atcore.services.app_users.permissions_manager import (
     AppPermissionsManager,
 )
@@ -25,6 +28,24 @@ from tethysext.atcore.utilities import update_urlmap_index
 DEFAULT_HANDLER = {"handler": panel_rws_handler, "type": "bokeh"}
 
 
+def get_controller_paths():
+    """
+    Get the dot-paths of the default controllers of all ResourceWorkflowStep and ResourceWorkflowResult classes that have been imported.
+
+    Returns:
+        list<str>: the dot-paths.
+    """  # noqa: E501
+    paths = []
+
+    for base in (ResourceWorkflowStep, ResourceWorkflowResult):
+        for mapper in base.__mapper__.self_and_descendants:
+            path = getattr(mapper.class_, "CONTROLLER", None)
+            if path and path not in paths:
+                paths.append(path)
+
+    return paths
+
+
 def urls(
     url_map_maker,
     app,
@@ -153,6 +174,24 @@ def urls(
             + "/{workflow_id}/step/{step_id}/result/{result_id}"
         )  # noqa: E222, E501
 
+        router_kwargs = {
+            "_app": app,
+            "_persistent_store_name": persistent_store_name,
+            "_AppUser": _AppUser,
+            "_Organization": _Organization,
+            "_Resource": _Resource,
+            "_PermissionsManager": _PermissionsManager,
+            "_ResourceWorkflow": _ResourceWorkflow,
+            "base_template": base_template,
+        }
+
+        # Import and prepare the step and result controllers with the kwargs the router instantiates them with
+        controller_registry.warm(
+            get_controller_paths(),
+            _ResourceWorkflowStep=_ResourceWorkflowRouter._ResourceWorkflowStep,
+            **router_kwargs,
+        )
+
         workflow_url_maps = [
             url_map_maker(
                 name=workflow_name,
@@ -161,16 +200,7 @@ def urls(
                     if base_url_path
                     else workflow_url
                 ),
-                controller=_ResourceWorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    _AppUser=_AppUser,
-                    _Organization=_Organization,
-                    _Resource=_Resource,
-                    _PermissionsManager=_PermissionsManager,
-                    _ResourceWorkflow=_ResourceWorkflow,
-                    base_template=base_template,
-                ),
+                controller=_ResourceWorkflowRouter.as_controller(**router_kwargs),
             ),
             url_map_maker(
                 name=workflow_step_name,
@@ -179,16 +209,7 @@ def urls(
                     if base_url_path
                     else workflow_step_url
                 ),
-                controller=_ResourceWorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    _AppUser=_AppUser,
-                    _Organization=_Organization,
-                    _Resource=_Resource,
-                    _PermissionsManager=_PermissionsManager,
-                    _ResourceWorkflow=_ResourceWorkflow,
-                    base_template=base_template,
-                ),
+                controller=_ResourceWorkflowRouter.as_controller(**router_kwargs),
                 handler=handler,
                 handler_type=handler_type,
                 regex=["[0-9A-Za-z-_.]+", "[0-9A-Za-z-_.{}]+", "[0-9A-Za-z-_.]+"],
@@ -200,16 +221,7 @@ def urls(
                     if base_url_path
                     else workflow_step_result_url
                 ),
-                controller=_ResourceWorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    _AppUser=_AppUser,
-                    _Organization=_Organization,
-                    _Resource=_Resource,
-                    _PermissionsManager=_PermissionsManager,
-                    _ResourceWorkflow=_ResourceWorkflow,
-                    base_template=base_template,
-                ),
+                controller=_ResourceWorkflowRouter.as_controller(**router_kwargs),
             ),
         ]
 